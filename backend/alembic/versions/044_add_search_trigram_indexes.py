@@ -0,0 +1,53 @@
+"""Add pg_trgm extension and trigram indexes for bounded global search
+
+Revision ID: 044
+Revises: 043
+Create Date: 2025-01-06
+
+Changes:
+- Enable the pg_trgm extension
+- Create GIN trigram indexes on lower(title) columns so the substring
+  LIKE filters and similarity() ranking in global search are index-backed
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '044'
+down_revision: Union[str, None] = '043'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, title column)
+TRIGRAM_INDEXES = [
+    ("ix_projects_name_trgm", "projects", "name"),
+    ("ix_tasks_title_trgm", "tasks", "title"),
+    ("ix_documents_title_trgm", "documents", "title"),
+    ("ix_blockers_title_trgm", "blockers", "title"),
+    ("ix_reviews_title_trgm", "reviews", "title"),
+    ("ix_ideas_title_trgm", "ideas", "title"),
+    ("ix_papers_title_trgm", "papers", "title"),
+    ("ix_collections_name_trgm", "collections", "name"),
+    ("ix_journal_entries_title_trgm", "journal_entries", "title"),
+    ("ix_users_display_name_trgm", "users", "display_name"),
+    ("ix_users_email_trgm", "users", "email"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for index_name, table, column in TRIGRAM_INDEXES:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS {index_name}
+            ON {table}
+            USING GIN (lower({column}) gin_trgm_ops)
+        """)
+
+
+def downgrade() -> None:
+    for index_name, _table, _column in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    # Leave the pg_trgm extension installed; other objects may depend on it
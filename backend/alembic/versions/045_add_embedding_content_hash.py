@@ -0,0 +1,37 @@
+"""Add embedding_content_hash to embeddable tables
+
+Revision ID: 045
+Revises: 044
+Create Date: 2025-01-08
+
+Changes:
+- Add embedding_content_hash (SHA-256 of the embedded text) to documents,
+  tasks, journal_entries, papers and projects so the embedding pipeline can
+  skip entities whose content has not changed
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '045'
+down_revision: Union[str, None] = '044'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDABLE_TABLES = ["documents", "tasks", "journal_entries", "papers", "projects"]
+
+
+def upgrade() -> None:
+    for table in EMBEDDABLE_TABLES:
+        op.add_column(
+            table,
+            sa.Column('embedding_content_hash', sa.String(64), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    for table in EMBEDDABLE_TABLES:
+        op.drop_column(table, 'embedding_content_hash')
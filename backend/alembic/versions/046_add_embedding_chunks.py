@@ -0,0 +1,65 @@
+"""Add embedding_chunks table for passage-level semantic search
+
+Revision ID: 046
+Revises: 045
+Create Date: 2025-01-10
+
+Changes:
+- Create embedding_chunks (entity_type, entity_id, chunk_idx, span, vector)
+- Create HNSW index for chunk similarity search
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '046'
+down_revision: Union[str, None] = '045'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Embedding dimensions - matches text-embedding-3-small default
+EMBEDDING_DIMENSIONS = 1536
+
+
+def upgrade() -> None:
+    op.create_table(
+        'embedding_chunks',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('entity_type', sa.String(50), nullable=False),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('chunk_idx', sa.Integer, nullable=False),
+        sa.Column('span_start', sa.Integer, nullable=False),
+        sa.Column('span_end', sa.Integer, nullable=False),
+        sa.Column('content', sa.Text, nullable=False),
+        sa.Column('token_count', sa.Integer, nullable=False),
+        sa.Column('embedding', Vector(EMBEDDING_DIMENSIONS), nullable=False),
+        sa.Column('embedding_model', sa.String(100), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.UniqueConstraint('entity_type', 'entity_id', 'chunk_idx', name='uq_embedding_chunk'),
+    )
+
+    op.create_index(
+        'ix_embedding_chunks_entity',
+        'embedding_chunks',
+        ['entity_type', 'entity_id'],
+    )
+
+    # Create HNSW index for efficient vector similarity search
+    op.execute("""
+        CREATE INDEX ix_embedding_chunks_embedding_hnsw
+        ON embedding_chunks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_embedding_chunks_embedding_hnsw")
+    op.drop_index('ix_embedding_chunks_entity', table_name='embedding_chunks')
+    op.drop_table('embedding_chunks')
@@ -0,0 +1,146 @@
+"""Add daily analytics rollup tables
+
+Revision ID: 047
+Revises: 046
+Create Date: 2025-01-14
+
+Changes:
+- Create analytics_daily_activity (org, day, activity type, target type counts)
+- Create analytics_daily_contributors (org, day, per-member activity counts)
+- Create analytics_daily_task_status (org, day, task counts by status)
+- Index activities on (organization_id, created_at) for the live "today" reads
+- Backfill the activity and contributor rollups for every closed day, and
+  today's task status snapshot (no earlier task history exists)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '047'
+down_revision: Union[str, None] = '046'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    ]
+
+
+def _organization_id() -> sa.Column:
+    return sa.Column(
+        'organization_id',
+        postgresql.UUID(as_uuid=True),
+        sa.ForeignKey('organizations.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_daily_activity',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        _organization_id(),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column('activity_type', sa.String(100), nullable=False),
+        sa.Column('target_type', sa.String(50), nullable=False),
+        sa.Column('activity_count', sa.Integer, nullable=False),
+        *_timestamps(),
+        sa.UniqueConstraint(
+            'organization_id', 'day', 'activity_type', 'target_type',
+            name='uq_analytics_daily_activity',
+        ),
+    )
+
+    op.create_table(
+        'analytics_daily_contributors',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        _organization_id(),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column(
+            'actor_id',
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('users.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('activity_count', sa.Integer, nullable=False),
+        sa.Column('tasks_completed', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('documents_created', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('comments_made', sa.Integer, nullable=False, server_default='0'),
+        *_timestamps(),
+        sa.UniqueConstraint(
+            'organization_id', 'day', 'actor_id',
+            name='uq_analytics_daily_contributor',
+        ),
+    )
+
+    op.create_table(
+        'analytics_daily_task_status',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        _organization_id(),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('task_count', sa.Integer, nullable=False),
+        *_timestamps(),
+        sa.UniqueConstraint(
+            'organization_id', 'day', 'status',
+            name='uq_analytics_daily_task_status',
+        ),
+    )
+
+    # The unique constraints lead with (organization_id, day), which covers
+    # the dashboard's per-org date range reads.
+
+    op.create_index(
+        'ix_activities_organization_created_at',
+        'activities',
+        ['organization_id', 'created_at'],
+    )
+
+    # Same aggregates as services.analytics.refresh_rollups. Today stays out
+    # of the activity rollups: readers aggregate it live.
+    op.execute("""
+        INSERT INTO analytics_daily_activity
+            (id, organization_id, day, activity_type, target_type, activity_count)
+        SELECT gen_random_uuid(), organization_id, (created_at AT TIME ZONE 'UTC')::date,
+               activity_type, target_type, count(*)
+        FROM activities
+        WHERE created_at < (now() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC'
+        GROUP BY organization_id, (created_at AT TIME ZONE 'UTC')::date, activity_type, target_type
+    """)
+    op.execute("""
+        INSERT INTO analytics_daily_contributors
+            (id, organization_id, day, actor_id, activity_count,
+             tasks_completed, documents_created, comments_made)
+        SELECT gen_random_uuid(), organization_id, (created_at AT TIME ZONE 'UTC')::date,
+               actor_id, count(*),
+               count(*) FILTER (WHERE activity_type = 'task.completed'),
+               count(*) FILTER (WHERE activity_type = 'document.created'),
+               count(*) FILTER (WHERE activity_type = 'comment.created')
+        FROM activities
+        WHERE created_at < (now() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC'
+        GROUP BY organization_id, (created_at AT TIME ZONE 'UTC')::date, actor_id
+    """)
+    op.execute("""
+        INSERT INTO analytics_daily_task_status (id, organization_id, day, status, task_count)
+        SELECT gen_random_uuid(), teams.organization_id, (now() AT TIME ZONE 'UTC')::date,
+               tasks.status, count(tasks.id)
+        FROM tasks
+        JOIN projects ON tasks.project_id = projects.id
+        JOIN teams ON projects.team_id = teams.id
+        WHERE teams.organization_id IS NOT NULL
+        GROUP BY teams.organization_id, tasks.status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activities_organization_created_at', table_name='activities')
+    op.drop_table('analytics_daily_task_status')
+    op.drop_table('analytics_daily_contributors')
+    op.drop_table('analytics_daily_activity')
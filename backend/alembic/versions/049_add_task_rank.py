@@ -0,0 +1,66 @@
+"""Add fractional rank keys for task ordering
+
+Revision ID: 049
+Revises: 048
+Create Date: 2025-01-17
+
+Changes:
+- Add tasks.rank (varchar, "C" collation), backfilled from position order
+- Index tasks on (project_id, status, rank) for column reads and appends
+- Index tasks on (project_id, rank, id) for keyset pagination of task lists
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '049'
+down_revision: Union[str, None] = '048'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def _digit(power: int) -> str:
+    return f"substr('{DIGITS}', (v / {62 ** power} % 62)::int + 1, 1)"
+
+
+def upgrade() -> None:
+    op.add_column(
+        'tasks',
+        sa.Column('rank', sa.String(255, collation='C'), nullable=True),
+    )
+
+    # Spread each column's tasks evenly over six base-62 digits in their
+    # current position order, as task_rank.spaced_keys does
+    rank_expr = " || ".join(_digit(power) for power in range(5, -1, -1))
+    op.execute(f"""
+        WITH ordered AS (
+            SELECT
+                id,
+                row_number() OVER w AS rn,
+                count(*) OVER (PARTITION BY project_id, status) AS n
+            FROM tasks
+            WINDOW w AS (PARTITION BY project_id, status ORDER BY position, created_at, id)
+        ),
+        spaced AS (
+            SELECT id, rn * {62 ** 6}::bigint / (n + 1) AS v FROM ordered
+        )
+        UPDATE tasks
+        SET rank = rtrim({rank_expr}, '0')
+        FROM spaced
+        WHERE tasks.id = spaced.id
+    """)
+
+    op.alter_column('tasks', 'rank', nullable=False)
+    op.create_index('ix_tasks_project_status_rank', 'tasks', ['project_id', 'status', 'rank'])
+    op.create_index('ix_tasks_project_rank_id', 'tasks', ['project_id', 'rank', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_project_rank_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_status_rank', table_name='tasks')
+    op.drop_column('tasks', 'rank')
@@ -0,0 +1,92 @@
+"""Replace per-comment reads with per-thread read watermarks
+
+Revision ID: 050
+Revises: 049
+Create Date: 2025-01-18
+
+Changes:
+- Create comment_thread_reads: one read watermark per (user, thread)
+- Backfill each watermark from the newest comment the user had read in
+  that thread
+- Drop comment_reads
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '050'
+down_revision: Union[str, None] = '049'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# comment_type -> (comment table, thread column)
+THREADS = {
+    'task': ('task_comments', 'task_id'),
+    'document': ('document_comments', 'document_id'),
+    'review': ('review_comments', 'review_id'),
+    'generic': ('comments', 'resource_id'),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'comment_thread_reads',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('thread_type', sa.String(50), nullable=False, comment='Type of comment: task, document, review, generic'),
+        sa.Column('thread_id', postgresql.UUID(as_uuid=True), nullable=False, comment='Task, document, review or commented resource ID'),
+        sa.Column('read_through', sa.DateTime(timezone=True), nullable=False, comment='Comments created at or before this are read'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('user_id', 'thread_type', 'thread_id', name='uq_comment_thread_read'),
+    )
+
+    for comment_type, (table, thread_column) in THREADS.items():
+        op.execute(f"""
+            INSERT INTO comment_thread_reads (user_id, thread_type, thread_id, read_through, updated_at)
+            SELECT r.user_id, '{comment_type}', c.{thread_column}, max(c.created_at), max(r.read_at)
+            FROM comment_reads r
+            JOIN {table} c ON c.id = r.comment_id
+            WHERE r.comment_type = '{comment_type}'
+            GROUP BY r.user_id, c.{thread_column}
+        """)
+
+    op.drop_index('ix_comment_reads_comment_lookup', table_name='comment_reads')
+    op.drop_index('ix_comment_reads_user_id', table_name='comment_reads')
+    op.drop_table('comment_reads')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'comment_reads',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('comment_type', sa.String(50), nullable=False, comment='Type of comment: task, document, review, generic'),
+        sa.Column('comment_id', postgresql.UUID(as_uuid=True), nullable=False, comment='ID of the comment in its respective table'),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('read_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('comment_type', 'comment_id', 'user_id', name='uq_comment_read'),
+    )
+    op.create_index('ix_comment_reads_user_id', 'comment_reads', ['user_id'])
+    op.create_index('ix_comment_reads_comment_lookup', 'comment_reads', ['comment_type', 'comment_id'])
+
+    # Expand each watermark back into one row per comment it covers
+    for comment_type, (table, thread_column) in THREADS.items():
+        op.execute(f"""
+            INSERT INTO comment_reads (comment_type, comment_id, user_id, read_at)
+            SELECT '{comment_type}', c.id, w.user_id, w.updated_at
+            FROM comment_thread_reads w
+            JOIN {table} c ON c.{thread_column} = w.thread_id AND c.created_at <= w.read_through
+            WHERE w.thread_type = '{comment_type}'
+        """)
+
+    op.drop_table('comment_thread_reads')
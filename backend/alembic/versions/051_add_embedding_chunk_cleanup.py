@@ -0,0 +1,65 @@
+"""Delete embedding chunks together with their entities
+
+Revision ID: 051
+Revises: 050
+Create Date: 2025-01-20
+
+Changes:
+- embedding_chunks.entity_id is polymorphic, so no foreign key can cascade;
+  add AFTER DELETE triggers on documents and papers that remove the
+  entity's chunks (also covers project/organization cascades)
+- Purge chunks left behind by deleted documents and papers, and by
+  archived documents
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '051'
+down_revision: Union[str, None] = '050'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# entity_type -> table
+CHUNKED_TABLES = {
+    'document': 'documents',
+    'paper': 'papers',
+}
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION embedding_chunks_cleanup() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM embedding_chunks
+            WHERE entity_type = TG_ARGV[0] AND entity_id = OLD.id;
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for entity_type, table in CHUNKED_TABLES.items():
+        op.execute(f"""
+            CREATE TRIGGER {table}_embedding_chunks_cleanup
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION embedding_chunks_cleanup('{entity_type}')
+        """)
+        op.execute(f"""
+            DELETE FROM embedding_chunks c
+            WHERE c.entity_type = '{entity_type}'
+              AND NOT EXISTS (SELECT 1 FROM {table} e WHERE e.id = c.entity_id)
+        """)
+
+    op.execute("""
+        DELETE FROM embedding_chunks c
+        USING documents d
+        WHERE c.entity_type = 'document' AND c.entity_id = d.id AND d.is_archived
+    """)
+
+
+def downgrade() -> None:
+    for table in CHUNKED_TABLES.values():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_embedding_chunks_cleanup ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS embedding_chunks_cleanup()")
@@ -0,0 +1,292 @@
+"""Per-conversation memoization of assistant query tool results.
+
+Within a conversation the model often repeats a lookup it has already made
+(the same get_projects call, the same search, the same dynamic query
+filters). ExecutionContext notices repeated searches to steer the model,
+but each repeat still hit the database. Results are stored in a Redis hash
+per conversation, keyed on the tool name, the canonicalized input, the user
+and the organization.
+
+Each entry is stamped with three counters and is served only while they
+all match:
+
+- ``assistant:v1:memo:epoch:{org_id}``, bumped by SQLAlchemy commit hooks
+  whenever rows the query tools read (projects, tasks, blockers, documents,
+  journal entries, papers, members, ...) change in the organization,
+  through the REST API, the assistant or a worker
+- the access cache's global epoch and per-user version, so a change to the
+  user's project access is never answered from a stale result
+
+Entries also expire after ``assistant_tool_memo_ttl_seconds``. Redis is
+optional: on errors every lookup is a miss.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from researchhub.config import get_settings
+from researchhub.db.redis import (
+    counter_unconfirmed,
+    get_redis,
+    retry_counter_bumps,
+    schedule_counter_bumps,
+)
+from researchhub.db.session import async_session_factory
+from researchhub.models.collaboration import Comment, ProjectShare
+from researchhub.models.document import Document
+from researchhub.models.journal import JournalEntry
+from researchhub.models.knowledge import Collection, Paper
+from researchhub.models.organization import Department, Organization, OrganizationMember, Team
+from researchhub.models.project import (
+    Blocker,
+    Project,
+    ProjectMember,
+    ProjectTeam,
+    Task,
+    TaskAssignment,
+    TaskComment,
+)
+from researchhub.services.access_cache import EPOCH_KEY as ACCESS_EPOCH_KEY, user_version_key
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "assistant:v1:memo"
+
+# Rows the query tools read, by how they reach their organization
+ORG_SCOPED_MODELS = (JournalEntry, Paper, Collection, Comment, OrganizationMember, Department, Team)
+PROJECT_SCOPED_MODELS = (Task, Blocker, Document, ProjectMember, ProjectTeam, ProjectShare)
+TASK_SCOPED_MODELS = (TaskAssignment, TaskComment)
+
+
+def _org_epoch_key(org_id: UUID) -> str:
+    return f"{KEY_PREFIX}:epoch:{org_id}"
+
+
+def _conversation_key(conversation_id: UUID) -> str:
+    return f"{KEY_PREFIX}:{conversation_id}"
+
+
+def canonicalize_input(value: Any) -> Any:
+    """Normalize tool input so equivalent calls share a key.
+
+    Drops keys whose value is None or empty and strips surrounding
+    whitespace from strings. Key order is handled by ``sort_keys`` when
+    the result is serialized.
+    """
+    if isinstance(value, dict):
+        canonical = {}
+        for key, item in value.items():
+            item = canonicalize_input(item)
+            if item is None or item == "" or item == [] or item == {}:
+                continue
+            canonical[key] = item
+        return canonical
+    if isinstance(value, list):
+        return [canonicalize_input(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def memo_field(tool_name: str, tool_input: Dict[str, Any], user_id: UUID, org_id: UUID) -> str:
+    """Hash field identifying one (tool, input, user, org) lookup."""
+    material = json.dumps(
+        [tool_name, canonicalize_input(tool_input), str(user_id), str(org_id)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ToolResultMemo:
+    """Memoized query tool results for one conversation.
+
+    ``hits`` and ``misses`` count lookups made through this instance, i.e.
+    one chat request.
+    """
+
+    def __init__(self, conversation_id: UUID, user_id: UUID, org_id: UUID):
+        settings = get_settings()
+        self.conversation_id = conversation_id
+        self.user_id = user_id
+        self.org_id = org_id
+        self.ttl_seconds = settings.assistant_tool_memo_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    async def _read_stamp(self) -> bytes:
+        counters = await get_redis().mget(
+            _org_epoch_key(self.org_id),
+            ACCESS_EPOCH_KEY,
+            user_version_key(self.user_id),
+        )
+        return b":".join(counter or b"0" for counter in counters)
+
+    async def get_many(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+    ) -> Tuple[List[Optional[Dict[str, Any]]], Optional[bytes]]:
+        """Look up several (tool name, input) calls in one round trip.
+
+        Returns the memoized result for each call (None on a miss) and the
+        stamp the lookup read. Results computed for the misses must be
+        stored with that stamp, so they are checked against the counters
+        read before the data was; it is None when they can't be stored.
+        """
+        if not calls:
+            return [], None
+        fields = [memo_field(name, tool_input, self.user_id, self.org_id) for name, tool_input in calls]
+        await retry_counter_bumps()
+        if counter_unconfirmed(_org_epoch_key(self.org_id)):
+            # A failed invalidation may have left stored results stale
+            self.misses += len(calls)
+            return [None] * len(calls), None
+        try:
+            stamp = await self._read_stamp()
+            cached = await get_redis().hmget(_conversation_key(self.conversation_id), fields)
+        except RedisError as e:
+            logger.warning("assistant_memo_unavailable", error=str(e))
+            self.misses += len(calls)
+            return [None] * len(calls), None
+
+        results: List[Optional[Dict[str, Any]]] = []
+        for (tool_name, _), entry in zip(calls, cached):
+            result = None
+            if entry:
+                stored_stamp, _, payload = entry.partition(b"|")
+                if stored_stamp == stamp:
+                    result = json.loads(payload)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                logger.debug("assistant_memo_hit", tool=tool_name, conversation_id=str(self.conversation_id))
+            results.append(result)
+        return results, stamp
+
+    async def get(
+        self,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[bytes]]:
+        """Memoized result for one call (or None), and the stamp read."""
+        results, stamp = await self.get_many([(tool_name, tool_input)])
+        return results[0], stamp
+
+    async def set(
+        self,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+        result: Dict[str, Any],
+        stamp: Optional[bytes],
+    ) -> None:
+        """Store a tool result under the stamp of the lookup that missed.
+
+        Error results, and results whose lookup returned no stamp, are skipped.
+        """
+        if stamp is None or result.get("error"):
+            return
+        try:
+            payload = json.dumps(result, default=str)
+        except (TypeError, ValueError):
+            return
+        key = _conversation_key(self.conversation_id)
+        field = memo_field(tool_name, tool_input, self.user_id, self.org_id)
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, stamp + b"|" + payload.encode())
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("assistant_memo_store_failed", error=str(e))
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# --- Invalidation ---
+# Hooks only read flushed instances and the identity map; projects and
+# tasks whose organization isn't loaded are resolved after commit.
+
+def _pending(session: Session) -> Dict[str, set]:
+    return session.info.setdefault(
+        "assistant_memo_invalidation", {"orgs": set(), "projects": set(), "tasks": set()}
+    )
+
+
+def _identity(session: Session, model: type, row_id: UUID) -> Any:
+    return session.identity_map.get(inspect(model).identity_key_from_primary_key([row_id]))
+
+
+def _project_org(session: Session, project_id: UUID) -> Optional[UUID]:
+    project = _identity(session, Project, project_id)
+    team = _identity(session, Team, project.team_id) if project is not None and project.team_id else None
+    return team.organization_id if team is not None else None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_memo_changes(session: Session, flush_context) -> None:
+    """Record which organizations' memoized results the flushed rows affect."""
+    pending = _pending(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Organization):
+            pending["orgs"].add(obj.id)
+        elif isinstance(obj, ORG_SCOPED_MODELS):
+            pending["orgs"].add(obj.organization_id)
+        elif isinstance(obj, (Project, *PROJECT_SCOPED_MODELS)):
+            pending["projects"].add(obj.id if isinstance(obj, Project) else obj.project_id)
+        elif isinstance(obj, TASK_SCOPED_MODELS):
+            task = _identity(session, Task, obj.task_id)
+            if task is not None:
+                pending["projects"].add(task.project_id)
+            else:
+                pending["tasks"].add(obj.task_id)
+
+    for project_id in list(pending["projects"]):
+        org_id = _project_org(session, project_id) if project_id else None
+        if org_id is not None:
+            pending["orgs"].add(org_id)
+            pending["projects"].discard(project_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_memo_invalidation(session: Session) -> None:
+    pending = session.info.pop("assistant_memo_invalidation", None)
+    if not pending:
+        return
+    project_ids = [project_id for project_id in pending["projects"] if project_id]
+    task_ids = [task_id for task_id in pending["tasks"] if task_id]
+
+    async def project_orgs() -> List[str]:
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(Team.organization_id)
+                .join(Project, Project.team_id == Team.id)
+                .where(or_(
+                    Project.id.in_(project_ids),
+                    Project.id.in_(select(Task.project_id).where(Task.id.in_(task_ids))),
+                ))
+                .distinct()
+            )
+            return [_org_epoch_key(org_id) for org_id in result.scalars().all() if org_id]
+
+    schedule_counter_bumps(
+        [_org_epoch_key(org_id) for org_id in pending["orgs"] if org_id],
+        "assistant_memo_invalidation_failed",
+        resolve_keys=project_orgs if project_ids or task_ids else None,
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_memo_invalidation(session: Session) -> None:
+    session.info.pop("assistant_memo_invalidation", None)
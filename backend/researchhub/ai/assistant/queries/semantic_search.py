@@ -20,7 +20,7 @@ from researchhub.models.journal import JournalEntry
 from researchhub.models.knowledge import Paper
 from researchhub.models.organization import Team
 from researchhub.models.project import Project, Task
-from researchhub.services.embedding import get_embedding_service
+from researchhub.services.embedding import get_embedding_service, search_entity_chunks
 
 
 class SemanticSearchTool(QueryTool):
@@ -112,7 +112,7 @@ for comprehensive keyword-based search."""
         # Generate embedding for query
         embedding_service = get_embedding_service()
         try:
-            query_embedding = await embedding_service.generate_embedding(query_text)
+            query_embedding = await embedding_service.generate_query_embedding(query_text)
         except ValueError as e:
             return {
                 "query": query_text,
@@ -292,10 +292,25 @@ for comprehensive keyword-based search."""
         result = await db.execute(query)
         rows = result.all()
 
+        # Long documents also match on their best passage
+        def scope(chunk_query):
+            chunk_query = chunk_query.where(
+                Document.project_id.in_(accessible_project_ids),
+                Document.is_archived == False,
+                Document.is_system == False,
+            )
+            if project_id:
+                chunk_query = chunk_query.where(Document.project_id == project_id)
+            return chunk_query
+
+        matches = await self._with_passages(
+            db, "document", Document, query_embedding, rows, limit * 2, scope,
+            selectinload(Document.project),
+        )
+
         # Filter by similarity threshold and format results
         documents = []
-        for doc, distance in rows:
-            similarity = 1 - distance  # Convert distance to similarity
+        for doc, similarity, passage in matches:
             if similarity >= similarity_threshold:
                 documents.append({
                     "id": str(doc.id),
@@ -305,6 +320,7 @@ for comprehensive keyword-based search."""
                     "project_name": doc.project.name if doc.project else None,
                     "project_id": str(doc.project_id) if doc.project_id else None,
                     "similarity_score": round(similarity, 3),
+                    "matched_passage": passage,
                     "type": "document",
                 })
                 if len(documents) >= limit:
@@ -485,10 +501,14 @@ for comprehensive keyword-based search."""
         result = await db.execute(query)
         rows = result.all()
 
+        matches = await self._with_passages(
+            db, "paper", Paper, query_embedding, rows, limit * 2,
+            lambda chunk_query: chunk_query.where(Paper.organization_id == org_id),
+        )
+
         # Filter by similarity threshold and format results
         papers = []
-        for paper, distance in rows:
-            similarity = 1 - distance
+        for paper, similarity, passage in matches:
             if similarity >= similarity_threshold:
                 papers.append({
                     "id": str(paper.id),
@@ -500,6 +520,7 @@ for comprehensive keyword-based search."""
                     "read_status": paper.read_status,
                     "tags": paper.tags or [],
                     "similarity_score": round(similarity, 3),
+                    "matched_passage": passage,
                     "type": "paper",
                 })
                 if len(papers) >= limit:
@@ -507,6 +528,45 @@ for comprehensive keyword-based search."""
 
         return papers
 
+    async def _with_passages(
+        self,
+        db: AsyncSession,
+        entity_type: str,
+        model: Any,
+        query_embedding: List[float],
+        rows: List[Any],
+        limit: int,
+        scope: Any,
+        *options: Any,
+    ) -> List[tuple[Any, float, str | None]]:
+        """Combine entity-level (entity, distance) rows with passage matches.
+
+        Each entity scores the better of its whole-entity similarity and its
+        best passage; results are returned most similar first.
+        """
+        matches = {entity.id: (entity, 1 - distance) for entity, distance in rows}
+        hits = await search_entity_chunks(
+            db, entity_type, model, query_embedding, limit, scope=scope
+        )
+        passages = {hit.entity_id: hit for hit in hits}
+
+        missing = [entity_id for entity_id in passages if entity_id not in matches]
+        if missing:
+            result = await db.execute(
+                select(model).options(*options).where(model.id.in_(missing))
+            )
+            for entity in result.scalars().all():
+                matches[entity.id] = (entity, 0.0)
+
+        combined = []
+        for entity_id, (entity, similarity) in matches.items():
+            hit = passages.get(entity_id)
+            if hit and hit.similarity > similarity:
+                similarity = hit.similarity
+            combined.append((entity, similarity, hit.passage if hit else None))
+        combined.sort(key=lambda match: match[1], reverse=True)
+        return combined
+
 
 class HybridSearchTool(QueryTool):
     """Combined semantic and full-text search using Reciprocal Rank Fusion (RRF).
@@ -593,7 +653,7 @@ BEST CHOICE when:
         # Generate embedding for semantic search
         embedding_service = get_embedding_service()
         try:
-            query_embedding = await embedding_service.generate_embedding(query_text)
+            query_embedding = await embedding_service.generate_query_embedding(query_text)
         except Exception:
             query_embedding = None
 
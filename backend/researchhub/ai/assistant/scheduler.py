@@ -0,0 +1,144 @@
+"""Concurrent execution of read-only query tools within one model turn.
+
+When the model requests several tools at once, the service processes them
+in order: budget checks, execution, pattern recording, SSE events. Query
+tools are read-only, so the scheduler starts all of a turn's eligible query
+tools up front, each on its own pooled session. The ordered pass then
+awaits each prefetched result instead of executing it, and a turn costs
+about as much as its slowest query.
+
+Budget accounting, ExecutionContext recording and event order are still
+driven by the ordered pass, so they are unchanged. Meta tools (think,
+ask_user) read the execution context as it is recorded and always run
+inline. Action tools write through the request session and always run
+inline, in order.
+
+When a ToolResultMemo is given, memoized results are served without
+touching the database and fresh results are stored back.
+"""
+
+import asyncio
+import copy
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from researchhub.ai.assistant.budget import ToolBudget
+from researchhub.ai.assistant.memo import ToolResultMemo
+from researchhub.ai.assistant.tools import QueryTool, ToolRegistry
+from researchhub.ai.providers.base import ToolUse
+from researchhub.db.session import async_session_factory
+
+logger = structlog.get_logger()
+
+
+class QueryToolScheduler:
+    """Prefetches a turn's query tool results concurrently."""
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        user_id: UUID,
+        org_id: UUID,
+        concurrency: int = 4,
+        memo: Optional[ToolResultMemo] = None,
+    ):
+        self.registry = registry
+        self.user_id = user_id
+        self.org_id = org_id
+        self.memo = memo
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._memoized: Dict[str, Dict[str, Any]] = {}
+
+    async def start(self, tool_uses: List[ToolUse], budget: ToolBudget) -> int:
+        """Start every query tool in the turn that the budget will let run.
+
+        Replays the budget checks on a copy of ``budget``. Clarification
+        blocks raised by results later in the turn can't be predicted; those
+        results are simply never consumed.
+
+        Returns:
+            Number of tools started (memo hits are not counted).
+        """
+        simulated = copy.deepcopy(budget)
+        eligible: List[tuple] = []
+        for tool_use in tool_uses:
+            simulated.record_call(tool_use.name)
+            if simulated.get_tool_type(tool_use.name) != "query":
+                continue
+            if simulated.is_blocked_for_clarification() or simulated.is_query_exhausted():
+                continue
+            tool = self.registry.get_tool(tool_use.name)
+            if isinstance(tool, QueryTool) and tool_use.id not in self._tasks:
+                eligible.append((tool, tool_use))
+
+        memoized: List[Optional[Dict[str, Any]]] = [None] * len(eligible)
+        stamp: Optional[bytes] = None
+        if self.memo is not None:
+            memoized, stamp = await self.memo.get_many(
+                [(tool_use.name, tool_use.input) for _, tool_use in eligible]
+            )
+
+        started = 0
+        for (tool, tool_use), result in zip(eligible, memoized):
+            if result is not None:
+                self._memoized[tool_use.id] = result
+            else:
+                self._tasks[tool_use.id] = asyncio.create_task(self._run(tool, tool_use, stamp))
+                started += 1
+        return started
+
+    async def _run(self, tool: QueryTool, tool_use: ToolUse, stamp: Optional[bytes]) -> Dict[str, Any]:
+        async with self._semaphore, async_session_factory() as session:
+            result = await tool.execute(
+                input=tool_use.input,
+                db=session,
+                user_id=self.user_id,
+                org_id=self.org_id,
+            )
+        if self.memo is not None:
+            await self.memo.set(tool_use.name, tool_use.input, result, stamp)
+        return result
+
+    async def execute(
+        self,
+        tool: QueryTool,
+        tool_use: ToolUse,
+        db: AsyncSession,
+    ) -> Dict[str, Any]:
+        """The tool's result: memoized or prefetched if available, otherwise run inline on ``db``."""
+        if tool_use.id in self._memoized:
+            return self._memoized.pop(tool_use.id)
+        task: Optional[asyncio.Task] = self._tasks.pop(tool_use.id, None)
+        if task is not None:
+            return await task
+
+        memoize = self.memo is not None and tool_use.name not in ToolBudget.META_TOOLS
+        stamp: Optional[bytes] = None
+        if memoize:
+            result, stamp = await self.memo.get(tool_use.name, tool_use.input)
+            if result is not None:
+                return result
+        result = await tool.execute(
+            input=tool_use.input,
+            db=db,
+            user_id=self.user_id,
+            org_id=self.org_id,
+        )
+        if memoize:
+            await self.memo.set(tool_use.name, tool_use.input, result, stamp)
+        return result
+
+    def cancel(self) -> None:
+        """Cancel prefetches whose results will not be consumed."""
+        for tool_use_id, task in self._tasks.items():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is not None:
+                # Retrieve the exception so asyncio doesn't log it as unhandled
+                logger.debug("assistant_prefetch_discarded", tool_use_id=tool_use_id)
+        self._tasks.clear()
+        self._memoized.clear()
@@ -5,6 +5,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID, uuid4
 
+import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from researchhub.ai.assistant.schemas import (
@@ -21,18 +22,25 @@ from researchhub.ai.assistant.tools import (
 )
 from researchhub.ai.assistant.budget import ToolBudget
 from researchhub.ai.assistant.context import ExecutionContext
+from researchhub.ai.assistant.memo import ToolResultMemo
 from researchhub.ai.assistant.queries.strategic import ThinkTool, AskUserTool
+from researchhub.ai.assistant.scheduler import QueryToolScheduler
 from researchhub.ai.providers.base import (
     AIMessage,
     AIProvider,
     StreamEvent,
+    SystemPrompt,
     ToolDefinition,
     ToolResult,
     ToolUse,
 )
+from researchhub.config import get_settings
+from researchhub.db.session import release_connection
 from researchhub.models.ai import AIConversation, AIPendingAction
 from researchhub.models.user import User
 
+logger = structlog.get_logger()
+
 
 class AssistantService:
     """Service for AI-powered assistant with tool calling and action approval."""
@@ -50,7 +58,9 @@ class AssistantService:
 
         Args:
             provider: The AI provider (e.g., Claude)
-            db: Database session
+            db: Database session; for streamed chats, one from
+                streaming_session, which ``chat`` releases while the
+                model generates
             user_id: Current user's ID
             org_id: Current organization's ID
             use_dynamic_queries: If True, disables specialized query tools
@@ -86,8 +96,13 @@ class AssistantService:
         page_context: Optional[PageContext],
         user: Optional[User] = None,
         action_history: Optional[Dict[str, List[Dict[str, Any]]]] = None,
-    ) -> str:
-        """Build a lean system prompt optimized for token efficiency."""
+    ) -> SystemPrompt:
+        """Build a lean system prompt optimized for token efficiency.
+
+        The instructions are identical for every request with the same tool
+        mode, so they form the cacheable static part. Date, user, action
+        history and page context change per request and follow them.
+        """
         today = date.today()
 
         # Compact header with essential context
@@ -110,13 +125,9 @@ class AssistantService:
             if executed or rejected:
                 parts.append("Do not re-propose actions from these lists.")
 
-        header = "\n".join(parts)
-
         # Build tool-specific guidance based on mode
         if self.use_unified_tools:
-            base_prompt = header + """
-
-You are an AI assistant for a knowledge management app. Help users with projects, tasks, documents, and blockers.
+            base_prompt = """You are an AI assistant for a knowledge management app. Help users with projects, tasks, documents, and blockers.
 
 ## CRITICAL RULES
 1. **Never fabricate**: If query returns empty, say "I couldn't find X". Never invent content.
@@ -125,7 +136,7 @@ You are an AI assistant for a knowledge management app. Help users with projects
 4. **Ask on ambiguity**: Multiple matches? Use ask_user immediately with options.
 5. **One action at a time**: Only call ONE action tool per response. Wait for user approval before next action.
 6. **No duplicate calls**: Never call the same tool twice in one response.
-7. **Check COMPLETED ACTIONS**: If actions are listed above as completed, acknowledge them and continue with any remaining work the user requested.
+7. **Check COMPLETED ACTIONS**: If the Context section lists completed actions, acknowledge them and continue with any remaining work the user requested.
 
 ## Tools (13 total)
 **Query**: search, get_details, get_items, get_attention_summary, get_team_members, think, ask_user
@@ -189,9 +200,7 @@ Multi-step requests, analysis, or unclear intent:
 - Task flow: idea → todo → in_progress → in_review → done
 - Blocker flow: open → in_progress → resolved"""
         else:
-            base_prompt = header + """
-
-You are an AI assistant for a knowledge management app. Help users with projects, tasks, documents, and blockers.
+            base_prompt = """You are an AI assistant for a knowledge management app. Help users with projects, tasks, documents, and blockers.
 
 ## CRITICAL RULES
 1. **Never fabricate**: If query returns empty, say "I couldn't find X". Never invent content.
@@ -200,7 +209,7 @@ You are an AI assistant for a knowledge management app. Help users with projects
 4. **Ask on ambiguity**: Multiple matches? Use ask_user immediately with options.
 5. **One action at a time**: Only call ONE action tool per response. Wait for user approval before next action.
 6. **No duplicate calls**: Never call the same tool twice in one response.
-7. **Check COMPLETED ACTIONS**: If actions are listed above as completed, acknowledge them and continue with any remaining work the user requested.
+7. **Check COMPLETED ACTIONS**: If the Context section lists completed actions, acknowledge them and continue with any remaining work the user requested.
 
 ## Tools
 - **Query tools**: get_projects, get_tasks, get_attention_summary, dynamic_query, search_content, semantic_search, hybrid_search
@@ -232,13 +241,17 @@ You are an AI assistant for a knowledge management app. Help users with projects
             base_prompt += "\n\n**Mode: dynamic_query preferred for all queries.**"
 
         if page_context:
-            base_prompt += f"\n\nPage context: {page_context.type}"
+            page_line = f"Page context: {page_context.type}"
             if page_context.id:
-                base_prompt += f" (ID: {page_context.id})"
+                page_line += f" (ID: {page_context.id})"
             if page_context.name:
-                base_prompt += f" - {page_context.name}"
+                page_line += f" - {page_context.name}"
+            parts.append(page_line)
 
-        return base_prompt
+        return SystemPrompt(
+            static=base_prompt,
+            dynamic="## Context\n" + "\n".join(parts),
+        )
 
     def _get_tool_definitions(self) -> List[ToolDefinition]:
         """Get all tool definitions for the LLM."""
@@ -329,6 +342,9 @@ You are an AI assistant for a knowledge management app. Help users with projects
         )
         execution_context.set_original_goal(request.message)
 
+        # Query results are memoized for the rest of the conversation
+        tool_memo = ToolResultMemo(conversation_id, self.user_id, self.org_id)
+
         # Set execution context on ThinkTool if available
         think_tool = self.tool_registry.get_tool("think")
         if think_tool and isinstance(think_tool, ThinkTool):
@@ -344,6 +360,10 @@ You are an AI assistant for a knowledge management app. Help users with projects
             accumulated_text = ""
             has_error = False
 
+            # Nothing touches the database while the model generates, so
+            # give the connection back to the pool for the duration
+            await release_connection(self.db)
+
             # Stream response from LLM
             async for event in self.provider.stream_with_tools(
                 messages=messages,
@@ -407,7 +427,15 @@ You are an AI assistant for a knowledge management app. Help users with projects
 
                 elif event.type == StreamEvent.DONE:
                     # Stream completed, we'll process tool calls below
-                    pass
+                    logger.info(
+                        "assistant_llm_turn",
+                        iteration=iteration,
+                        model=event.data.get("model"),
+                        input_tokens=event.data.get("input_tokens", 0),
+                        output_tokens=event.data.get("output_tokens", 0),
+                        cache_read_tokens=event.data.get("cache_read_tokens", 0),
+                        cache_write_tokens=event.data.get("cache_write_tokens", 0),
+                    )
 
             # If there was an error, stop processing
             if has_error:
@@ -419,190 +447,209 @@ You are an AI assistant for a knowledge management app. Help users with projects
             # Process any tool calls that were collected
             has_action_tools = False  # Track if any action tools were processed
             if pending_tool_uses:
-                for tool_use in pending_tool_uses:
-                    # Record call with budget tracker
-                    tool_budget.record_call(tool_use.name)
-
-                    # Check if queries are blocked for clarification (except ask_user itself)
-                    if (tool_budget.is_blocked_for_clarification() and
-                        tool_budget.get_tool_type(tool_use.name) == "query" and
-                        tool_use.name != "ask_user"):
-                        # Block query - user clarification is required first
-                        tool_results.append(ToolResult(
-                            tool_use_id=tool_use.id,
-                            content={
-                                "error": f"Query blocked: {tool_budget.clarification_reason} "
-                                         "You MUST call ask_user first to let the user choose.",
-                                "required_action": "ask_user",
-                            },
-                            is_error=True,
-                        ))
-                        continue
-
-                    # Check if query or action budget is exhausted
-                    if tool_budget.is_query_exhausted() and tool_budget.get_tool_type(tool_use.name) == "query":
-                        # Return a "budget exhausted" result
-                        tool_results.append(ToolResult(
-                            tool_use_id=tool_use.id,
-                            content={"error": "Query budget exhausted. Please respond to the user with the information you have gathered."},
-                            is_error=True,
-                        ))
-                        continue
-
-                    if tool_budget.is_action_exhausted() and tool_budget.get_tool_type(tool_use.name) == "action":
-                        tool_results.append(ToolResult(
-                            tool_use_id=tool_use.id,
-                            content={"error": "Action budget exhausted for this session."},
-                            is_error=True,
-                        ))
-                        continue
-
-                    # Get the tool
-                    tool = self.tool_registry.get_tool(tool_use.name)
-                    if not tool:
-                        # Tool not found
-                        tool_results.append(ToolResult(
-                            tool_use_id=tool_use.id,
-                            content={"error": f"Unknown tool: {tool_use.name}"},
-                            is_error=True,
-                        ))
-                        continue
-
-                    try:
-                        if isinstance(tool, QueryTool):
-                            # Execute query tools immediately
-                            result = await tool.execute(
-                                input=tool_use.input,
-                                db=self.db,
-                                user_id=self.user_id,
-                                org_id=self.org_id,
-                            )
+                # Read-only query tools run concurrently, each on its own session;
+                # results are still consumed in order below
+                scheduler = QueryToolScheduler(
+                    self.tool_registry,
+                    self.user_id,
+                    self.org_id,
+                    concurrency=get_settings().assistant_tool_concurrency,
+                    memo=tool_memo,
+                )
+                await scheduler.start(pending_tool_uses, tool_budget)
+                try:
+                    for tool_use in pending_tool_uses:
+                        # Record call with budget tracker
+                        tool_budget.record_call(tool_use.name)
+
+                        # Check if queries are blocked for clarification (except ask_user itself)
+                        if (tool_budget.is_blocked_for_clarification() and
+                            tool_budget.get_tool_type(tool_use.name) == "query" and
+                            tool_use.name != "ask_user"):
+                            # Block query - user clarification is required first
+                            tool_results.append(ToolResult(
+                                tool_use_id=tool_use.id,
+                                tool_use=tool_use,
+                                content={
+                                    "error": f"Query blocked: {tool_budget.clarification_reason} "
+                                             "You MUST call ask_user first to let the user choose.",
+                                    "required_action": "ask_user",
+                                },
+                                is_error=True,
+                            ))
+                            continue
 
-                            # Record with execution context for pattern detection
-                            # (skip meta-tools as they don't need pattern tracking)
-                            auto_injection = None
-                            if tool_use.name not in ToolBudget.META_TOOLS:
-                                auto_injection = await execution_context.record_tool_call(
-                                    tool_name=tool_use.name,
-                                    tool_input=tool_use.input,
-                                    result=result,
+                        # Check if query or action budget is exhausted
+                        if tool_budget.is_query_exhausted() and tool_budget.get_tool_type(tool_use.name) == "query":
+                            # Return a "budget exhausted" result
+                            tool_results.append(ToolResult(
+                                tool_use_id=tool_use.id,
+                                tool_use=tool_use,
+                                content={"error": "Query budget exhausted. Please respond to the user with the information you have gathered."},
+                                is_error=True,
+                            ))
+                            continue
+
+                        if tool_budget.is_action_exhausted() and tool_budget.get_tool_type(tool_use.name) == "action":
+                            tool_results.append(ToolResult(
+                                tool_use_id=tool_use.id,
+                                tool_use=tool_use,
+                                content={"error": "Action budget exhausted for this session."},
+                                is_error=True,
+                            ))
+                            continue
+
+                        # Get the tool
+                        tool = self.tool_registry.get_tool(tool_use.name)
+                        if not tool:
+                            # Tool not found
+                            tool_results.append(ToolResult(
+                                tool_use_id=tool_use.id,
+                                tool_use=tool_use,
+                                content={"error": f"Unknown tool: {tool_use.name}"},
+                                is_error=True,
+                            ))
+                            continue
+
+                        try:
+                            if isinstance(tool, QueryTool):
+                                # Execute query tools immediately
+                                # Query tools already started by the scheduler
+                                # are awaited here; the rest run inline
+                                result = await scheduler.execute(tool, tool_use, self.db)
+
+                                # Record with execution context for pattern detection
+                                # (skip meta-tools as they don't need pattern tracking)
+                                auto_injection = None
+                                if tool_use.name not in ToolBudget.META_TOOLS:
+                                    auto_injection = await execution_context.record_tool_call(
+                                        tool_name=tool_use.name,
+                                        tool_input=tool_use.input,
+                                        result=result,
+                                    )
+
+                                    # Check if patterns require user clarification
+                                    # This blocks further queries until ask_user is called
+                                    requires_clarification, reason = execution_context.requires_user_clarification()
+                                    if requires_clarification and not tool_budget.is_blocked_for_clarification():
+                                        tool_budget.set_requires_clarification(reason)
+
+                                # Handle ask_user specially - emit clarification_needed event and stop
+                                if result.get("type") == "user_interaction_required":
+                                    yield SSEEvent(
+                                        event="clarification_needed",
+                                        data={
+                                            "question": result.get("question"),
+                                            "reason": result.get("reason"),
+                                            "options": result.get("options", []),
+                                        },
+                                    )
+                                    # Stop the stream - user needs to respond before we continue
+                                    # The done event will be emitted below
+                                    self._log_tool_memo(tool_memo)
+                                    yield SSEEvent(
+                                        event="done",
+                                        data={"conversation_id": str(conversation_id)},
+                                    )
+                                    return
+                                else:
+                                    # Emit tool result event for regular tools
+                                    yield SSEEvent(
+                                        event="tool_result",
+                                        data=result,
+                                    )
+
+                                tool_results.append(ToolResult(
+                                    tool_use_id=tool_use.id,
+                                    tool_use=tool_use,
+                                    content=result,
+                                ))
+
+                                # Inject auto-injection message if pattern detected
+                                if auto_injection:
+                                    messages.append(AIMessage(
+                                        role="user",
+                                        content=auto_injection,
+                                    ))
+
+                            elif isinstance(tool, ActionTool):
+                                # Create preview for action tools
+                                preview = await tool.create_preview(
+                                    input=tool_use.input,
+                                    db=self.db,
+                                    user_id=self.user_id,
+                                    org_id=self.org_id,
                                 )
 
-                                # Check if patterns require user clarification
-                                # This blocks further queries until ask_user is called
-                                requires_clarification, reason = execution_context.requires_user_clarification()
-                                if requires_clarification and not tool_budget.is_blocked_for_clarification():
-                                    tool_budget.set_requires_clarification(reason)
+                                # Store as pending action
+                                pending_action = await self._store_pending_action(
+                                    conversation_id=conversation_id,
+                                    preview=preview,
+                                )
 
-                            # Handle ask_user specially - emit clarification_needed event and stop
-                            if result.get("type") == "user_interaction_required":
+                                # Emit action preview event
                                 yield SSEEvent(
-                                    event="clarification_needed",
+                                    event="action_preview",
                                     data={
-                                        "question": result.get("question"),
-                                        "reason": result.get("reason"),
-                                        "options": result.get("options", []),
+                                        "action_id": str(pending_action.id),
+                                        "tool_name": preview.tool_name,
+                                        "description": preview.description,
+                                        "entity_type": preview.entity_type,
+                                        "entity_id": str(preview.entity_id) if preview.entity_id else None,
+                                        "old_state": preview.old_state,
+                                        "new_state": preview.new_state,
+                                        "diff": [
+                                            {
+                                                "field": d.field,
+                                                "old_value": d.old_value,
+                                                "new_value": d.new_value,
+                                                "change_type": d.change_type,
+                                            }
+                                            for d in preview.diff
+                                        ],
+                                        "expires_at": pending_action.expires_at.isoformat(),
                                     },
                                 )
-                                # Stop the stream - user needs to respond before we continue
-                                # The done event will be emitted below
-                                yield SSEEvent(
-                                    event="done",
-                                    data={"conversation_id": str(conversation_id)},
-                                )
-                                return
-                            else:
-                                # Emit tool result event for regular tools
+
+                                # Build the pending approval result
+                                pending_result = {
+                                    "status": "pending_approval",
+                                    "action_id": str(pending_action.id),
+                                    "message": f"Action '{preview.description}' is pending user approval. The user will see a preview of the changes.",
+                                }
+
+                                # Emit tool result event so frontend can track it
                                 yield SSEEvent(
                                     event="tool_result",
-                                    data=result,
+                                    data=pending_result,
                                 )
 
-                            tool_results.append(ToolResult(
-                                tool_use_id=tool_use.id,
-                                content=result,
-                            ))
-
-                            # Inject auto-injection message if pattern detected
-                            if auto_injection:
-                                messages.append(AIMessage(
-                                    role="user",
-                                    content=auto_injection,
+                                # Tell the LLM the action is pending approval
+                                tool_results.append(ToolResult(
+                                    tool_use_id=tool_use.id,
+                                    tool_use=tool_use,
+                                    content=pending_result,
                                 ))
 
-                        elif isinstance(tool, ActionTool):
-                            # Create preview for action tools
-                            preview = await tool.create_preview(
-                                input=tool_use.input,
-                                db=self.db,
-                                user_id=self.user_id,
-                                org_id=self.org_id,
-                            )
-
-                            # Store as pending action
-                            pending_action = await self._store_pending_action(
-                                conversation_id=conversation_id,
-                                preview=preview,
-                            )
+                                # Mark that we processed action tools
+                                has_action_tools = True
 
-                            # Emit action preview event
-                            yield SSEEvent(
-                                event="action_preview",
-                                data={
-                                    "action_id": str(pending_action.id),
-                                    "tool_name": preview.tool_name,
-                                    "description": preview.description,
-                                    "entity_type": preview.entity_type,
-                                    "entity_id": str(preview.entity_id) if preview.entity_id else None,
-                                    "old_state": preview.old_state,
-                                    "new_state": preview.new_state,
-                                    "diff": [
-                                        {
-                                            "field": d.field,
-                                            "old_value": d.old_value,
-                                            "new_value": d.new_value,
-                                            "change_type": d.change_type,
-                                        }
-                                        for d in preview.diff
-                                    ],
-                                    "expires_at": pending_action.expires_at.isoformat(),
-                                },
-                            )
-
-                            # Build the pending approval result
-                            pending_result = {
-                                "status": "pending_approval",
-                                "action_id": str(pending_action.id),
-                                "message": f"Action '{preview.description}' is pending user approval. The user will see a preview of the changes.",
-                            }
-
-                            # Emit tool result event so frontend can track it
-                            yield SSEEvent(
-                                event="tool_result",
-                                data=pending_result,
-                            )
-
-                            # Tell the LLM the action is pending approval
+                        except Exception as e:
+                            # Handle tool execution errors
                             tool_results.append(ToolResult(
                                 tool_use_id=tool_use.id,
-                                content=pending_result,
+                                tool_use=tool_use,
+                                content={"error": str(e)},
+                                is_error=True,
                             ))
 
-                            # Mark that we processed action tools
-                            has_action_tools = True
-
-                    except Exception as e:
-                        # Handle tool execution errors
-                        tool_results.append(ToolResult(
-                            tool_use_id=tool_use.id,
-                            content={"error": str(e)},
-                            is_error=True,
-                        ))
-
-                        yield SSEEvent(
-                            event="error",
-                            data={"message": f"Tool error: {str(e)}"},
-                        )
+                            yield SSEEvent(
+                                event="error",
+                                data={"message": f"Tool error: {str(e)}"},
+                            )
+                finally:
+                    # Drop prefetches left unconsumed by an early return or disconnect
+                    scheduler.cancel()
 
                 # If action tools were processed, stop and wait for user approval
                 # All actions are now pending - user needs to approve them before we continue
@@ -652,11 +699,23 @@ Would you like to try rephrasing your question?"""
             )
 
         # Done event
+        self._log_tool_memo(tool_memo)
         yield SSEEvent(
             event="done",
             data={"conversation_id": str(conversation_id)},
         )
 
+    def _log_tool_memo(self, memo: ToolResultMemo) -> None:
+        """Log memoized tool result usage for one chat request."""
+        if memo.hits or memo.misses:
+            logger.info(
+                "assistant_tool_memo",
+                conversation_id=str(memo.conversation_id),
+                hits=memo.hits,
+                misses=memo.misses,
+                hit_rate=round(memo.hit_rate, 3),
+            )
+
     async def _get_or_create_conversation(
         self,
         conversation_id: Optional[UUID],
@@ -2,12 +2,22 @@
 
 Detects potential PHI in text before sending to AI providers, supporting
 HIPAA compliance for healthcare research applications.
+
+Prompts can hold whole documents, so the detector avoids running every
+pattern over the full text. Each built-in pattern only matches text that
+contains a digit or an "@". A single pass finds those anchors, and the
+patterns then run only over the regions around them. Text is consumed in
+overlapping windows, so chunked input is scanned in bounded memory.
+Findings match a plain per-pattern ``finditer`` scan of the whole text.
 """
 
+import asyncio
+import hashlib
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Pattern
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
 
 
 class PHIType(str, Enum):
@@ -59,6 +69,33 @@ class PHIDetectionResult:
         return list(set(f.type.value for f in self.findings))
 
 
+# A digit or "@" plus the rest of its whitespace-delimited token
+_ANCHOR = re.compile(r'[\d@]\S*')
+
+# Context keyword separators and token start before an anchor (searched
+# with endpos at the anchor, so \Z is the anchor position)
+_TOKEN_HEAD = re.compile(r'[\s:#]*\S*\Z')
+
+# Length of the longest context keyword ("medical record") that may
+# precede the separators
+_KEYWORD_LOOKBACK = 14
+
+# Regions closer than this are scanned as one
+_REGION_MERGE_GAP = 64
+
+# Characters kept on each side of a window boundary; covers the 20
+# characters of exclusion context and \b lookbehind
+_WINDOW_CONTEXT = 64
+
+
+@dataclass
+class _ScanState:
+    """Progress of one scan across windows, in absolute text positions."""
+    next_start: dict = field(default_factory=dict)  # pattern key -> finditer resume position
+    scanned_to: int = 0
+    findings: List[PHIFinding] = field(default_factory=list)
+
+
 class PHIDetector:
     """Detect and optionally redact PHI in text.
 
@@ -136,23 +173,39 @@ class PHIDetector:
         self,
         enabled_types: Optional[List[PHIType]] = None,
         custom_patterns: Optional[dict[str, Pattern]] = None,
+        window_size: int = 256 * 1024,
+        cache_size: int = 128,
     ):
         """Initialize the PHI detector.
 
         Args:
             enabled_types: PHI types to detect (all by default)
             custom_patterns: Additional custom regex patterns
+            window_size: Characters scanned per window
+            cache_size: Detection results kept per content hash (0 disables)
         """
         self.enabled_types = enabled_types or list(PHIType)
         self.custom_patterns = custom_patterns or {}
+        self.window_size = window_size
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, Tuple[PHIFinding, ...]] = OrderedDict()
 
         # Remove NAME from enabled types if present (requires NER)
         if PHIType.NAME in self.enabled_types:
             self.enabled_types.remove(PHIType.NAME)
 
+        self._anchored_patterns = [
+            (phi_type, self.PATTERNS[phi_type])
+            for phi_type in self.enabled_types
+            if phi_type in self.PATTERNS
+        ]
+
     async def detect(self, text: str) -> PHIDetectionResult:
         """Detect potential PHI in text.
 
+        Results are cached by content hash. Texts longer than one window
+        are scanned in a worker thread.
+
         Args:
             text: Text to scan for PHI
 
@@ -162,49 +215,180 @@ class PHIDetector:
         if not text:
             return PHIDetectionResult(has_phi=False)
 
-        findings: List[PHIFinding] = []
+        key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return PHIDetectionResult(has_phi=bool(cached), findings=list(cached))
 
-        # Check each enabled pattern
-        for phi_type in self.enabled_types:
-            if phi_type not in self.PATTERNS:
-                continue
+        if len(text) > self.window_size:
+            findings = await asyncio.to_thread(self._scan, self._windows(text))
+        else:
+            findings = self._scan([text])
 
-            pattern = self.PATTERNS[phi_type]
-            for match in pattern.finditer(text):
-                # Check if match is excluded
-                if self._is_excluded(text, match.start(), match.end()):
-                    continue
-
-                findings.append(PHIFinding(
-                    type=phi_type,
-                    start=match.start(),
-                    end=match.end(),
-                    text=match.group(),
-                    confidence=1.0,
-                ))
-
-        # Check custom patterns
-        for pattern_name, pattern in self.custom_patterns.items():
-            for match in pattern.finditer(text):
-                if self._is_excluded(text, match.start(), match.end()):
-                    continue
-
-                findings.append(PHIFinding(
-                    type=PHIType.SSN,  # Use SSN as generic custom type
-                    start=match.start(),
-                    end=match.end(),
-                    text=match.group(),
-                    confidence=0.9,  # Slightly lower for custom
-                ))
+        if self.cache_size > 0:
+            self._cache[key] = tuple(findings)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return PHIDetectionResult(
+            has_phi=len(findings) > 0,
+            findings=findings,
+        )
+
+    async def detect_chunks(self, chunks: Iterable[str]) -> PHIDetectionResult:
+        """Detect potential PHI in text supplied as consecutive chunks.
 
-        # Sort by position
-        findings.sort(key=lambda f: f.start)
+        Equivalent to ``detect("".join(chunks))`` without building the
+        joined string; at most about one window of text is held at a time.
+        Results are not cached.
 
+        Args:
+            chunks: Consecutive pieces of the text
+
+        Returns:
+            PHIDetectionResult with findings (positions in the joined text)
+        """
+        findings = await asyncio.to_thread(self._scan, chunks)
         return PHIDetectionResult(
             has_phi=len(findings) > 0,
             findings=findings,
         )
 
+    def _windows(self, text: str) -> Iterator[str]:
+        for start in range(0, len(text), self.window_size):
+            yield text[start:start + self.window_size]
+
+    def _scan(self, chunks: Iterable[str]) -> List[PHIFinding]:
+        """Scan text in overlapping windows.
+
+        Args:
+            chunks: Consecutive pieces of the text
+
+        Returns:
+            Findings sorted by position
+        """
+        state = _ScanState()
+        pending: List[str] = []
+        pending_size = 0
+        buffer = ""
+        offset = 0  # Position of buffer[0] in the full text
+
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if len(buffer) + pending_size < self.window_size + _WINDOW_CONTEXT:
+                continue
+            buffer += "".join(pending)
+            pending.clear()
+            pending_size = 0
+
+            done = self._scan_window(buffer, offset, state, final=False)
+            keep = max(0, done - _WINDOW_CONTEXT)
+            buffer = buffer[keep:]
+            offset += keep
+
+        buffer += "".join(pending)
+        self._scan_window(buffer, offset, state, final=True)
+
+        state.findings.sort(key=lambda f: f.start)
+        return state.findings
+
+    def _scan_window(self, buffer: str, offset: int, state: _ScanState, final: bool) -> int:
+        """Scan the regions of one window that are complete.
+
+        Returns:
+            Buffer index before which the text has been scanned. Regions
+            that may continue into the next chunk are left for the next window.
+        """
+        limit = len(buffer) if final else len(buffer) - _WINDOW_CONTEXT
+        window_start = max(0, state.scanned_to - offset)
+        done = limit
+
+        for start, end in self._regions(buffer, window_start):
+            if end > limit:
+                done = start
+                break
+            self._scan_region(buffer, offset, start, end, state)
+            state.scanned_to = offset + end
+
+        # Custom patterns may match anywhere, so they scan the whole window
+        for name, pattern in self.custom_patterns.items():
+            pos = max(window_start, state.next_start.get(name, 0) - offset)
+            for match in pattern.finditer(buffer, pos):
+                if match.start() >= done:
+                    break
+                self._record(
+                    buffer, offset, match, PHIType.SSN,  # Use SSN as generic custom type
+                    confidence=0.9,  # Slightly lower for custom
+                    state=state,
+                )
+                state.next_start[name] = offset + max(match.end(), match.start() + 1)
+
+        return done
+
+    def _regions(self, buffer: str, pos: int) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) buffer ranges that can contain built-in PHI matches.
+
+        Each anchor token is widened back over its start and any keyword
+        and separators before it. Nearby ranges are merged.
+        """
+        region_start = region_end = None
+        for anchor in _ANCHOR.finditer(buffer, pos):
+            anchor_start, anchor_end = anchor.span()
+            if region_end is not None and anchor_start <= region_end + _REGION_MERGE_GAP:
+                region_end = max(region_end, anchor_end)
+                continue
+
+            lookback = _WINDOW_CONTEXT
+            while True:
+                low = max(0, anchor_start - lookback)
+                head = _TOKEN_HEAD.search(buffer, low, anchor_start).start()
+                if head > low or low == 0:
+                    break
+                lookback *= 4
+            start = max(0, head - _KEYWORD_LOOKBACK)
+
+            if region_end is not None:
+                yield region_start, region_end
+            region_start, region_end = start, anchor_end
+
+        if region_end is not None:
+            yield region_start, region_end
+
+    def _scan_region(self, buffer: str, offset: int, start: int, end: int, state: _ScanState) -> None:
+        """Run the built-in patterns over one region, resuming like finditer."""
+        for phi_type, pattern in self._anchored_patterns:
+            pos = max(start, state.next_start.get(phi_type, 0) - offset)
+            while pos <= end:
+                match = pattern.search(buffer, pos, end)
+                if match is None:
+                    break
+                self._record(buffer, offset, match, phi_type, confidence=1.0, state=state)
+                pos = max(match.end(), match.start() + 1)
+            state.next_start[phi_type] = max(state.next_start.get(phi_type, 0), offset + pos)
+
+    def _record(
+        self,
+        buffer: str,
+        offset: int,
+        match: re.Match,
+        phi_type: PHIType,
+        confidence: float,
+        state: _ScanState,
+    ) -> None:
+        # Check if match is excluded
+        if self._is_excluded(buffer, match.start(), match.end()):
+            return
+
+        state.findings.append(PHIFinding(
+            type=phi_type,
+            start=offset + match.start(),
+            end=offset + match.end(),
+            text=match.group(),
+            confidence=confidence,
+        ))
+
     async def redact(self, text: str, replacement: str = "[REDACTED]") -> str:
         """Replace detected PHI with a placeholder.
 
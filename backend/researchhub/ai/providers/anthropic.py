@@ -1,7 +1,8 @@
 """Anthropic Claude AI provider implementation."""
 
+import json
 import time
-from typing import AsyncIterator, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import anthropic
 from anthropic import AsyncAnthropic
@@ -11,12 +12,26 @@ from researchhub.ai.providers.base import (
     AIProvider,
     AIResponse,
     AIResponseWithTools,
+    StreamEvent,
+    SystemInput,
+    SystemPrompt,
     ToolDefinition,
     ToolResult,
     ToolUse,
 )
 from researchhub.ai.exceptions import AIProviderError, AIRateLimitError
 
+# Marks the end of a cacheable prompt prefix (5 minute TTL, refreshed on hit)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Extended thinking budgets for stream_with_tools' thinking_level
+THINKING_BUDGETS = {
+    "minimal": 1024,
+    "low": 4096,
+    "medium": 10000,
+    "high": 24000,
+}
+
 
 class AnthropicProvider(AIProvider):
     """Anthropic Claude implementation.
@@ -116,7 +131,7 @@ class AnthropicProvider(AIProvider):
             }
 
             if system_content:
-                request_kwargs["system"] = system_content
+                request_kwargs["system"] = _system_blocks(system_content)
 
             if stop_sequences:
                 request_kwargs["stop_sequences"] = stop_sequences
@@ -132,6 +147,7 @@ class AnthropicProvider(AIProvider):
                 output_tokens=response.usage.output_tokens,
                 finish_reason=response.stop_reason or "stop",
                 latency_ms=latency_ms,
+                **_cache_usage(response.usage),
             )
 
         except anthropic.RateLimitError as e:
@@ -201,7 +217,7 @@ class AnthropicProvider(AIProvider):
             }
 
             if system_content:
-                request_kwargs["system"] = system_content
+                request_kwargs["system"] = _system_blocks(system_content)
 
             if stop_sequences:
                 request_kwargs["stop_sequences"] = stop_sequences
@@ -231,7 +247,7 @@ class AnthropicProvider(AIProvider):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 30000,
-        system: Optional[str] = None,
+        system: Optional[SystemInput] = None,
     ) -> AIResponseWithTools:
         """Generate a completion with tool calling support using Claude.
 
@@ -242,7 +258,8 @@ class AnthropicProvider(AIProvider):
             model: Model identifier (uses default if not specified)
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
-            system: Optional system prompt for the conversation
+            system: Optional system prompt for the conversation; a
+                SystemPrompt marks which part is cacheable
 
         Returns:
             AIResponseWithTools containing text and/or tool use requests
@@ -256,9 +273,205 @@ class AnthropicProvider(AIProvider):
         model = model or self._default_model
         start_time = time.perf_counter()
 
+        request_kwargs = self._build_tool_request(
+            messages, tools, tool_results, model, temperature, max_tokens, system,
+        )
+
+        try:
+            response = await self.client.messages.create(**request_kwargs)
+
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+
+            # Parse response content
+            text_content = ""
+            tool_uses = []
+
+            for block in response.content:
+                if block.type == "text":
+                    text_content += block.text
+                elif block.type == "tool_use":
+                    tool_uses.append(ToolUse(
+                        id=block.id,
+                        name=block.name,
+                        input=block.input,
+                    ))
+
+            return AIResponseWithTools(
+                content=text_content,
+                model=model,
+                input_tokens=response.usage.input_tokens,
+                output_tokens=response.usage.output_tokens,
+                finish_reason=response.stop_reason or "stop",
+                latency_ms=latency_ms,
+                tool_uses=tool_uses,
+                **_cache_usage(response.usage),
+            )
+
+        except anthropic.RateLimitError as e:
+            raise AIRateLimitError(
+                provider=self.provider_name,
+                message=str(e),
+                retry_after=getattr(e, "retry_after", None),
+            )
+        except anthropic.APIError as e:
+            raise AIProviderError(
+                provider=self.provider_name,
+                message=str(e),
+                status_code=getattr(e, "status_code", None),
+            )
+
+    async def stream_with_tools(
+        self,
+        messages: List[AIMessage],
+        tools: List[ToolDefinition],
+        tool_results: Optional[List[ToolResult]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 30000,
+        system: Optional[SystemInput] = None,
+        thinking_level: Optional[str] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a completion with tool calling support using Claude.
+
+        Text and thinking are yielded as their deltas arrive. Tool inputs
+        stream in as partial JSON; each tool call is yielded as soon as its
+        content block closes, not when the whole message ends.
+
+        Args:
+            messages: List of messages forming the conversation
+            tools: List of available tools the AI can call
+            tool_results: Results from previously requested tool calls
+            model: Model identifier (uses default if not specified)
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            system: Optional system prompt for the conversation; a
+                SystemPrompt marks which part is cacheable
+            thinking_level: Enables extended thinking ('minimal', 'low',
+                'medium', 'high'). Ignored on turns that return tool
+                results, since those would need the earlier thinking
+                blocks replayed.
+
+        Yields:
+            StreamEvent objects with types:
+            - 'thinking': Extended thinking content
+            - 'text_delta': Incremental text content
+            - 'tool_call': Tool invocation request
+            - 'done': Stream completed
+            - 'error': Error occurred
+        """
+        self._validate_messages(messages)
+
+        model = model or self._default_model
+        start_time = time.perf_counter()
+
+        request_kwargs = self._build_tool_request(
+            messages, tools, tool_results, model, temperature, max_tokens, system,
+        )
+        if thinking_level in THINKING_BUDGETS and not tool_results:
+            request_kwargs["thinking"] = {
+                "type": "enabled",
+                "budget_tokens": min(THINKING_BUDGETS[thinking_level], max_tokens - 1),
+            }
+            # Extended thinking requires the default temperature
+            request_kwargs.pop("temperature", None)
+
+        input_tokens = 0
+        output_tokens = 0
+        cache_usage = _cache_usage(None)
+        finish_reason = "stop"
+        # Tool use blocks being streamed, by content block index
+        pending_tools: Dict[int, Dict[str, Any]] = {}
+
+        try:
+            stream = await self.client.messages.create(**request_kwargs, stream=True)
+
+            try:
+                async for event in stream:
+                    if event.type == "message_start":
+                        input_tokens = event.message.usage.input_tokens
+                        cache_usage = _cache_usage(event.message.usage)
+
+                    elif event.type == "content_block_start":
+                        block = event.content_block
+                        if block.type == "tool_use":
+                            pending_tools[event.index] = {
+                                "id": block.id,
+                                "name": block.name,
+                                "json": [],
+                            }
+
+                    elif event.type == "content_block_delta":
+                        delta = event.delta
+                        if delta.type == "text_delta":
+                            yield StreamEvent(
+                                type=StreamEvent.TEXT_DELTA,
+                                data={"content": delta.text},
+                            )
+                        elif delta.type == "thinking_delta":
+                            yield StreamEvent(
+                                type=StreamEvent.THINKING,
+                                data={"content": delta.thinking},
+                            )
+                        elif delta.type == "input_json_delta" and event.index in pending_tools:
+                            pending_tools[event.index]["json"].append(delta.partial_json)
+
+                    elif event.type == "content_block_stop":
+                        tool = pending_tools.pop(event.index, None)
+                        if tool is not None:
+                            raw_input = "".join(tool["json"])
+                            yield StreamEvent(
+                                type=StreamEvent.TOOL_CALL,
+                                data={
+                                    "id": tool["id"],
+                                    "name": tool["name"],
+                                    "input": json.loads(raw_input) if raw_input else {},
+                                },
+                            )
+
+                    elif event.type == "message_delta":
+                        output_tokens = event.usage.output_tokens
+                        finish_reason = event.delta.stop_reason or finish_reason
+            finally:
+                # Releases the connection if the consumer stops early
+                await stream.close()
+
+            yield StreamEvent(
+                type=StreamEvent.DONE,
+                data={
+                    "model": model,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    **cache_usage,
+                    "finish_reason": finish_reason,
+                    "latency_ms": int((time.perf_counter() - start_time) * 1000),
+                },
+            )
+
+        except anthropic.RateLimitError as e:
+            yield StreamEvent(
+                type=StreamEvent.ERROR,
+                data={"message": f"Rate limit exceeded: {str(e)}"},
+            )
+        except (anthropic.APIError, json.JSONDecodeError) as e:
+            yield StreamEvent(
+                type=StreamEvent.ERROR,
+                data={"message": str(e)},
+            )
+
+    def _build_tool_request(
+        self,
+        messages: List[AIMessage],
+        tools: List[ToolDefinition],
+        tool_results: Optional[List[ToolResult]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[SystemInput],
+    ) -> Dict[str, Any]:
+        """Build messages.create kwargs for a tool-enabled request."""
         # Separate system message from conversation messages
         system_from_messages = None
-        conversation_messages = []
+        conversation_messages: List[Dict[str, Any]] = []
 
         for msg in messages:
             if msg.role == "system":
@@ -272,21 +485,47 @@ class AnthropicProvider(AIProvider):
         # Use explicit system parameter if provided, otherwise use system from messages
         system_content = system if system else system_from_messages
 
+        # Cache the conversation so far; the next request in a tool loop
+        # repeats it verbatim before its tool turn
+        _mark_cache_breakpoint(conversation_messages)
+
         # If we have tool results, add them to the conversation
         if tool_results:
+            # tool_result blocks must answer tool_use blocks in the preceding
+            # assistant turn; replay that turn (merged into a trailing
+            # assistant text message, if any)
+            tool_use_blocks = [
+                {
+                    "type": "tool_use",
+                    "id": result.tool_use.id,
+                    "name": result.tool_use.name,
+                    "input": result.tool_use.input,
+                }
+                for result in tool_results
+                if result.tool_use is not None
+            ]
+            if tool_use_blocks:
+                if conversation_messages and conversation_messages[-1]["role"] == "assistant":
+                    tool_use_blocks[:0] = _content_blocks(conversation_messages.pop()["content"])
+                conversation_messages.append({
+                    "role": "assistant",
+                    "content": tool_use_blocks,
+                })
+
             # Add a user message with tool_result blocks
             tool_result_content = []
             for result in tool_results:
                 tool_result_content.append({
                     "type": "tool_result",
                     "tool_use_id": result.tool_use_id,
-                    "content": str(result.content) if not isinstance(result.content, str) else result.content,
+                    "content": _serialize_tool_content(result.content),
                     "is_error": result.is_error,
                 })
             conversation_messages.append({
                 "role": "user",
                 "content": tool_result_content,
             })
+            _mark_cache_breakpoint(conversation_messages)
 
         # Convert tools to Anthropic format
         anthropic_tools = []
@@ -297,56 +536,60 @@ class AnthropicProvider(AIProvider):
                 "input_schema": tool.input_schema,
             })
 
-        try:
-            # Build request kwargs
-            request_kwargs = {
-                "model": model,
-                "messages": conversation_messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "tools": anthropic_tools,
-            }
+        request_kwargs: Dict[str, Any] = {
+            "model": model,
+            "messages": conversation_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "tools": anthropic_tools,
+        }
 
-            if system_content:
-                request_kwargs["system"] = system_content
+        if system_content:
+            request_kwargs["system"] = _system_blocks(system_content)
 
-            response = await self.client.messages.create(**request_kwargs)
+        return request_kwargs
 
-            latency_ms = int((time.perf_counter() - start_time) * 1000)
 
-            # Parse response content
-            text_content = ""
-            tool_uses = []
+def _cache_usage(usage: Any) -> Dict[str, int]:
+    """Prompt cache token counts from an Anthropic usage object."""
+    return {
+        "cache_read_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+        "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+    }
 
-            for block in response.content:
-                if block.type == "text":
-                    text_content += block.text
-                elif block.type == "tool_use":
-                    tool_uses.append(ToolUse(
-                        id=block.id,
-                        name=block.name,
-                        input=block.input,
-                    ))
 
-            return AIResponseWithTools(
-                content=text_content,
-                model=model,
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-                finish_reason=response.stop_reason or "stop",
-                latency_ms=latency_ms,
-                tool_uses=tool_uses,
-            )
+def _system_blocks(system: SystemInput) -> List[Dict[str, Any]]:
+    """System prompt as text blocks, with a cache breakpoint after the stable part.
 
-        except anthropic.RateLimitError as e:
-            raise AIRateLimitError(
-                provider=self.provider_name,
-                message=str(e),
-                retry_after=getattr(e, "retry_after", None),
-            )
-        except anthropic.APIError as e:
-            raise AIProviderError(
-                provider=self.provider_name,
-                message=str(e),
-                status_code=getattr(e, "status_code", None),
-            )
+    Tools are sent before the system prompt, so this breakpoint caches the
+    tool schemas too.
+    """
+    if isinstance(system, SystemPrompt):
+        blocks = [{"type": "text", "text": system.static, "cache_control": CACHE_CONTROL}]
+        if system.dynamic:
+            blocks.append({"type": "text", "text": system.dynamic})
+        return blocks
+    return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+
+
+def _content_blocks(content: Any) -> List[Dict[str, Any]]:
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    return list(content)
+
+
+def _mark_cache_breakpoint(conversation_messages: List[Dict[str, Any]]) -> None:
+    """Put a cache breakpoint on the last block of the last message."""
+    if not conversation_messages:
+        return
+    last = conversation_messages[-1]
+    blocks = _content_blocks(last["content"])
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    last["content"] = blocks
+
+
+def _serialize_tool_content(content: Any) -> str:
+    """Tool results are dicts from our tools; send them as JSON text."""
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, default=str)
@@ -1,12 +1,23 @@
 """Azure OpenAI AI provider implementation."""
 
+import json
 import time
-from typing import AsyncIterator, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import openai
 from openai import AsyncAzureOpenAI
 
-from researchhub.ai.providers.base import AIMessage, AIProvider, AIResponse
+from researchhub.ai.providers.base import (
+    AIMessage,
+    AIProvider,
+    AIResponse,
+    AIResponseWithTools,
+    StreamEvent,
+    SystemInput,
+    ToolDefinition,
+    ToolResult,
+    ToolUse,
+)
 from researchhub.ai.exceptions import AIProviderError, AIRateLimitError
 
 
@@ -38,7 +49,7 @@ class AzureOpenAIProvider(AIProvider):
         endpoint: str,
         api_key: str,
         deployment: str,
-        api_version: str = "2024-02-01",
+        api_version: str = "2024-10-21",
         timeout: float = 60.0,
     ):
         """Initialize the Azure OpenAI provider.
@@ -47,7 +58,8 @@ class AzureOpenAIProvider(AIProvider):
             endpoint: Azure OpenAI resource endpoint URL
             api_key: Azure OpenAI API key
             deployment: Model deployment name
-            api_version: Azure OpenAI API version
+            api_version: Azure OpenAI API version (2024-10-21+ reports
+                cached prompt tokens and streamed usage)
             timeout: Request timeout in seconds
         """
         self.client = AsyncAzureOpenAI(
@@ -97,7 +109,7 @@ class AzureOpenAIProvider(AIProvider):
 
         # Convert messages to OpenAI format
         openai_messages = [
-            {"role": msg.role, "content": msg.content}
+            {"role": msg.role, "content": str(msg.content)}
             for msg in messages
         ]
 
@@ -123,6 +135,7 @@ class AzureOpenAIProvider(AIProvider):
                 output_tokens=response.usage.completion_tokens if response.usage else 0,
                 finish_reason=response.choices[0].finish_reason or "stop",
                 latency_ms=latency_ms,
+                cache_read_tokens=_cached_tokens(response.usage),
             )
 
         except openai.RateLimitError as e:
@@ -171,7 +184,7 @@ class AzureOpenAIProvider(AIProvider):
 
         # Convert messages to OpenAI format
         openai_messages = [
-            {"role": msg.role, "content": msg.content}
+            {"role": msg.role, "content": str(msg.content)}
             for msg in messages
         ]
 
@@ -205,3 +218,299 @@ class AzureOpenAIProvider(AIProvider):
                 message=str(e),
                 status_code=getattr(e, "status_code", None),
             )
+
+    async def complete_with_tools(
+        self,
+        messages: List[AIMessage],
+        tools: List[ToolDefinition],
+        tool_results: Optional[List[ToolResult]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 30000,
+        system: Optional[SystemInput] = None,
+    ) -> AIResponseWithTools:
+        """Generate a completion with function calling using Azure OpenAI.
+
+        Args:
+            messages: List of messages forming the conversation
+            tools: List of available tools the AI can call
+            tool_results: Results from previously requested tool calls
+            model: Model/deployment identifier (uses default if not specified)
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            system: Optional system prompt for the conversation
+
+        Returns:
+            AIResponseWithTools containing text and/or tool use requests
+
+        Raises:
+            AIProviderError: If the Azure OpenAI API request fails
+            AIRateLimitError: If rate limited by Azure OpenAI
+        """
+        self._validate_messages(messages)
+
+        deployment = model or self.deployment
+        start_time = time.perf_counter()
+
+        request_kwargs = self._build_tool_request(
+            messages, tools, tool_results, deployment, temperature, max_tokens, system,
+        )
+
+        try:
+            response = await self.client.chat.completions.create(**request_kwargs)
+
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+
+            choice = response.choices[0]
+            tool_uses = [
+                ToolUse(
+                    id=call.id,
+                    name=call.function.name,
+                    input=json.loads(call.function.arguments) if call.function.arguments else {},
+                )
+                for call in choice.message.tool_calls or []
+            ]
+
+            return AIResponseWithTools(
+                content=choice.message.content or "",
+                model=deployment,
+                input_tokens=response.usage.prompt_tokens if response.usage else 0,
+                output_tokens=response.usage.completion_tokens if response.usage else 0,
+                finish_reason=choice.finish_reason or "stop",
+                latency_ms=latency_ms,
+                tool_uses=tool_uses,
+                cache_read_tokens=_cached_tokens(response.usage),
+            )
+
+        except openai.RateLimitError as e:
+            raise AIRateLimitError(
+                provider=self.provider_name,
+                message=str(e),
+                retry_after=None,
+            )
+        except openai.APIError as e:
+            raise AIProviderError(
+                provider=self.provider_name,
+                message=str(e),
+                status_code=getattr(e, "status_code", None),
+            )
+
+    async def stream_with_tools(
+        self,
+        messages: List[AIMessage],
+        tools: List[ToolDefinition],
+        tool_results: Optional[List[ToolResult]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 30000,
+        system: Optional[SystemInput] = None,
+        thinking_level: Optional[str] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a completion with function calling using Azure OpenAI.
+
+        Text is yielded as it arrives. Function arguments arrive as JSON
+        fragments keyed by tool call index; each call is yielded once the
+        model moves on to the next call or the stream finishes.
+
+        Args:
+            messages: List of messages forming the conversation
+            tools: List of available tools the AI can call
+            tool_results: Results from previously requested tool calls
+            model: Model/deployment identifier (uses default if not specified)
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            system: Optional system prompt for the conversation
+            thinking_level: Not supported by Azure OpenAI chat models; ignored
+
+        Yields:
+            StreamEvent objects with types:
+            - 'text_delta': Incremental text content
+            - 'tool_call': Tool invocation request
+            - 'done': Stream completed
+            - 'error': Error occurred
+        """
+        self._validate_messages(messages)
+
+        deployment = model or self.deployment
+        start_time = time.perf_counter()
+
+        request_kwargs = self._build_tool_request(
+            messages, tools, tool_results, deployment, temperature, max_tokens, system,
+        )
+
+        input_tokens = 0
+        output_tokens = 0
+        cache_read_tokens = 0
+        finish_reason = "stop"
+        # Tool calls being streamed, by tool call index
+        pending_tools: Dict[int, Dict[str, Any]] = {}
+
+        def tool_call_event(index: int) -> StreamEvent:
+            tool = pending_tools.pop(index)
+            raw_input = "".join(tool["arguments"])
+            return StreamEvent(
+                type=StreamEvent.TOOL_CALL,
+                data={
+                    "id": tool["id"],
+                    "name": tool["name"],
+                    "input": json.loads(raw_input) if raw_input else {},
+                },
+            )
+
+        try:
+            stream = await self.client.chat.completions.create(
+                **request_kwargs,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            try:
+                async for chunk in stream:
+                    if chunk.usage:
+                        input_tokens = chunk.usage.prompt_tokens
+                        output_tokens = chunk.usage.completion_tokens
+                        cache_read_tokens = _cached_tokens(chunk.usage)
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    delta = choice.delta
+                    if delta and delta.content:
+                        yield StreamEvent(
+                            type=StreamEvent.TEXT_DELTA,
+                            data={"content": delta.content},
+                        )
+
+                    for call in (delta.tool_calls if delta else None) or []:
+                        if call.index not in pending_tools:
+                            # A new call starts: earlier calls are complete
+                            for index in sorted(pending_tools):
+                                yield tool_call_event(index)
+                            pending_tools[call.index] = {
+                                "id": call.id,
+                                "name": call.function.name if call.function else "",
+                                "arguments": [],
+                            }
+                        if call.function and call.function.arguments:
+                            pending_tools[call.index]["arguments"].append(call.function.arguments)
+
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+            finally:
+                # Releases the connection if the consumer stops early
+                await stream.close()
+
+            for index in sorted(pending_tools):
+                yield tool_call_event(index)
+
+            yield StreamEvent(
+                type=StreamEvent.DONE,
+                data={
+                    "model": deployment,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cache_read_tokens": cache_read_tokens,
+                    "finish_reason": "tool_use" if finish_reason == "tool_calls" else finish_reason,
+                    "latency_ms": int((time.perf_counter() - start_time) * 1000),
+                },
+            )
+
+        except openai.RateLimitError as e:
+            yield StreamEvent(
+                type=StreamEvent.ERROR,
+                data={"message": f"Rate limit exceeded: {str(e)}"},
+            )
+        except (openai.APIError, json.JSONDecodeError) as e:
+            yield StreamEvent(
+                type=StreamEvent.ERROR,
+                data={"message": str(e)},
+            )
+
+    def _build_tool_request(
+        self,
+        messages: List[AIMessage],
+        tools: List[ToolDefinition],
+        tool_results: Optional[List[ToolResult]],
+        deployment: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[SystemInput],
+    ) -> Dict[str, Any]:
+        """Build chat.completions.create kwargs for a tool-enabled request."""
+        # Azure caches prompts of 1024+ tokens implicitly by exact prefix, so
+        # the system prompt's stable part goes first (str() of a SystemPrompt)
+        openai_messages: List[Dict[str, Any]] = []
+        if system:
+            openai_messages.append({"role": "system", "content": str(system)})
+        for msg in messages:
+            # An explicit system parameter replaces system messages
+            if msg.role == "system" and system:
+                continue
+            openai_messages.append({"role": msg.role, "content": str(msg.content)})
+
+        if tool_results:
+            # tool messages must answer tool_calls on the preceding assistant
+            # message; replay it (merged into a trailing assistant message)
+            tool_calls = [
+                {
+                    "id": result.tool_use.id,
+                    "type": "function",
+                    "function": {
+                        "name": result.tool_use.name,
+                        "arguments": json.dumps(result.tool_use.input),
+                    },
+                }
+                for result in tool_results
+                if result.tool_use is not None
+            ]
+            if tool_calls:
+                if openai_messages and openai_messages[-1]["role"] == "assistant":
+                    assistant_message = openai_messages[-1]
+                else:
+                    assistant_message = {"role": "assistant", "content": None}
+                    openai_messages.append(assistant_message)
+                assistant_message["tool_calls"] = tool_calls
+
+            for result in tool_results:
+                content = result.content
+                if not isinstance(content, str):
+                    content = json.dumps(content, default=str)
+                if result.tool_use is not None:
+                    openai_messages.append({
+                        "role": "tool",
+                        "tool_call_id": result.tool_use_id,
+                        "content": content,
+                    })
+                else:
+                    # No call to answer; pass the result along as context
+                    openai_messages.append({
+                        "role": "user",
+                        "content": f"Tool result ({result.tool_use_id}): {content}",
+                    })
+
+        request_kwargs: Dict[str, Any] = {
+            "model": deployment,
+            "messages": openai_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        # The API rejects an empty tools list
+        if tools:
+            request_kwargs["tools"] = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "parameters": tool.input_schema,
+                    },
+                }
+                for tool in tools
+            ]
+        return request_kwargs
+
+
+def _cached_tokens(usage: Any) -> int:
+    """Prompt tokens served from Azure's prompt cache, if reported."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details else 0
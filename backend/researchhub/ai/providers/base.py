@@ -7,7 +7,7 @@ enabling provider-agnostic AI interactions throughout the application.
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, AsyncIterator, List, Literal, Optional
+from typing import Any, AsyncIterator, List, Literal, Optional, Union
 from uuid import UUID, uuid4
 
 
@@ -17,10 +17,11 @@ class AIMessage:
 
     Attributes:
         role: The role of the message sender ('system', 'user', or 'assistant')
-        content: The text content of the message
+        content: The text content of the message; system messages may pass
+            a SystemPrompt to mark their cacheable prefix
     """
     role: Literal["system", "user", "assistant"]
-    content: str
+    content: Union[str, "SystemPrompt"]
 
 
 @dataclass
@@ -34,6 +35,9 @@ class AIResponse:
         output_tokens: Number of tokens in the generated response
         finish_reason: Why generation stopped ('stop', 'max_tokens', etc.)
         latency_ms: Time taken for the request in milliseconds
+        cache_read_tokens: Prompt tokens served from the provider's prompt cache
+        cache_write_tokens: Prompt tokens written to the prompt cache
+            (Anthropic only; other providers cache implicitly)
         request_id: Unique identifier for this request
     """
     content: str
@@ -42,6 +46,8 @@ class AIResponse:
     output_tokens: int
     finish_reason: str
     latency_ms: Optional[int] = None
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
     request_id: UUID = field(default_factory=uuid4)
     created_at: datetime = field(default_factory=datetime.utcnow)
 
@@ -51,6 +57,30 @@ class AIResponse:
         return self.input_tokens + self.output_tokens
 
 
+@dataclass
+class SystemPrompt:
+    """A system prompt split for prompt caching.
+
+    Providers cache prompts by exact prefix, in the order tools → system →
+    messages. Keeping instructions that never change in ``static`` and
+    per-user or per-request details (date, user, page) in ``dynamic`` lets
+    the static part be cached across users and requests.
+
+    Attributes:
+        static: Instructions identical across requests
+        dynamic: Per-request context, sent after the static part
+    """
+    static: str
+    dynamic: str = ""
+
+    def __str__(self) -> str:
+        return "\n\n".join(part for part in (self.static, self.dynamic) if part)
+
+
+# System prompts may be given whole or split for caching
+SystemInput = Union[str, SystemPrompt]
+
+
 @dataclass
 class ToolDefinition:
     """Definition of a tool that can be called by the AI.
@@ -87,10 +117,14 @@ class ToolResult:
         tool_use_id: ID of the ToolUse this is responding to
         content: The result content (will be serialized to string/JSON)
         is_error: Whether this result represents an error
+        tool_use: The ToolUse this is responding to. Anthropic and OpenAI
+            require the assistant turn that made the call to precede its
+            result, so those providers replay it from here.
     """
     tool_use_id: str
     content: Any
     is_error: bool = False
+    tool_use: Optional[ToolUse] = None
 
 
 @dataclass
@@ -233,7 +267,7 @@ class AIProvider(ABC):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 30000,
-        system: Optional[str] = None,
+        system: Optional[SystemInput] = None,
     ) -> "AIResponseWithTools":
         """Generate a completion with tool calling support.
 
@@ -248,7 +282,8 @@ class AIProvider(ABC):
             model: Model identifier (uses default if not specified)
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
-            system: Optional system prompt for the conversation
+            system: Optional system prompt for the conversation; a
+                SystemPrompt marks which part is cacheable
 
         Returns:
             AIResponseWithTools containing text and/or tool use requests
@@ -266,7 +301,7 @@ class AIProvider(ABC):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 30000,
-        system: Optional[str] = None,
+        system: Optional[SystemInput] = None,
         thinking_level: Optional[str] = None,
     ) -> AsyncIterator["StreamEvent"]:
         """Stream a completion with tool calling support.
@@ -281,7 +316,8 @@ class AIProvider(ABC):
             model: Model identifier (uses default if not specified)
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
-            system: Optional system prompt for the conversation
+            system: Optional system prompt for the conversation; a
+                SystemPrompt marks which part is cacheable
             thinking_level: Optional thinking depth ('minimal', 'low', 'medium', 'high')
                            Only supported by some models (e.g., Gemini 3)
 
@@ -335,6 +371,8 @@ class AIProvider(ABC):
                     "model": response.model,
                     "input_tokens": response.input_tokens,
                     "output_tokens": response.output_tokens,
+                    "cache_read_tokens": response.cache_read_tokens,
+                    "cache_write_tokens": response.cache_write_tokens,
                     "finish_reason": response.finish_reason,
                 },
             )
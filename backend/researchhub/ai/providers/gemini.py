@@ -16,6 +16,7 @@ from researchhub.ai.providers.base import (
     AIResponse,
     AIResponseWithTools,
     StreamEvent,
+    SystemInput,
     ToolDefinition,
     ToolResult,
     ToolUse,
@@ -108,7 +109,7 @@ class GeminiProvider(AIProvider):
 
         for msg in messages:
             if msg.role == "system":
-                system_instruction = msg.content
+                system_instruction = str(msg.content)
             else:
                 # Gemini uses 'model' instead of 'assistant'
                 role = "model" if msg.role == "assistant" else "user"
@@ -177,6 +178,7 @@ class GeminiProvider(AIProvider):
             usage = response.usage_metadata
             input_tokens = usage.prompt_token_count if usage else 0
             output_tokens = usage.candidates_token_count if usage else 0
+            cache_read_tokens = (usage.cached_content_token_count or 0) if usage else 0
 
             # Get finish reason
             finish_reason = "stop"
@@ -188,6 +190,7 @@ class GeminiProvider(AIProvider):
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
+                cache_read_tokens=cache_read_tokens,
                 finish_reason=finish_reason,
                 latency_ms=latency_ms,
             )
@@ -296,7 +299,7 @@ class GeminiProvider(AIProvider):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 30000,
-        system: Optional[str] = None,
+        system: Optional[SystemInput] = None,
     ) -> AIResponseWithTools:
         """Generate a completion with tool calling support using Gemini.
 
@@ -322,7 +325,8 @@ class GeminiProvider(AIProvider):
 
         system_from_messages, contents = self._build_contents(messages)
         # Use explicit system parameter if provided, otherwise use system from messages
-        system_instruction = system if system else system_from_messages
+        # Gemini caches implicitly by prefix; str() puts a SystemPrompt's stable part first
+        system_instruction = str(system) if system else system_from_messages
 
         # Convert ToolDefinition to Gemini function declarations using SDK types
         # NOTE: Must use parameters_json_schema, not parameters - this is critical!
@@ -382,6 +386,7 @@ class GeminiProvider(AIProvider):
             usage = response.usage_metadata
             input_tokens = usage.prompt_token_count if usage else 0
             output_tokens = usage.candidates_token_count if usage else 0
+            cache_read_tokens = (usage.cached_content_token_count or 0) if usage else 0
 
             # Get finish reason
             finish_reason = "stop"
@@ -411,6 +416,7 @@ class GeminiProvider(AIProvider):
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
+                cache_read_tokens=cache_read_tokens,
                 finish_reason=finish_reason,
                 latency_ms=latency_ms,
                 tool_uses=tool_uses,
@@ -444,7 +450,7 @@ class GeminiProvider(AIProvider):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 30000,
-        system: Optional[str] = None,
+        system: Optional[SystemInput] = None,
         thinking_level: Optional[str] = None,
     ) -> AsyncIterator[StreamEvent]:
         """Stream a completion with tool calling support using Gemini.
@@ -476,7 +482,8 @@ class GeminiProvider(AIProvider):
         start_time = time.perf_counter()
 
         system_from_messages, contents = self._build_contents(messages)
-        system_instruction = system if system else system_from_messages
+        # Gemini caches implicitly by prefix; str() puts a SystemPrompt's stable part first
+        system_instruction = str(system) if system else system_from_messages
 
         # Convert ToolDefinition to Gemini function declarations using SDK types
         # NOTE: Must use parameters_json_schema, not parameters - this is critical!
@@ -555,12 +562,14 @@ class GeminiProvider(AIProvider):
             tool_uses = []
             input_tokens = 0
             output_tokens = 0
+            cache_read_tokens = 0
 
             async for chunk in stream:
                 # Check for usage metadata updates
                 if chunk.usage_metadata:
                     input_tokens = chunk.usage_metadata.prompt_token_count or 0
                     output_tokens = chunk.usage_metadata.candidates_token_count or 0
+                    cache_read_tokens = chunk.usage_metadata.cached_content_token_count or 0
 
                 # Process candidates
                 if chunk.candidates:
@@ -610,6 +619,7 @@ class GeminiProvider(AIProvider):
                     "model": model,
                     "input_tokens": input_tokens,
                     "output_tokens": output_tokens,
+                    "cache_read_tokens": cache_read_tokens,
                     "finish_reason": "stop" if not tool_uses else "tool_use",
                     "latency_ms": latency_ms,
                 },
@@ -14,11 +14,10 @@ from researchhub.ai.providers.anthropic import AnthropicProvider
 from researchhub.ai.providers.azure_openai import AzureOpenAIProvider
 from researchhub.ai.providers.gemini import GeminiProvider
 from researchhub.ai.phi_detector import PHIDetector, PHIDetectionResult
-from researchhub.ai.templates import DEFAULT_TEMPLATES, render_template
+from researchhub.ai.template_registry import CompiledTemplate, get_template_registry
 from researchhub.ai.schemas import AIFeatureName, DocumentAction, SummaryType
 from researchhub.ai.exceptions import (
     AIFeatureDisabledError,
-    AITemplateNotFoundError,
     AIPHIDetectedError,
 )
 from researchhub.config import get_settings
@@ -111,12 +110,12 @@ class AIService:
         self._providers[provider_name] = provider
         return provider
 
-    def _get_template(
+    async def _get_template(
         self,
         template_key: str,
         organization_id: Optional[UUID] = None,
-    ) -> dict:
-        """Get a prompt template by key.
+    ) -> CompiledTemplate:
+        """Get a compiled prompt template by key.
 
         First checks for organization-specific custom template,
         then falls back to default templates.
@@ -126,30 +125,25 @@ class AIService:
             organization_id: Organization for custom templates
 
         Returns:
-            Template dictionary
+            Compiled template
 
         Raises:
             AITemplateNotFoundError: If template doesn't exist
         """
-        # TODO: Check database for custom org template first
-        # custom = await self.db.get_custom_template(organization_id, template_key)
-        # if custom:
-        #     return custom
-
-        if template_key in DEFAULT_TEMPLATES:
-            return DEFAULT_TEMPLATES[template_key]
-
-        raise AITemplateNotFoundError(template_key)
+        return await get_template_registry().get(template_key, organization_id)
 
     def _build_messages(
         self,
-        template: dict,
+        template: CompiledTemplate,
         variables: dict[str, Any],
     ) -> list[AIMessage]:
         """Build AI messages from a template and variables.
 
+        The system message content is a SystemPrompt when the template has
+        a static prefix, so providers can cache that part.
+
         Args:
-            template: Template dictionary with system_prompt and user_prompt_template
+            template: Compiled template
             variables: Variables to substitute in templates
 
         Returns:
@@ -158,13 +152,13 @@ class AIService:
         messages = []
 
         # System message
-        if template.get("system_prompt"):
-            system_content = render_template(template["system_prompt"], variables)
+        system_content = template.render_system(variables)
+        if system_content:
             messages.append(AIMessage(role="system", content=system_content))
 
         # User message
-        if template.get("user_prompt_template"):
-            user_content = render_template(template["user_prompt_template"], variables)
+        user_content = template.render_user(variables)
+        if user_content:
             messages.append(AIMessage(role="user", content=user_content))
 
         return messages
@@ -298,13 +292,13 @@ class AIService:
         await self._check_feature_enabled(organization_id, feature_name)
 
         # 2. Get template
-        template = self._get_template(template_key, organization_id)
+        template = await self._get_template(template_key, organization_id)
 
         # 3. Build messages
         messages = self._build_messages(template, variables)
 
         # 4. PHI check on combined content
-        combined_content = " ".join(m.content for m in messages)
+        combined_content = " ".join(str(m.content) for m in messages)
         phi_result, processed_content = await self._check_phi(
             combined_content,
             organization_id,
@@ -370,13 +364,13 @@ class AIService:
         await self._check_feature_enabled(organization_id, feature_name)
 
         # 2. Get template
-        template = self._get_template(template_key, organization_id)
+        template = await self._get_template(template_key, organization_id)
 
         # 3. Build messages
         messages = self._build_messages(template, variables)
 
         # 4. PHI check
-        combined_content = " ".join(m.content for m in messages)
+        combined_content = " ".join(str(m.content) for m in messages)
         phi_result, _ = await self._check_phi(combined_content, organization_id)
 
         # 5. Get provider
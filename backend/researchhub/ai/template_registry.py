@@ -0,0 +1,268 @@
+"""Compiled prompt templates, with per-organization overrides.
+
+Jinja templates are parsed and compiled once: the DEFAULT_TEMPLATES when
+the registry is created, and an organization's AIPromptTemplate overrides
+the first time the organization renders a prompt. Compiled overrides are
+kept in process memory, stamped with ``ai:v1:templates:ver:{org_id}``. A
+SQLAlchemy commit hook bumps that counter when an organization's templates
+change, so every process reloads them on the next render. While a failed
+bump is pending retry, the organization's overrides are reloaded on every
+render.
+
+Each compiled template also records its static prefix: the literal text
+before the first Jinja tag. A rendered system prompt with such a prefix is
+returned as a SystemPrompt whose ``static`` part is that prefix, so
+providers can cache it.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+import structlog
+from jinja2 import Template
+from redis.exceptions import RedisError
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from researchhub.ai.exceptions import AITemplateNotFoundError
+from researchhub.ai.providers.base import SystemInput, SystemPrompt
+from researchhub.ai.templates import DEFAULT_TEMPLATES, compile_template
+from researchhub.config import get_settings
+from researchhub.db.redis import (
+    counter_unconfirmed,
+    get_redis,
+    retry_counter_bumps,
+    schedule_counter_bumps,
+)
+from researchhub.db.session import async_session_factory
+from researchhub.models.ai import AIPromptTemplate
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "ai:v1:templates"
+
+# First Jinja delimiter; a trailing "-" also strips whitespace before it
+_FIRST_TAG = re.compile(r"\{[{%#](-?)")
+
+# Columns an override row may set, beyond the prompts
+_OVERRIDE_FIELDS = ("display_name", "category", "description", "temperature", "max_tokens")
+
+
+def _version_key(organization_id: UUID) -> str:
+    return f"{KEY_PREFIX}:ver:{organization_id}"
+
+
+def static_prefix(source: str) -> str:
+    """Literal text a template renders identically for every input."""
+    match = _FIRST_TAG.search(source)
+    if match is None:
+        return source
+    prefix = source[:match.start()]
+    return prefix.rstrip() if match.group(1) else prefix
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A prompt template with its Jinja sources compiled.
+
+    Supports ``get``/``[]`` on the underlying definition (category,
+    temperature, max_tokens, ...) like the plain template dicts.
+    """
+
+    definition: dict[str, Any]
+    system: Optional[Template]
+    user: Optional[Template]
+    system_static: str
+    user_static: str
+
+    @classmethod
+    def from_definition(cls, definition: dict[str, Any]) -> "CompiledTemplate":
+        system_source = definition.get("system_prompt") or ""
+        user_source = definition.get("user_prompt_template") or ""
+        return cls(
+            definition=definition,
+            system=compile_template(system_source) if system_source else None,
+            user=compile_template(user_source) if user_source else None,
+            system_static=static_prefix(system_source),
+            user_static=static_prefix(user_source),
+        )
+
+    @property
+    def template_key(self) -> str:
+        return self.definition["template_key"]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.definition.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.definition[key]
+
+    def render_system(self, variables: dict[str, Any]) -> Optional[SystemInput]:
+        """Render the system prompt, split into its static and dynamic parts.
+
+        Returns a plain string when the prompt has no static prefix.
+        """
+        if self.system is None:
+            return None
+        rendered = self.system.render(**variables)
+        static = self.system_static.rstrip()
+        if not static or not rendered.startswith(static):
+            return rendered
+        return SystemPrompt(static=static, dynamic=rendered[len(static):].strip())
+
+    def render_user(self, variables: dict[str, Any]) -> Optional[str]:
+        """Render the user prompt."""
+        if self.user is None:
+            return None
+        return self.user.render(**variables)
+
+
+def _override_definition(row: AIPromptTemplate) -> dict[str, Any]:
+    """Template dict for an override, falling back to the default's metadata."""
+    definition = dict(DEFAULT_TEMPLATES.get(row.template_key, {}))
+    definition["template_key"] = row.template_key
+    for name in _OVERRIDE_FIELDS:
+        value = getattr(row, name)
+        if value is not None:
+            definition[name] = value
+    definition["system_prompt"] = row.system_prompt
+    definition["user_prompt_template"] = row.user_prompt_template
+    return definition
+
+
+class TemplateRegistry:
+    """Compiled default templates plus cached per-organization overrides."""
+
+    def __init__(self, max_orgs: int, ttl_seconds: int):
+        self.max_orgs = max_orgs
+        self.ttl_seconds = ttl_seconds
+        self._defaults = {
+            key: CompiledTemplate.from_definition(definition)
+            for key, definition in DEFAULT_TEMPLATES.items()
+        }
+        self._overrides: dict[UUID, tuple[bytes, float, dict[str, CompiledTemplate]]] = {}
+
+    async def get(
+        self,
+        template_key: str,
+        organization_id: Optional[UUID] = None,
+    ) -> CompiledTemplate:
+        """Get a template, preferring the organization's active override.
+
+        Raises:
+            AITemplateNotFoundError: If no override or default exists
+        """
+        if organization_id is not None:
+            overrides = await self._get_overrides(organization_id)
+            if template_key in overrides:
+                return overrides[template_key]
+
+        if template_key in self._defaults:
+            return self._defaults[template_key]
+
+        raise AITemplateNotFoundError(template_key)
+
+    async def _get_overrides(self, organization_id: UUID) -> dict[str, CompiledTemplate]:
+        await retry_counter_bumps()
+        if counter_unconfirmed(_version_key(organization_id)):
+            return await self._load_overrides(organization_id)
+
+        try:
+            stamp = await get_redis().get(_version_key(organization_id)) or b"0"
+        except RedisError as e:
+            # Without a stamp, rely on the TTL alone
+            logger.warning("ai_template_cache_unavailable", error=str(e))
+            stamp = None
+
+        entry = self._overrides.get(organization_id)
+        if entry and (stamp is None or entry[0] == stamp) and entry[1] > time.monotonic():
+            return entry[2]
+
+        overrides = await self._load_overrides(organization_id)
+        if len(self._overrides) >= self.max_orgs and organization_id not in self._overrides:
+            self._overrides.pop(next(iter(self._overrides)))
+        self._overrides[organization_id] = (
+            stamp or b"0",
+            time.monotonic() + self.ttl_seconds,
+            overrides,
+        )
+        return overrides
+
+    async def _load_overrides(self, organization_id: UUID) -> dict[str, CompiledTemplate]:
+        async with async_session_factory() as session:
+            rows = (await session.execute(
+                select(AIPromptTemplate)
+                .where(
+                    AIPromptTemplate.organization_id == organization_id,
+                    AIPromptTemplate.is_active == True,  # noqa: E712
+                )
+                .order_by(AIPromptTemplate.version)
+            )).scalars().all()
+
+        overrides: dict[str, CompiledTemplate] = {}
+        for row in rows:
+            try:
+                # Later versions of the same key replace earlier ones
+                overrides[row.template_key] = CompiledTemplate.from_definition(
+                    _override_definition(row)
+                )
+            except Exception as e:
+                # A broken override must not take the feature down
+                logger.error(
+                    "ai_template_override_invalid",
+                    organization_id=str(organization_id),
+                    template_key=row.template_key,
+                    error=str(e),
+                )
+        return overrides
+
+    def evict(self, organization_ids: set[UUID]) -> None:
+        """Drop the compiled overrides of some organizations."""
+        for organization_id in organization_ids:
+            self._overrides.pop(organization_id, None)
+
+
+_registry: TemplateRegistry | None = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry."""
+    global _registry
+    if _registry is None:
+        settings = get_settings()
+        _registry = TemplateRegistry(
+            max_orgs=settings.ai_template_cache_max_orgs,
+            ttl_seconds=settings.ai_template_cache_ttl_seconds,
+        )
+    return _registry
+
+
+# --- Invalidation ---
+
+@event.listens_for(Session, "after_flush")
+def _collect_template_changes(session: Session, flush_context) -> None:
+    """Record which organizations' overrides the flushed rows affect."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, AIPromptTemplate) and obj.organization_id is not None:
+            session.info.setdefault("ai_template_invalidation", set()).add(obj.organization_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_template_invalidation(session: Session) -> None:
+    organization_ids = session.info.pop("ai_template_invalidation", None)
+    if not organization_ids:
+        return
+    if _registry is not None:
+        _registry.evict(organization_ids)
+    schedule_counter_bumps(
+        [_version_key(organization_id) for organization_id in organization_ids],
+        "ai_template_invalidation_failed",
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_template_invalidation(session: Session) -> None:
+    session.info.pop("ai_template_invalidation", None)
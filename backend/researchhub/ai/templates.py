@@ -4,15 +4,29 @@ These templates define the system and user prompts for each AI feature.
 Organizations can customize these templates through the database.
 """
 
+from functools import lru_cache
 from typing import Any
 
-from jinja2 import Environment, BaseLoader
+from jinja2 import Environment, BaseLoader, Template
 
 
 # Jinja2 environment for template rendering
 _jinja_env = Environment(loader=BaseLoader())
 
 
+@lru_cache(maxsize=512)
+def compile_template(template_str: str) -> Template:
+    """Parse and compile a Jinja2 template string, once per distinct string.
+
+    Args:
+        template_str: Template string with {{ variable }} placeholders
+
+    Returns:
+        Compiled template
+    """
+    return _jinja_env.from_string(template_str)
+
+
 def render_template(template_str: str, variables: dict[str, Any]) -> str:
     """Render a Jinja2 template string with variables.
 
@@ -23,8 +37,7 @@ def render_template(template_str: str, variables: dict[str, Any]) -> str:
     Returns:
         Rendered string
     """
-    template = _jinja_env.from_string(template_str)
-    return template.render(**variables)
+    return compile_template(template_str).render(**variables)
 
 
 # =============================================================================
@@ -191,10 +204,12 @@ You have access to the document content and can help with:
 - Providing writing advice
 
 Be helpful and specific. Reference specific parts of the document when relevant.
-Do NOT fabricate information that isn't in the document.""",
+Do NOT fabricate information that isn't in the document.
+Long documents are given as excerpts relevant to the question, with [...] where
+text was left out. If the excerpts don't cover something, say so rather than guessing.""",
     "user_prompt_template": """Document type: {{ document_type | default('research document') }}
 
-Document content:
+Document content{% if document_excerpted %} (excerpts){% endif %}:
 {{ document_content }}
 
 User question: {{ user_message }}""",
@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 from researchhub.db.session import get_db
 from researchhub.api.v1.auth import get_current_user
 from researchhub.models import Activity, Notification, NotificationPreference, User
+from researchhub.services.pagination import TOTAL_MODE_PATTERN, paginate
 
 router = APIRouter(tags=["activities"])
 
@@ -45,8 +46,10 @@ class ActivityResponse(BaseModel):
 class ActivityFeedResponse(BaseModel):
     """Schema for paginated activity feed response."""
     activities: list[ActivityResponse]
-    total: int
+    total: int | None = None
+    total_is_estimate: bool = False
     has_more: bool
+    next_cursor: str | None = None
 
 
 # --- Notification Schemas ---
@@ -79,8 +82,10 @@ class NotificationListResponse(BaseModel):
     """Schema for paginated notification list."""
     notifications: list[NotificationResponse]
     unread_count: int
-    total: int
+    total: int | None = None
+    total_is_estimate: bool = False
     has_more: bool
+    next_cursor: str | None = None
 
 
 class MarkNotificationsRequest(BaseModel):
@@ -141,9 +146,15 @@ async def get_activity_feed(
     actor_id: UUID | None = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    total: str = Query("none", pattern=TOTAL_MODE_PATTERN),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get activity feed for an organization or project."""
+    """Get activity feed for an organization or project.
+
+    Pass ``next_cursor`` back as ``cursor`` for the next page. ``total`` is
+    only computed when requested.
+    """
     query = (
         select(Activity)
         .where(Activity.organization_id == organization_id)
@@ -162,28 +173,20 @@ async def get_activity_feed(
     if actor_id:
         query = query.where(Activity.actor_id == actor_id)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
-
     # Fetch activities with actor info
-    query = (
-        query
-        .options(selectinload(Activity.actor))
-        .order_by(Activity.created_at.desc())
-        .offset(skip)
-        .limit(limit + 1)
+    page = await paginate(
+        db,
+        query.options(selectinload(Activity.actor)),
+        order_by=[Activity.created_at.desc(), Activity.id.desc()],
+        limit=limit,
+        cursor=cursor,
+        offset=skip,
+        total=total,
     )
 
-    result = await db.execute(query)
-    activities = result.scalars().all()
-
-    has_more = len(activities) > limit
-    activities = activities[:limit]
-
     # Build response with actor info
     activity_responses = []
-    for activity in activities:
+    for activity in page.items:
         response = ActivityResponse(
             id=activity.id,
             activity_type=activity.activity_type,
@@ -207,8 +210,10 @@ async def get_activity_feed(
 
     return ActivityFeedResponse(
         activities=activity_responses,
-        total=total,
-        has_more=has_more,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -261,9 +266,15 @@ async def get_notifications(
     is_read: bool | None = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    total: str = Query("none", pattern=TOTAL_MODE_PATTERN),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get notifications for the current user."""
+    """Get notifications for the current user.
+
+    Pass ``next_cursor`` back as ``cursor`` for the next page. ``total`` is
+    only computed when requested; ``unread_count`` always is.
+    """
     query = (
         select(Notification)
         .where(Notification.user_id == current_user.id)
@@ -276,10 +287,7 @@ async def get_notifications(
     if is_read is not None:
         query = query.where(Notification.is_read == is_read)
 
-    # Count total and unread
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
-
+    # Unread count for the badge
     unread_query = select(func.count()).select_from(
         select(Notification)
         .where(Notification.user_id == current_user.id)
@@ -290,23 +298,19 @@ async def get_notifications(
     unread_count = await db.scalar(unread_query) or 0
 
     # Fetch notifications
-    query = (
-        query
-        .options(selectinload(Notification.sender))
-        .order_by(Notification.created_at.desc())
-        .offset(skip)
-        .limit(limit + 1)
+    page = await paginate(
+        db,
+        query.options(selectinload(Notification.sender)),
+        order_by=[Notification.created_at.desc(), Notification.id.desc()],
+        limit=limit,
+        cursor=cursor,
+        offset=skip,
+        total=total,
     )
 
-    result = await db.execute(query)
-    notifications = result.scalars().all()
-
-    has_more = len(notifications) > limit
-    notifications = notifications[:limit]
-
     # Build response
     notification_responses = []
-    for notif in notifications:
+    for notif in page.items:
         response = NotificationResponse(
             id=notif.id,
             notification_type=notif.notification_type,
@@ -331,8 +335,10 @@ async def get_notifications(
     return NotificationListResponse(
         notifications=notification_responses,
         unread_count=unread_count,
-        total=total,
-        has_more=has_more,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from researchhub.api.v1.auth import CurrentUser
+from researchhub.config import get_settings
 from researchhub.db.session import get_db_session
 from researchhub.models.user import User
 from researchhub.models.organization import OrganizationMember
@@ -48,6 +49,7 @@ from researchhub.ai.exceptions import (
     AITemplateNotFoundError,
     AIPHIDetectedError,
 )
+from researchhub.services.document_retrieval import select_passages
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -133,7 +135,7 @@ async def generate(
 
     try:
         # Determine feature from template category
-        template = ai_service._get_template(request.template_key, org_id)
+        template = await ai_service._get_template(request.template_key, org_id)
         category = template.get("category", "writing")
         feature_map = {
             "writing": AIFeatureName.DOCUMENT_ASSISTANT,
@@ -184,7 +186,7 @@ async def generate_stream(
 
     try:
         # Determine feature from template category
-        template = ai_service._get_template(request.template_key, org_id)
+        template = await ai_service._get_template(request.template_key, org_id)
         category = template.get("category", "writing")
         feature_map = {
             "writing": AIFeatureName.DOCUMENT_ASSISTANT,
@@ -300,6 +302,11 @@ async def document_chat(
             detail="Document not found",
         )
 
+    # Only the passages relevant to the question, within a token budget
+    excerpt = (await select_passages(
+        db, [document], message, get_settings().document_chat_context_tokens
+    ))[document.id]
+
     ai_service = get_ai_service()
 
     try:
@@ -310,7 +317,8 @@ async def document_chat(
             template_key="document_chat",
             variables={
                 "document_type": document.document_type,
-                "document_content": document.content_text or str(document.content),
+                "document_content": excerpt.text,
+                "document_excerpted": not excerpt.complete,
                 "user_message": message,
             },
         )
@@ -1,30 +1,33 @@
 """Analytics and metrics API endpoints."""
 
-from datetime import datetime, timedelta
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
+import structlog
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy import select, func, and_, case, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from researchhub.api.v1.auth import CurrentUser
-from researchhub.db.session import get_db, get_db_session
+from researchhub.config import get_settings
+from researchhub.db.redis import get_redis
+from researchhub.db.session import async_session_factory, get_db, get_db_session
 from researchhub.models import (
     Project,
     Task,
-    Document,
-    Idea,
-    Paper,
-    Activity,
     User,
-    OrganizationMember,
     Team,
     Blocker,
     BlockerLink,
     TaskComment,
-    CommentRead,
 )
+from researchhub.services import analytics, comment_reads
+
+logger = structlog.get_logger()
 
 router = APIRouter(tags=["analytics"])
 
@@ -108,115 +111,39 @@ class DashboardAnalytics(BaseModel):
     project_progress: list[ProjectProgress]
     recent_activity_types: list[ActivityMetrics]
     top_contributors: list[TeamProductivity]
+    task_status_over_time: list[TimeSeriesData] = []
 
 
 # --- Analytics Endpoints ---
 
-@router.get("/overview", response_model=OverviewMetrics)
-async def get_overview_metrics(
-    organization_id: UUID = Query(...),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get high-level overview metrics for the organization."""
-    # Projects (join through Team to get organization_id)
-    project_query = (
-        select(func.count(Project.id))
-        .join(Team, Project.team_id == Team.id)
-        .where(Team.organization_id == organization_id)
-    )
-    total_projects = await db.scalar(project_query) or 0
-
-    active_projects_query = (
-        select(func.count(Project.id))
-        .join(Team, Project.team_id == Team.id)
-        .where(
-            and_(
-                Team.organization_id == organization_id,
-                Project.status == "active",
-            )
-        )
-    )
-    active_projects = await db.scalar(active_projects_query) or 0
-
-    # Tasks (through projects and teams)
-    task_query = (
-        select(func.count(Task.id))
-        .join(Project, Task.project_id == Project.id)
-        .join(Team, Project.team_id == Team.id)
-        .where(Team.organization_id == organization_id)
-    )
-    total_tasks = await db.scalar(task_query) or 0
-
-    completed_tasks_query = (
-        select(func.count(Task.id))
-        .join(Project, Task.project_id == Project.id)
-        .join(Team, Project.team_id == Team.id)
-        .where(
-            and_(
-                Team.organization_id == organization_id,
-                Task.status == "completed",
-            )
-        )
-    )
-    completed_tasks = await db.scalar(completed_tasks_query) or 0
-
+def _overview_from_summary(summary: analytics.OrgSummary) -> OverviewMetrics:
+    completed_tasks = summary.task_status["completed"]
+    total_tasks = summary.total_tasks
     task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-
-    # Documents (through Project → Team)
-    doc_query = (
-        select(func.count(Document.id))
-        .select_from(Document)
-        .join(Project, Document.project_id == Project.id)
-        .join(Team, Project.team_id == Team.id)
-        .where(Team.organization_id == organization_id)
-    )
-    total_documents = await db.scalar(doc_query) or 0
-
-    # Ideas
-    idea_query = select(func.count(Idea.id)).where(
-        Idea.organization_id == organization_id
-    )
-    total_ideas = await db.scalar(idea_query) or 0
-
-    # Papers
-    paper_query = select(func.count(Paper.id)).where(
-        Paper.organization_id == organization_id
-    )
-    total_papers = await db.scalar(paper_query) or 0
-
-    # Members
-    member_query = select(func.count(OrganizationMember.id)).where(
-        OrganizationMember.organization_id == organization_id
-    )
-    total_members = await db.scalar(member_query) or 0
-
-    # Active members (had activity in last week)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    active_members_query = (
-        select(func.count(func.distinct(Activity.actor_id)))
-        .where(
-            and_(
-                Activity.organization_id == organization_id,
-                Activity.created_at >= week_ago,
-            )
-        )
-    )
-    active_members = await db.scalar(active_members_query) or 0
-
     return OverviewMetrics(
-        total_projects=total_projects,
-        active_projects=active_projects,
+        total_projects=summary.total_projects,
+        active_projects=summary.active_projects,
         total_tasks=total_tasks,
         completed_tasks=completed_tasks,
         task_completion_rate=round(task_completion_rate, 1),
-        total_documents=total_documents,
-        total_ideas=total_ideas,
-        total_papers=total_papers,
-        total_members=total_members,
-        active_members_last_week=active_members,
+        total_documents=summary.total_documents,
+        total_ideas=summary.total_ideas,
+        total_papers=summary.total_papers,
+        total_members=summary.total_members,
+        active_members_last_week=summary.active_members_last_week,
     )
 
 
+@router.get("/overview", response_model=OverviewMetrics)
+async def get_overview_metrics(
+    organization_id: UUID = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get high-level overview metrics for the organization."""
+    summary = await analytics.get_org_summary(db, organization_id)
+    return _overview_from_summary(summary)
+
+
 @router.get("/task-status", response_model=TaskStatusBreakdown)
 async def get_task_status_breakdown(
     organization_id: UUID = Query(...),
@@ -255,37 +182,14 @@ async def get_activity_timeline(
     db: AsyncSession = Depends(get_db),
 ):
     """Get activity timeline for the specified period."""
-    start_date = datetime.utcnow() - timedelta(days=days)
-
-    # Get daily activity counts by type
-    query = (
-        select(
-            func.date(Activity.created_at).label("date"),
-            Activity.target_type,
-            func.count(Activity.id).label("count"),
-        )
-        .where(
-            and_(
-                Activity.organization_id == organization_id,
-                Activity.created_at >= start_date,
-            )
-        )
-        .group_by(func.date(Activity.created_at), Activity.target_type)
-        .order_by(func.date(Activity.created_at))
-    )
-
-    result = await db.execute(query)
-    rows = result.all()
+    rows = await analytics.get_activity_timeline(db, organization_id, days)
 
     # Organize by target type
     timeline_data: dict[str, list[TimeSeriesPoint]] = {}
-    for row in rows:
-        target_type = row.target_type
-        if target_type not in timeline_data:
-            timeline_data[target_type] = []
-        timeline_data[target_type].append(TimeSeriesPoint(
-            date=row.date.isoformat(),
-            value=row.count,
+    for day, target_type, count in rows:
+        timeline_data.setdefault(target_type, []).append(TimeSeriesPoint(
+            date=day.isoformat(),
+            value=count,
         ))
 
     return [
@@ -372,7 +276,8 @@ async def get_project_progress(
     # Map impact number back to string
     impact_map = {4: "critical", 3: "high", 2: "medium", 1: "low", 0: None}
 
-    # Fetch comment counts per project (through tasks)
+    # Fetch comment counts per project (through tasks), with the user's
+    # unread count when authenticated
     comment_query = (
         select(
             Task.project_id,
@@ -382,52 +287,14 @@ async def get_project_progress(
         .where(Task.project_id.in_(project_ids))
         .group_by(Task.project_id)
     )
-    comment_result = await db.execute(comment_query)
-    comment_data = {row.project_id: row.total_comments for row in comment_result.all()}
-
-    # If user is authenticated, calculate unread counts
-    unread_data: dict[UUID, int] = {}
     if current_user:
-        # Get all task IDs for these projects
-        task_ids_query = select(Task.id, Task.project_id).where(Task.project_id.in_(project_ids))
-        task_result = await db.execute(task_ids_query)
-        task_rows = task_result.all()
-
-        if task_rows:
-            task_ids = [row.id for row in task_rows]
-            task_to_project = {row.id: row.project_id for row in task_rows}
-
-            # Get all comments for these tasks
-            comments_query = (
-                select(TaskComment.id, TaskComment.task_id, TaskComment.user_id)
-                .where(TaskComment.task_id.in_(task_ids))
-            )
-            comments_result = await db.execute(comments_query)
-            all_comments = comments_result.all()
-
-            # Get read status for these comments
-            comment_ids = [c.id for c in all_comments]
-            if comment_ids:
-                read_query = (
-                    select(CommentRead.comment_id)
-                    .where(
-                        and_(
-                            CommentRead.comment_type == "task",
-                            CommentRead.comment_id.in_(comment_ids),
-                            CommentRead.user_id == current_user.id,
-                        )
-                    )
-                )
-                read_result = await db.execute(read_query)
-                read_ids = {row[0] for row in read_result.all()}
-
-                # Calculate unread per project
-                for comment in all_comments:
-                    project_id = task_to_project.get(comment.task_id)
-                    if project_id:
-                        # Unread if: not read AND not authored by current user
-                        if comment.id not in read_ids and comment.user_id != current_user.id:
-                            unread_data[project_id] = unread_data.get(project_id, 0) + 1
+        comment_query = comment_reads.with_unread_count(comment_query, current_user.id, "task")
+    comment_result = await db.execute(comment_query)
+    comment_rows = comment_result.all()
+    comment_data = {row.project_id: row.total_comments for row in comment_rows}
+    unread_data: dict[UUID, int] = (
+        {row.project_id: row.unread_count for row in comment_rows} if current_user else {}
+    )
 
     # Build response
     projects = []
@@ -463,35 +330,16 @@ async def get_activity_type_breakdown(
     db: AsyncSession = Depends(get_db),
 ):
     """Get activity breakdown by type."""
-    start_date = datetime.utcnow() - timedelta(days=days)
-
-    query = (
-        select(
-            Activity.activity_type,
-            func.count(Activity.id).label("count"),
-        )
-        .where(
-            and_(
-                Activity.organization_id == organization_id,
-                Activity.created_at >= start_date,
-            )
-        )
-        .group_by(Activity.activity_type)
-        .order_by(func.count(Activity.id).desc())
-    )
-
-    result = await db.execute(query)
-    rows = result.all()
-
-    total = sum(row.count for row in rows)
+    rows = await analytics.get_activity_type_counts(db, organization_id, days)
+    total = sum(count for _, count in rows)
 
     return [
         ActivityMetrics(
-            activity_type=row.activity_type,
-            count=row.count,
-            percentage=round(row.count / total * 100, 1) if total > 0 else 0,
+            activity_type=activity_type,
+            count=count,
+            percentage=round(count / total * 100, 1) if total > 0 else 0,
         )
-        for row in rows
+        for activity_type, count in rows
     ]
 
 
@@ -503,45 +351,21 @@ async def get_team_productivity(
     db: AsyncSession = Depends(get_db),
 ):
     """Get team member productivity metrics."""
-    start_date = datetime.utcnow() - timedelta(days=days)
+    contributors = await analytics.get_top_contributors(db, organization_id, days, limit)
 
-    # Get activity counts per user
-    query = (
-        select(
-            Activity.actor_id,
-            User.display_name,
-            func.count(Activity.id).label("total_activities"),
-            func.count(case((Activity.activity_type == "task.completed", 1))).label("tasks_completed"),
-            func.count(case((Activity.activity_type == "document.created", 1))).label("documents_created"),
-            func.count(case((Activity.activity_type == "comment.created", 1))).label("comments_made"),
-        )
-        .join(User, Activity.actor_id == User.id)
-        .where(
-            and_(
-                Activity.organization_id == organization_id,
-                Activity.created_at >= start_date,
-            )
-        )
-        .group_by(Activity.actor_id, User.display_name)
-        .order_by(func.count(Activity.id).desc())
-        .limit(limit)
-    )
-
-    result = await db.execute(query)
     team_data = []
-
-    for row in result.all():
+    for row in contributors:
         # Calculate activity score (weighted)
         score = (
             row.tasks_completed * 3 +
             row.documents_created * 2 +
             row.comments_made * 1 +
-            row.total_activities * 0.1
+            row.activity_count * 0.1
         )
 
         team_data.append(TeamProductivity(
-            user_id=row.actor_id,
-            user_name=row.display_name,
+            user_id=row.user_id,
+            user_name=row.user_name,
             tasks_completed=row.tasks_completed,
             documents_created=row.documents_created,
             comments_made=row.comments_made,
@@ -551,29 +375,128 @@ async def get_team_productivity(
     return team_data
 
 
+@router.get("/task-status-history", response_model=list[TimeSeriesData])
+async def get_task_status_history(
+    organization_id: UUID = Query(...),
+    days: int = Query(30, ge=7, le=90),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get daily task counts by status from the rollup snapshots."""
+    rows = await analytics.get_task_status_history(db, organization_id, days)
+
+    history: dict[str, list[TimeSeriesPoint]] = {}
+    for day, task_status, count in rows:
+        history.setdefault(task_status, []).append(TimeSeriesPoint(
+            date=day.isoformat(),
+            value=count,
+        ))
+
+    return [TimeSeriesData(label=label, data=data) for label, data in history.items()]
+
+
+class OrganizationDashboard(BaseModel):
+    """Organization-wide dashboard sections (the same for every member)."""
+    overview: OverviewMetrics
+    task_status: TaskStatusBreakdown
+    activity_over_time: list[TimeSeriesData]
+    recent_activity_types: list[ActivityMetrics]
+    top_contributors: list[TeamProductivity]
+    task_status_over_time: list[TimeSeriesData]
+
+
+def _dashboard_cache_key(organization_id: UUID) -> str:
+    return f"analytics:v1:dashboard:{organization_id}"
+
+
+async def _on_own_session(endpoint: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """Run an analytics query on its own pooled session.
+
+    Concurrent branches must not share an AsyncSession.
+    """
+    async with async_session_factory() as session:
+        return await endpoint(*args, db=session)
+
+
+async def _load_summary(
+    organization_id: UUID,
+    db: AsyncSession,
+) -> tuple[OverviewMetrics, TaskStatusBreakdown]:
+    summary = await analytics.get_org_summary(db, organization_id)
+    return _overview_from_summary(summary), TaskStatusBreakdown(**summary.task_status)
+
+
+async def _load_organization_dashboard(organization_id: UUID) -> OrganizationDashboard:
+    """Compute the org-wide sections concurrently, one session per query."""
+    (
+        (overview, task_status),
+        activity_timeline,
+        activity_types,
+        top_contributors,
+        task_status_history,
+    ) = await asyncio.gather(
+        _on_own_session(_load_summary, organization_id),
+        _on_own_session(get_activity_timeline, organization_id, 30),
+        _on_own_session(get_activity_type_breakdown, organization_id, 30),
+        _on_own_session(get_team_productivity, organization_id, 30, 5),
+        _on_own_session(get_task_status_history, organization_id, 30),
+    )
+    return OrganizationDashboard(
+        overview=overview,
+        task_status=task_status,
+        activity_over_time=activity_timeline,
+        recent_activity_types=activity_types,
+        top_contributors=top_contributors,
+        task_status_over_time=task_status_history,
+    )
+
+
+async def _get_organization_dashboard(organization_id: UUID) -> OrganizationDashboard:
+    """Org-wide dashboard sections, cached in Redis for a short TTL."""
+    ttl = get_settings().analytics_dashboard_cache_ttl_seconds
+    key = _dashboard_cache_key(organization_id)
+    if ttl > 0:
+        try:
+            cached = await get_redis().get(key)
+            if cached is not None:
+                return OrganizationDashboard.model_validate_json(cached)
+        except Exception as e:
+            logger.warning("analytics_dashboard_cache_get_failed", error=str(e))
+
+    dashboard = await _load_organization_dashboard(organization_id)
+
+    if ttl > 0:
+        try:
+            await get_redis().set(key, dashboard.model_dump_json(), ex=ttl)
+        except Exception as e:
+            logger.warning("analytics_dashboard_cache_set_failed", error=str(e))
+    return dashboard
+
+
 @router.get("/dashboard", response_model=DashboardAnalytics)
 async def get_dashboard_analytics(
     organization_id: UUID = Query(...),
     current_user: CurrentUser = None,
     db: AsyncSession = Depends(get_db_session),
 ):
-    """Get complete dashboard analytics in a single request."""
-    # Fetch all metrics in parallel would be more efficient,
-    # but for simplicity we'll call them sequentially
-    overview = await get_overview_metrics(organization_id, db)
-    task_status = await get_task_status_breakdown(organization_id, None, db)
-    activity_timeline = await get_activity_timeline(organization_id, 30, db)
-    project_progress = await get_project_progress(organization_id, current_user, None, db)
-    activity_types = await get_activity_type_breakdown(organization_id, 30, db)
-    top_contributors = await get_team_productivity(organization_id, 30, 5, db)
+    """Get complete dashboard analytics in a single request.
+
+    Org-wide sections come from the rollup tables (cached briefly); project
+    progress carries per-user unread counts, so it is always computed live,
+    on the request session, while the org-wide sections load.
+    """
+    organization, project_progress = await asyncio.gather(
+        _get_organization_dashboard(organization_id),
+        get_project_progress(organization_id, current_user, None, db),
+    )
 
     return DashboardAnalytics(
-        overview=overview,
-        task_status=task_status,
-        activity_over_time=activity_timeline,
+        overview=organization.overview,
+        task_status=organization.task_status,
+        activity_over_time=organization.activity_over_time,
         project_progress=project_progress,
-        recent_activity_types=activity_types,
-        top_contributors=top_contributors,
+        recent_activity_types=organization.recent_activity_types,
+        top_contributors=organization.top_contributors,
+        task_status_over_time=organization.task_status_over_time,
     )
 
 
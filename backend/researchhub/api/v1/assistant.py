@@ -1,6 +1,5 @@
 """AI Assistant endpoints for context-aware chat with tool calling."""
 
-import json
 from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
@@ -12,7 +11,7 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from researchhub.api.v1.auth import CurrentUser
-from researchhub.db.session import get_db_session
+from researchhub.db.session import get_db_session, release_connection, streaming_session
 from researchhub.models.user import User
 from researchhub.models.organization import OrganizationMember
 from researchhub.models.ai import AIPendingAction
@@ -24,6 +23,7 @@ from researchhub.ai.assistant.schemas import (
 )
 from researchhub.ai.assistant.executors import approve_action, reject_action
 from researchhub.ai.providers import get_provider
+from researchhub.utils.sse import sse_stream
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -171,35 +171,30 @@ async def assistant_chat(
     # Get provider
     provider = get_provider()
 
-    # Create service
-    service = AssistantService(
-        provider=provider,
-        db=db,
-        user_id=current_user.id,
-        org_id=org_id,
-        use_dynamic_queries=request.use_dynamic_queries,
-    )
+    # The request's session (also used to authenticate) lives until the
+    # response is sent; end its transaction so it holds no connection while
+    # the chat streams. The chat borrows connections from its own session.
+    await release_connection(db)
 
-    async def event_generator() -> AsyncIterator[str]:
+    async def chat_events() -> AsyncIterator[tuple[str, dict]]:
         try:
-            logger.info("Starting assistant chat stream")
-            event_count = 0
-            async for event in service.chat(chat_request):
-                event_count += 1
-                event_type = event.event.value if hasattr(event.event, 'value') else str(event.event)
-                logger.info("Yielding event", event_type=event_type, event_count=event_count)
-                event_data = json.dumps(event.data)
-                yield f"event: {event_type}\ndata: {event_data}\n\n"
-            logger.info("Chat stream completed", total_events=event_count)
+            async with streaming_session("assistant_chat") as chat_db:
+                service = AssistantService(
+                    provider=provider,
+                    db=chat_db,
+                    user_id=current_user.id,
+                    org_id=org_id,
+                    use_dynamic_queries=request.use_dynamic_queries,
+                )
+                async for event in service.chat(chat_request):
+                    event_type = event.event.value if hasattr(event.event, 'value') else str(event.event)
+                    yield event_type, event.data
         except Exception as e:
-            logger.error("Assistant chat error", error=str(e), error_type=type(e).__name__)
-            import traceback
-            logger.error("Traceback", tb=traceback.format_exc())
-            error_data = json.dumps({"message": str(e)})
-            yield f"event: error\ndata: {error_data}\n\n"
+            logger.exception("assistant_chat_failed", error=str(e), error_type=type(e).__name__)
+            yield "error", {"message": str(e)}
 
     return StreamingResponse(
-        event_generator(),
+        sse_stream(chat_events(), stream="assistant_chat"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
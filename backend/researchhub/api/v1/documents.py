@@ -18,7 +18,9 @@ from researchhub.models.document import Document, DocumentVersion, DocumentComme
 from researchhub.models.project import Project
 from researchhub.models.user import User
 from researchhub.services.notification import NotificationService
-from researchhub.tasks import auto_review_document_task, generate_embedding
+from researchhub.services.embedding import delete_entity_chunks
+from researchhub.services.embedding_queue import enqueue_embedding
+from researchhub.tasks import auto_review_document_task
 from researchhub.utils.tiptap import extract_plain_text, count_words
 
 router = APIRouter()
@@ -281,7 +283,7 @@ async def create_document(
 
     # Generate embedding for semantic search
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="document",
             entity_id=str(document.id),
         )
@@ -501,7 +503,7 @@ async def update_document(
 
         # Regenerate embedding if content changed
         try:
-            generate_embedding.delay(
+            await enqueue_embedding(
                 entity_type="document",
                 entity_id=str(document.id),
             )
@@ -537,6 +539,8 @@ async def delete_document(
     await check_project_access(db, document.project_id, current_user.id, "member")
 
     document.is_archived = True
+    # Archived documents drop out of passage search and document chat
+    await delete_entity_chunks(db, "document", [document.id])
     await db.commit()
 
     logger.info("Document archived", document_id=str(document_id))
@@ -859,18 +863,17 @@ async def create_document_comment(
 
         if project and project.team and project.team.organization_id:
             notification_service = NotificationService(db)
-            for mention in mentions_info:
-                await notification_service.notify(
-                    user_id=mention.user_id,
-                    notification_type="user_mentioned",
-                    title=f"You were mentioned in: {document.title}",
-                    message=f"You were mentioned in a comment on '{document.title}'",
-                    organization_id=project.team.organization_id,
-                    target_type="document",
-                    target_id=document_id,
-                    target_url=f"/projects/{document.project_id}/documents/{document_id}",
-                    sender_id=current_user.id,
-                )
+            await notification_service.notify_many(
+                user_ids=[mention.user_id for mention in mentions_info],
+                notification_type="user_mentioned",
+                title=f"You were mentioned in: {document.title}",
+                message=f"You were mentioned in a comment on '{document.title}'",
+                organization_id=project.team.organization_id,
+                target_type="document",
+                target_id=document_id,
+                target_url=f"/projects/{document.project_id}/documents/{document_id}",
+                sender_id=current_user.id,
+            )
 
     logger.info(
         "Document comment created",
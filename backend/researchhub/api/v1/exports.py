@@ -1,29 +1,49 @@
-"""Export endpoints for generating PDF and CSV files."""
+"""Export endpoints for generating PDF and CSV files.
+
+CSV and NDJSON exports stream from the database as they are read. PDFs are
+rendered off the event loop and stored by content (see services/exports.py);
+a large PDF export answers 202 with an export job to poll at
+``/jobs/{job_id}`` and download from ``/jobs/{job_id}/download``.
+"""
 
 import csv
 import io
 from datetime import datetime
-from typing import Literal
+from typing import Any, AsyncIterable, Literal, Sequence
 from uuid import UUID
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from researchhub.api.v1.auth import CurrentUser
 from researchhub.db.session import get_db_session
 from researchhub.models.document import Document
 from researchhub.models.idea import Idea
 from researchhub.models.knowledge import Paper
-from researchhub.models.organization import OrganizationMember
+from researchhub.models.organization import OrganizationMember, Team
 from researchhub.models.project import Project, Task
-from researchhub.services.pdf_generator import pdf_generator
-
-router = APIRouter(prefix="/exports")
+from researchhub.services.exports import (
+    ExportJob,
+    PDFExport,
+    analytics_metrics,
+    artifact_path,
+    csv_chunks,
+    export_pdf,
+    get_job,
+    idea_query,
+    ndjson_chunks,
+    paper_query,
+    project_document_query,
+    project_task_query,
+    stream_rows,
+    task_query,
+)
+
+router = APIRouter()
 logger = structlog.get_logger()
 
 
@@ -34,6 +54,15 @@ class ExportRequest(BaseModel):
     include_metadata: bool = True
 
 
+class ExportJobResponse(BaseModel):
+    """A PDF export rendered in the background."""
+
+    job_id: str
+    status: str
+    filename: str
+    error: str | None = None
+
+
 def generate_csv(headers: list[str], rows: list[list]) -> io.StringIO:
     """Generate CSV content from headers and rows."""
     output = io.StringIO()
@@ -44,6 +73,46 @@ def generate_csv(headers: list[str], rows: list[list]) -> io.StringIO:
     return output
 
 
+def tabular_response(
+    format: Literal["csv", "ndjson"],
+    filename: str,
+    headers: Sequence[str],
+    rows: AsyncIterable[Sequence[Any]],
+    export: str,
+) -> StreamingResponse:
+    """Stream rows as a CSV or NDJSON download."""
+    if format == "ndjson":
+        return StreamingResponse(
+            ndjson_chunks(headers, rows, export),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename={filename}.ndjson"}
+        )
+    return StreamingResponse(
+        csv_chunks(headers, rows, export),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+    )
+
+
+def _job_response(job: ExportJob) -> ExportJobResponse:
+    return ExportJobResponse(job_id=job.id, status=job.status, filename=job.filename, error=job.error)
+
+
+async def pdf_response(
+    db: AsyncSession,
+    export: PDFExport,
+    current_user: CurrentUser,
+):
+    """The PDF download, or 202 with the job that is rendering it."""
+    result = await export_pdf(db, export, current_user.id)
+    if isinstance(result, ExportJob):
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=_job_response(result).model_dump(),
+        )
+    return FileResponse(result, media_type="application/pdf", filename=f"{export.filename}.pdf")
+
+
 async def verify_org_access(
     organization_id: UUID,
     user: CurrentUser,
@@ -63,25 +132,69 @@ async def verify_org_access(
         )
 
 
+async def _get_owned_job(job_id: UUID, current_user: CurrentUser) -> ExportJob:
+    job = await get_job(job_id)
+    if job is None or job.user_id != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found",
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: UUID,
+    current_user: CurrentUser,
+):
+    """Get the status of a background PDF export."""
+    return _job_response(await _get_owned_job(job_id, current_user))
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(
+    job_id: UUID,
+    current_user: CurrentUser,
+):
+    """Download the PDF of a finished background export."""
+    job = await _get_owned_job(job_id, current_user)
+    if job.status != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is {job.status}",
+        )
+    path = artifact_path(job.artifact_key)
+    if not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export has expired, please export again",
+        )
+    return FileResponse(path, media_type="application/pdf", filename=f"{job.filename}.pdf")
+
+
 @router.get("/projects/{project_id}")
 async def export_project(
     project_id: UUID,
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db_session),
-    format: Literal["csv", "pdf"] = Query("csv"),
+    format: Literal["csv", "ndjson", "pdf"] = Query("csv"),
     include_tasks: bool = Query(True),
     include_documents: bool = Query(True),
 ):
     """Export project data with tasks and documents."""
-    # Fetch project with related data
-    query = select(Project).options(selectinload(Project.team)).where(Project.id == project_id)
-    if include_tasks:
-        query = query.options(selectinload(Project.tasks))
-    if include_documents:
-        query = query.options(selectinload(Project.documents))
-
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
+    result = await db.execute(
+        select(
+            Project.name,
+            Project.status,
+            Project.description,
+            Project.created_at,
+            Project.updated_at,
+            Team.organization_id,
+        )
+        .outerjoin(Team, Project.team_id == Team.id)
+        .where(Project.id == project_id)
+    )
+    project = result.first()
 
     if project is None:
         raise HTTPException(
@@ -89,83 +202,44 @@ async def export_project(
             detail="Project not found",
         )
 
-    org_id = project.team.organization_id if project.team else None
-    if org_id:
-        await verify_org_access(org_id, current_user, db)
+    if project.organization_id:
+        await verify_org_access(project.organization_id, current_user, db)
 
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filename = f"project_{project.name.replace(' ', '_')}_{timestamp}"
 
-    if format == "csv":
-        headers = ["Type", "Name", "Status", "Created", "Updated", "Description"]
-        rows = [
-            ["Project", project.name, project.status,
-             project.created_at.isoformat(),
-             project.updated_at.isoformat() if project.updated_at else "",
-             project.description or ""]
-        ]
-
+    if format == "pdf":
+        return await pdf_response(db, PDFExport(
+            kind="project",
+            params={
+                "project_id": str(project_id),
+                "include_tasks": include_tasks,
+                "include_documents": include_documents,
+            },
+            filename=filename,
+        ), current_user)
+
+    async def rows():
+        yield ["Project", project.name, project.status, project.created_at,
+               project.updated_at, project.description]
+        queries = []
         if include_tasks:
-            for task in project.tasks:
-                rows.append([
-                    "Task", task.title, task.status,
-                    task.created_at.isoformat(),
-                    task.updated_at.isoformat() if task.updated_at else "",
-                    task.description or ""
-                ])
-
+            queries.append(project_task_query(
+                literal("Task"), Task.title, Task.status,
+                Task.created_at, Task.updated_at, Task.description,
+                project_id=project_id,
+            ).order_by(Task.created_at))
         if include_documents:
-            for doc in project.documents:
-                rows.append([
-                    "Document", doc.title, "N/A",
-                    doc.created_at.isoformat(),
-                    doc.updated_at.isoformat() if doc.updated_at else "",
-                    ""
-                ])
+            queries.append(project_document_query(
+                literal("Document"), Document.title, literal("N/A"),
+                Document.created_at, Document.updated_at, literal(""),
+                project_id=project_id,
+            ).order_by(Document.created_at))
+        async for row in stream_rows(db, *queries):
+            yield row
 
-        output = generate_csv(headers, rows)
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-        )
-
-    else:  # PDF
-        # Prepare task data
-        task_list = []
-        if include_tasks:
-            for task in project.tasks:
-                task_list.append({
-                    'title': task.title,
-                    'status': task.status,
-                    'priority': task.priority,
-                    'due_date': task.due_date.isoformat() if task.due_date else 'N/A',
-                })
-
-        # Prepare document data
-        doc_list = []
-        if include_documents:
-            for doc in project.documents:
-                doc_list.append({
-                    'title': doc.title,
-                    'document_type': getattr(doc, 'document_type', 'N/A'),
-                    'created_at': doc.created_at.strftime('%Y-%m-%d'),
-                })
-
-        output = pdf_generator.generate_project_pdf(
-            project_name=project.name,
-            project_status=project.status,
-            project_description=project.description,
-            tasks=task_list,
-            documents=doc_list,
-        )
-
-        return StreamingResponse(
-            output,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
-        )
+    headers = ["Type", "Name", "Status", "Created", "Updated", "Description"]
+    return tabular_response(format, filename, headers, rows(), "project")
 
 
 @router.get("/tasks")
@@ -175,67 +249,35 @@ async def export_tasks(
     organization_id: UUID = Query(...),
     project_id: UUID | None = Query(None),
     status_filter: str | None = Query(None),
-    format: Literal["csv", "pdf"] = Query("csv"),
+    format: Literal["csv", "ndjson", "pdf"] = Query("csv"),
 ):
-    """Export tasks to CSV or PDF."""
+    """Export tasks to CSV, NDJSON or PDF."""
     await verify_org_access(organization_id, current_user, db)
 
-    query = select(Task).join(Project).where(Project.organization_id == organization_id)
-
-    if project_id:
-        query = query.where(Task.project_id == project_id)
-    if status_filter:
-        query = query.where(Task.status == status_filter)
-
-    query = query.order_by(Task.created_at.desc())
-
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filename = f"tasks_export_{timestamp}"
 
-    if format == "csv":
-        headers = ["Title", "Status", "Priority", "Due Date", "Created", "Assignee", "Project"]
-        rows = []
-
-        for task in tasks:
-            rows.append([
-                task.title,
-                task.status,
-                task.priority,
-                task.due_date.isoformat() if task.due_date else "",
-                task.created_at.isoformat(),
-                str(task.assignee_id) if task.assignee_id else "",
-                str(task.project_id),
-            ])
-
-        output = generate_csv(headers, rows)
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-        )
-
-    else:  # PDF
-        task_list = []
-        for task in tasks:
-            task_list.append({
-                'title': task.title,
-                'status': task.status,
-                'priority': task.priority,
-                'due_date': task.due_date.isoformat() if task.due_date else 'N/A',
-                'assignee': str(task.assignee_id)[:8] if task.assignee_id else 'Unassigned',
-            })
-
-        output = pdf_generator.generate_tasks_pdf(task_list)
-
-        return StreamingResponse(
-            output,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
-        )
+    if format == "pdf":
+        return await pdf_response(db, PDFExport(
+            kind="tasks",
+            params={
+                "organization_id": str(organization_id),
+                "project_id": str(project_id) if project_id else None,
+                "status_filter": status_filter,
+            },
+            filename=filename,
+        ), current_user)
+
+    query = task_query(
+        Task.title, Task.status, Task.priority, Task.due_date,
+        Task.created_at, Task.assignee_id, Task.project_id,
+        organization_id=organization_id,
+        project_id=project_id,
+        status_filter=status_filter,
+    ).order_by(Task.created_at.desc())
+
+    headers = ["Title", "Status", "Priority", "Due Date", "Created", "Assignee", "Project"]
+    return tabular_response(format, filename, headers, stream_rows(db, query), "tasks")
 
 
 @router.get("/documents/{document_id}")
@@ -258,12 +300,13 @@ async def export_document(
         )
 
     # Verify access through project
-    result = await db.execute(
-        select(Project).options(selectinload(Project.team)).where(Project.id == document.project_id)
+    organization_id = await db.scalar(
+        select(Team.organization_id)
+        .join(Project, Project.team_id == Team.id)
+        .where(Project.id == document.project_id)
     )
-    project = result.scalar_one_or_none()
-    if project and project.team and project.team.organization_id:
-        await verify_org_access(project.team.organization_id, current_user, db)
+    if organization_id:
+        await verify_org_access(organization_id, current_user, db)
 
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filename = f"doc_{document.title.replace(' ', '_')}_{timestamp}"
@@ -304,22 +347,11 @@ async def export_document(
         )
 
     else:  # PDF
-        metadata = {
-            'Created': document.created_at.strftime('%Y-%m-%d'),
-            'Last Updated': document.updated_at.strftime('%Y-%m-%d') if document.updated_at else None,
-        }
-
-        output = pdf_generator.generate_document_pdf(
-            title=document.title,
-            content=content,
-            metadata=metadata,
-        )
-
-        return StreamingResponse(
-            output,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
-        )
+        return await pdf_response(db, PDFExport(
+            kind="document",
+            params={"document_id": str(document_id)},
+            filename=filename,
+        ), current_user)
 
 
 @router.get("/ideas")
@@ -328,64 +360,32 @@ async def export_ideas(
     db: AsyncSession = Depends(get_db_session),
     organization_id: UUID = Query(...),
     project_id: UUID | None = Query(None),
-    format: Literal["csv", "pdf"] = Query("csv"),
+    format: Literal["csv", "ndjson", "pdf"] = Query("csv"),
 ):
-    """Export ideas to CSV or PDF."""
+    """Export ideas to CSV, NDJSON or PDF."""
     await verify_org_access(organization_id, current_user, db)
 
-    query = select(Idea).where(Idea.organization_id == organization_id)
-
-    if project_id:
-        query = query.where(Idea.project_id == project_id)
-
-    query = query.order_by(Idea.created_at.desc())
-
-    result = await db.execute(query)
-    ideas = result.scalars().all()
-
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filename = f"ideas_export_{timestamp}"
 
-    if format == "csv":
-        headers = ["Title", "Status", "Priority", "Type", "Created", "Tags"]
-        rows = []
-
-        for idea in ideas:
-            rows.append([
-                idea.title,
-                idea.status,
-                idea.priority,
-                idea.idea_type,
-                idea.created_at.isoformat(),
-                ", ".join(idea.tags) if idea.tags else "",
-            ])
-
-        output = generate_csv(headers, rows)
+    if format == "pdf":
+        return await pdf_response(db, PDFExport(
+            kind="ideas",
+            params={
+                "organization_id": str(organization_id),
+                "project_id": str(project_id) if project_id else None,
+            },
+            filename=filename,
+        ), current_user)
 
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-        )
+    query = idea_query(
+        Idea.title, Idea.status, Idea.source, Idea.created_at, Idea.tags,
+        organization_id=organization_id,
+        project_id=project_id,
+    ).order_by(Idea.created_at.desc())
 
-    else:  # PDF
-        idea_list = []
-        for idea in ideas:
-            idea_list.append({
-                'title': idea.title,
-                'status': idea.status,
-                'priority': idea.priority,
-                'idea_type': idea.idea_type,
-                'tags': idea.tags if idea.tags else [],
-            })
-
-        output = pdf_generator.generate_ideas_pdf(idea_list)
-
-        return StreamingResponse(
-            output,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
-        )
+    headers = ["Title", "Status", "Source", "Created", "Tags"]
+    return tabular_response(format, filename, headers, stream_rows(db, query), "ideas")
 
 
 @router.get("/papers")
@@ -394,12 +394,15 @@ async def export_papers(
     db: AsyncSession = Depends(get_db_session),
     organization_id: UUID = Query(...),
     collection_id: UUID | None = Query(None),
-    format: Literal["csv", "bibtex"] = Query("csv"),
+    format: Literal["csv", "ndjson", "bibtex"] = Query("csv"),
 ):
-    """Export papers to CSV or BibTeX format."""
+    """Export papers to CSV, NDJSON or BibTeX format."""
     await verify_org_access(organization_id, current_user, db)
 
-    query = select(Paper).where(Paper.organization_id == organization_id)
+    query = paper_query(
+        Paper.title, Paper.authors, Paper.publication_year, Paper.journal, Paper.doi, Paper.pmid, Paper.created_at,
+        organization_id=organization_id,
+    )
 
     if collection_id:
         # Would need to join with collection_papers table
@@ -407,63 +410,36 @@ async def export_papers(
 
     query = query.order_by(Paper.created_at.desc())
 
-    result = await db.execute(query)
-    papers = result.scalars().all()
-
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filename = f"papers_export_{timestamp}"
 
-    if format == "csv":
+    if format != "bibtex":
         headers = ["Title", "Authors", "Year", "Journal", "DOI", "PMID", "Added"]
-        rows = []
-
-        for paper in papers:
-            authors = ", ".join(paper.authors) if paper.authors else ""
-            rows.append([
-                paper.title,
-                authors,
-                paper.year or "",
-                paper.journal or "",
-                paper.doi or "",
-                paper.pmid or "",
-                paper.created_at.isoformat(),
-            ])
-
-        output = generate_csv(headers, rows)
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-        )
+        return tabular_response(format, filename, headers, stream_rows(db, query), "papers")
 
-    else:  # BibTeX
-        bibtex_entries = []
-
-        for i, paper in enumerate(papers):
+    async def bibtex_entries():
+        i = 0
+        async for title, authors, year, journal, doi, _, _ in stream_rows(db, query):
             # Generate citation key
-            first_author = paper.authors[0].split()[-1] if paper.authors else "Unknown"
-            year = paper.year or "0000"
+            first_author = authors[0].split()[-1] if authors else "Unknown"
+            year = year or "0000"
             cite_key = f"{first_author.lower()}{year}_{i}"
 
-            authors = " and ".join(paper.authors) if paper.authors else ""
-
             entry = f"""@article{{{cite_key},
-  title = {{{paper.title}}},
-  author = {{{authors}}},
+  title = {{{title}}},
+  author = {{{" and ".join(authors) if authors else ""}}},
   year = {{{year}}},
-  journal = {{{paper.journal or ""}}},
-  doi = {{{paper.doi or ""}}}
+  journal = {{{journal or ""}}},
+  doi = {{{doi or ""}}}
 }}"""
-            bibtex_entries.append(entry)
-
-        bibtex_content = "\n\n".join(bibtex_entries)
+            yield entry if i == 0 else "\n\n" + entry
+            i += 1
 
-        return StreamingResponse(
-            iter([bibtex_content]),
-            media_type="application/x-bibtex",
-            headers={"Content-Disposition": f"attachment; filename={filename}.bib"}
-        )
+    return StreamingResponse(
+        bibtex_entries(),
+        media_type="application/x-bibtex",
+        headers={"Content-Disposition": f"attachment; filename={filename}.bib"}
+    )
 
 
 @router.get("/analytics")
@@ -476,68 +452,34 @@ async def export_analytics(
     """Export analytics data to CSV or PDF."""
     await verify_org_access(organization_id, current_user, db)
 
-    # Gather analytics data
-    projects_result = await db.execute(
-        select(Project).where(Project.organization_id == organization_id)
-    )
-    projects = projects_result.scalars().all()
-
-    tasks_result = await db.execute(
-        select(Task)
-        .join(Project)
-        .where(Project.organization_id == organization_id)
-    )
-    tasks = tasks_result.scalars().all()
-
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filename = f"analytics_export_{timestamp}"
 
-    # Calculate metrics
-    total_projects = len(projects)
-    active_projects = len([p for p in projects if p.status == "active"])
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == "completed"])
-
-    task_statuses = {}
-    for task in tasks:
-        task_statuses[task.status] = task_statuses.get(task.status, 0) + 1
-
-    if format == "csv":
-        headers = ["Metric", "Value"]
-        rows = [
-            ["Total Projects", total_projects],
-            ["Active Projects", active_projects],
-            ["Total Tasks", total_tasks],
-            ["Completed Tasks", completed_tasks],
-            ["Completion Rate", f"{(completed_tasks / total_tasks * 100) if total_tasks > 0 else 0:.1f}%"],
-        ]
-
-        # Add task status breakdown
-        for status, count in task_statuses.items():
-            rows.append([f"Tasks - {status}", count])
-
-        output = generate_csv(headers, rows)
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-        )
-
-    else:  # PDF
-        metrics = {
-            'total_projects': total_projects,
-            'active_projects': active_projects,
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'completion_rate': f"{(completed_tasks / total_tasks * 100) if total_tasks > 0 else 0:.1f}%",
-            'task_statuses': task_statuses,
-        }
-
-        output = pdf_generator.generate_analytics_pdf(metrics)
-
-        return StreamingResponse(
-            output,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
-        )
+    if format == "pdf":
+        return await pdf_response(db, PDFExport(
+            kind="analytics",
+            params={"organization_id": str(organization_id)},
+            filename=filename,
+        ), current_user)
+
+    metrics = await analytics_metrics(db, organization_id)
+    headers = ["Metric", "Value"]
+    rows = [
+        ["Total Projects", metrics['total_projects']],
+        ["Active Projects", metrics['active_projects']],
+        ["Total Tasks", metrics['total_tasks']],
+        ["Completed Tasks", metrics['completed_tasks']],
+        ["Completion Rate", metrics['completion_rate']],
+    ]
+
+    # Add task status breakdown
+    for task_status, count in metrics['task_statuses'].items():
+        rows.append([f"Tasks - {task_status}", count])
+
+    output = generate_csv(headers, rows)
+
+    return StreamingResponse(
+        iter([output.getvalue()]),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+    )
@@ -20,7 +20,7 @@ from researchhub.models.project import Project, Task, ProjectMember, ProjectTeam
 from researchhub.models.collaboration import ProjectShare
 from researchhub.models.document import Document
 from researchhub.models.knowledge import Paper
-from researchhub.tasks import generate_embedding
+from researchhub.services.embedding_queue import enqueue_embedding
 from researchhub.utils.tiptap import extract_plain_text
 
 router = APIRouter()
@@ -310,7 +310,7 @@ async def create_journal_entry(
 
     # Generate embedding for semantic search
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="journal_entry",
             entity_id=str(entry.id),
         )
@@ -773,7 +773,7 @@ async def update_journal_entry(
     # Regenerate embedding if content-related fields changed
     if "title" in update_data or "content" in update_data or "tags" in update_data:
         try:
-            generate_embedding.delay(
+            await enqueue_embedding(
                 entity_type="journal_entry",
                 entity_id=str(entry_id),
             )
@@ -4,7 +4,7 @@ from datetime import datetime
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field, HttpUrl
 from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,7 +14,8 @@ from researchhub.db.session import get_db
 from researchhub.api.v1.auth import get_current_user
 from researchhub.models import Paper, Collection, CollectionPaper, PaperHighlight, PaperLink, User
 from researchhub.services.external_apis import crossref_service, pubmed_service
-from researchhub.tasks import generate_embedding
+from researchhub.services.pagination import TOTAL_MODE_PATTERN, paginate
+from researchhub.services.embedding_queue import enqueue_embedding
 
 logger = structlog.get_logger()
 
@@ -223,7 +224,7 @@ async def create_paper(
 
     # Trigger embedding generation
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="paper",
             entity_id=str(paper.id),
         )
@@ -239,15 +240,24 @@ async def create_paper(
 
 @router.get("/papers", response_model=list[PaperResponse])
 async def list_papers(
+    response: Response,
     organization_id: UUID,
     search: str | None = None,
     read_status: str | None = Query(None, pattern="^(unread|reading|read)$"),
     collection_id: UUID | None = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    total: str = Query("none", pattern=TOTAL_MODE_PATTERN),
     db: AsyncSession = Depends(get_db),
 ):
-    """List papers with filtering and search."""
+    """List papers with filtering and search.
+
+    The body stays a plain list; paging metadata is returned in headers.
+    Pass ``X-Next-Cursor`` back as ``cursor`` for the next page while
+    ``X-Has-More`` is true. ``X-Total-Count`` (and ``X-Total-Is-Estimate``)
+    are only set when ``total`` is requested.
+    """
     query = select(Paper).where(Paper.organization_id == organization_id)
 
     if search:
@@ -267,10 +277,23 @@ async def list_papers(
             CollectionPaper.collection_id == collection_id
         )
 
-    query = query.order_by(Paper.created_at.desc()).offset(skip).limit(limit)
+    page = await paginate(
+        db,
+        query,
+        order_by=[Paper.created_at.desc(), Paper.id.desc()],
+        limit=limit,
+        cursor=cursor,
+        offset=skip,
+        total=total,
+    )
 
-    result = await db.execute(query)
-    return result.scalars().all()
+    response.headers["X-Has-More"] = "true" if page.has_more else "false"
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+        response.headers["X-Total-Is-Estimate"] = "true" if page.total_is_estimate else "false"
+    return page.items
 
 
 @router.get("/papers/{paper_id}", response_model=PaperResponse)
@@ -325,7 +348,7 @@ async def update_paper(
     content_fields = {"title", "authors", "abstract", "notes", "journal"}
     if content_fields & set(update_data.keys()):
         try:
-            generate_embedding.delay(
+            await enqueue_embedding(
                 entity_type="paper",
                 entity_id=str(paper_id),
             )
@@ -414,7 +437,7 @@ async def import_paper_by_doi(
 
     # Trigger embedding generation
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="paper",
             entity_id=str(paper.id),
         )
@@ -483,7 +506,7 @@ async def import_paper_by_pmid(
 
     # Trigger embedding generation
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="paper",
             entity_id=str(paper.id),
         )
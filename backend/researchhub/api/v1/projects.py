@@ -6,7 +6,7 @@ from uuid import UUID
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import select, func, or_, and_, exists, delete
+from sqlalchemy import select, func, or_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -18,7 +18,9 @@ from researchhub.services.recurring_task import RecurringTaskService
 from researchhub.services.custom_field import CustomFieldService
 from researchhub.services.workflow import WorkflowService
 from researchhub.services import access_control as ac
-from researchhub.tasks import generate_embedding
+from researchhub.services import project_hierarchy as hierarchy
+from researchhub.services.access_cache import get_access_set
+from researchhub.services.embedding_queue import enqueue_embedding
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -250,7 +252,7 @@ async def create_project(
             )
 
         # Check hierarchy depth (parent depth + 1 must not exceed max)
-        parent_depth = parent_project.get_depth()
+        parent_depth = await hierarchy.get_depth(db, parent_project.id)
         if parent_depth >= MAX_HIERARCHY_DEPTH:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -343,7 +345,7 @@ async def create_project(
 
     # Generate embedding for semantic search
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="project",
             entity_id=str(project.id),
         )
@@ -378,72 +380,10 @@ async def list_projects(
     include_ancestors: bool = Query(False, description="Include ancestor chain for breadcrumb display"),
 ) -> dict:
     """List projects the user has access to."""
-    # Get user's team and organization memberships in a single query
-    membership_result = await db.execute(
-        select(
-            TeamMember.team_id,
-            Team.organization_id,
-        )
-        .join(Team, TeamMember.team_id == Team.id)
-        .where(TeamMember.user_id == current_user.id)
-    )
-    membership_rows = membership_result.all()
-    user_team_ids = [row[0] for row in membership_rows]
-    user_org_ids = list(set(row[1] for row in membership_rows if row[1] is not None))
-
-    # Subquery for projects where user is direct member
-    project_member_subquery = (
-        select(ProjectMember.project_id)
-        .where(ProjectMember.user_id == current_user.id)
-        .subquery()
-    )
-
-    # Subquery for projects accessible via project_teams (multi-team access)
-    # This also handles the primary team_id
-    project_teams_subquery = (
-        select(ProjectTeam.project_id)
-        .where(ProjectTeam.team_id.in_(user_team_ids))
-        .subquery()
-    )
-
-    # Subquery for org-public projects in user's organizations
-    org_public_subquery = (
-        select(Project.id)
-        .join(Team, Project.team_id == Team.id)
-        .where(
-            and_(
-                Project.is_org_public == True,
-                Team.organization_id.in_(user_org_ids),
-            )
-        )
-        .subquery()
-    )
-
-    # Subquery for excluded projects (blocklist)
-    exclusion_exists = exists(
-        select(ProjectExclusion.id).where(
-            ProjectExclusion.project_id == Project.id,
-            ProjectExclusion.user_id == current_user.id,
-        )
-    )
-
-    # Base query - projects accessible via:
-    # 1. Primary team_id (backward compatibility)
-    # 2. project_teams (multi-team access)
-    # 3. Direct ProjectMember
-    # 4. Org-public projects in user's organizations
-    # AND user is not explicitly excluded
-    query = select(Project).where(
-        and_(
-            or_(
-                Project.team_id.in_(user_team_ids),
-                Project.id.in_(select(project_teams_subquery)),
-                Project.id.in_(select(project_member_subquery)),
-                Project.id.in_(select(org_public_subquery)),
-            ),
-            ~exclusion_exists,  # Exclude projects where user is in blocklist
-        )
-    )
+    # Resolved from the user's cached access set: direct membership, shares,
+    # team and org-public access and parent inheritance, minus exclusions
+    access = await get_access_set(db, current_user.id)
+    query = select(Project).where(Project.id.in_(access.project_ids))
 
     # Apply filters
     if team_id:
@@ -525,44 +465,15 @@ async def list_projects(
     # Build ancestors map if requested
     ancestors_map: dict[UUID, list[ProjectAncestor]] = {}
     if include_ancestors:
-        # Collect all parent_ids we need to fetch
-        parent_ids_to_fetch: set[UUID] = set()
-        for project in projects:
-            if project.parent_id:
-                parent_ids_to_fetch.add(project.parent_id)
-
-        # Fetch all needed ancestors in batches, building the full chain
-        all_ancestors: dict[UUID, Project] = {}
-        while parent_ids_to_fetch:
-            # Fetch this batch of parents
-            parents_result = await db.execute(
-                select(Project).where(Project.id.in_(parent_ids_to_fetch))
-            )
-            fetched_parents = {p.id: p for p in parents_result.scalars().all()}
-            all_ancestors.update(fetched_parents)
-
-            # Find new parent_ids to fetch (grandparents, etc.)
-            parent_ids_to_fetch = set()
-            for parent in fetched_parents.values():
-                if parent.parent_id and parent.parent_id not in all_ancestors:
-                    parent_ids_to_fetch.add(parent.parent_id)
-
-        # Build ancestor chains for each project
+        # All ancestor chains in one recursive query
+        chains = await hierarchy.get_ancestor_chains(
+            db, [project.id for project in projects if project.parent_id]
+        )
         for project in projects:
-            if project.parent_id:
-                chain: list[ProjectAncestor] = []
-                current_parent_id = project.parent_id
-                while current_parent_id and current_parent_id in all_ancestors:
-                    ancestor = all_ancestors[current_parent_id]
-                    chain.insert(0, ProjectAncestor(
-                        id=ancestor.id,
-                        name=ancestor.name,
-                        color=ancestor.color,
-                    ))
-                    current_parent_id = ancestor.parent_id
-                ancestors_map[project.id] = chain
-            else:
-                ancestors_map[project.id] = []
+            ancestors_map[project.id] = [
+                ProjectAncestor(id=ancestor.id, name=ancestor.name, color=ancestor.color)
+                for ancestor in chains.get(project.id, [])
+            ]
 
     # Convert to response with computed fields
     project_responses = []
@@ -766,7 +677,7 @@ async def update_project(
     # Regenerate embedding if name or description changed
     if "name" in update_data or "description" in update_data:
         try:
-            generate_embedding.delay(
+            await enqueue_embedding(
                 entity_type="project",
                 entity_id=str(project_id),
             )
@@ -1539,33 +1450,24 @@ async def get_project_tree(
     # Check access
     project = await check_project_access(db, project_id, current_user.id)
 
-    async def build_tree(proj: Project) -> dict:
-        """Recursively build tree structure."""
-        children_query = select(Project).where(Project.parent_id == proj.id)
-        if not include_archived:
-            children_query = children_query.where(Project.is_archived == False)
-
-        children_result = await db.execute(children_query)
-        children = list(children_result.scalars().all())
-
-        child_trees = []
-        for child in children:
-            child_tree = await build_tree(child)
-            child_trees.append(child_tree)
+    # Whole subtree with task counts in one recursive query
+    tree = await hierarchy.get_subtree(db, project.id, include_archived=include_archived)
 
+    def to_dict(node: hierarchy.TreeNode) -> dict:
+        proj = node.project
         return {
             "id": proj.id,
             "name": proj.name,
             "description": proj.description,
             "status": proj.status,
             "parent_id": proj.parent_id,
-            "has_children": len(children) > 0,
-            "children_count": len(children),
-            "task_count": len(proj.tasks) if proj.tasks else 0,
-            "children": child_trees,
+            "has_children": len(node.children) > 0,
+            "children_count": len(node.children),
+            "task_count": node.task_count,
+            "children": [to_dict(child) for child in node.children],
         }
 
-    return await build_tree(project)
+    return to_dict(tree)
 
 
 @router.post("/{project_id}/move", response_model=ProjectResponse)
@@ -1600,26 +1502,14 @@ async def move_project(
 
         # Prevent circular references
         # Check if new_parent is a descendant of project
-        async def is_descendant(potential_parent_id: UUID, ancestor_id: UUID) -> bool:
-            """Check if potential_parent is a descendant of ancestor."""
-            if potential_parent_id == ancestor_id:
-                return True
-            children_result = await db.execute(
-                select(Project.id).where(Project.parent_id == ancestor_id)
-            )
-            for (child_id,) in children_result.all():
-                if await is_descendant(potential_parent_id, child_id):
-                    return True
-            return False
-
-        if await is_descendant(move_data.new_parent_id, project_id):
+        if await hierarchy.is_descendant(db, move_data.new_parent_id, project_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot move a project to one of its descendants",
             )
 
         # Check hierarchy depth
-        parent_depth = new_parent.get_depth()
+        parent_depth = await hierarchy.get_depth(db, new_parent.id)
         if parent_depth >= MAX_HIERARCHY_DEPTH:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1655,23 +1545,10 @@ async def get_project_ancestors(
     """Get the ancestor chain for a project (for breadcrumb navigation)."""
     project = await check_project_access(db, project_id, current_user.id)
 
-    ancestors = []
-    current = project
-
-    while current.parent_id:
-        parent_result = await db.execute(
-            select(Project)
-            .options(selectinload(Project.parent))
-            .where(Project.id == current.parent_id)
-        )
-        parent = parent_result.scalar_one_or_none()
-        if parent:
-            ancestors.insert(0, parent)  # Insert at beginning to maintain order
-            current = parent
-        else:
-            break
-
-    return ancestors
+    # Root first, in one recursive query
+    return await hierarchy.get_ancestors(
+        db, project.id, selectinload(Project.parent)
+    )
 
 
 # =============================================================================
@@ -1,18 +1,23 @@
 """Global search API endpoints."""
 
-import structlog
-from datetime import datetime
-from typing import Literal
+import asyncio
+import base64
+import json
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import Select, case, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer
 
 from researchhub.api.v1.auth import CurrentUser
-from researchhub.db.session import get_db
+from researchhub.config import get_settings
+from researchhub.db.session import async_session_factory, get_db
 from researchhub.models import (
     Blocker,
     Project,
@@ -25,8 +30,14 @@ from researchhub.models import (
     User,
     JournalEntry,
 )
-from researchhub.models.organization import TeamMember, OrganizationMember
-from researchhub.services.embedding import get_embedding_service
+from researchhub.models.organization import OrganizationMember
+from researchhub.services.access_cache import get_access_set
+from researchhub.services.embedding import (
+    ChunkHit,
+    get_embedding_service,
+    search_entity_chunks,
+    widen_vector_scan,
+)
 
 logger = structlog.get_logger()
 
@@ -35,15 +46,32 @@ router = APIRouter(tags=["search"])
 # Scoring constants for hybrid search ranking
 SCORE_EXACT_TITLE_MATCH = 100  # Query exactly matches title
 SCORE_PARTIAL_TITLE_MATCH = 50  # Query found in title
+SCORE_TITLE_PREFIX_BONUS = 10  # Bonus when the title starts with the query
 SCORE_CONTENT_MATCH = 20  # Query found in content/description
+SCORE_FTS_MULTIPLIER = 20  # ts_rank (0-1) multiplied by this, replaces content match for FTS entities
+SCORE_TRIGRAM_MULTIPLIER = 10  # Trigram title similarity (0-1) multiplied by this
 SCORE_SEMANTIC_MULTIPLIER = 40  # Similarity score (0-1) multiplied by this
+SEMANTIC_SIMILARITY_THRESHOLD = 0.3  # Minimum cosine similarity for semantic matches
 
 # Entity types that support semantic search (have embeddings)
 SEMANTIC_ENTITY_TYPES = {"document", "task", "journal", "paper"}
 
+# Each entity branch returns at most this many pre-ranked candidates, so the
+# merge step works on bounded lists regardless of corpus size.
+MAX_BRANCH_CANDIDATES = 200
+
+# Slack applied to SQL-side cursor bounds; the exact keyset comparison happens
+# after merging, so the SQL bound only needs to never exclude a valid row.
+CURSOR_SCORE_EPSILON = 1e-4
+CURSOR_TIME_SLACK = timedelta(milliseconds=1)
+
 
 def _calculate_keyword_score(query: str, title: str, content: str | None = None) -> float:
-    """Calculate relevance score for keyword matches."""
+    """Calculate relevance score for keyword matches.
+
+    Python mirror of _keyword_score_expr, kept for callers that score
+    already-loaded rows.
+    """
     score = 0.0
     q_lower = query.lower()
     title_lower = title.lower()
@@ -55,7 +83,7 @@ def _calculate_keyword_score(query: str, title: str, content: str | None = None)
         score += SCORE_PARTIAL_TITLE_MATCH
         # Bonus for title starting with query
         if title_lower.startswith(q_lower):
-            score += 10
+            score += SCORE_TITLE_PREFIX_BONUS
 
     # Content matching
     if content and q_lower in content.lower():
@@ -85,6 +113,223 @@ def _merge_result(
         results[key] = item
 
 
+# --- Ranking and keyset helpers ---
+
+SortBy = Literal["relevance", "created_at", "updated_at"]
+
+
+@dataclass
+class _SearchContext:
+    """Per-request search parameters shared by every entity branch."""
+
+    q: str
+    q_lower: str
+    tsquery: Any
+    team_ids: list[UUID]
+    org_ids: list[UUID]
+    project_id: UUID | None
+    created_after: datetime | None
+    created_before: datetime | None
+    sort_by: SortBy
+    cursor_bound: float | None  # Primary sort value of the cursor, if any
+    branch_limit: int
+
+
+def _keyword_score_expr(
+    ctx: _SearchContext,
+    title_col: Any,
+    content_col: Any = None,
+    search_vector_col: Any = None,
+) -> Any:
+    """Build the SQL relevance expression for a keyword branch.
+
+    Title scoring mirrors _calculate_keyword_score. Content relevance comes
+    from ts_rank over the search_vector column where one exists, otherwise
+    from a substring match, and trigram similarity breaks ties between
+    near-identical titles.
+    """
+    title = func.lower(func.coalesce(title_col, ""))
+    score = case(
+        (title == ctx.q_lower, SCORE_EXACT_TITLE_MATCH),
+        (
+            title.like(f"{ctx.q_lower}%"),
+            SCORE_PARTIAL_TITLE_MATCH + SCORE_TITLE_PREFIX_BONUS,
+        ),
+        (title.like(f"%{ctx.q_lower}%"), SCORE_PARTIAL_TITLE_MATCH),
+        else_=0,
+    ) + func.similarity(title, ctx.q_lower) * SCORE_TRIGRAM_MULTIPLIER
+
+    if search_vector_col is not None:
+        score = score + func.coalesce(
+            func.ts_rank(search_vector_col, ctx.tsquery), 0
+        ) * SCORE_FTS_MULTIPLIER
+    elif content_col is not None:
+        score = score + case(
+            (func.lower(content_col).like(f"%{ctx.q_lower}%"), SCORE_CONTENT_MATCH),
+            else_=0,
+        )
+    return score
+
+
+def _keyword_match_clause(
+    ctx: _SearchContext,
+    title_col: Any,
+    content_col: Any = None,
+    search_vector_col: Any = None,
+) -> Any:
+    """Build the WHERE clause selecting keyword candidates for a branch."""
+    term = f"%{ctx.q_lower}%"
+    clauses = [func.lower(title_col).like(term)]
+    if search_vector_col is not None:
+        clauses.append(search_vector_col.op("@@")(ctx.tsquery))
+    elif content_col is not None:
+        clauses.append(func.lower(content_col).like(term))
+    return or_(*clauses)
+
+
+def _apply_date_filters(query: Select, model: Any, ctx: _SearchContext) -> Select:
+    """Apply created_after/created_before filters."""
+    if ctx.created_after:
+        query = query.where(model.created_at >= ctx.created_after)
+    if ctx.created_before:
+        query = query.where(model.created_at <= ctx.created_before)
+    return query
+
+
+def _apply_cursor_bound(query: Select, model: Any, ctx: _SearchContext, score: Any) -> Select:
+    """Restrict a branch to rows that can sort at or after the cursor."""
+    if ctx.cursor_bound is None:
+        return query
+    if ctx.sort_by == "relevance":
+        return query.where(score <= ctx.cursor_bound + CURSOR_SCORE_EPSILON)
+    column = model.created_at if ctx.sort_by == "created_at" else model.updated_at
+    bound = datetime.fromtimestamp(ctx.cursor_bound, tz=timezone.utc)
+    return query.where(column <= bound + CURSOR_TIME_SLACK)
+
+
+def _rank_keyword_query(query: Select, model: Any, ctx: _SearchContext, score: Any) -> Select:
+    """Apply the cursor bound, sort order and top-k limit to a keyword branch."""
+    query = _apply_cursor_bound(query, model, ctx, score)
+    if ctx.sort_by == "created_at":
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    elif ctx.sort_by == "updated_at":
+        query = query.order_by(model.updated_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(score.desc(), model.created_at.desc(), model.id.desc())
+    return query.limit(ctx.branch_limit)
+
+
+def _select_entity(model: Any, *columns: Any) -> Select:
+    """Select a model plus extra columns, deferring vector/tsvector payloads."""
+    options = [
+        defer(getattr(model, name))
+        for name in ("embedding", "search_vector")
+        if hasattr(model, name)
+    ]
+    return select(model, *columns).options(*options)
+
+
+def _semantic_query(
+    model: Any,
+    ctx: _SearchContext,
+    query_embedding: list[float],
+) -> Select:
+    """Build a bounded nearest-neighbour query for an embeddable model.
+
+    Ordering stays on raw cosine distance so the HNSW index is used; the
+    cursor bound is applied as a filter on top.
+    """
+    distance = model.embedding.cosine_distance(query_embedding)
+    query = (
+        _select_entity(model, (1 - distance).label("similarity"))
+        .where(model.embedding.isnot(None))
+    )
+    query = _apply_date_filters(query, model, ctx)
+    query = _apply_cursor_bound(
+        query, model, ctx, (1 - distance) * SCORE_SEMANTIC_MULTIPLIER
+    )
+    return query.order_by(distance).limit(ctx.branch_limit)
+
+
+async def _semantic_with_chunks(
+    db: AsyncSession,
+    ctx: _SearchContext,
+    entity_type: str,
+    model: Any,
+    query_embedding: list[float],
+    scope: Any,
+    *options: Any,
+) -> list[tuple[Any, float, ChunkHit | None]]:
+    """Run entity-level and passage-level nearest-neighbour search together.
+
+    ``scope`` adds the access-control joins/filters to both queries. An
+    entity's similarity is the better of its whole-entity vector and its best
+    passage, which is returned for the snippet.
+    """
+    await widen_vector_scan(db, ctx.branch_limit)
+    rows = await db.execute(scope(_semantic_query(model, ctx, query_embedding).options(*options)))
+    matches: dict[UUID, tuple[Any, float]] = {
+        entity.id: (entity, similarity or 0.0) for entity, similarity in rows.all()
+    }
+
+    hits = await search_entity_chunks(
+        db,
+        entity_type,
+        model,
+        query_embedding,
+        ctx.branch_limit,
+        scope=lambda query: _apply_date_filters(scope(query), model, ctx),
+    )
+    passages = {hit.entity_id: hit for hit in hits}
+
+    missing = [entity_id for entity_id in passages if entity_id not in matches]
+    if missing:
+        result = await db.execute(
+            _select_entity(model).options(*options).where(model.id.in_(missing))
+        )
+        for entity in result.scalars().all():
+            matches[entity.id] = (entity, 0.0)
+
+    return [
+        (
+            entity,
+            max(similarity, passages[entity_id].similarity) if entity_id in passages else similarity,
+            passages.get(entity_id),
+        )
+        for entity_id, (entity, similarity) in matches.items()
+    ]
+
+
+def _sort_key(item: "SearchResultItem", sort_by: SortBy) -> tuple[float, float, str, str]:
+    """Total ordering key for merged results (sorted descending)."""
+    if sort_by == "created_at":
+        primary = item.created_at.timestamp()
+    elif sort_by == "updated_at":
+        primary = (item.updated_at or item.created_at).timestamp()
+    else:
+        primary = float(item.score or 0)
+    return (primary, item.created_at.timestamp(), item.type, str(item.id))
+
+
+def _encode_cursor(key: tuple[float, float, str, str]) -> str:
+    """Encode a sort key as an opaque keyset cursor."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, float, str, str]:
+    """Decode an opaque keyset cursor back into a sort key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        primary, created, entity_type, entity_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (float(primary), float(created), str(entity_type), str(entity_id))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid search cursor",
+        )
+
+
 # --- Search Schemas ---
 
 class SearchResultItem(BaseModel):
@@ -108,10 +353,16 @@ class SearchResultItem(BaseModel):
 class SearchResponse(BaseModel):
     """Paginated search response."""
     results: list[SearchResultItem]
+    # Number of ranked candidates from this position onward. Each entity branch
+    # is bounded to its top-k, so this is a lower bound on the full match count.
     total: int
     query: str
     filters: dict
     has_more: bool
+    next_cursor: str | None = None  # Pass as `cursor` to fetch the next page
+    # True when a branch missed the deadline or failed, or hybrid relevance
+    # ranking ran past its candidate pool
+    partial: bool = False
 
 
 class SearchSuggestion(BaseModel):
@@ -121,6 +372,608 @@ class SearchSuggestion(BaseModel):
     id: UUID | None = None
 
 
+# --- Keyword Branches ---
+# Each branch returns at most ctx.branch_limit pre-ranked rows.
+
+async def _keyword_projects(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search projects - use team membership for access control."""
+    if not ctx.team_ids:
+        return []
+    score = _keyword_score_expr(ctx, Project.name, search_vector_col=Project.search_vector)
+    query = (
+        _select_entity(Project, score.label("score"))
+        .where(Project.team_id.in_(ctx.team_ids))
+        .where(Project.is_archived == False)
+        .where(_keyword_match_clause(ctx, Project.name, search_vector_col=Project.search_vector))
+    )
+    query = _apply_date_filters(query, Project, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Project, ctx, score))
+    return [
+        SearchResultItem(
+            id=project.id,
+            type="project",
+            title=project.name,
+            description=project.description,
+            snippet=_get_snippet(project.description, ctx.q) if project.description else None,
+            url=f"/projects/{project.id}",
+            created_at=project.created_at,
+            updated_at=project.updated_at,
+            metadata={
+                "status": project.status,
+                "scope": project.scope,
+            },
+            score=float(row_score),
+        )
+        for project, row_score in rows.all()
+    ]
+
+
+async def _keyword_tasks(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search tasks - use team membership via project for access control.
+
+    Task.description is JSONB (TipTap format); its plain-text mirror is
+    covered by search_vector.
+    """
+    if not ctx.team_ids:
+        return []
+    score = _keyword_score_expr(ctx, Task.title, search_vector_col=Task.search_vector)
+    query = (
+        _select_entity(Task, score.label("score"))
+        .join(Project, Task.project_id == Project.id)
+        .where(Project.team_id.in_(ctx.team_ids))
+        .where(_keyword_match_clause(ctx, Task.title, search_vector_col=Task.search_vector))
+    )
+    if ctx.project_id:
+        query = query.where(Task.project_id == ctx.project_id)
+    query = _apply_date_filters(query, Task, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Task, ctx, score))
+    return [
+        SearchResultItem(
+            id=task.id,
+            type="task",
+            title=task.title,
+            description=None,  # JSONB can't be displayed as string
+            snippet=_get_snippet(task.description_text, ctx.q) if task.description_text else None,
+            url=f"/projects/{task.project_id}?task={task.id}",
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            metadata={
+                "status": task.status,
+                "priority": task.priority,
+                "project_id": str(task.project_id),
+            },
+            score=float(row_score),
+        )
+        for task, row_score in rows.all()
+    ]
+
+
+async def _keyword_documents(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search documents - use team membership via project for access control."""
+    if not ctx.team_ids:
+        return []
+    score = _keyword_score_expr(ctx, Document.title, search_vector_col=Document.search_vector)
+    query = (
+        _select_entity(Document, score.label("score"))
+        .options(defer(Document.content))
+        .join(Project, Document.project_id == Project.id)
+        .where(Project.team_id.in_(ctx.team_ids))
+        .where(Document.is_archived == False)
+        .where(_keyword_match_clause(ctx, Document.title, search_vector_col=Document.search_vector))
+    )
+    if ctx.project_id:
+        query = query.where(Document.project_id == ctx.project_id)
+    query = _apply_date_filters(query, Document, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Document, ctx, score))
+    return [
+        SearchResultItem(
+            id=doc.id,
+            type="document",
+            title=doc.title,
+            description=None,
+            snippet=_get_snippet(doc.content_text, ctx.q) if doc.content_text else None,
+            url=f"/documents/{doc.id}",
+            created_at=doc.created_at,
+            updated_at=doc.updated_at,
+            metadata={
+                "status": doc.status,
+                "document_type": doc.document_type,
+            },
+            score=float(row_score),
+        )
+        for doc, row_score in rows.all()
+    ]
+
+
+async def _keyword_blockers(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search blockers - use team membership via project for access control."""
+    if not ctx.team_ids:
+        return []
+    score = _keyword_score_expr(ctx, Blocker.title, search_vector_col=Blocker.search_vector)
+    query = (
+        _select_entity(Blocker, score.label("score"))
+        .join(Project, Blocker.project_id == Project.id)
+        .where(Project.team_id.in_(ctx.team_ids))
+        .where(_keyword_match_clause(ctx, Blocker.title, search_vector_col=Blocker.search_vector))
+    )
+    if ctx.project_id:
+        query = query.where(Blocker.project_id == ctx.project_id)
+    query = _apply_date_filters(query, Blocker, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Blocker, ctx, score))
+    return [
+        SearchResultItem(
+            id=blocker.id,
+            type="blocker",
+            title=blocker.title,
+            description=None,  # JSONB can't be displayed as string
+            snippet=_get_snippet(blocker.description_text, ctx.q) if blocker.description_text else None,
+            url=f"/projects/{blocker.project_id}/blockers/{blocker.id}",
+            created_at=blocker.created_at,
+            updated_at=blocker.updated_at,
+            metadata={
+                "status": blocker.status,
+                "priority": blocker.priority,
+                "blocker_type": blocker.blocker_type,
+                "impact_level": blocker.impact_level,
+                "project_id": str(blocker.project_id),
+            },
+            score=float(row_score),
+        )
+        for blocker, row_score in rows.all()
+    ]
+
+
+async def _keyword_reviews(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search reviews - use team membership via project for access control."""
+    if not ctx.team_ids:
+        return []
+    score = _keyword_score_expr(ctx, Review.title, content_col=Review.description)
+    query = (
+        _select_entity(Review, score.label("score"))
+        .join(Project, Review.project_id == Project.id)
+        .where(Project.team_id.in_(ctx.team_ids))
+        .where(_keyword_match_clause(ctx, Review.title, content_col=Review.description))
+    )
+    if ctx.project_id:
+        query = query.where(Review.project_id == ctx.project_id)
+    query = _apply_date_filters(query, Review, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Review, ctx, score))
+    return [
+        SearchResultItem(
+            id=review.id,
+            type="review",
+            title=review.title,
+            description=review.description[:200] if review.description else None,
+            snippet=_get_snippet(review.description, ctx.q) if review.description else None,
+            url=f"/reviews/{review.id}",
+            created_at=review.created_at,
+            updated_at=review.updated_at,
+            metadata={
+                "status": review.status,
+                "priority": review.priority,
+                "review_type": review.review_type,
+                "project_id": str(review.project_id),
+                "document_id": str(review.document_id),
+            },
+            score=float(row_score),
+        )
+        for review, row_score in rows.all()
+    ]
+
+
+async def _keyword_ideas(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search ideas - these have organization_id directly."""
+    if not ctx.org_ids:
+        return []
+    score = _keyword_score_expr(ctx, Idea.title, content_col=Idea.content)
+    query = (
+        _select_entity(Idea, score.label("score"))
+        .where(Idea.organization_id.in_(ctx.org_ids))
+        .where(_keyword_match_clause(ctx, Idea.title, content_col=Idea.content))
+    )
+    query = _apply_date_filters(query, Idea, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Idea, ctx, score))
+    return [
+        SearchResultItem(
+            id=idea.id,
+            type="idea",
+            title=idea.title or idea.content[:100],  # Use content start if no title
+            description=idea.content[:200] if idea.content else None,
+            snippet=_get_snippet(idea.content, ctx.q) if idea.content else None,
+            url=f"/ideas/{idea.id}",
+            created_at=idea.created_at,
+            updated_at=idea.updated_at,
+            metadata={
+                "status": idea.status,
+                "source": idea.source,
+            },
+            score=float(row_score),
+        )
+        for idea, row_score in rows.all()
+    ]
+
+
+async def _keyword_papers(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search papers - these have organization_id directly.
+
+    Paper.search_vector covers title and abstract.
+    """
+    if not ctx.org_ids:
+        return []
+    score = _keyword_score_expr(ctx, Paper.title, search_vector_col=Paper.search_vector)
+    query = (
+        _select_entity(Paper, score.label("score"))
+        .where(Paper.organization_id.in_(ctx.org_ids))
+        .where(_keyword_match_clause(ctx, Paper.title, search_vector_col=Paper.search_vector))
+    )
+    query = _apply_date_filters(query, Paper, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Paper, ctx, score))
+    return [
+        SearchResultItem(
+            id=paper.id,
+            type="paper",
+            title=paper.title,
+            description=", ".join(paper.authors) if paper.authors else None,
+            snippet=_get_snippet(paper.abstract, ctx.q) if paper.abstract else None,
+            url=f"/knowledge/papers/{paper.id}",
+            created_at=paper.created_at,
+            updated_at=paper.updated_at,
+            metadata={
+                "year": paper.publication_year,
+                "journal": paper.journal,
+                "doi": paper.doi,
+            },
+            score=float(row_score),
+        )
+        for paper, row_score in rows.all()
+    ]
+
+
+async def _keyword_collections(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search collections - these have organization_id directly."""
+    if not ctx.org_ids:
+        return []
+    score = _keyword_score_expr(ctx, Collection.name, content_col=Collection.description)
+    query = (
+        _select_entity(Collection, score.label("score"))
+        .where(Collection.organization_id.in_(ctx.org_ids))
+        .where(_keyword_match_clause(ctx, Collection.name, content_col=Collection.description))
+    )
+    query = _apply_date_filters(query, Collection, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, Collection, ctx, score))
+    return [
+        SearchResultItem(
+            id=coll.id,
+            type="collection",
+            title=coll.name,
+            description=coll.description,
+            snippet=_get_snippet(coll.description, ctx.q) if coll.description else None,
+            url=f"/knowledge/collections/{coll.id}",
+            created_at=coll.created_at,
+            updated_at=coll.updated_at,
+            metadata={
+                "visibility": coll.visibility,
+            },
+            score=float(row_score),
+        )
+        for coll, row_score in rows.all()
+    ]
+
+
+async def _keyword_users(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search users - scoped to users in the same organizations (security fix)."""
+    if not ctx.org_ids:
+        return []
+    # A user may belong to several shared orgs; filter with a semi-join
+    # instead of DISTINCT so the ranked ORDER BY stays valid.
+    shared_org_members = (
+        select(OrganizationMember.user_id)
+        .where(OrganizationMember.organization_id.in_(ctx.org_ids))
+    )
+    display = func.coalesce(User.display_name, User.email)
+    score = _keyword_score_expr(ctx, display, content_col=User.email)
+    query = (
+        _select_entity(User, score.label("score"))
+        .where(User.id.in_(shared_org_members))
+        .where(
+            or_(
+                func.lower(User.email).like(f"%{ctx.q_lower}%"),
+                func.lower(User.display_name).like(f"%{ctx.q_lower}%"),
+            )
+        )
+    )
+
+    rows = await db.execute(_rank_keyword_query(query, User, ctx, score))
+    return [
+        SearchResultItem(
+            id=user.id,
+            type="user",
+            title=user.display_name or user.email,
+            description=user.email if user.display_name else None,
+            snippet=None,
+            url=f"/users/{user.id}",
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            metadata={
+                "avatar_url": user.avatar_url,
+            },
+            score=float(row_score),
+        )
+        for user, row_score in rows.all()
+    ]
+
+
+async def _keyword_journals(db: AsyncSession, ctx: _SearchContext) -> list[SearchResultItem]:
+    """Search journal entries - these have organization_id directly."""
+    if not ctx.org_ids:
+        return []
+    score = _keyword_score_expr(
+        ctx, JournalEntry.title, search_vector_col=JournalEntry.search_vector
+    )
+    query = (
+        _select_entity(JournalEntry, score.label("score"))
+        .options(defer(JournalEntry.content))
+        .where(JournalEntry.organization_id.in_(ctx.org_ids))
+        .where(JournalEntry.is_archived == False)
+        .where(
+            _keyword_match_clause(
+                ctx, JournalEntry.title, search_vector_col=JournalEntry.search_vector
+            )
+        )
+    )
+    if ctx.project_id:
+        query = query.where(JournalEntry.project_id == ctx.project_id)
+    query = _apply_date_filters(query, JournalEntry, ctx)
+
+    rows = await db.execute(_rank_keyword_query(query, JournalEntry, ctx, score))
+    return [
+        _journal_item(journal, snippet=_get_snippet(journal.content_text, ctx.q), score=float(row_score))
+        for journal, row_score in rows.all()
+    ]
+
+
+# --- Semantic Branches ---
+# Only for embeddable entities; ranked by cosine similarity.
+
+async def _semantic_tasks(
+    db: AsyncSession, ctx: _SearchContext, query_embedding: list[float]
+) -> list[SearchResultItem]:
+    """Search tasks semantically."""
+    if not ctx.team_ids:
+        return []
+    query = (
+        _semantic_query(Task, ctx, query_embedding)
+        .join(Project, Task.project_id == Project.id)
+        .where(Project.team_id.in_(ctx.team_ids))
+    )
+    if ctx.project_id:
+        query = query.where(Task.project_id == ctx.project_id)
+
+    await widen_vector_scan(db, ctx.branch_limit)
+    rows = await db.execute(query)
+    return [
+        SearchResultItem(
+            id=task.id,
+            type="task",
+            title=task.title,
+            description=None,
+            snippet=None,
+            url=f"/projects/{task.project_id}?task={task.id}",
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            metadata={
+                "status": task.status,
+                "priority": task.priority,
+                "project_id": str(task.project_id),
+            },
+            score=similarity * SCORE_SEMANTIC_MULTIPLIER,
+        )
+        for task, similarity in rows.all()
+        if similarity and similarity > SEMANTIC_SIMILARITY_THRESHOLD
+    ]
+
+
+async def _semantic_documents(
+    db: AsyncSession, ctx: _SearchContext, query_embedding: list[float]
+) -> list[SearchResultItem]:
+    """Search documents semantically, matching on their best passage."""
+    if not ctx.team_ids:
+        return []
+
+    def scope(query: Select) -> Select:
+        query = (
+            query.join(Project, Document.project_id == Project.id)
+            .where(Project.team_id.in_(ctx.team_ids))
+            .where(Document.is_archived == False)
+        )
+        if ctx.project_id:
+            query = query.where(Document.project_id == ctx.project_id)
+        return query
+
+    matches = await _semantic_with_chunks(
+        db, ctx, "document", Document, query_embedding, scope, defer(Document.content)
+    )
+    return [
+        SearchResultItem(
+            id=doc.id,
+            type="document",
+            title=doc.title,
+            description=None,
+            snippet=_leading_snippet(hit.passage if hit else doc.content_text, 300 if hit else 150),
+            url=f"/documents/{doc.id}",
+            created_at=doc.created_at,
+            updated_at=doc.updated_at,
+            metadata={
+                "status": doc.status,
+                "document_type": doc.document_type,
+            },
+            score=similarity * SCORE_SEMANTIC_MULTIPLIER,
+        )
+        for doc, similarity, hit in matches
+        if similarity > SEMANTIC_SIMILARITY_THRESHOLD
+    ]
+
+
+async def _semantic_journals(
+    db: AsyncSession, ctx: _SearchContext, query_embedding: list[float]
+) -> list[SearchResultItem]:
+    """Search journal entries semantically."""
+    if not ctx.org_ids:
+        return []
+    query = (
+        _semantic_query(JournalEntry, ctx, query_embedding)
+        .options(defer(JournalEntry.content))
+        .where(JournalEntry.organization_id.in_(ctx.org_ids))
+        .where(JournalEntry.is_archived == False)
+    )
+    if ctx.project_id:
+        query = query.where(JournalEntry.project_id == ctx.project_id)
+
+    await widen_vector_scan(db, ctx.branch_limit)
+    rows = await db.execute(query)
+    return [
+        _journal_item(
+            journal,
+            snippet=_leading_snippet(journal.content_text),
+            score=similarity * SCORE_SEMANTIC_MULTIPLIER,
+        )
+        for journal, similarity in rows.all()
+        if similarity and similarity > SEMANTIC_SIMILARITY_THRESHOLD
+    ]
+
+
+async def _semantic_papers(
+    db: AsyncSession, ctx: _SearchContext, query_embedding: list[float]
+) -> list[SearchResultItem]:
+    """Search papers semantically, matching on their best passage."""
+    if not ctx.org_ids:
+        return []
+
+    def scope(query: Select) -> Select:
+        return query.where(Paper.organization_id.in_(ctx.org_ids))
+
+    matches = await _semantic_with_chunks(db, ctx, "paper", Paper, query_embedding, scope)
+    return [
+        SearchResultItem(
+            id=paper.id,
+            type="paper",
+            title=paper.title,
+            description=", ".join(paper.authors) if paper.authors else None,
+            snippet=_leading_snippet(hit.passage if hit else paper.abstract, 300 if hit else 150),
+            url=f"/knowledge/papers/{paper.id}",
+            created_at=paper.created_at,
+            updated_at=paper.updated_at,
+            metadata={
+                "year": paper.publication_year,
+                "journal": paper.journal,
+                "doi": paper.doi,
+            },
+            score=similarity * SCORE_SEMANTIC_MULTIPLIER,
+        )
+        for paper, similarity, hit in matches
+        if similarity > SEMANTIC_SIMILARITY_THRESHOLD
+    ]
+
+
+def _journal_item(journal: JournalEntry, snippet: str | None, score: float) -> SearchResultItem:
+    """Build a search result for a journal entry."""
+    return SearchResultItem(
+        id=journal.id,
+        type="journal",
+        title=journal.title or f"Journal Entry - {journal.entry_date.isoformat()}",
+        description=journal.content_text[:200] if journal.content_text else None,
+        snippet=snippet,
+        url=f"/journals/{journal.id}",
+        created_at=journal.created_at,
+        updated_at=journal.updated_at,
+        metadata={
+            "entry_type": journal.entry_type,
+            "entry_date": journal.entry_date.isoformat(),
+            "scope": journal.scope,
+            "project_id": str(journal.project_id) if journal.project_id else None,
+        },
+        score=score,
+    )
+
+
+KEYWORD_BRANCHES = {
+    "project": _keyword_projects,
+    "task": _keyword_tasks,
+    "document": _keyword_documents,
+    "blocker": _keyword_blockers,
+    "review": _keyword_reviews,
+    "idea": _keyword_ideas,
+    "paper": _keyword_papers,
+    "collection": _keyword_collections,
+    "user": _keyword_users,
+    "journal": _keyword_journals,
+}
+
+SEMANTIC_BRANCHES = {
+    "task": _semantic_tasks,
+    "document": _semantic_documents,
+    "journal": _semantic_journals,
+    "paper": _semantic_papers,
+}
+
+
+# --- Concurrent Branch Executor ---
+
+async def _run_branch(
+    semaphore: asyncio.Semaphore,
+    branch: Any,
+    *args: Any,
+) -> list[SearchResultItem]:
+    """Run one search branch on its own pooled session.
+
+    Branches must not share an AsyncSession, so each borrows a connection
+    from async_session_factory only for the duration of its query.
+    """
+    async with semaphore, async_session_factory() as session:
+        return await branch(session, *args)
+
+
+async def _wait_until(
+    tasks: dict[str, asyncio.Task],
+    deadline: float,
+) -> tuple[dict[str, list[SearchResultItem]], list[str]]:
+    """Wait for branch tasks until the deadline.
+
+    Returns the results of branches that finished, keyed like ``tasks``, and
+    the keys of branches that timed out or failed. Pending tasks are cancelled.
+    """
+    if not tasks:
+        return {}, []
+    timeout = max(deadline - asyncio.get_running_loop().time(), 0)
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    completed: dict[str, list[SearchResultItem]] = {}
+    incomplete: list[str] = []
+    for key, task in tasks.items():
+        if task not in done or task.cancelled():
+            incomplete.append(key)
+        elif task.exception() is not None:
+            logger.warning(
+                "search_branch_failed",
+                branch=key,
+                error=str(task.exception()),
+            )
+            incomplete.append(key)
+        else:
+            completed[key] = task.result()
+    return completed, incomplete
+
+
 # --- Search Endpoints ---
 
 @router.get("", response_model=SearchResponse)
@@ -139,7 +992,10 @@ async def global_search(
         "hybrid",
         description="Search mode: hybrid (default, combines keyword + semantic), keyword (exact matches), semantic (conceptual similarity)"
     ),
-    sort_by: Literal["relevance", "created_at", "updated_at"] = Query("relevance"),
+    sort_by: SortBy = Query("relevance"),
+    cursor: str | None = Query(
+        None, description="Opaque keyset cursor from a previous response's next_cursor"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
@@ -154,31 +1010,50 @@ async def global_search(
     - hybrid (default): Combines keyword and semantic search with smart ranking.
       Keyword matches (especially title matches) rank highest, semantic matches
       fill in conceptually related results.
-    - keyword: Traditional SQL LIKE matching for exact terms.
+    - keyword: Full-text (search_vector) and trigram title matching.
     - semantic: Vector similarity search for conceptual matches (only for
       document, task, journal, paper - others fall back to keyword).
 
+    Ranking happens in PostgreSQL: every entity branch returns only its
+    bounded, pre-ranked top-k, and the merge step pages through those lists
+    with keyset cursors. `skip` only reaches the first MAX_BRANCH_CANDIDATES
+    results; page further with `cursor`. Hybrid relevance ranking draws on a
+    fixed pool of MAX_BRANCH_CANDIDATES candidates per type, and a page that
+    runs past the end of a truncated pool is marked `partial`.
+
+    Branches run concurrently, each on its own pooled session, within a
+    per-request deadline (settings.search_deadline_seconds). Branches that
+    miss it are dropped and the response is marked `partial`.
+
     Results are ranked by relevance and filtered by user's accessible content.
     """
-    search_term = f"%{q.lower()}%"
     results: dict[str, SearchResultItem] = {}  # keyed by "type:id" for deduplication
+    filters = {
+        "types": types,
+        "project_id": str(project_id) if project_id else None,
+        "created_after": created_after.isoformat() if created_after else None,
+        "created_before": created_before.isoformat() if created_before else None,
+        "mode": mode,
+    }
+    cursor_key = _decode_cursor(cursor) if cursor else None
+    if skip + limit > MAX_BRANCH_CANDIDATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"skip + limit may not exceed {MAX_BRANCH_CANDIDATES}; "
+                "use next_cursor to page further"
+            ),
+        )
 
     # Determine if we should run keyword and/or semantic search
     run_keyword = mode in ("hybrid", "keyword")
     run_semantic = mode in ("hybrid", "semantic")
 
-    # Get user's team memberships (includes personal teams)
-    team_result = await db.execute(
-        select(TeamMember.team_id).where(TeamMember.user_id == current_user.id)
-    )
-    user_team_ids = [row[0] for row in team_result.all()]
-
-    # Get user's organization memberships (for user search scoping)
-    org_result = await db.execute(
-        select(OrganizationMember.organization_id)
-        .where(OrganizationMember.user_id == current_user.id)
-    )
-    user_org_ids = [row[0] for row in org_result.all()]
+    # Team memberships (includes personal teams) and org memberships (for
+    # user search scoping), from the user's cached access set
+    access = await get_access_set(db, current_user.id)
+    user_team_ids = access.team_ids
+    user_org_ids = access.org_ids
 
     # Determine which types to search
     search_types = types or [
@@ -186,644 +1061,153 @@ async def global_search(
         "collection", "user", "journal", "blocker", "review"
     ]
 
-    # Get embedding for semantic search if needed
-    query_embedding = None
-    if run_semantic:
-        try:
-            embedding_service = get_embedding_service()
-            query_embedding = await embedding_service.generate_embedding(q)
-        except Exception as e:
-            logger.warning("Failed to get query embedding, falling back to keyword search", error=str(e))
-            if mode == "semantic":
-                # Pure semantic mode failed, return empty results
-                return SearchResponse(
-                    results=[],
-                    total=0,
-                    query=q,
-                    filters={
-                        "types": types,
-                        "project_id": str(project_id) if project_id else None,
-                        "created_after": created_after.isoformat() if created_after else None,
-                        "created_before": created_before.isoformat() if created_before else None,
-                        "mode": mode,
-                    },
-                    has_more=False,
-                )
-            # For hybrid mode, continue with keyword only
-            run_semantic = False
+    ctx = _SearchContext(
+        q=q,
+        q_lower=q.lower(),
+        tsquery=func.plainto_tsquery("english", q),
+        team_ids=user_team_ids,
+        org_ids=user_org_ids,
+        project_id=project_id,
+        created_after=created_after,
+        created_before=created_before,
+        sort_by=sort_by,
+        cursor_bound=cursor_key[0] if cursor_key else None,
+        # One extra row per branch lets us detect has_more without a COUNT
+        branch_limit=skip + limit + 1,
+    )
+
+    # Hybrid relevance ranks on the sum of keyword and semantic scores, which
+    # neither branch can bound by the cursor or cut to top-k on its own. For
+    # types both branches cover, every page draws on the same fixed candidate
+    # pool instead, so pages are slices of one ranking and never skip rows.
+    pooled_types: set[str] = set()
+    pooled_ctx = ctx
+    if mode == "hybrid" and sort_by == "relevance":
+        pooled_types = set(KEYWORD_BRANCHES) & set(SEMANTIC_BRANCHES)
+        pooled_ctx = replace(ctx, cursor_bound=None, branch_limit=MAX_BRANCH_CANDIDATES)
 
     # ============================================================
-    # KEYWORD SEARCH (for all entity types)
+    # FAN OUT BRANCHES CONCURRENTLY
     # ============================================================
+    # Keyword branches start immediately, overlapping the embedding call;
+    # semantic branches start as soon as the query embedding is available.
+    # Anything still running at the deadline is cancelled and the response
+    # is marked partial.
+
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.search_deadline_seconds
+    semaphore = asyncio.Semaphore(settings.search_branch_concurrency)
 
+    keyword_tasks: dict[str, asyncio.Task] = {}
     if run_keyword:
-        # Search Projects - use team membership for access control
-        if "project" in search_types and user_team_ids:
-            project_query = (
-                select(Project)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(Project.is_archived == False)
-                .where(
-                    or_(
-                        func.lower(Project.name).like(search_term),
-                        func.lower(Project.description).like(search_term),
-                    )
-                )
-            )
-            if created_after:
-                project_query = project_query.where(Project.created_at >= created_after)
-            if created_before:
-                project_query = project_query.where(Project.created_at <= created_before)
-
-            project_results = await db.execute(project_query)
-            for project in project_results.scalars().all():
-                score = _calculate_keyword_score(q, project.name, project.description)
-                item = SearchResultItem(
-                    id=project.id,
-                    type="project",
-                    title=project.name,
-                    description=project.description,
-                    snippet=_get_snippet(project.description, q) if project.description else None,
-                    url=f"/projects/{project.id}",
-                    created_at=project.created_at,
-                    updated_at=project.updated_at,
-                    metadata={
-                        "status": project.status,
-                        "scope": project.scope,
-                    },
-                    score=score,
+        keyword_tasks = {
+            entity_type: asyncio.create_task(
+                _run_branch(
+                    semaphore,
+                    KEYWORD_BRANCHES[entity_type],
+                    pooled_ctx if entity_type in pooled_types else ctx,
                 )
-                _merge_result(results, item, "keyword")
-
-        # Search Tasks - use team membership via project for access control
-        # Note: Task.description is JSONB (TipTap format), so we only search title
-        if "task" in search_types and user_team_ids:
-            task_query = (
-                select(Task)
-                .join(Project, Task.project_id == Project.id)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(func.lower(Task.title).like(search_term))
             )
-            if project_id:
-                task_query = task_query.where(Task.project_id == project_id)
-            if created_after:
-                task_query = task_query.where(Task.created_at >= created_after)
-            if created_before:
-                task_query = task_query.where(Task.created_at <= created_before)
-
-            task_results = await db.execute(task_query)
-            for task in task_results.scalars().all():
-                score = _calculate_keyword_score(q, task.title)
-                item = SearchResultItem(
-                    id=task.id,
-                    type="task",
-                    title=task.title,
-                    description=None,  # JSONB can't be displayed as string
-                    snippet=None,
-                    url=f"/projects/{task.project_id}?task={task.id}",
-                    created_at=task.created_at,
-                    updated_at=task.updated_at,
-                    metadata={
-                        "status": task.status,
-                        "priority": task.priority,
-                        "project_id": str(task.project_id),
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Documents - use team membership via project for access control
-        if "document" in search_types and user_team_ids:
-            doc_query = (
-                select(Document)
-                .join(Project, Document.project_id == Project.id)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(
-                    or_(
-                        func.lower(Document.title).like(search_term),
-                        func.lower(Document.content_text).like(search_term),
-                    )
-                )
-            )
-            if project_id:
-                doc_query = doc_query.where(Document.project_id == project_id)
-            if created_after:
-                doc_query = doc_query.where(Document.created_at >= created_after)
-            if created_before:
-                doc_query = doc_query.where(Document.created_at <= created_before)
-
-            doc_results = await db.execute(doc_query)
-            for doc in doc_results.scalars().all():
-                score = _calculate_keyword_score(q, doc.title, doc.content_text)
-                item = SearchResultItem(
-                    id=doc.id,
-                    type="document",
-                    title=doc.title,
-                    description=None,
-                    snippet=_get_snippet(doc.content_text, q) if doc.content_text else None,
-                    url=f"/documents/{doc.id}",
-                    created_at=doc.created_at,
-                    updated_at=doc.updated_at,
-                    metadata={
-                        "status": doc.status,
-                        "document_type": doc.document_type,
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Blockers - use team membership via project for access control
-        if "blocker" in search_types and user_team_ids:
-            blocker_query = (
-                select(Blocker)
-                .join(Project, Blocker.project_id == Project.id)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(func.lower(Blocker.title).like(search_term))
-            )
-            if project_id:
-                blocker_query = blocker_query.where(Blocker.project_id == project_id)
-            if created_after:
-                blocker_query = blocker_query.where(Blocker.created_at >= created_after)
-            if created_before:
-                blocker_query = blocker_query.where(Blocker.created_at <= created_before)
-
-            blocker_results = await db.execute(blocker_query)
-            for blocker in blocker_results.scalars().all():
-                score = _calculate_keyword_score(q, blocker.title)
-                item = SearchResultItem(
-                    id=blocker.id,
-                    type="blocker",
-                    title=blocker.title,
-                    description=None,  # JSONB can't be displayed as string
-                    snippet=None,
-                    url=f"/projects/{blocker.project_id}/blockers/{blocker.id}",
-                    created_at=blocker.created_at,
-                    updated_at=blocker.updated_at,
-                    metadata={
-                        "status": blocker.status,
-                        "priority": blocker.priority,
-                        "blocker_type": blocker.blocker_type,
-                        "impact_level": blocker.impact_level,
-                        "project_id": str(blocker.project_id),
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Reviews - use team membership via project for access control
-        if "review" in search_types and user_team_ids:
-            review_query = (
-                select(Review)
-                .join(Project, Review.project_id == Project.id)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(
-                    or_(
-                        func.lower(Review.title).like(search_term),
-                        func.lower(Review.description).like(search_term),
+            for entity_type in search_types
+            if entity_type in KEYWORD_BRANCHES
+        }
+
+    incomplete: list[str] = []
+    semantic_tasks: dict[str, asyncio.Task] = {}
+    semantic_types = [t for t in search_types if t in SEMANTIC_BRANCHES]
+    if run_semantic and semantic_types:
+        embedding_task = asyncio.create_task(get_embedding_service().generate_query_embedding(q))
+        embedded, embedding_missed = await _wait_until({"embedding": embedding_task}, deadline)
+        query_embedding = embedded.get("embedding")
+
+        if query_embedding:
+            semantic_tasks = {
+                entity_type: asyncio.create_task(
+                    _run_branch(
+                        semaphore,
+                        SEMANTIC_BRANCHES[entity_type],
+                        pooled_ctx if entity_type in pooled_types else ctx,
+                        query_embedding,
                     )
                 )
+                for entity_type in semantic_types
+            }
+        else:
+            logger.warning(
+                "Failed to get query embedding, falling back to keyword search",
+                timed_out=bool(embedding_missed) and not embedding_task.done(),
             )
-            if project_id:
-                review_query = review_query.where(Review.project_id == project_id)
-            if created_after:
-                review_query = review_query.where(Review.created_at >= created_after)
-            if created_before:
-                review_query = review_query.where(Review.created_at <= created_before)
-
-            review_results = await db.execute(review_query)
-            for review in review_results.scalars().all():
-                score = _calculate_keyword_score(q, review.title, review.description)
-                item = SearchResultItem(
-                    id=review.id,
-                    type="review",
-                    title=review.title,
-                    description=review.description[:200] if review.description else None,
-                    snippet=_get_snippet(review.description, q) if review.description else None,
-                    url=f"/reviews/{review.id}",
-                    created_at=review.created_at,
-                    updated_at=review.updated_at,
-                    metadata={
-                        "status": review.status,
-                        "priority": review.priority,
-                        "review_type": review.review_type,
-                        "project_id": str(review.project_id),
-                        "document_id": str(review.document_id),
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Ideas - these have organization_id directly
-        if "idea" in search_types and user_org_ids:
-            idea_query = (
-                select(Idea)
-                .where(Idea.organization_id.in_(user_org_ids))
-                .where(
-                    or_(
-                        func.lower(Idea.title).like(search_term),
-                        func.lower(Idea.content).like(search_term),
-                    )
-                )
-            )
-            if created_after:
-                idea_query = idea_query.where(Idea.created_at >= created_after)
-            if created_before:
-                idea_query = idea_query.where(Idea.created_at <= created_before)
-
-            idea_results = await db.execute(idea_query)
-            for idea in idea_results.scalars().all():
-                score = _calculate_keyword_score(q, idea.title or "", idea.content)
-                item = SearchResultItem(
-                    id=idea.id,
-                    type="idea",
-                    title=idea.title or idea.content[:100],  # Use content start if no title
-                    description=idea.content[:200] if idea.content else None,
-                    snippet=_get_snippet(idea.content, q) if idea.content else None,
-                    url=f"/ideas/{idea.id}",
-                    created_at=idea.created_at,
-                    updated_at=idea.updated_at,
-                    metadata={
-                        "status": idea.status,
-                        "source": idea.source,
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Papers - these have organization_id directly
-        # Note: Paper.authors is ARRAY type, can't use .like() - only search title and abstract
-        if "paper" in search_types and user_org_ids:
-            paper_query = (
-                select(Paper)
-                .where(Paper.organization_id.in_(user_org_ids))
-                .where(
-                    or_(
-                        func.lower(Paper.title).like(search_term),
-                        func.lower(Paper.abstract).like(search_term),
-                    )
-                )
-            )
-            if created_after:
-                paper_query = paper_query.where(Paper.created_at >= created_after)
-            if created_before:
-                paper_query = paper_query.where(Paper.created_at <= created_before)
-
-            paper_results = await db.execute(paper_query)
-            for paper in paper_results.scalars().all():
-                score = _calculate_keyword_score(q, paper.title, paper.abstract)
-                item = SearchResultItem(
-                    id=paper.id,
-                    type="paper",
-                    title=paper.title,
-                    description=", ".join(paper.authors) if paper.authors else None,
-                    snippet=_get_snippet(paper.abstract, q) if paper.abstract else None,
-                    url=f"/knowledge/papers/{paper.id}",
-                    created_at=paper.created_at,
-                    updated_at=paper.updated_at,
-                    metadata={
-                        "year": paper.publication_year,
-                        "journal": paper.journal,
-                        "doi": paper.doi,
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Collections - these have organization_id directly
-        if "collection" in search_types and user_org_ids:
-            coll_query = (
-                select(Collection)
-                .where(Collection.organization_id.in_(user_org_ids))
-                .where(
-                    or_(
-                        func.lower(Collection.name).like(search_term),
-                        func.lower(Collection.description).like(search_term),
-                    )
-                )
-            )
-            if created_after:
-                coll_query = coll_query.where(Collection.created_at >= created_after)
-            if created_before:
-                coll_query = coll_query.where(Collection.created_at <= created_before)
-
-            coll_results = await db.execute(coll_query)
-            for coll in coll_results.scalars().all():
-                score = _calculate_keyword_score(q, coll.name, coll.description)
-                item = SearchResultItem(
-                    id=coll.id,
-                    type="collection",
-                    title=coll.name,
-                    description=coll.description,
-                    snippet=_get_snippet(coll.description, q) if coll.description else None,
-                    url=f"/knowledge/collections/{coll.id}",
-                    created_at=coll.created_at,
-                    updated_at=coll.updated_at,
-                    metadata={
-                        "visibility": coll.visibility,
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Users - scoped to users in same organizations (security fix)
-        if "user" in search_types and user_org_ids:
-            # Get users who are members of organizations the current user belongs to
-            user_query = (
-                select(User)
-                .join(OrganizationMember, User.id == OrganizationMember.user_id)
-                .where(OrganizationMember.organization_id.in_(user_org_ids))
-                .where(
-                    or_(
-                        func.lower(User.email).like(search_term),
-                        func.lower(User.display_name).like(search_term),
-                    )
-                )
-                .distinct()  # User might be in multiple orgs
-            )
-
-            user_results = await db.execute(user_query)
-            for user in user_results.scalars().all():
-                score = _calculate_keyword_score(q, user.display_name or user.email, user.email)
-                item = SearchResultItem(
-                    id=user.id,
-                    type="user",
-                    title=user.display_name or user.email,
-                    description=user.email if user.display_name else None,
-                    snippet=None,
-                    url=f"/users/{user.id}",
-                    created_at=user.created_at,
-                    updated_at=user.updated_at,
-                    metadata={
-                        "avatar_url": user.avatar_url,
-                    },
-                    score=score,
-                )
-                _merge_result(results, item, "keyword")
-
-        # Search Journal Entries - these have organization_id directly
-        if "journal" in search_types and user_org_ids:
-            journal_query = (
-                select(JournalEntry)
-                .where(JournalEntry.organization_id.in_(user_org_ids))
-                .where(JournalEntry.is_archived == False)
-                .where(
-                    or_(
-                        func.lower(JournalEntry.title).like(search_term),
-                        func.lower(JournalEntry.content_text).like(search_term),
-                    )
-                )
-            )
-            if project_id:
-                journal_query = journal_query.where(JournalEntry.project_id == project_id)
-            if created_after:
-                journal_query = journal_query.where(JournalEntry.created_at >= created_after)
-            if created_before:
-                journal_query = journal_query.where(JournalEntry.created_at <= created_before)
-
-            journal_results = await db.execute(journal_query)
-            for journal in journal_results.scalars().all():
-                score = _calculate_keyword_score(
-                    q,
-                    journal.title or f"Journal Entry - {journal.entry_date.isoformat()}",
-                    journal.content_text
-                )
-                item = SearchResultItem(
-                    id=journal.id,
-                    type="journal",
-                    title=journal.title or f"Journal Entry - {journal.entry_date.isoformat()}",
-                    description=journal.content_text[:200] if journal.content_text else None,
-                    snippet=_get_snippet(journal.content_text, q) if journal.content_text else None,
-                    url=f"/journals/{journal.id}",
-                    created_at=journal.created_at,
-                    updated_at=journal.updated_at,
-                    metadata={
-                        "entry_type": journal.entry_type,
-                        "entry_date": journal.entry_date.isoformat(),
-                        "scope": journal.scope,
-                        "project_id": str(journal.project_id) if journal.project_id else None,
-                    },
-                    score=score,
+            incomplete.extend(f"semantic:{t}" for t in semantic_types)
+            if mode == "semantic":
+                # Pure semantic mode failed, return empty results
+                for task in keyword_tasks.values():
+                    task.cancel()
+                return SearchResponse(
+                    results=[],
+                    total=0,
+                    query=q,
+                    filters=filters,
+                    has_more=False,
+                    partial=True,
                 )
-                _merge_result(results, item, "keyword")
 
-    # ============================================================
-    # SEMANTIC SEARCH (for embeddable entities only)
-    # ============================================================
+    keyword_results, missed = await _wait_until(keyword_tasks, deadline)
+    incomplete.extend(f"keyword:{t}" for t in missed)
+    semantic_results, missed = await _wait_until(semantic_tasks, deadline)
+    incomplete.extend(f"semantic:{t}" for t in missed)
 
-    if run_semantic and query_embedding:
-        # Import pgvector operators
-        from pgvector.sqlalchemy import Vector
+    if incomplete:
+        logger.warning("search_partial_results", incomplete_branches=incomplete)
 
-        # Semantic search limit (we fetch more than needed for merging)
-        semantic_limit = min(limit * 2, 50)
-
-        # Search Tasks semantically
-        if "task" in search_types and user_team_ids:
-            # Use raw SQL for vector similarity search
-            task_semantic_query = (
-                select(
-                    Task,
-                    (1 - Task.embedding.cosine_distance(query_embedding)).label("similarity")
-                )
-                .join(Project, Task.project_id == Project.id)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(Task.embedding.isnot(None))
-                .order_by((1 - Task.embedding.cosine_distance(query_embedding)).desc())
-                .limit(semantic_limit)
-            )
-            if project_id:
-                task_semantic_query = task_semantic_query.where(Task.project_id == project_id)
-            if created_after:
-                task_semantic_query = task_semantic_query.where(Task.created_at >= created_after)
-            if created_before:
-                task_semantic_query = task_semantic_query.where(Task.created_at <= created_before)
-
-            task_semantic_results = await db.execute(task_semantic_query)
-            for row in task_semantic_results.all():
-                task = row[0]
-                similarity = row[1]
-                if similarity and similarity > 0.3:  # Minimum similarity threshold
-                    semantic_score = similarity * SCORE_SEMANTIC_MULTIPLIER
-                    item = SearchResultItem(
-                        id=task.id,
-                        type="task",
-                        title=task.title,
-                        description=None,
-                        snippet=None,
-                        url=f"/projects/{task.project_id}?task={task.id}",
-                        created_at=task.created_at,
-                        updated_at=task.updated_at,
-                        metadata={
-                            "status": task.status,
-                            "priority": task.priority,
-                            "project_id": str(task.project_id),
-                        },
-                        score=semantic_score,
-                    )
-                    _merge_result(results, item, "semantic")
-
-        # Search Documents semantically
-        if "document" in search_types and user_team_ids:
-            doc_semantic_query = (
-                select(
-                    Document,
-                    (1 - Document.embedding.cosine_distance(query_embedding)).label("similarity")
-                )
-                .join(Project, Document.project_id == Project.id)
-                .where(Project.team_id.in_(user_team_ids))
-                .where(Document.embedding.isnot(None))
-                .order_by((1 - Document.embedding.cosine_distance(query_embedding)).desc())
-                .limit(semantic_limit)
-            )
-            if project_id:
-                doc_semantic_query = doc_semantic_query.where(Document.project_id == project_id)
-            if created_after:
-                doc_semantic_query = doc_semantic_query.where(Document.created_at >= created_after)
-            if created_before:
-                doc_semantic_query = doc_semantic_query.where(Document.created_at <= created_before)
-
-            doc_semantic_results = await db.execute(doc_semantic_query)
-            for row in doc_semantic_results.all():
-                doc = row[0]
-                similarity = row[1]
-                if similarity and similarity > 0.3:
-                    semantic_score = similarity * SCORE_SEMANTIC_MULTIPLIER
-                    item = SearchResultItem(
-                        id=doc.id,
-                        type="document",
-                        title=doc.title,
-                        description=None,
-                        snippet=doc.content_text[:150] + "..." if doc.content_text and len(doc.content_text) > 150 else doc.content_text,
-                        url=f"/documents/{doc.id}",
-                        created_at=doc.created_at,
-                        updated_at=doc.updated_at,
-                        metadata={
-                            "status": doc.status,
-                            "document_type": doc.document_type,
-                        },
-                        score=semantic_score,
-                    )
-                    _merge_result(results, item, "semantic")
-
-        # Search Journal Entries semantically
-        if "journal" in search_types and user_org_ids:
-            journal_semantic_query = (
-                select(
-                    JournalEntry,
-                    (1 - JournalEntry.embedding.cosine_distance(query_embedding)).label("similarity")
-                )
-                .where(JournalEntry.organization_id.in_(user_org_ids))
-                .where(JournalEntry.is_archived == False)
-                .where(JournalEntry.embedding.isnot(None))
-                .order_by((1 - JournalEntry.embedding.cosine_distance(query_embedding)).desc())
-                .limit(semantic_limit)
-            )
-            if project_id:
-                journal_semantic_query = journal_semantic_query.where(JournalEntry.project_id == project_id)
-            if created_after:
-                journal_semantic_query = journal_semantic_query.where(JournalEntry.created_at >= created_after)
-            if created_before:
-                journal_semantic_query = journal_semantic_query.where(JournalEntry.created_at <= created_before)
-
-            journal_semantic_results = await db.execute(journal_semantic_query)
-            for row in journal_semantic_results.all():
-                journal = row[0]
-                similarity = row[1]
-                if similarity and similarity > 0.3:
-                    semantic_score = similarity * SCORE_SEMANTIC_MULTIPLIER
-                    item = SearchResultItem(
-                        id=journal.id,
-                        type="journal",
-                        title=journal.title or f"Journal Entry - {journal.entry_date.isoformat()}",
-                        description=journal.content_text[:200] if journal.content_text else None,
-                        snippet=journal.content_text[:150] + "..." if journal.content_text and len(journal.content_text) > 150 else journal.content_text,
-                        url=f"/journals/{journal.id}",
-                        created_at=journal.created_at,
-                        updated_at=journal.updated_at,
-                        metadata={
-                            "entry_type": journal.entry_type,
-                            "entry_date": journal.entry_date.isoformat(),
-                            "scope": journal.scope,
-                            "project_id": str(journal.project_id) if journal.project_id else None,
-                        },
-                        score=semantic_score,
-                    )
-                    _merge_result(results, item, "semantic")
-
-        # Search Papers semantically
-        if "paper" in search_types and user_org_ids:
-            paper_semantic_query = (
-                select(
-                    Paper,
-                    (1 - Paper.embedding.cosine_distance(query_embedding)).label("similarity")
-                )
-                .where(Paper.organization_id.in_(user_org_ids))
-                .where(Paper.embedding.isnot(None))
-                .order_by((1 - Paper.embedding.cosine_distance(query_embedding)).desc())
-                .limit(semantic_limit)
-            )
-            if created_after:
-                paper_semantic_query = paper_semantic_query.where(Paper.created_at >= created_after)
-            if created_before:
-                paper_semantic_query = paper_semantic_query.where(Paper.created_at <= created_before)
-
-            paper_semantic_results = await db.execute(paper_semantic_query)
-            for row in paper_semantic_results.all():
-                paper = row[0]
-                similarity = row[1]
-                if similarity and similarity > 0.3:
-                    semantic_score = similarity * SCORE_SEMANTIC_MULTIPLIER
-                    item = SearchResultItem(
-                        id=paper.id,
-                        type="paper",
-                        title=paper.title,
-                        description=", ".join(paper.authors) if paper.authors else None,
-                        snippet=paper.abstract[:150] + "..." if paper.abstract and len(paper.abstract) > 150 else paper.abstract,
-                        url=f"/knowledge/papers/{paper.id}",
-                        created_at=paper.created_at,
-                        updated_at=paper.updated_at,
-                        metadata={
-                            "year": paper.publication_year,
-                            "journal": paper.journal,
-                            "doi": paper.doi,
-                        },
-                        score=semantic_score,
-                    )
-                    _merge_result(results, item, "semantic")
+    # Merge in a fixed order (keyword first, in search_types order) so
+    # duplicate handling is deterministic regardless of completion order.
+    for entity_type in search_types:
+        for item in keyword_results.get(entity_type, []):
+            _merge_result(results, item, "keyword")
+    for entity_type in search_types:
+        for item in semantic_results.get(entity_type, []):
+            _merge_result(results, item, "semantic")
 
     # ============================================================
-    # SORT AND PAGINATE RESULTS
+    # MERGE BOUNDED BRANCHES AND PAGINATE
     # ============================================================
 
-    # Convert dict to list for sorting
-    results_list = list(results.values())
+    # Sort by the requested key; relevance ties break on created_at, then a
+    # stable (type, id) suffix so keyset cursors are unambiguous.
+    ranked = sorted(
+        results.values(),
+        key=lambda item: _sort_key(item, sort_by),
+        reverse=True,
+    )
+    if cursor_key is not None:
+        ranked = [item for item in ranked if _sort_key(item, sort_by) < cursor_key]
 
-    # Sort results
-    if sort_by == "created_at":
-        results_list.sort(key=lambda x: x.created_at, reverse=True)
-    elif sort_by == "updated_at":
-        results_list.sort(key=lambda x: x.updated_at or x.created_at, reverse=True)
-    else:  # relevance - use calculated scores
-        # Sort by score (descending), then by created_at (descending) as tiebreaker
-        results_list.sort(key=lambda x: (x.score or 0, x.created_at), reverse=True)
+    paginated_results = ranked[skip:skip + limit]
+    has_more = skip + len(paginated_results) < len(ranked)
 
-    # Pagination
-    total = len(results_list)
-    paginated_results = results_list[skip:skip + limit]
-    has_more = skip + len(paginated_results) < total
+    # A full pool may have cut off lower-ranked matches the pool can't reach
+    pool_exhausted = not has_more and any(
+        len(branch_results.get(entity_type, [])) >= MAX_BRANCH_CANDIDATES
+        for branch_results in (keyword_results, semantic_results)
+        for entity_type in pooled_types
+    )
+    if pool_exhausted:
+        logger.info("search_candidate_pool_exhausted", query_length=len(q))
+    next_cursor = (
+        _encode_cursor(_sort_key(paginated_results[-1], sort_by))
+        if has_more and paginated_results
+        else None
+    )
 
     return SearchResponse(
         results=paginated_results,
-        total=total,
+        total=len(ranked),
         query=q,
-        filters={
-            "types": types,
-            "project_id": str(project_id) if project_id else None,
-            "created_after": created_after.isoformat() if created_after else None,
-            "created_before": created_before.isoformat() if created_before else None,
-            "mode": mode,
-        },
+        filters=filters,
         has_more=has_more,
+        next_cursor=next_cursor,
+        partial=bool(incomplete) or pool_exhausted,
     )
 
 
@@ -843,18 +1227,10 @@ async def search_suggestions(
     search_term = f"{q.lower()}%"
     suggestions: list[SearchSuggestion] = []
 
-    # Get user's team memberships (includes personal teams)
-    team_result = await db.execute(
-        select(TeamMember.team_id).where(TeamMember.user_id == current_user.id)
-    )
-    user_team_ids = [row[0] for row in team_result.all()]
-
-    # Get user's organization memberships
-    org_result = await db.execute(
-        select(OrganizationMember.organization_id)
-        .where(OrganizationMember.user_id == current_user.id)
-    )
-    user_org_ids = [row[0] for row in org_result.all()]
+    # Team (includes personal teams) and org memberships, from the cache
+    access = await get_access_set(db, current_user.id)
+    user_team_ids = access.team_ids
+    user_org_ids = access.org_ids
 
     # Get project name suggestions - use team membership
     if user_team_ids:
@@ -1040,3 +1416,10 @@ def _get_snippet(text: str | None, query: str, max_length: int = 150) -> str | N
         snippet = snippet + "..."
 
     return snippet
+
+
+def _leading_snippet(text: str | None, max_length: int = 150) -> str | None:
+    """Return the start of a text as a snippet (for semantic matches)."""
+    if text and len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
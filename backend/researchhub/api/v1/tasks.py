@@ -6,9 +6,9 @@ from typing import Any
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field, field_validator, model_validator
-from sqlalchemy import select, func, or_, and_, update
+from sqlalchemy import select, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -22,7 +22,10 @@ from researchhub.services.task_document import TaskDocumentService
 from researchhub.services.custom_field import CustomFieldService
 from researchhub.services.workflow import WorkflowService
 from researchhub.services.notification import NotificationService
-from researchhub.tasks import auto_review_for_review_task, generate_embedding
+from researchhub.services.embedding_queue import enqueue_embedding
+from researchhub.services.pagination import TOTAL_MODE_PATTERN, paginate
+from researchhub.services import task_board, task_rank
+from researchhub.tasks import auto_review_for_review_task, rebalance_task_ranks
 from researchhub.utils.tiptap import extract_plain_text
 
 router = APIRouter()
@@ -299,6 +302,8 @@ class TaskResponse(BaseModel):
     updated_at: datetime
     comment_count: int = 0
     subtask_count: int = 0
+    # Plain-text start of the description, set on kanban board cards
+    description_preview: str | None = None
     # Creator info
     created_by_name: str | None = None
     created_by_email: str | None = None
@@ -348,10 +353,12 @@ class TaskListResponse(BaseModel):
     """Paginated task list response."""
 
     items: list[TaskResponse]
-    total: int
+    total: int | None
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    has_more: bool
+    next_cursor: str | None = None
 
 
 class TasksByStatusResponse(BaseModel):
@@ -374,15 +381,7 @@ async def create_task(
     # Verify project access
     await check_project_access(db, task_data.project_id, current_user.id, "member")
 
-    # Get max position for the status column
-    max_pos_result = await db.execute(
-        select(func.max(Task.position)).where(
-            Task.project_id == task_data.project_id,
-            Task.status == task_data.status,
-        )
-    )
-    max_position = max_pos_result.scalar() or 0
-
+    # The rank hook appends the task to its status column on flush
     task = Task(
         title=task_data.title,
         description=task_data.description,
@@ -397,7 +396,6 @@ async def create_task(
         tags=task_data.tags,
         estimated_hours=task_data.estimated_hours,
         created_by_id=current_user.id,
-        position=max_position + 1,
     )
     db.add(task)
     await db.commit()
@@ -414,7 +412,7 @@ async def create_task(
 
     # Generate embedding for semantic search
     try:
-        generate_embedding.delay(
+        await enqueue_embedding(
             entity_type="task",
             entity_id=str(task.id),
         )
@@ -435,13 +433,20 @@ async def list_tasks(
     project_id: UUID | None = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    total: str = Query("exact", pattern=TOTAL_MODE_PATTERN),
     status: str | None = Query(None, pattern="^(idea|todo|in_progress|in_review|done)$"),
     priority: str | None = Query(None, pattern="^(low|medium|high|urgent)$"),
     assignee_id: UUID | None = None,
     search: str | None = Query(None, max_length=100),
     include_completed: bool = Query(True),
 ) -> dict:
-    """List tasks with filtering."""
+    """List tasks with filtering.
+
+    Pass ``next_cursor`` back as ``cursor`` for the next page; ``page`` is
+    still honored when no cursor is given. ``total`` defaults to an exact
+    count for the ``pages`` field, use ``none`` or ``estimate`` to skip it.
+    """
     if not project_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -479,43 +484,28 @@ async def list_tasks(
             )
         )
 
-    # Get total count (without options for performance)
-    count_base = select(Task).where(Task.project_id == project_id)
-    if status:
-        count_base = count_base.where(Task.status == status)
-    elif not include_completed:
-        count_base = count_base.where(Task.status != "done")
-    if priority:
-        count_base = count_base.where(Task.priority == priority)
-    if assignee_id:
-        count_base = count_base.where(Task.assignee_id == assignee_id)
-    if search:
-        count_base = count_base.where(
-            or_(
-                Task.title.ilike(f"%{search}%"),
-                Task.description.ilike(f"%{search}%"),
-            )
-        )
-    count_query = select(func.count()).select_from(count_base.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination and ordering
-    query = query.order_by(Task.position.asc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    tasks = list(result.scalars().all())
-
-    # Convert tasks to response dicts with assignments
-    task_items = [_task_to_response(t) for t in tasks]
+    result = await paginate(
+        db,
+        query,
+        order_by=[Task.rank.asc(), Task.id.asc()],
+        limit=page_size,
+        cursor=cursor,
+        offset=(page - 1) * page_size,
+        total=total,
+    )
 
     return {
-        "items": task_items,
-        "total": total,
+        "items": [_task_to_response(t) for t in result.items],
+        "total": result.total,
         "page": page,
         "page_size": page_size,
-        "pages": (total + page_size - 1) // page_size,
+        "pages": (
+            (result.total + page_size - 1) // page_size
+            if result.total is not None
+            else None
+        ),
+        "has_more": result.has_more,
+        "next_cursor": result.next_cursor,
     }
 
 
@@ -524,81 +514,12 @@ async def get_tasks_by_status(
     project_id: UUID,
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db_session),
-) -> dict:
+    include_description: bool = Query(False, description="Include full task descriptions"),
+    if_none_match: str | None = Header(None),
+) -> Response | dict:
     """Get tasks grouped by status for kanban view."""
-    # Verify project access
-    project = await check_project_access(db, project_id, current_user.id)
-
-    # Optimized query: only load relationships needed for kanban cards
-    # - assignments.user: needed for assignee avatars
-    # - created_by: needed for creator info
-    # - Skip project (we already have it), comments (just need count), subtasks (just need count)
-    result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.assignments).selectinload(TaskAssignment.user),
-            selectinload(Task.created_by),
-        )
-        .where(Task.project_id == project_id, Task.parent_task_id.is_(None))
-        .order_by(Task.position.asc())
-    )
-    tasks = list(result.scalars().all())
-
-    # Get comment and subtask counts efficiently in bulk
-    if tasks:
-        task_ids = [t.id for t in tasks]
-
-        # Get comment counts
-        from researchhub.models.project import TaskComment
-        comment_counts_result = await db.execute(
-            select(TaskComment.task_id, func.count(TaskComment.id))
-            .where(TaskComment.task_id.in_(task_ids))
-            .group_by(TaskComment.task_id)
-        )
-        comment_counts = dict(comment_counts_result.all())
-
-        # Get subtask counts
-        subtask_counts_result = await db.execute(
-            select(Task.parent_task_id, func.count(Task.id))
-            .where(Task.parent_task_id.in_(task_ids))
-            .group_by(Task.parent_task_id)
-        )
-        subtask_counts = dict(subtask_counts_result.all())
-    else:
-        comment_counts = {}
-        subtask_counts = {}
-
-    # Convert tasks to response dicts with counts
-    task_responses = [
-        _task_to_response_light(t, project.name, comment_counts.get(t.id, 0), subtask_counts.get(t.id, 0))
-        for t in tasks
-    ]
-
-    return {
-        "idea": [t for t in task_responses if t["status"] == "idea"],
-        "todo": [t for t in task_responses if t["status"] == "todo"],
-        "in_progress": [t for t in task_responses if t["status"] == "in_progress"],
-        "in_review": [t for t in task_responses if t["status"] == "in_review"],
-        "done": [t for t in task_responses if t["status"] == "done"],
-    }
-
-
-async def _get_descendant_project_ids(db: AsyncSession, project_id: UUID) -> list[UUID]:
-    """Recursively get all descendant project IDs for a given project."""
-    all_ids = [project_id]
-
-    # Iterative approach to avoid deep recursion
-    ids_to_check = [project_id]
-    while ids_to_check:
-        current_id = ids_to_check.pop()
-        result = await db.execute(
-            select(Project.id).where(Project.parent_id == current_id)
-        )
-        child_ids = list(result.scalars().all())
-        all_ids.extend(child_ids)
-        ids_to_check.extend(child_ids)
-
-    return all_ids
+    await check_project_access(db, project_id, current_user.id)
+    return await _board_response(db, project_id, False, include_description, if_none_match)
 
 
 @router.get("/by-status-aggregated", response_model=TasksByStatusResponse)
@@ -607,62 +528,12 @@ async def get_tasks_by_status_aggregated(
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db_session),
     include_children: bool = Query(False, description="Include tasks from child projects"),
-) -> dict:
+    include_description: bool = Query(False, description="Include full task descriptions"),
+    if_none_match: str | None = Header(None),
+) -> Response | dict:
     """Get tasks grouped by status, optionally including tasks from child projects."""
-    # Verify project access
     await check_project_access(db, project_id, current_user.id)
-
-    # Common options for loading relationships
-    task_options = [
-        selectinload(Task.assignments).selectinload(TaskAssignment.user),
-        selectinload(Task.project),
-        selectinload(Task.comments),
-        selectinload(Task.subtasks),
-        selectinload(Task.created_by),
-    ]
-
-    if include_children:
-        # Get all descendant project IDs
-        project_ids = await _get_descendant_project_ids(db, project_id)
-
-        # Fetch projects to get names
-        projects_result = await db.execute(
-            select(Project).where(Project.id.in_(project_ids))
-        )
-        projects = {p.id: p.name for p in projects_result.scalars().all()}
-
-        result = await db.execute(
-            select(Task)
-            .options(*task_options)
-            .where(Task.project_id.in_(project_ids), Task.parent_task_id.is_(None))
-            .order_by(Task.project_id, Task.position.asc())
-        )
-        tasks = list(result.scalars().all())
-
-        # Convert tasks to response dicts with project_name for child projects
-        task_responses = []
-        for t in tasks:
-            response = _task_to_response(t)
-            if t.project_id != project_id:
-                response["project_name"] = projects.get(t.project_id)
-            task_responses.append(response)
-    else:
-        result = await db.execute(
-            select(Task)
-            .options(*task_options)
-            .where(Task.project_id == project_id, Task.parent_task_id.is_(None))
-            .order_by(Task.position.asc())
-        )
-        tasks = list(result.scalars().all())
-        task_responses = [_task_to_response(t) for t in tasks]
-
-    return {
-        "idea": [t for t in task_responses if t["status"] == "idea"],
-        "todo": [t for t in task_responses if t["status"] == "todo"],
-        "in_progress": [t for t in task_responses if t["status"] == "in_progress"],
-        "in_review": [t for t in task_responses if t["status"] == "in_review"],
-        "done": [t for t in task_responses if t["status"] == "done"],
-    }
+    return await _board_response(db, project_id, include_children, include_description, if_none_match)
 
 
 # =========================================================================
@@ -730,46 +601,22 @@ def _task_to_response(task: Task) -> dict:
     }
 
 
-def _task_to_response_light(
-    task: Task,
-    project_name: str | None,
-    comment_count: int,
-    subtask_count: int,
-) -> dict:
-    """Convert task to response dict with pre-computed counts (optimized for kanban)."""
-    return {
-        "id": task.id,
-        "title": task.title,
-        "description": task.description,
-        "status": task.status,
-        "priority": task.priority,
-        "task_type": task.task_type,
-        "project_id": task.project_id,
-        "project_name": project_name,
-        "assignee_id": task.assignee_id,
-        "created_by_id": task.created_by_id,
-        "created_by_name": task.created_by.display_name if hasattr(task, "created_by") and task.created_by else None,
-        "created_by_email": task.created_by.email if hasattr(task, "created_by") and task.created_by else None,
-        "due_date": task.due_date,
-        "completed_at": task.completed_at,
-        "position": task.position,
-        "estimated_hours": task.estimated_hours,
-        "actual_hours": task.actual_hours,
-        "parent_task_id": task.parent_task_id,
-        "tags": task.tags or [],
-        "created_at": task.created_at,
-        "updated_at": task.updated_at,
-        "comment_count": comment_count,
-        "subtask_count": subtask_count,
-        "vote_count": task.vote_count if hasattr(task, "vote_count") else 0,
-        "user_voted": False,
-        "impact_score": task.impact_score if hasattr(task, "impact_score") else None,
-        "effort_score": task.effort_score if hasattr(task, "effort_score") else None,
-        "assignments": [
-            _assignment_to_response(a)
-            for a in (task.assignments if hasattr(task, "assignments") and task.assignments else [])
-        ],
-    }
+async def _board_response(
+    db: AsyncSession,
+    project_id: UUID,
+    include_children: bool,
+    include_description: bool,
+    if_none_match: str | None,
+) -> Response | dict:
+    """Serve a board: cached and ETag-validated unless descriptions are requested."""
+    if include_description:
+        return await task_board.load_board(db, project_id, include_children, include_description=True)
+
+    snapshot = await task_board.get_board_snapshot(db, project_id, include_children)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache"}
+    if task_board.etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 
 # =========================================================================
@@ -918,7 +765,7 @@ async def update_task(
     # Regenerate embedding if title or description changed
     if "title" in update_data or "description" in update_data:
         try:
-            generate_embedding.delay(
+            await enqueue_embedding(
                 entity_type="task",
                 entity_id=str(task_id),
             )
@@ -992,9 +839,16 @@ async def move_task(
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db_session),
     new_status: str = Query(..., pattern="^(idea|todo|in_progress|in_review|done)$"),
-    new_position: int = Query(..., ge=0),
+    new_position: int | None = Query(None, ge=0),
+    after_id: UUID | None = Query(None, description="Task to place this one below"),
+    before_id: UUID | None = Query(None, description="Task to place this one above"),
 ) -> Task:
-    """Move a task to a different status column and/or position."""
+    """Move a task to a different status column and/or position.
+
+    The place is given by neighbor ids or by the index in the target
+    column; with neither the task goes to the end. Only the moved task is
+    written: it gets a rank key between its new neighbors.
+    """
     result = await db.execute(select(Task).where(Task.id == task_id))
     task = result.scalar_one_or_none()
 
@@ -1008,35 +862,25 @@ async def move_task(
     await check_project_access(db, task.project_id, current_user.id, "member")
 
     old_status = task.status
-    old_position = task.position
-
-    # Update positions in old column (shift down)
-    if old_status != new_status:
-        await db.execute(
-            update(Task)
-            .where(
-                Task.project_id == task.project_id,
-                Task.status == old_status,
-                Task.position > old_position,
-            )
-            .values(position=Task.position - 1)
-        )
 
-    # Update positions in new column (shift up)
-    await db.execute(
-        update(Task)
-        .where(
-            Task.project_id == task.project_id,
-            Task.status == new_status,
-            Task.position >= new_position,
-            Task.id != task_id,
+    try:
+        rank = await task_rank.rank_for_move(
+            db,
+            task,
+            new_status,
+            after_id=after_id,
+            before_id=before_id,
+            position=new_position,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-        .values(position=Task.position + 1)
-    )
 
     # Update task
     task.status = new_status
-    task.position = new_position
+    task.rank = rank
 
     # Handle completion status
     if new_status == "done" and old_status != "done":
@@ -1045,6 +889,14 @@ async def move_task(
         task.completed_at = None
 
     await db.commit()
+
+    if task_rank.needs_rebalance(rank):
+        try:
+            rebalance_task_ranks.delay(project_id=str(task.project_id), status=new_status)
+        except Exception as e:
+            # Long keys still order correctly; the next move retries
+            logger.warning("Rank rebalance trigger failed", task_id=str(task_id), error=str(e))
+
     # Re-query with fresh data (including updated_at) and created_by relationship
     stmt = select(Task).options(selectinload(Task.created_by)).where(Task.id == task_id)
     result = await db.execute(stmt)
@@ -1585,18 +1437,17 @@ async def assign_users_to_task(
     # Send notifications to assigned users
     if project and project.team and project.team.organization_id:
         notification_service = NotificationService(db)
-        for user_id in assignment_data.user_ids:
-            await notification_service.notify(
-                user_id=user_id,
-                notification_type="task_assigned",
-                title=f"You were assigned to: {task.title}",
-                message=f"You have been assigned to the task '{task.title}'",
-                organization_id=project.team.organization_id,
-                target_type="task",
-                target_id=task_id,
-                target_url=f"/projects/{task.project_id}/tasks/{task_id}",
-                sender_id=current_user.id,
-            )
+        await notification_service.notify_many(
+            user_ids=assignment_data.user_ids,
+            notification_type="task_assigned",
+            title=f"You were assigned to: {task.title}",
+            message=f"You have been assigned to the task '{task.title}'",
+            organization_id=project.team.organization_id,
+            target_type="task",
+            target_id=task_id,
+            target_url=f"/projects/{task.project_id}/tasks/{task_id}",
+            sender_id=current_user.id,
+        )
 
     # Reload with user info
     loaded = await service.get_task_assignments(task_id, include_user=True)
@@ -2708,18 +2559,8 @@ async def convert_idea_to_task(
     # Verify project access
     await check_project_access(db, task.project_id, current_user.id, "member")
 
-    # Get max position for target status
-    max_pos_result = await db.execute(
-        select(func.max(Task.position)).where(
-            Task.project_id == task.project_id,
-            Task.status == convert_data.target_status,
-        )
-    )
-    max_position = max_pos_result.scalar() or 0
-
-    # Update task
+    # Update task (the rank hook appends it to the target column)
     task.status = convert_data.target_status
-    task.position = max_position + 1
     if convert_data.assignee_id:
         task.assignee_id = convert_data.assignee_id
     if convert_data.due_date:
@@ -2870,7 +2711,7 @@ async def get_task_attention_details(
 
     Used for hover card display with summaries of blockers and recent comments.
     """
-    from researchhub.models.collaboration import CommentRead
+    from researchhub.services import comment_reads
 
     # Get task
     result = await db.execute(select(Task).where(Task.id == task_id))
@@ -2916,40 +2757,17 @@ async def get_task_attention_details(
     comment_result = await db.execute(comment_query)
     comment_rows = comment_result.all()
 
-    # Get total comment count
-    count_result = await db.execute(
-        select(func.count(TaskComment.id)).where(TaskComment.task_id == task_id)
-    )
-    total_comments = count_result.scalar() or 0
-
-    # Get read status for these comments
-    comment_ids = [row[0].id for row in comment_rows]
-    read_result = await db.execute(
-        select(CommentRead.comment_id)
-        .where(
-            CommentRead.comment_type == "task",
-            CommentRead.comment_id.in_(comment_ids) if comment_ids else False,
-            CommentRead.user_id == current_user.id,
-        )
-    )
-    read_comment_ids = {row[0] for row in read_result.all()}
-
-    # Calculate unread count (excluding user's own comments)
-    unread_count_result = await db.execute(
-        select(func.count(TaskComment.id))
-        .where(
-            TaskComment.task_id == task_id,
-            TaskComment.user_id != current_user.id,
-            ~TaskComment.id.in_(
-                select(CommentRead.comment_id)
-                .where(
-                    CommentRead.comment_type == "task",
-                    CommentRead.user_id == current_user.id,
-                )
-            ),
-        )
-    )
-    unread_comments = unread_count_result.scalar() or 0
+    # Total and unread comment counts (excluding user's own comments)
+    counts = await comment_reads.unread_counts(db, current_user.id, "task", [task_id])
+    thread = counts.get(task_id)
+    total_comments = thread.total_comments if thread else 0
+    unread_comments = thread.unread_count if thread else 0
+
+    # Get read status for the recent comments
+    read_state = await comment_reads.read_state(
+        db, current_user.id, "task", [row[0].id for row in comment_rows]
+    ) if comment_rows else {}
+    read_comment_ids = {comment_id for comment_id, read_at in read_state.items() if read_at}
 
     return TaskAttentionDetails(
         task_id=task.id,
@@ -39,6 +39,12 @@ class Settings(BaseSettings):
     # Redis
     redis_url: RedisDsn = Field(default="redis://localhost:6379/0")
     redis_cache_ttl: int = 3600  # 1 hour default
+    redis_socket_timeout: float = 0.5  # Keep cache lookups from stalling requests
+    # Per-user project access sets (services/access_cache.py)
+    access_cache_max_entries: int = 10000
+    access_cache_ttl_seconds: int = 300
+    # Kanban board snapshots (services/task_board.py)
+    task_board_cache_ttl_seconds: int = 600
 
     # Google OAuth Authentication
     google_client_id: str = ""
@@ -65,6 +71,24 @@ class Settings(BaseSettings):
     azure_openai_deployment: str = "gpt-4"
     gemini_api_key: SecretStr = SecretStr("")
     gemini_model: str = "gemini-3-flash-preview"
+    # Max query tools the assistant runs at once per turn (one pooled DB session each)
+    assistant_tool_concurrency: int = 4
+    # Per-conversation memo of query tool results (ai/assistant/memo.py)
+    assistant_tool_memo_ttl_seconds: int = 900
+    # Streamed responses (utils/sse.py): text deltas are coalesced into
+    # frames of at most sse_max_frame_chars, sent at least every
+    # sse_flush_interval_ms; idle streams get a comment every
+    # sse_heartbeat_seconds
+    sse_flush_interval_ms: int = 50
+    sse_max_frame_chars: int = 4096
+    sse_heartbeat_seconds: int = 15
+    # Events buffered for a slow client before the producer is paused
+    sse_max_pending_events: int = 256
+    # One in N frames is logged at debug level
+    sse_log_sample_every: int = 100
+    # Compiled per-organization prompt template overrides (ai/template_registry.py)
+    ai_template_cache_max_orgs: int = 1024
+    ai_template_cache_ttl_seconds: int = 300
 
     # Embeddings
     openai_api_key: SecretStr = SecretStr("")
@@ -72,6 +96,50 @@ class Settings(BaseSettings):
     embedding_dimensions: int = 1536
     # Azure embedding deployment (if using Azure OpenAI for embeddings)
     azure_embedding_deployment: str = "text-embedding-3-small"
+    # Query embedding cache (in-process LRU + Redis)
+    embedding_cache_max_entries: int = 2048
+    embedding_cache_ttl_seconds: int = 600
+    embedding_cache_redis_ttl_seconds: int = 86400
+    # Passage-level embeddings for long documents and papers
+    embedding_chunk_max_tokens: int = 512
+    embedding_batch_max_tokens: int = 100_000  # Per embeddings API request
+    semantic_chunk_pooling: Literal["max", "mean"] = "max"
+    # Relevant-passage retrieval for document prompts (services/document_retrieval.py)
+    document_chat_context_tokens: int = 4000
+    auto_review_context_tokens: int = 8000
+    document_passage_cache_max_documents: int = 256
+    # Embedding job queue (coalesces saves per entity, drained by embedding_worker)
+    embedding_queue_debounce_seconds: float = 5.0
+    embedding_queue_max_delay_seconds: float = 60.0  # Cap for continuously edited entities
+    embedding_queue_batch_size: int = 100  # Jobs claimed per worker iteration
+    embedding_queue_poll_seconds: float = 1.0
+    embedding_queue_retry_seconds: float = 30.0  # First retry; doubles per failed attempt
+    embedding_queue_retry_max_seconds: float = 3600.0
+    embedding_queue_max_attempts: int = 6  # Then the job moves to the dead-letter set
+    embedding_worker_metrics_port: int = 9101
+
+    # Global search
+    search_deadline_seconds: float = 3.0  # Per-request budget; slow branches are dropped
+    search_branch_concurrency: int = 8  # Max pooled sessions one search request may hold
+
+    # Analytics
+    analytics_rollup_interval_seconds: int = 300  # Beat schedule for refresh_analytics_rollups
+    analytics_rollup_lookback_days: int = 1  # Closed days recomputed per refresh, besides today
+    analytics_dashboard_cache_ttl_seconds: int = 60  # Org-wide dashboard sections, 0 disables
+
+    # Notifications (services/notification.py)
+    notification_preference_cache_ttl_seconds: int = 30
+    notification_preference_cache_max_users: int = 10_000
+    notification_fanout_inline_max: int = 500  # Larger fan-outs run in fan_out_notifications
+
+    # Exports (services/exports.py)
+    export_stream_batch_size: int = 1000  # Rows per server-side cursor fetch
+    export_pdf_workers: int = 2  # Rendering processes per API process
+    export_pdf_inline_max_rows: int = 5000  # Larger PDF exports render as a Celery job
+    export_artifact_dir: str = "/tmp/researchhub-exports"  # Shared by API and workers
+    export_artifact_ttl_seconds: int = 86400  # Since last download
+    export_job_ttl_seconds: int = 86400
+    export_job_time_limit_seconds: int = 1800
 
     # Feature Flags
     feature_ai_enabled: bool = True
@@ -85,10 +153,15 @@ class Settings(BaseSettings):
     # Celery
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
+    # Per worker process; each process runs one task at a time on a persistent loop
+    celery_database_pool_size: int = 2
+    celery_database_max_overflow: int = 2
 
     # Monitoring
     sentry_dsn: str = ""
-    prometheus_enabled: bool = True
+    # Serves /metrics on the API port; set a token so only the scraper can read it
+    prometheus_enabled: bool = False
+    prometheus_token: SecretStr = SecretStr("")
 
 
 @lru_cache
@@ -98,6 +98,13 @@ class EmbeddableMixin:
         nullable=True,
     )
 
+    # SHA-256 of the text the embedding was generated from, so saves that
+    # don't change embeddable content (status, position, ...) can be skipped
+    embedding_content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+    )
+
     # Full-text search vector for PostgreSQL FTS (hybrid search)
     # Populated by database trigger - no need to set in application code
     search_vector: Mapped[Any | None] = mapped_column(
@@ -124,6 +131,17 @@ class EmbeddableMixin:
         settings = get_settings()
         return self.embedding_model != settings.embedding_model
 
+    def is_embedding_current(self, content_hash: str) -> bool:
+        """Check if the stored embedding was generated from this exact content.
+
+        True when an embedding exists, was produced by the configured model,
+        and its recorded content hash matches.
+        """
+        return (
+            not self.needs_reembedding
+            and self.embedding_content_hash == content_hash
+        )
+
 
 class BaseModel(Base, UUIDMixin, TimestampMixin):
     """Base model with UUID primary key and timestamps."""
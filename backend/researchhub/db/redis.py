@@ -0,0 +1,194 @@
+"""Shared Redis client for application-level caches.
+
+Celery uses its own broker/backend connections; this client is for caches
+that the API processes share (query embeddings, access sets, etc.). Cache
+callers must treat Redis as optional and degrade to a miss on errors.
+
+Caches are invalidated by bumping version counters from SQLAlchemy commit
+hooks. Those hooks are synchronous, so schedule_counter_bumps sends the
+INCRs from a background task instead of blocking the event loop, and
+bump_counters_now (for hooks that must bump before a commit) awaits them
+through the AsyncSession's greenlet. Counters whose bump failed stay
+"unconfirmed": caches must not serve entries they guard until
+retry_counter_bumps gets them through.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+
+import structlog
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from researchhub.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Delays (seconds) between attempts to bump counters after a commit
+COUNTER_BUMP_RETRY_DELAYS = (0.1, 0.5, 2.0)
+
+_client: Redis | None = None
+_sync_client: SyncRedis | None = None
+
+_counter_bumps: set[asyncio.Task] = set()
+_unconfirmed_counters: set[str] = set()
+
+
+def get_redis() -> Redis:
+    """Get the lazily-created shared Redis client."""
+    global _client
+    if _client is None:
+        _client = Redis.from_url(
+            str(settings.redis_url),
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            health_check_interval=30,
+        )
+    return _client
+
+
+def get_sync_redis() -> SyncRedis:
+    """Get a blocking Redis client, for synchronous hooks (e.g. ORM events)."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = SyncRedis.from_url(
+            str(settings.redis_url),
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            health_check_interval=30,
+        )
+    return _sync_client
+
+
+async def _incr_all(keys: Iterable[str]) -> None:
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.incr(key)
+        await pipe.execute()
+
+
+def _incr_all_sync(keys: Iterable[str]) -> None:
+    with get_sync_redis().pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.incr(key)
+        pipe.execute()
+
+
+async def _bump_counters(
+    keys: list[str],
+    failure_event: str,
+    resolve_keys: Callable[[], Awaitable[Iterable[str]]] | None = None,
+) -> None:
+    if resolve_keys is not None:
+        try:
+            keys = [*keys, *await resolve_keys()]
+        except Exception as e:
+            logger.error(failure_event, error=str(e), stage="resolve")
+        if not keys:
+            return
+    for delay in (*COUNTER_BUMP_RETRY_DELAYS, None):
+        try:
+            await _incr_all(keys)
+            return
+        except RedisError as e:
+            error = e
+        if delay is not None:
+            await asyncio.sleep(delay)
+    _unconfirmed_counters.update(keys)
+    logger.error(failure_event, error=str(error), counter_count=len(keys))
+
+
+def schedule_counter_bumps(
+    keys: Iterable[str],
+    failure_event: str,
+    resolve_keys: Callable[[], Awaitable[Iterable[str]]] | None = None,
+) -> None:
+    """INCR cache version counters without blocking the caller.
+
+    Meant for session commit hooks. Inside a running event loop the INCRs
+    are sent by a background task, retried with backoff; outside one they
+    use the blocking client. ``resolve_keys`` adds counters that need a
+    lookup to find (e.g. a database query); it only runs inside a loop.
+    Counters that could not be bumped are logged as ``failure_event`` and
+    marked unconfirmed.
+    """
+    keys = list(keys)
+    if not keys and resolve_keys is None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if resolve_keys is not None:
+            logger.error(failure_event, error="no running event loop", stage="resolve")
+        if not keys:
+            return
+        try:
+            _incr_all_sync(keys)
+        except RedisError as e:
+            _unconfirmed_counters.update(keys)
+            logger.error(failure_event, error=str(e), counter_count=len(keys))
+        return
+    task = loop.create_task(_bump_counters(keys, failure_event, resolve_keys))
+    _counter_bumps.add(task)
+    task.add_done_callback(_counter_bumps.discard)
+
+
+def bump_counters_now(keys: Iterable[str], failure_event: str) -> None:
+    """INCR cache version counters before the calling hook returns.
+
+    For hooks that must invalidate before their change becomes visible,
+    e.g. ahead of a commit that revokes access. Inside an AsyncSession's
+    greenlet the async client is awaited, so the event loop keeps running;
+    otherwise the blocking client is used. Failures are logged as
+    ``failure_event`` and the counters marked unconfirmed.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    try:
+        if in_greenlet():
+            await_only(_incr_all(keys))
+        else:
+            _incr_all_sync(keys)
+    except RedisError as e:
+        _unconfirmed_counters.update(keys)
+        logger.error(failure_event, error=str(e), counter_count=len(keys), stage="before_commit")
+
+
+def counter_unconfirmed(*keys: str) -> bool:
+    """Whether a bump of any of these counters failed and is still pending."""
+    return bool(_unconfirmed_counters) and any(key in _unconfirmed_counters for key in keys)
+
+
+async def retry_counter_bumps() -> None:
+    """Retry failed counter bumps; a no-op when there are none."""
+    if not _unconfirmed_counters:
+        return
+    keys = list(_unconfirmed_counters)
+    try:
+        await _incr_all(keys)
+    except RedisError:
+        return
+    _unconfirmed_counters.difference_update(keys)
+    logger.info("cache_counter_bumps_recovered", counter_count=len(keys))
+
+
+async def flush_counter_bumps() -> None:
+    """Wait for scheduled counter bumps that are still in flight."""
+    while _counter_bumps:
+        await asyncio.gather(*_counter_bumps, return_exceptions=True)
+
+
+async def close_redis() -> None:
+    """Close the shared Redis clients, if they were created."""
+    global _client, _sync_client
+    await flush_counter_bumps()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
@@ -1,25 +1,39 @@
 """Database session management."""
 
+import time
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, SessionTransaction
 
 from researchhub.config import get_settings
+from researchhub.metrics import DB_STREAM_CONNECTION_HOLD, DB_STREAM_CONNECTIONS, DB_STREAMS_OPEN
 
 settings = get_settings()
 
+
+def _create_engine(pool_size: int, max_overflow: int) -> AsyncEngine:
+    return create_async_engine(
+        str(settings.database_url),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_pre_ping=True,
+        echo=settings.debug,
+    )
+
+
 # Create async engine
-engine = create_async_engine(
-    str(settings.database_url),
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    pool_timeout=settings.database_pool_timeout,
-    pool_pre_ping=True,
-    echo=settings.debug,
-)
+engine = _create_engine(settings.database_pool_size, settings.database_max_overflow)
 
 # Create session factory
 async_session_factory = async_sessionmaker(
@@ -39,6 +53,22 @@ async def init_db() -> None:
         await conn.execute(text("SELECT 1"))
 
 
+def configure_engine(pool_size: int, max_overflow: int) -> None:
+    """Replace the engine with one sized for this process.
+
+    Used by Celery worker processes, which run one task at a time and need
+    a much smaller pool than an API process. Existing sessions keep their
+    connections; new sessions from async_session_factory use the new engine.
+    The old engine's pool is dropped without closing connections, which may
+    belong to a parent process after fork.
+    """
+    global engine
+    old_engine = engine
+    engine = _create_engine(pool_size, max_overflow)
+    async_session_factory.configure(bind=engine)
+    old_engine.sync_engine.dispose(close=False)
+
+
 async def close_db() -> None:
     """Close database connection pool."""
     await engine.dispose()
@@ -57,6 +87,62 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def streaming_session(stream: str) -> AsyncGenerator[AsyncSession, None]:
+    """Session for a long-lived streaming response.
+
+    A session holds a pooled connection from its first statement until its
+    transaction ends, and a streaming response can outlive a request by
+    minutes. Callers of this session end each unit of work with
+    ``release_connection`` so the connection goes back to the pool while
+    the stream waits on something else (an LLM, the client). The next
+    statement checks a connection out again.
+
+    Connection hold times and the number currently held are reported per
+    ``stream`` name.
+    """
+    DB_STREAMS_OPEN.labels(stream=stream).inc()
+    try:
+        async with async_session_factory(info={"stream": stream}) as session:
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+    finally:
+        DB_STREAMS_OPEN.labels(stream=stream).dec()
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """End the session's transaction, returning its connection to the pool.
+
+    Pending changes are committed; loaded objects stay usable
+    (expire_on_commit is off).
+    """
+    if session.in_transaction():
+        await session.commit()
+
+
+@event.listens_for(Session, "after_begin")
+def _track_stream_checkout(session: Session, transaction: SessionTransaction, connection) -> None:
+    stream = session.info.get("stream")
+    if stream is not None and "stream_checkout_at" not in session.info:
+        session.info["stream_checkout_at"] = time.monotonic()
+        DB_STREAM_CONNECTIONS.labels(stream=stream).inc()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _track_stream_release(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is not None:
+        return
+    checkout_at = session.info.pop("stream_checkout_at", None)
+    if checkout_at is not None:
+        stream = session.info["stream"]
+        DB_STREAM_CONNECTIONS.labels(stream=stream).dec()
+        DB_STREAM_CONNECTION_HOLD.labels(stream=stream).observe(time.monotonic() - checkout_at)
+
+
 # Type alias for dependency injection
 DBSession = Annotated[AsyncSession, Depends(get_db_session)]
 
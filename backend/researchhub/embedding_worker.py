@@ -0,0 +1,28 @@
+"""Long-running embedding queue worker.
+
+Run with ``python -m researchhub.embedding_worker``. One event loop and one
+database engine serve the worker for its whole lifetime.
+"""
+
+import asyncio
+
+import structlog
+from prometheus_client import start_http_server
+
+from researchhub.config import get_settings
+from researchhub.services.embedding_queue import serve_embedding_worker
+
+logger = structlog.get_logger()
+
+
+def main() -> None:
+    """Start the metrics endpoint and drain the embedding queue."""
+    settings = get_settings()
+    if settings.prometheus_enabled:
+        start_http_server(settings.embedding_worker_metrics_port)
+        logger.info("embedding_worker_metrics_started", port=settings.embedding_worker_metrics_port)
+    asyncio.run(serve_embedding_worker())
+
+
+if __name__ == "__main__":
+    main()
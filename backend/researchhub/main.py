@@ -1,17 +1,22 @@
 """FastAPI application entry point."""
 
+import hmac
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from prometheus_client import make_asgi_app
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
+from researchhub.ai.template_registry import get_template_registry
 from researchhub.api import router as api_router
 from researchhub.config import get_settings
+from researchhub.db.redis import close_redis
 from researchhub.db.session import close_db, init_db
+from researchhub.services.exports import shutdown_pdf_pool
 from researchhub.middleware.logging import LoggingMiddleware
 from researchhub.middleware.request_id import RequestIDMiddleware
 
@@ -26,15 +31,39 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting Pasteur API", version=settings.app_version)
     await init_db()
     logger.info("Database connection initialized")
+    # Compile the default prompt templates before the first AI request
+    get_template_registry()
 
     yield
 
     # Shutdown
     logger.info("Shutting down Pasteur API")
+    shutdown_pdf_pool()
     await close_db()
+    await close_redis()
     logger.info("Database connection closed")
 
 
+def metrics_app():
+    """Prometheus exposition app, behind a bearer token when one is configured."""
+    exposition = make_asgi_app()
+    token = settings.prometheus_token.get_secret_value()
+    if not token:
+        return exposition
+    expected = f"Bearer {token}".encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] == "http":
+            headers = dict(scope["headers"])
+            if not hmac.compare_digest(headers.get(b"authorization", b""), expected):
+                response = PlainTextResponse("Unauthorized", status_code=401)
+                await response(scope, receive, send)
+                return
+        await exposition(scope, receive, send)
+
+    return app
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
@@ -55,6 +84,8 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Paging metadata of list endpoints that return a bare array
+        expose_headers=["X-Has-More", "X-Next-Cursor", "X-Total-Count", "X-Total-Is-Estimate"],
     )
     app.add_middleware(LoggingMiddleware)
     app.add_middleware(RequestIDMiddleware)
@@ -64,6 +95,12 @@ def create_app() -> FastAPI:
     # Include API router
     app.include_router(api_router, prefix=settings.api_prefix)
 
+    # Prometheus metrics (cache hit rates, pool occupancy, queue depth)
+    if settings.prometheus_enabled:
+        if not settings.prometheus_token.get_secret_value():
+            logger.warning("Prometheus metrics enabled without PROMETHEUS_TOKEN")
+        app.mount("/metrics", metrics_app())
+
     return app
 
 
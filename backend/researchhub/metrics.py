@@ -0,0 +1,100 @@
+"""Prometheus metrics shared across the application.
+
+Metrics are exposed at /metrics when settings.prometheus_enabled is true.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Query embedding cache (services/embedding_cache.py)
+EMBEDDING_CACHE_REQUESTS = Counter(
+    "researchhub_embedding_cache_requests_total",
+    "Query embedding cache lookups by tier and result",
+    ["tier", "result"],  # tier: memory|redis, result: hit|miss|error
+)
+
+# Embedding job queue (services/embedding_queue.py), reported by the worker
+EMBEDDING_QUEUE_DEPTH = Gauge(
+    "researchhub_embedding_queue_depth",
+    "Entities waiting in the embedding queue (including not yet due)",
+)
+EMBEDDING_QUEUE_OVERDUE = Gauge(
+    "researchhub_embedding_queue_overdue_seconds",
+    "How long the earliest due embedding job has been waiting past its due time",
+)
+EMBEDDING_QUEUE_LAG = Histogram(
+    "researchhub_embedding_queue_lag_seconds",
+    "Time from first queueing an entity to its embedding being processed",
+    buckets=(1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+EMBEDDING_QUEUE_JOBS = Counter(
+    "researchhub_embedding_queue_jobs_total",
+    "Processed embedding jobs by entity type and outcome",
+    ["entity_type", "result"],  # result: success|skipped|unchanged|failed|dead_lettered
+)
+
+# Connections held by long-lived streaming responses (db/session.py
+# streaming_session), e.g. assistant chats
+DB_STREAM_CONNECTIONS = Gauge(
+    "researchhub_db_stream_connections",
+    "Pooled DB connections currently checked out by streaming responses",
+    ["stream"],
+)
+DB_STREAM_CONNECTION_HOLD = Histogram(
+    "researchhub_db_stream_connection_hold_seconds",
+    "How long a streaming response holds a pooled connection per unit of work",
+    ["stream"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_STREAMS_OPEN = Gauge(
+    "researchhub_db_streams_open",
+    "Streaming responses in progress that may borrow pooled DB connections",
+    ["stream"],
+)
+
+# Server-Sent Event streams (utils/sse.py)
+SSE_FRAMES = Counter(
+    "researchhub_sse_frames_total",
+    "SSE frames sent by stream and event (heartbeats as event=heartbeat)",
+    ["stream", "event"],
+)
+SSE_EVENTS_COALESCED = Counter(
+    "researchhub_sse_events_coalesced_total",
+    "Text delta events merged into an earlier frame instead of sent on their own",
+    ["stream"],
+)
+SSE_STREAM_CPU = Histogram(
+    "researchhub_sse_stream_cpu_seconds",
+    "CPU time spent encoding, coalescing and logging one stream's events",
+    ["stream"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+# Exports (services/exports.py)
+EXPORT_ROWS = Counter(
+    "researchhub_export_rows_total",
+    "Rows written by streamed exports",
+    ["export", "format"],  # format: csv|ndjson
+)
+EXPORT_PDF_RENDER = Histogram(
+    "researchhub_export_pdf_render_seconds",
+    "Time to render an export PDF",
+    ["export", "runner"],  # runner: pool (API process pool)|job (Celery)
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900),
+)
+EXPORT_ARTIFACT_CACHE = Counter(
+    "researchhub_export_artifact_cache_total",
+    "Stored export PDF lookups by result",
+    ["result"],  # hit|miss
+)
+
+# Notification fan-out (services/notification.py)
+NOTIFICATION_PREFERENCE_CACHE = Counter(
+    "researchhub_notification_preference_cache_total",
+    "Recipient preference lookups by result",
+    ["result"],  # hit|miss
+)
+NOTIFICATION_FANOUT_RECIPIENTS = Histogram(
+    "researchhub_notification_fanout_recipients",
+    "Recipients per notify_many fan-out written in the request or task",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
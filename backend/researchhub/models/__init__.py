@@ -50,7 +50,7 @@ from researchhub.models.collaboration import (
     Invitation,
     Comment,
     Reaction,
-    CommentRead,
+    CommentThreadRead,
 )
 from researchhub.models.ai import (
     AIConversation,
@@ -70,6 +70,12 @@ from researchhub.models.journal import (
     JournalEntry,
     JournalEntryLink,
 )
+from researchhub.models.embedding import EmbeddingChunk
+from researchhub.models.analytics import (
+    DailyActivityRollup,
+    DailyContributorRollup,
+    DailyTaskStatusRollup,
+)
 
 __all__ = [
     # User & Organization
@@ -117,7 +123,7 @@ __all__ = [
     "Invitation",
     "Comment",
     "Reaction",
-    "CommentRead",
+    "CommentThreadRead",
     # AI
     "AIConversation",
     "AIConversationMessage",
@@ -133,4 +139,14 @@ __all__ = [
     # Journal
     "JournalEntry",
     "JournalEntryLink",
+    # Embeddings
+    "EmbeddingChunk",
+    # Analytics rollups
+    "DailyActivityRollup",
+    "DailyContributorRollup",
+    "DailyTaskStatusRollup",
 ]
+
+# Tasks need a rank before insert; registering the hook with the models means
+# every session that can load Task assigns one, not only those in the app
+import researchhub.services.task_rank  # noqa: E402,F401
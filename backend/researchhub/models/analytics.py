@@ -0,0 +1,99 @@
+"""Daily analytics rollups, refreshed by the refresh_analytics_rollups task."""
+
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import Date, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from researchhub.db.base import BaseModel
+
+
+class DailyActivityRollup(BaseModel):
+    """Activity counts per organization, day, activity type and target type.
+
+    Powers the activity timeline and activity type breakdown without
+    scanning the activities table. Rows for recent days are recomputed on
+    every refresh; older days are final.
+    """
+
+    __tablename__ = "analytics_daily_activity"
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id", "day", "activity_type", "target_type",
+            name="uq_analytics_daily_activity",
+        ),
+    )
+
+    organization_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    activity_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    target_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    activity_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DailyActivityRollup {self.organization_id} {self.day} {self.activity_type}>"
+
+
+class DailyContributorRollup(BaseModel):
+    """Per-member activity counts for one organization and day."""
+
+    __tablename__ = "analytics_daily_contributors"
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id", "day", "actor_id",
+            name="uq_analytics_daily_contributor",
+        ),
+    )
+
+    organization_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    actor_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    activity_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    tasks_completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    documents_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    comments_made: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DailyContributorRollup {self.organization_id} {self.day} {self.actor_id}>"
+
+
+class DailyTaskStatusRollup(BaseModel):
+    """Snapshot of task counts by status for one organization and day.
+
+    Today's row is overwritten on every refresh, so each past day keeps
+    the last counts seen on that day.
+    """
+
+    __tablename__ = "analytics_daily_task_status"
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id", "day", "status",
+            name="uq_analytics_daily_task_status",
+        ),
+    )
+
+    organization_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DailyTaskStatusRollup {self.organization_id} {self.day} {self.status}>"
@@ -563,54 +563,46 @@ class Reaction(BaseModel):
     )
 
 
-class CommentRead(BaseModel):
+class CommentThreadRead(BaseModel):
     """
-    Tracks which comments a user has read.
+    How far a user has read a comment thread.
 
-    Works across all comment types (task, document, review, generic)
-    using a polymorphic comment_type + comment_id approach.
+    One row per user and thread, across all comment types (task, document,
+    review, generic). Comments in the thread created at or before
+    ``read_through`` count as read, so storage grows with the threads a
+    user opens rather than with every comment they see.
     """
 
-    __tablename__ = "comment_reads"
+    __tablename__ = "comment_thread_reads"
     __table_args__ = (
         UniqueConstraint(
-            "comment_type", "comment_id", "user_id",
-            name="uq_comment_read"
+            "user_id", "thread_type", "thread_id",
+            name="uq_comment_thread_read"
         ),
     )
 
-    # Comment reference (polymorphic)
-    comment_type: Mapped[str] = mapped_column(
-        String(50),
-        nullable=False,
-        index=True,
-        comment="Type of comment: task, document, review, generic",
-    )
-    comment_id: Mapped[UUID] = mapped_column(
+    # User reading the thread
+    user_id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
-        comment="ID of the comment in its respective table",
     )
 
-    # User who read the comment
-    user_id: Mapped[UUID] = mapped_column(
+    # Thread reference (polymorphic)
+    thread_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        comment="Type of comment: task, document, review, generic",
+    )
+    thread_id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
-        ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
+        comment="Task, document, review or commented resource ID",
     )
 
-    # When the comment was read
-    read_at: Mapped[datetime] = mapped_column(
+    # Read watermark
+    read_through: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default="now()",
-    )
-
-    # Relationships
-    reader: Mapped["User"] = relationship(
-        "User",
-        foreign_keys=[user_id],
-        lazy="joined",
+        comment="Comments created at or before this are read",
     )
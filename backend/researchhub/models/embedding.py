@@ -0,0 +1,49 @@
+"""Chunk-level embedding storage for long entities."""
+
+from uuid import UUID
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from researchhub.config import get_settings
+from researchhub.db.base import BaseModel
+
+
+class EmbeddingChunk(BaseModel):
+    """One embedded passage of a long entity (document, paper).
+
+    Entity-level embeddings only cover the start of long texts; chunks cover
+    the whole text so semantic search can match any passage and return it as
+    the snippet. Chunks are rewritten whenever the entity's content hash
+    changes.
+    """
+
+    __tablename__ = "embedding_chunks"
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", "chunk_idx", name="uq_embedding_chunk"),
+        Index("ix_embedding_chunks_entity", "entity_type", "entity_id"),
+    )
+
+    # Source entity (polymorphic)
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)  # document, paper
+    entity_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
+
+    # Position of the passage within the entity's extracted text
+    chunk_idx: Mapped[int] = mapped_column(Integer, nullable=False)
+    span_start: Mapped[int] = mapped_column(Integer, nullable=False)
+    span_end: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Passage text (returned as the search snippet) and its estimated size
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    embedding: Mapped[list[float]] = mapped_column(
+        Vector(get_settings().embedding_dimensions),
+        nullable=False,
+    )
+    embedding_model: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingChunk {self.entity_type}={self.entity_id} #{self.chunk_idx}>"
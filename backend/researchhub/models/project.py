@@ -14,7 +14,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PGUUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from researchhub.db.base import BaseModel, EmbeddableMixin
@@ -355,7 +355,10 @@ class Task(BaseModel, EmbeddableMixin):
         DateTime(timezone=True), nullable=True
     )
 
-    # Ordering within status column
+    # Ordering within status column: a fractional rank key, compared bytewise
+    # (services/task_rank.py assigns it on insert and status change)
+    rank: Mapped[str] = mapped_column(String(255, collation="C"), nullable=False)
+    # Legacy integer ordering, superseded by rank and no longer renumbered
     position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     # Time tracking (optional)
@@ -933,6 +936,8 @@ class Blocker(BaseModel):
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # TipTap rich text format
     description_text: Mapped[str | None] = mapped_column(Text, nullable=True)  # Plain text for search
+    # Full-text search vector, populated by database trigger (migration 042)
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True)
 
     # Status and priority
     status: Mapped[str] = mapped_column(
@@ -0,0 +1,113 @@
+"""Benchmark export encoding and PDF rendering for large task lists.
+
+Compares, for the same synthetic task rows:
+
+- CSV: the previous approach (every row in a list, then the whole file in
+  one StringIO) against services.exports.csv_chunks, by peak traced
+  memory. Rows come from an async generator, standing in for a server-side
+  cursor.
+- PDF: generate_tasks_pdf with the task table as a single ReportLab Table
+  (the previous layout) against the chunked layout, by CPU time.
+
+Usage:
+    python -m researchhub.scripts.benchmark_exports
+
+Options:
+    --rows N        Task rows (default: 50000)
+    --pdf-rows N    Task rows for the PDF comparison (default: 8000)
+"""
+
+import argparse
+import asyncio
+import importlib
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from researchhub.api.v1.exports import generate_csv
+from researchhub.services.exports import csv_chunks
+
+# The package re-exports the generator instance under the module's name
+pdf_module = importlib.import_module("researchhub.services.pdf_generator")
+
+HEADERS = ["Title", "Status", "Priority", "Due Date", "Created", "Assignee", "Project"]
+
+
+async def task_rows(count: int):
+    created = datetime(2024, 1, 1)
+    project_id = uuid.uuid4()
+    for i in range(count):
+        yield (
+            f"Task {i}: collect and clean the cohort data",
+            "in_progress",
+            "medium",
+            None,
+            created + timedelta(minutes=i),
+            uuid.uuid4(),
+            project_id,
+        )
+
+
+async def _reference_csv(count: int) -> int:
+    rows = []
+    async for row in task_rows(count):
+        rows.append([
+            row[0], row[1], row[2], "", row[4].isoformat(), str(row[5]), str(row[6]),
+        ])
+    return len(generate_csv(HEADERS, rows).getvalue())
+
+
+async def _streamed_csv(count: int) -> int:
+    size = 0
+    async for chunk in csv_chunks(HEADERS, task_rows(count), "benchmark"):
+        size += len(chunk)
+    return size
+
+
+def _peak_memory(coro) -> tuple[int, int]:
+    tracemalloc.start()
+    size = asyncio.run(coro)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak
+
+
+def _render_seconds(count: int, chunk_rows: int) -> float:
+    tasks = [
+        {'title': f'Task {i}', 'status': 'todo', 'priority': 'medium', 'due_date': 'N/A', 'assignee': 'Unassigned'}
+        for i in range(count)
+    ]
+    previous = pdf_module.TABLE_CHUNK_ROWS
+    pdf_module.TABLE_CHUNK_ROWS = chunk_rows
+    try:
+        start = time.process_time()
+        pdf_module.pdf_generator.generate_tasks_pdf(tasks)
+        return time.process_time() - start
+    finally:
+        pdf_module.TABLE_CHUNK_ROWS = previous
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--pdf-rows", type=int, default=8000)
+    args = parser.parse_args()
+
+    reference_size, reference_peak = _peak_memory(_reference_csv(args.rows))
+    streamed_size, streamed_peak = _peak_memory(_streamed_csv(args.rows))
+    print(f"CSV, {args.rows} rows")
+    print(f"  {'path':<10} {'bytes':>12} {'peak memory':>14}")
+    print(f"  {'reference':<10} {reference_size:>12} {reference_peak / 2**20:>12.1f}MB")
+    print(f"  {'streamed':<10} {streamed_size:>12} {streamed_peak / 2**20:>12.1f}MB")
+
+    single = _render_seconds(args.pdf_rows, args.pdf_rows)
+    chunked = _render_seconds(args.pdf_rows, pdf_module.TABLE_CHUNK_ROWS)
+    print(f"PDF, {args.pdf_rows} rows")
+    print(f"  single table {single:.2f}s, chunked {chunked:.2f}s ({single / chunked:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Benchmark the PHI detector against a per-pattern full-text scan.
+
+The reference is the detector's previous algorithm: every enabled pattern
+runs over the whole text with finditer, and each match gets the exclusion
+check. Both must return identical findings. Three synthetic corpora are
+generated, differing in how often they contain numbers and PHI.
+
+Usage:
+    python -m researchhub.scripts.benchmark_phi_detector
+
+Options:
+    --size CHARS       Characters per corpus (default: 1000000)
+    --repeat N         Timed runs per corpus, best is reported (default: 5)
+    --seed N           Random seed for corpus generation (default: 42)
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Callable, List
+
+from researchhub.ai.phi_detector import PHIDetector, PHIFinding
+
+WORDS = (
+    "the participants were enrolled in the cohort and followed up at the clinic "
+    "where outcomes were assessed by blinded reviewers according to the protocol "
+    "approved by the ethics committee with informed consent obtained from all"
+).split()
+
+# Corpus name -> (share of plain number tokens, share of PHI tokens)
+CORPORA = {
+    "prose": (0.005, 0.0005),
+    "numeric": (0.05, 0.005),
+    "dense_phi": (0.06, 0.045),
+}
+
+
+def _phi_token(rng: random.Random) -> str:
+    return rng.choice([
+        lambda: f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}",
+        lambda: f"({rng.randint(200, 999)}) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        lambda: f"participant{rng.randint(1, 99)}@example.org",
+        lambda: f"DOB: {rng.randint(1, 12)}/{rng.randint(1, 28)}/19{rng.randint(40, 99)}",
+        lambda: f"MRN {rng.randint(1000000, 99999999)}",
+        lambda: "4111 1111 1111 1111",
+        lambda: f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+    ])()
+
+
+def generate_corpus(size: int, number_share: float, phi_share: float, rng: random.Random) -> str:
+    """Generate prose-like text with the given shares of numbers and PHI."""
+    tokens: List[str] = []
+    length = 0
+    while length < size:
+        roll = rng.random()
+        if roll < phi_share:
+            token = _phi_token(rng)
+        elif roll < phi_share + number_share:
+            token = str(rng.randint(0, 100000))
+        else:
+            token = rng.choice(WORDS)
+        tokens.append(token)
+        length += len(token) + 1
+    return " ".join(tokens)[:size]
+
+
+def reference_detect(detector: PHIDetector, text: str) -> List[PHIFinding]:
+    """Per-pattern full-text scan (the detector's previous algorithm)."""
+    findings: List[PHIFinding] = []
+    for phi_type in detector.enabled_types:
+        if phi_type not in detector.PATTERNS:
+            continue
+        for match in detector.PATTERNS[phi_type].finditer(text):
+            if detector._is_excluded(text, match.start(), match.end()):
+                continue
+            findings.append(PHIFinding(
+                type=phi_type,
+                start=match.start(),
+                end=match.end(),
+                text=match.group(),
+            ))
+    findings.sort(key=lambda f: f.start)
+    return findings
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _key(findings: List[PHIFinding]) -> list:
+    return sorted((f.start, f.end, f.type.value, f.text) for f in findings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    uncached = PHIDetector(cache_size=0)
+    cached = PHIDetector()
+    mismatches = 0
+
+    print(f"{'corpus':<10} {'findings':>8} {'reference':>10} {'detector':>10} {'speedup':>8} {'cached':>10}")
+    for name, (number_share, phi_share) in CORPORA.items():
+        text = generate_corpus(args.size, number_share, phi_share, rng)
+
+        expected = reference_detect(uncached, text)
+        actual = uncached._scan(uncached._windows(text))
+        if _key(expected) != _key(actual):
+            mismatches += 1
+            print(f"{name}: findings differ ({len(expected)} reference, {len(actual)} detector)")
+
+        reference_time = _best_of(args.repeat, lambda: reference_detect(uncached, text))
+        detector_time = _best_of(args.repeat, lambda: uncached._scan(uncached._windows(text)))
+        asyncio.run(cached.detect(text))
+        cached_time = _best_of(args.repeat, lambda: asyncio.run(cached.detect(text)))
+
+        print(
+            f"{name:<10} {len(expected):>8} {reference_time * 1000:>8.1f}ms "
+            f"{detector_time * 1000:>8.1f}ms {reference_time / detector_time:>7.1f}x "
+            f"{cached_time * 1000:>8.2f}ms"
+        )
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Benchmark assistant SSE streaming against the previous per-event encoding.
+
+The reference is the chat endpoint's previous event loop: every event is
+logged at info level, serialized with json.dumps and sent as its own
+chunk. Both paths stream the same synthetic chat, a few tool events
+between runs of one-token text deltas, with the given delay between
+tokens. Logs are rendered as JSON at info level and written to /dev/null,
+so their formatting cost is counted but nothing is printed.
+
+Reported CPU is process time over the whole stream, so it includes the
+event loop's own overhead; the reference and the encoder pay the same
+loop overhead for the same token timing.
+
+Usage:
+    python -m researchhub.scripts.benchmark_sse_stream
+
+Options:
+    --tokens N            Text delta events per stream (default: 4000)
+    --token-interval-ms   Delay between tokens (default: 1)
+    --repeat N            Runs per path, best is reported (default: 3)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, AsyncIterator
+
+import structlog
+
+from researchhub.utils.sse import sse_stream
+
+TOOL_EVENTS = 10
+
+
+def _configure_logging() -> None:
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(20),  # INFO
+        logger_factory=structlog.PrintLoggerFactory(open(os.devnull, "w")),
+    )
+
+
+async def synthetic_chat(tokens: int, interval: float) -> AsyncIterator[tuple[str, Any]]:
+    """Token deltas with a tool call and result every tokens / TOOL_EVENTS."""
+    every = max(tokens // TOOL_EVENTS, 1)
+    for i in range(tokens):
+        if i % every == 0:
+            yield "tool_call", {"tool": "search", "input": {"query": f"query {i}"}}
+            yield "tool_result", {"results": [{"id": n, "title": f"Result {n}"} for n in range(20)]}
+        yield "text_delta", {"content": " tok"}
+        await asyncio.sleep(interval)
+    yield "done", {"conversation_id": "00000000-0000-0000-0000-000000000000"}
+
+
+async def reference_stream(events: AsyncIterator[tuple[str, Any]]) -> AsyncIterator[str]:
+    """The endpoint's previous per-event loop."""
+    logger = structlog.get_logger()
+    event_count = 0
+    async for event_type, data in events:
+        event_count += 1
+        logger.info("Yielding event", event_type=event_type, event_count=event_count)
+        event_data = json.dumps(data)
+        yield f"event: {event_type}\ndata: {event_data}\n\n"
+    logger.info("Chat stream completed", total_events=event_count)
+
+
+async def _consume(chunks: AsyncIterator) -> tuple[int, int, float]:
+    start = time.process_time()
+    count = size = 0
+    async for chunk in chunks:
+        count += 1
+        size += len(chunk)
+    return count, size, time.process_time() - start
+
+
+def _best(repeat: int, make_stream) -> tuple[int, int, float]:
+    runs = [asyncio.run(_consume(make_stream())) for _ in range(repeat)]
+    return min(runs, key=lambda run: run[2])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=4000)
+    parser.add_argument("--token-interval-ms", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _configure_logging()
+    interval = args.token_interval_ms / 1000
+
+    reference = _best(args.repeat, lambda: reference_stream(synthetic_chat(args.tokens, interval)))
+    encoder = _best(args.repeat, lambda: sse_stream(synthetic_chat(args.tokens, interval), stream="benchmark"))
+
+    print(f"{'path':<10} {'chunks':>8} {'bytes':>10} {'cpu':>10}")
+    for name, (chunks, size, cpu) in (("reference", reference), ("encoder", encoder)):
+        print(f"{name:<10} {chunks:>8} {size:>10} {cpu * 1000:>8.1f}ms")
+    print(f"cpu ratio: {reference[2] / encoder[2]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Check passage search recall against an exact scan.
+
+search_entity_chunks walks the HNSW index on embedding_chunks and filters
+by entity type and access scope afterwards. This samples stored chunks,
+searches with each chunk's own vector scoped to the chunk's organization
+(the filter a tenant's search applies), and compares the entity ids it
+returns with an exact scan of the same query (index scans disabled).
+
+Usage:
+    python -m researchhub.scripts.check_vector_recall
+
+Options:
+    --entity-type TYPE   document or paper (default: document)
+    --samples N          Sampled query chunks (default: 50)
+    --limit N            Entities requested per search (default: 20)
+    --min-recall R       Exit non-zero below this mean recall (default: 0.9)
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from researchhub.db.session import async_session_factory
+from researchhub.models.document import Document
+from researchhub.models.embedding import EmbeddingChunk
+from researchhub.models.knowledge import Paper
+from researchhub.models.organization import Team
+from researchhub.models.project import Project
+from researchhub.services.embedding import search_entity_chunks
+
+
+def _organization_scope(entity_type: str, organization_id: UUID):
+    if entity_type == "paper":
+        return lambda query: query.where(Paper.organization_id == organization_id)
+    return lambda query: (
+        query.join(Project, Document.project_id == Project.id)
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+    )
+
+
+async def _sample(entity_type: str, count: int) -> list[tuple[list[float], UUID]]:
+    model = Paper if entity_type == "paper" else Document
+    query = (
+        select(EmbeddingChunk.embedding)
+        .join(model, model.id == EmbeddingChunk.entity_id)
+        .where(EmbeddingChunk.entity_type == entity_type)
+        .order_by(func.random())
+        .limit(count)
+    )
+    if entity_type == "paper":
+        query = query.add_columns(Paper.organization_id)
+    else:
+        query = (
+            query.add_columns(Team.organization_id)
+            .join(Project, Document.project_id == Project.id)
+            .join(Team, Project.team_id == Team.id)
+            .where(Team.organization_id.isnot(None))
+        )
+    async with async_session_factory() as db:
+        result = await db.execute(query)
+        return [(list(embedding), organization_id) for embedding, organization_id in result.all()]
+
+
+async def _search(
+    entity_type: str,
+    embedding: list[float],
+    organization_id: UUID,
+    limit: int,
+    exact: bool,
+) -> list[UUID]:
+    model = Paper if entity_type == "paper" else Document
+    async with async_session_factory() as db:
+        if exact:
+            await db.execute(select(func.set_config("enable_indexscan", "off", True)))
+        hits = await search_entity_chunks(
+            db,
+            entity_type,
+            model,
+            embedding,
+            limit,
+            scope=_organization_scope(entity_type, organization_id),
+        )
+        await db.rollback()
+    return [hit.entity_id for hit in hits]
+
+
+async def check(entity_type: str, samples: int, limit: int) -> list[float]:
+    recalls = []
+    for embedding, organization_id in await _sample(entity_type, samples):
+        expected = await _search(entity_type, embedding, organization_id, limit, exact=True)
+        if not expected:
+            continue
+        found = await _search(entity_type, embedding, organization_id, limit, exact=False)
+        recalls.append(len(set(found) & set(expected)) / len(expected))
+    return recalls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entity-type", choices=["document", "paper"], default="document")
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    args = parser.parse_args()
+
+    recalls = asyncio.run(check(args.entity_type, args.samples, args.limit))
+    if not recalls:
+        print(f"No {args.entity_type} chunks to sample")
+        return 0
+
+    mean = sum(recalls) / len(recalls)
+    print(f"{args.entity_type}: {len(recalls)} queries, limit {args.limit}")
+    print(f"  mean recall {mean:.3f}, min {min(recalls):.3f}")
+    return 0 if mean >= args.min_recall else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
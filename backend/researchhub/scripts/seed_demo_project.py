@@ -28,6 +28,7 @@ from researchhub.db.session import async_session_factory
 from researchhub.models.organization import Organization, Team
 from researchhub.models.project import Blocker, Project, Task, TaskComment
 from researchhub.models.user import User
+from researchhub.services.task_rank import spaced_keys
 
 
 # Demo project content
@@ -347,6 +348,7 @@ async def seed_demo_project(db: AsyncSession) -> None:
     # Create tasks for main project
     task_map: dict[str, Task] = {}
     position = 0
+    ranks = spaced_keys(len(MAIN_PROJECT_TASKS))
     for task_data in MAIN_PROJECT_TASKS:
         task = Task(
             id=uuid4(),
@@ -357,6 +359,7 @@ async def seed_demo_project(db: AsyncSession) -> None:
             project_id=main_project.id,
             created_by_id=user_id,
             position=position,
+            rank=ranks[position],
         )
         db.add(task)
         task_map[task.title] = task
@@ -365,6 +368,7 @@ async def seed_demo_project(db: AsyncSession) -> None:
 
     # Create tasks for subproject 1
     position = 0
+    ranks = spaced_keys(len(SUBPROJECT1_TASKS))
     for task_data in SUBPROJECT1_TASKS:
         task = Task(
             id=uuid4(),
@@ -375,6 +379,7 @@ async def seed_demo_project(db: AsyncSession) -> None:
             project_id=subproject_ids[0],
             created_by_id=user_id,
             position=position,
+            rank=ranks[position],
             due_date=date.today() + timedelta(days=14) if task_data["status"] == "in_progress" else None,
         )
         db.add(task)
@@ -384,6 +389,7 @@ async def seed_demo_project(db: AsyncSession) -> None:
 
     # Create tasks for subproject 2
     position = 0
+    ranks = spaced_keys(len(SUBPROJECT2_TASKS))
     for task_data in SUBPROJECT2_TASKS:
         task = Task(
             id=uuid4(),
@@ -394,6 +400,7 @@ async def seed_demo_project(db: AsyncSession) -> None:
             project_id=subproject_ids[1],
             created_by_id=user_id,
             position=position,
+            rank=ranks[position],
             due_date=date.today() + timedelta(days=21) if task_data["status"] == "todo" and task_data["priority"] == "high" else None,
         )
         db.add(task)
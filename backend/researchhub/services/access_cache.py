@@ -0,0 +1,550 @@
+"""Per-user project access sets, cached in process memory and Redis.
+
+Authorization used to rebuild a user's team, organization and project
+memberships with several queries on every request. This module resolves
+them once per user into an AccessSet: the effective role for every project
+the user can open, including roles inherited from parent projects, plus the
+user's team and organization IDs. The resolution rules mirror
+access_control.check_project_access_fast.
+
+Each cached set is stamped with two Redis counters. ``access:v1:ver:{user_id}``
+is bumped for every user a committed change can affect: the user of a
+membership, share or exclusion row, and for projects, project teams and
+teams, the members of the teams and organizations involved (see
+_affected_user_ids). ``access:v1:epoch`` invalidates every set; it is only
+bumped for bulk UPDATE/DELETE statements, which don't say which rows they
+touched. Counters are bumped before the commit, so a revoked grant is never
+served once the revocation is visible, and again after it, for sets rebuilt
+in between. If Redis is unavailable, or a bump failed and has not been
+retried successfully yet, sets are resolved from the database on every call
+and nothing is cached.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from researchhub.config import get_settings
+from researchhub.db.redis import (
+    bump_counters_now,
+    counter_unconfirmed,
+    get_redis,
+    retry_counter_bumps,
+    schedule_counter_bumps,
+)
+from researchhub.models.collaboration import ProjectShare
+from researchhub.models.organization import Organization, OrganizationMember, Team, TeamMember
+from researchhub.models.project import Project, ProjectExclusion, ProjectMember, ProjectTeam
+from researchhub.services import project_hierarchy as hierarchy
+from researchhub.services.access_control import ROLE_HIERARCHY
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "access:v1"
+EPOCH_KEY = f"{KEY_PREFIX}:epoch"
+
+# Rows keyed by user_id whose changes only affect that user
+USER_SCOPED_MODELS = (ProjectMember, ProjectShare, ProjectExclusion, TeamMember, OrganizationMember)
+
+# Project attributes that feed into access resolution
+PROJECT_ACCESS_ATTRS = (
+    "team_id",
+    "parent_id",
+    "scope",
+    "created_by_id",
+    "allow_all_team_members",
+    "is_org_public",
+    "org_public_role",
+)
+TEAM_ACCESS_ATTRS = ("owner_id", "organization_id")
+# Project attributes that decide whether organization members get access
+PROJECT_PUBLIC_ATTRS = ("scope", "is_org_public", "org_public_role")
+
+
+@dataclass
+class AccessSet:
+    """Everything needed to authorize one user without further queries."""
+
+    roles: dict[UUID, str] = field(default_factory=dict)  # project_id -> effective role
+    team_ids: list[UUID] = field(default_factory=list)
+    org_ids: list[UUID] = field(default_factory=list)
+
+    def role_for(self, project_id: UUID) -> str | None:
+        """Effective role on a project, or None if the user has no access."""
+        return self.roles.get(project_id)
+
+    @property
+    def project_ids(self) -> list[UUID]:
+        return list(self.roles)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "roles": {str(pid): role for pid, role in self.roles.items()},
+            "team_ids": [str(tid) for tid in self.team_ids],
+            "org_ids": [str(oid) for oid in self.org_ids],
+        })
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> "AccessSet":
+        raw = json.loads(data)
+        return cls(
+            roles={UUID(pid): role for pid, role in raw["roles"].items()},
+            team_ids=[UUID(tid) for tid in raw["team_ids"]],
+            org_ids=[UUID(oid) for oid in raw["org_ids"]],
+        )
+
+
+def user_version_key(user_id: UUID) -> str:
+    return f"{KEY_PREFIX}:ver:{user_id}"
+
+
+def _set_key(user_id: UUID) -> str:
+    return f"{KEY_PREFIX}:set:{user_id}"
+
+
+def _best_role(*roles: str | None) -> str | None:
+    present = [role for role in roles if role]
+    if not present:
+        return None
+    return max(present, key=lambda role: ROLE_HIERARCHY.get(role, 0))
+
+
+async def resolve_access_set(db: AsyncSession, user_id: UUID) -> AccessSet:
+    """Resolve a user's access set from the database (uncached)."""
+    team_rows = (await db.execute(
+        select(TeamMember.team_id, TeamMember.role).where(TeamMember.user_id == user_id)
+    )).all()
+    team_roles = {team_id: role for team_id, role in team_rows}
+
+    org_ids = list((await db.execute(
+        select(OrganizationMember.organization_id).where(OrganizationMember.user_id == user_id)
+    )).scalars().all())
+
+    owned_team_ids = set((await db.execute(
+        select(Team.id).where(Team.owner_id == user_id)
+    )).scalars().all())
+
+    member_roles = dict((await db.execute(
+        select(ProjectMember.project_id, ProjectMember.role).where(ProjectMember.user_id == user_id)
+    )).all())
+    share_roles = dict((await db.execute(
+        select(ProjectShare.project_id, ProjectShare.role).where(ProjectShare.user_id == user_id)
+    )).all())
+    excluded = set((await db.execute(
+        select(ProjectExclusion.project_id).where(ProjectExclusion.user_id == user_id)
+    )).scalars().all())
+
+    # Projects the user can reach directly: memberships, shares, personal
+    # projects, projects linked to their teams, and org-public projects
+    user_team_ids = set(team_roles) | owned_team_ids
+    direct_ids = set(member_roles) | set(share_roles)
+    direct_ids |= set((await db.execute(
+        select(Project.id).where(Project.created_by_id == user_id, Project.scope == "PERSONAL")
+    )).scalars().all())
+    if user_team_ids:
+        direct_ids |= set((await db.execute(
+            select(ProjectTeam.project_id).where(ProjectTeam.team_id.in_(user_team_ids))
+        )).scalars().all())
+    if org_ids:
+        direct_ids |= set((await db.execute(
+            select(ProjectTeam.project_id)
+            .join(Team, ProjectTeam.team_id == Team.id)
+            .join(Project, ProjectTeam.project_id == Project.id)
+            .where(Team.organization_id.in_(org_ids), Project.is_org_public == True)
+        )).scalars().all())
+
+    # Load candidates plus every descendant, which may inherit access
+    projects: dict[UUID, Any] = {}
+    if direct_ids:
+        descendants = hierarchy.descendants_cte(list(direct_ids))
+        for row in (await db.execute(
+            select(
+                Project.id,
+                Project.parent_id,
+                Project.scope,
+                Project.created_by_id,
+                Project.allow_all_team_members,
+                Project.is_org_public,
+                Project.org_public_role,
+            ).where(Project.id.in_(select(descendants.c.id)))
+        )).all():
+            projects[row.id] = row
+
+    project_teams: dict[UUID, list] = {}
+    if projects:
+        for row in (await db.execute(
+            select(
+                ProjectTeam.project_id,
+                ProjectTeam.team_id,
+                ProjectTeam.role,
+                Team.owner_id,
+                Team.organization_id,
+            )
+            .join(Team, ProjectTeam.team_id == Team.id)
+            .where(ProjectTeam.project_id.in_(list(projects)))
+        )).all():
+            project_teams.setdefault(row.project_id, []).append(row)
+
+    org_id_set = set(org_ids)
+    roles: dict[UUID, str | None] = {}
+
+    def _scope_role(project: Any, links: list) -> str | None:
+        if project.scope == "PERSONAL":
+            return "owner" if project.created_by_id == user_id else None
+        if project.scope == "TEAM" and not project.allow_all_team_members:
+            return None
+        if project.scope not in ("TEAM", "ORGANIZATION"):
+            return None
+
+        best = None
+        for link in links:
+            if link.owner_id == user_id:
+                return "owner"
+            team_role = team_roles.get(link.team_id)
+            if team_role is not None:
+                effective = link.role
+                if team_role == "lead" and ROLE_HIERARCHY.get(effective, 0) < ROLE_HIERARCHY["admin"]:
+                    effective = "admin"
+                best = _best_role(best, effective)
+        if best:
+            return best
+
+        if (
+            project.scope == "ORGANIZATION"
+            and project.is_org_public
+            and any(link.organization_id in org_id_set for link in links)
+        ):
+            return project.org_public_role
+        return None
+
+    def resolve(project_id: UUID, depth: int) -> str | None:
+        if project_id in roles:
+            return roles[project_id]
+        project = projects.get(project_id)
+        if project is None or project_id in excluded:
+            return None
+        roles[project_id] = None  # Cycle guard
+
+        role = member_roles.get(project_id) or share_roles.get(project_id)
+        if role is None:
+            role = _scope_role(project, project_teams.get(project_id, []))
+        if role is None and project.parent_id and depth < hierarchy.MAX_TRAVERSAL_DEPTH:
+            parent_role = resolve(project.parent_id, depth + 1)
+            if parent_role:
+                # Admins/owners inherit their full role, others get member
+                if ROLE_HIERARCHY.get(parent_role, 0) >= ROLE_HIERARCHY["admin"]:
+                    role = parent_role
+                else:
+                    role = "member"
+        roles[project_id] = role
+        return role
+
+    for project_id in projects:
+        resolve(project_id, 0)
+
+    return AccessSet(
+        roles={pid: role for pid, role in roles.items() if role},
+        team_ids=list(team_roles),
+        org_ids=org_ids,
+    )
+
+
+class AccessSetCache:
+    """In-process cache of access sets in front of Redis.
+
+    Every lookup reads the user's two stamps from Redis in one round trip,
+    so invalidations from any process take effect on the next request.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[UUID, tuple[tuple, float, AccessSet]] = {}
+
+    async def get(self, db: AsyncSession, user_id: UUID) -> AccessSet:
+        """Get a user's access set, resolving and caching it on a miss."""
+        await retry_counter_bumps()
+        if counter_unconfirmed(EPOCH_KEY, user_version_key(user_id)):
+            # Other processes may still hold sets from before the change
+            return await resolve_access_set(db, user_id)
+
+        redis = get_redis()
+        try:
+            # Read stamps before resolving so a concurrent invalidation
+            # leaves the stored set already stale rather than hiding it
+            epoch, version = await redis.mget(EPOCH_KEY, user_version_key(user_id))
+        except RedisError as e:
+            logger.warning("access_cache_unavailable", error=str(e))
+            return await resolve_access_set(db, user_id)
+        stamp = (epoch or b"0", version or b"0")
+
+        entry = self._entries.get(user_id)
+        if entry and entry[0] == stamp and entry[1] > time.monotonic():
+            return entry[2]
+
+        try:
+            cached = await redis.get(_set_key(user_id))
+        except RedisError:
+            cached = None
+        if cached:
+            stored_stamp, _, payload = cached.partition(b"|")
+            if stored_stamp == b":".join(stamp):
+                access = AccessSet.from_json(payload)
+                self._store_local(user_id, stamp, access)
+                return access
+
+        access = await resolve_access_set(db, user_id)
+        self._store_local(user_id, stamp, access)
+        try:
+            await redis.set(
+                _set_key(user_id),
+                b":".join(stamp) + b"|" + access.to_json().encode(),
+                ex=self.ttl_seconds,
+            )
+        except RedisError as e:
+            logger.warning("access_cache_store_failed", error=str(e))
+        return access
+
+    def evict(self, user_ids: set[UUID] | None = None) -> None:
+        """Drop local entries for some users, or all of them."""
+        if user_ids is None:
+            self._entries.clear()
+        else:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def _store_local(self, user_id: UUID, stamp: tuple, access: AccessSet) -> None:
+        if len(self._entries) >= self.max_entries and user_id not in self._entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[user_id] = (stamp, time.monotonic() + self.ttl_seconds, access)
+
+
+_access_cache: AccessSetCache | None = None
+
+
+def get_access_cache() -> AccessSetCache:
+    """Get the process-wide access set cache."""
+    global _access_cache
+    if _access_cache is None:
+        settings = get_settings()
+        _access_cache = AccessSetCache(
+            max_entries=settings.access_cache_max_entries,
+            ttl_seconds=settings.access_cache_ttl_seconds,
+        )
+    return _access_cache
+
+
+async def get_access_set(db: AsyncSession, user_id: UUID) -> AccessSet:
+    """Get a user's (cached) access set."""
+    return await get_access_cache().get(db, user_id)
+
+
+# --- Invalidation ---
+
+def invalidate_users(user_ids: set[UUID]) -> None:
+    """Invalidate the cached access sets of specific users."""
+    if _access_cache is not None:
+        _access_cache.evict(user_ids)
+    schedule_counter_bumps(
+        [user_version_key(user_id) for user_id in user_ids],
+        "access_cache_invalidation_failed",
+    )
+
+
+def invalidate_all() -> None:
+    """Invalidate every cached access set."""
+    if _access_cache is not None:
+        _access_cache.evict()
+    schedule_counter_bumps([EPOCH_KEY], "access_cache_invalidation_failed")
+
+
+def _attr_changed(obj: object, names: tuple[str, ...]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+def _attr_values(obj: object, name: str) -> set:
+    """An attribute's current and previous values, without loading it."""
+    state = inspect(obj)
+    values = set(state.attrs[name].history.deleted)
+    values.add(state.dict.get(name))
+    values.discard(None)
+    return values
+
+
+def _pending_invalidation(session: Session) -> dict:
+    return session.info.setdefault("access_invalidation", {
+        "users": set(),
+        "projects": set(),
+        "teams": set(),
+        "orgs": set(),
+        "public": False,
+        "all": False,
+    })
+
+
+def _affected_user_ids(
+    session: Session,
+    project_ids: set[UUID],
+    team_ids: set[UUID],
+    org_ids: set[UUID],
+    public: bool,
+) -> set[UUID]:
+    """Users whose access sets changes to these rows can affect.
+
+    A project change reaches everyone with a route to the project or its
+    ancestors (children inherit): creators, members, shares, members and
+    owners of the linked teams, and, if any of those projects is (or was)
+    org-public, members of the linked teams' organizations. A team change
+    reaches the team's members and owner; an organization, its members.
+    """
+    users: set[UUID] = set()
+    team_ids, org_ids = set(team_ids), set(org_ids)
+
+    if project_ids:
+        ancestors = hierarchy.ancestors_cte(list(project_ids))
+        chain = set(project_ids) | set(session.execute(select(ancestors.c.ancestor_id)).scalars())
+        for team_id, created_by_id, is_org_public in session.execute(
+            select(Project.team_id, Project.created_by_id, Project.is_org_public)
+            .where(Project.id.in_(chain))
+        ):
+            users.add(created_by_id)
+            team_ids.add(team_id)
+            public = public or is_org_public
+        team_ids.update(session.execute(
+            select(ProjectTeam.team_id).where(ProjectTeam.project_id.in_(chain))
+        ).scalars())
+        for model in (ProjectMember, ProjectShare):
+            users.update(session.execute(
+                select(model.user_id).where(model.project_id.in_(chain))
+            ).scalars())
+
+    team_ids.discard(None)
+    if team_ids:
+        users.update(session.execute(
+            select(TeamMember.user_id).where(TeamMember.team_id.in_(team_ids))
+        ).scalars())
+        for owner_id, organization_id in session.execute(
+            select(Team.owner_id, Team.organization_id).where(Team.id.in_(team_ids))
+        ):
+            users.add(owner_id)
+            if public:
+                org_ids.add(organization_id)
+
+    org_ids.discard(None)
+    if org_ids:
+        users.update(session.execute(
+            select(OrganizationMember.user_id)
+            .where(OrganizationMember.organization_id.in_(org_ids))
+        ).scalars())
+
+    users.discard(None)
+    return users
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_access_deletions(session: Session, flush_context, instances) -> None:
+    """Resolve who loses access through projects, teams and organizations
+    about to be deleted.
+
+    Their memberships go with them through database cascades the session
+    never sees, so they are looked up while they still exist. Deletes of
+    these rows are rare, so the lookup seldom runs.
+    """
+    projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    teams = {obj.id for obj in session.deleted if isinstance(obj, Team)}
+    orgs = {obj.id for obj in session.deleted if isinstance(obj, Organization)}
+    if projects or teams or orgs:
+        _pending_invalidation(session)["users"].update(
+            _affected_user_ids(session, projects, teams, orgs, public=True)
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_access_changes(session: Session, flush_context) -> None:
+    """Record the flushed rows that can change someone's access set."""
+    pending = _pending_invalidation(session)
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, USER_SCOPED_MODELS):
+            # Reassigned rows also change the previous user's access
+            pending["users"].update(_attr_values(obj, "user_id"))
+        elif isinstance(obj, ProjectTeam):
+            pending["projects"].update(_attr_values(obj, "project_id"))
+            pending["teams"].update(_attr_values(obj, "team_id"))
+        elif isinstance(obj, Project) and obj not in session.deleted:
+            if obj in session.dirty and not _attr_changed(obj, PROJECT_ACCESS_ATTRS):
+                continue
+            pending["projects"].add(obj.id)
+            # Users who reached it through its previous parent or team
+            pending["projects"].update(inspect(obj).attrs.parent_id.history.deleted)
+            pending["teams"].update(inspect(obj).attrs.team_id.history.deleted)
+            if obj in session.dirty and _attr_changed(obj, PROJECT_PUBLIC_ATTRS):
+                pending["public"] = True
+        elif isinstance(obj, Team) and obj in session.dirty:
+            if not _attr_changed(obj, TEAM_ACCESS_ATTRS):
+                continue
+            pending["teams"].add(obj.id)
+            pending["users"].update(_attr_values(obj, "owner_id"))
+            pending["orgs"].update(_attr_values(obj, "organization_id"))
+
+    pending["projects"].discard(None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_access_changes(orm_execute_state) -> None:
+    """Bulk UPDATE/DELETE statements don't say which rows changed."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(
+        mapper.class_, (*USER_SCOPED_MODELS, ProjectTeam, Project, Team, Organization)
+    ):
+        _pending_invalidation(orm_execute_state.session)["all"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session) -> None:
+    """Resolve the affected users and bump their stamps before the commit.
+
+    Runs inside the transaction, so the lookups see its changes. Until the
+    commit lands, sets rebuilt with the new stamps may still reflect the old
+    rows; the after-commit bump invalidates those.
+    """
+    session.flush()
+    pending = session.info.get("access_invalidation")
+    if not pending:
+        return
+    if pending["projects"] or pending["teams"] or pending["orgs"]:
+        pending["users"].update(_affected_user_ids(
+            session, pending["projects"], pending["teams"], pending["orgs"], pending["public"]
+        ))
+        pending["projects"], pending["teams"], pending["orgs"] = set(), set(), set()
+    keys = [EPOCH_KEY] if pending["all"] else []
+    keys.extend(user_version_key(user_id) for user_id in pending["users"])
+    bump_counters_now(keys, "access_cache_invalidation_failed")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_access_invalidation(session: Session) -> None:
+    """Bump the stamps again once the changes are visible to other sessions."""
+    pending = session.info.pop("access_invalidation", None)
+    if not pending:
+        return
+    if pending["all"]:
+        invalidate_all()
+    if pending["users"]:
+        invalidate_users(pending["users"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_access_invalidation(session: Session) -> None:
+    session.info.pop("access_invalidation", None)
@@ -0,0 +1,491 @@
+"""Organization analytics backed by daily rollup tables.
+
+Scanning the activities table for every dashboard load gets slow for large
+organizations. The refresh_analytics_rollups beat task therefore aggregates
+activities into per-day rows:
+
+- Activity counts by type (DailyActivityRollup).
+- Per-member counts (DailyContributorRollup).
+- A daily snapshot of task counts by status (DailyTaskStatusRollup).
+
+Activities are append-only, so only the last ``analytics_rollup_lookback_days``
+days plus today are recomputed on each run; older days are final. A run
+also goes back to the newest rolled-up day, so days missed while the beat
+was down are filled in; migration 047 backfilled history. Readers combine
+rollup rows for past days with a live aggregate over today's activities
+(and today's task counts), which the (organization_id, created_at) index
+keeps cheap. Day boundaries are UTC.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import (
+    Date,
+    Select,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from researchhub.models import (
+    Activity,
+    DailyActivityRollup,
+    DailyContributorRollup,
+    DailyTaskStatusRollup,
+    Document,
+    Idea,
+    OrganizationMember,
+    Paper,
+    Project,
+    Task,
+    Team,
+    User,
+)
+
+logger = structlog.get_logger()
+
+# Statuses broken out in the dashboard; other statuses only count toward totals
+TASK_STATUSES = ("todo", "in_progress", "in_review", "completed", "blocked")
+
+# Activity types counted per contributor
+CONTRIBUTOR_ACTIVITY_COLUMNS = {
+    "tasks_completed": "task.completed",
+    "documents_created": "document.created",
+    "comments_made": "comment.created",
+}
+
+# pg advisory lock key so overlapping refreshes skip instead of colliding
+_REFRESH_LOCK_KEY = 0x616E616C  # "anal"
+
+# UTC calendar day of an activity. The timezone name is a literal (not a
+# bind parameter) so the expression is identical in SELECT and GROUP BY.
+_ACTIVITY_DAY = cast(
+    func.timezone(literal_column("'UTC'"), Activity.created_at),
+    Date,
+)
+
+
+def utc_today() -> date:
+    """The current UTC date, which rollup days are keyed by."""
+    return datetime.now(timezone.utc).date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+# --- Refresh ---
+
+
+async def refresh_rollups(
+    db: AsyncSession,
+    lookback_days: int = 1,
+    today: date | None = None,
+) -> dict[str, int] | None:
+    """Recompute rollups for today and the previous ``lookback_days`` days.
+
+    Also recomputes every day since the newest rolled-up day, so a refresh
+    after an outage catches up. Recomputed days are deleted and re-inserted
+    in one transaction, so reruns are idempotent and groups that disappeared
+    are dropped. Pass a large ``lookback_days`` to backfill.
+
+    Returns:
+        Rows written per table, or None if another refresh holds the lock.
+    """
+    today = today or utc_today()
+    since_day = today - timedelta(days=lookback_days)
+
+    locked = await db.scalar(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+    if not locked:
+        logger.info("analytics_rollup_refresh_skipped", reason="locked")
+        return None
+
+    last_day = await db.scalar(select(func.max(DailyActivityRollup.day)))
+    if last_day is not None:
+        since_day = min(since_day, last_day)
+    since = _day_start(since_day)
+
+    started = time.monotonic()
+
+    await db.execute(delete(DailyActivityRollup).where(DailyActivityRollup.day >= since_day))
+    activity = await db.execute(
+        insert(DailyActivityRollup).from_select(
+            ["id", "organization_id", "day", "activity_type", "target_type", "activity_count"],
+            select(
+                func.gen_random_uuid(),
+                Activity.organization_id,
+                _ACTIVITY_DAY,
+                Activity.activity_type,
+                Activity.target_type,
+                func.count(),
+            )
+            .where(Activity.created_at >= since)
+            .group_by(
+                Activity.organization_id,
+                _ACTIVITY_DAY,
+                Activity.activity_type,
+                Activity.target_type,
+            ),
+        )
+    )
+
+    await db.execute(delete(DailyContributorRollup).where(DailyContributorRollup.day >= since_day))
+    contributors = await db.execute(
+        insert(DailyContributorRollup).from_select(
+            ["id", "organization_id", "day", "actor_id", "activity_count",
+             *CONTRIBUTOR_ACTIVITY_COLUMNS],
+            select(
+                func.gen_random_uuid(),
+                Activity.organization_id,
+                _ACTIVITY_DAY,
+                Activity.actor_id,
+                func.count(),
+                *(
+                    func.count(case((Activity.activity_type == activity_type, 1)))
+                    for activity_type in CONTRIBUTOR_ACTIVITY_COLUMNS.values()
+                ),
+            )
+            .where(Activity.created_at >= since)
+            .group_by(Activity.organization_id, _ACTIVITY_DAY, Activity.actor_id),
+        )
+    )
+
+    # Task status is a point-in-time snapshot: only today's row changes
+    await db.execute(delete(DailyTaskStatusRollup).where(DailyTaskStatusRollup.day == today))
+    task_status = await db.execute(
+        insert(DailyTaskStatusRollup).from_select(
+            ["id", "organization_id", "day", "status", "task_count"],
+            select(
+                func.gen_random_uuid(),
+                Team.organization_id,
+                literal(today, Date),
+                Task.status,
+                func.count(Task.id),
+            )
+            .join(Project, Task.project_id == Project.id)
+            .join(Team, Project.team_id == Team.id)
+            .where(Team.organization_id.isnot(None))  # Personal teams have no org
+            .group_by(Team.organization_id, Task.status),
+        )
+    )
+
+    await db.commit()
+
+    rows = {
+        "activity": activity.rowcount,
+        "contributors": contributors.rowcount,
+        "task_status": task_status.rowcount,
+    }
+    logger.info(
+        "analytics_rollups_refreshed",
+        since_day=since_day.isoformat(),
+        duration_ms=round((time.monotonic() - started) * 1000),
+        **rows,
+    )
+    return rows
+
+
+# --- Readers ---
+
+
+@dataclass
+class OrgSummary:
+    """Organization-wide counts from get_org_summary."""
+
+    total_projects: int
+    active_projects: int
+    total_tasks: int
+    task_status: dict[str, int] = field(default_factory=dict)
+    total_documents: int = 0
+    total_ideas: int = 0
+    total_papers: int = 0
+    total_members: int = 0
+    active_members_last_week: int = 0
+
+
+def _live_activity(organization_id: UUID, today: date, *columns: Any) -> Select:
+    """Select columns over today's activities, which are not final in the rollups."""
+    return select(*columns).where(
+        Activity.organization_id == organization_id,
+        Activity.created_at >= _day_start(today),
+    )
+
+
+async def get_org_summary(db: AsyncSession, organization_id: UUID) -> OrgSummary:
+    """Project, task, content and member counts in a single query.
+
+    Each count is a one-row aggregate subquery; the outer SELECT cross joins
+    them so the whole overview is one round trip.
+    """
+    today = utc_today()
+
+    projects = (
+        select(
+            func.count(Project.id).label("total"),
+            func.count(case((Project.status == "active", 1))).label("active"),
+        )
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+        .subquery("project_counts")
+    )
+    tasks = (
+        select(
+            func.count(Task.id).label("total"),
+            *(
+                func.count(case((Task.status == status, 1))).label(status)
+                for status in TASK_STATUSES
+            ),
+        )
+        .join(Project, Task.project_id == Project.id)
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+        .subquery("task_counts")
+    )
+    documents = (
+        select(func.count(Document.id))
+        .join(Project, Document.project_id == Project.id)
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+        .scalar_subquery()
+    )
+    ideas = (
+        select(func.count(Idea.id))
+        .where(Idea.organization_id == organization_id)
+        .scalar_subquery()
+    )
+    papers = (
+        select(func.count(Paper.id))
+        .where(Paper.organization_id == organization_id)
+        .scalar_subquery()
+    )
+    members = (
+        select(func.count(OrganizationMember.id))
+        .where(OrganizationMember.organization_id == organization_id)
+        .scalar_subquery()
+    )
+
+    # Members active over the last seven days plus today
+    recent_actors = union_all(
+        select(DailyContributorRollup.actor_id).where(
+            DailyContributorRollup.organization_id == organization_id,
+            DailyContributorRollup.day >= today - timedelta(days=7),
+            DailyContributorRollup.day < today,
+        ),
+        _live_activity(organization_id, today, Activity.actor_id),
+    ).subquery("recent_actors")
+    active_members = select(
+        func.count(func.distinct(recent_actors.c.actor_id))
+    ).scalar_subquery()
+
+    row = (
+        await db.execute(
+            select(
+                projects.c.total.label("total_projects"),
+                projects.c.active.label("active_projects"),
+                tasks.c.total.label("total_tasks"),
+                *(tasks.c[status] for status in TASK_STATUSES),
+                documents.label("total_documents"),
+                ideas.label("total_ideas"),
+                papers.label("total_papers"),
+                members.label("total_members"),
+                active_members.label("active_members"),
+            )
+        )
+    ).one()
+
+    return OrgSummary(
+        total_projects=row.total_projects,
+        active_projects=row.active_projects,
+        total_tasks=row.total_tasks,
+        task_status={status: row._mapping[status] for status in TASK_STATUSES},
+        total_documents=row.total_documents,
+        total_ideas=row.total_ideas,
+        total_papers=row.total_papers,
+        total_members=row.total_members,
+        active_members_last_week=row.active_members,
+    )
+
+
+async def get_activity_timeline(
+    db: AsyncSession,
+    organization_id: UUID,
+    days: int,
+) -> list[tuple[date, str, int]]:
+    """(day, target_type, count) for the last ``days`` days, oldest first."""
+    today = utc_today()
+    combined = union_all(
+        select(
+            DailyActivityRollup.day.label("day"),
+            DailyActivityRollup.target_type.label("target_type"),
+            DailyActivityRollup.activity_count.label("activity_count"),
+        ).where(
+            DailyActivityRollup.organization_id == organization_id,
+            DailyActivityRollup.day >= today - timedelta(days=days),
+            DailyActivityRollup.day < today,
+        ),
+        _live_activity(organization_id, today, literal(today, Date), Activity.target_type, func.count())
+        .group_by(Activity.target_type),
+    ).subquery("activity_days")
+
+    result = await db.execute(
+        select(
+            combined.c.day,
+            combined.c.target_type,
+            func.sum(combined.c.activity_count).label("count"),
+        )
+        .group_by(combined.c.day, combined.c.target_type)
+        .order_by(combined.c.day)
+    )
+    return [(row.day, row.target_type, int(row.count)) for row in result.all()]
+
+
+async def get_activity_type_counts(
+    db: AsyncSession,
+    organization_id: UUID,
+    days: int,
+) -> list[tuple[str, int]]:
+    """(activity_type, count) over the last ``days`` days, most frequent first."""
+    today = utc_today()
+    combined = union_all(
+        select(
+            DailyActivityRollup.activity_type.label("activity_type"),
+            DailyActivityRollup.activity_count.label("activity_count"),
+        ).where(
+            DailyActivityRollup.organization_id == organization_id,
+            DailyActivityRollup.day >= today - timedelta(days=days),
+            DailyActivityRollup.day < today,
+        ),
+        _live_activity(organization_id, today, Activity.activity_type, func.count())
+        .group_by(Activity.activity_type),
+    ).subquery("activity_types")
+
+    total = func.sum(combined.c.activity_count)
+    result = await db.execute(
+        select(combined.c.activity_type, total.label("count"))
+        .group_by(combined.c.activity_type)
+        .order_by(total.desc())
+    )
+    return [(row.activity_type, int(row.count)) for row in result.all()]
+
+
+@dataclass
+class ContributorCounts:
+    """One member's activity totals over a period."""
+
+    user_id: UUID
+    user_name: str | None
+    activity_count: int
+    tasks_completed: int
+    documents_created: int
+    comments_made: int
+
+
+async def get_top_contributors(
+    db: AsyncSession,
+    organization_id: UUID,
+    days: int,
+    limit: int,
+) -> list[ContributorCounts]:
+    """Members with the most activity over the last ``days`` days."""
+    today = utc_today()
+    rolled = select(
+        DailyContributorRollup.actor_id.label("actor_id"),
+        DailyContributorRollup.activity_count.label("activity_count"),
+        *(
+            getattr(DailyContributorRollup, column).label(column)
+            for column in CONTRIBUTOR_ACTIVITY_COLUMNS
+        ),
+    ).where(
+        DailyContributorRollup.organization_id == organization_id,
+        DailyContributorRollup.day >= today - timedelta(days=days),
+        DailyContributorRollup.day < today,
+    )
+    live = (
+        _live_activity(
+            organization_id,
+            today,
+            Activity.actor_id,
+            func.count(),
+            *(
+                func.count(case((Activity.activity_type == activity_type, 1)))
+                for activity_type in CONTRIBUTOR_ACTIVITY_COLUMNS.values()
+            ),
+        )
+        .group_by(Activity.actor_id)
+    )
+    combined = union_all(rolled, live).subquery("contributor_days")
+
+    activity_total = func.sum(combined.c.activity_count)
+    result = await db.execute(
+        select(
+            combined.c.actor_id,
+            User.display_name,
+            activity_total.label("activity_count"),
+            *(
+                func.sum(combined.c[column]).label(column)
+                for column in CONTRIBUTOR_ACTIVITY_COLUMNS
+            ),
+        )
+        .join(User, combined.c.actor_id == User.id)
+        .group_by(combined.c.actor_id, User.display_name)
+        .order_by(activity_total.desc())
+        .limit(limit)
+    )
+    return [
+        ContributorCounts(
+            user_id=row.actor_id,
+            user_name=row.display_name,
+            activity_count=int(row.activity_count),
+            tasks_completed=int(row.tasks_completed),
+            documents_created=int(row.documents_created),
+            comments_made=int(row.comments_made),
+        )
+        for row in result.all()
+    ]
+
+
+async def get_task_status_history(
+    db: AsyncSession,
+    organization_id: UUID,
+    days: int,
+) -> list[tuple[date, str, int]]:
+    """(day, status, count) snapshots for the last ``days`` days, oldest first.
+
+    Past days come from the rollup snapshots; today is counted live, so the
+    series is never empty before the first refresh.
+    """
+    today = utc_today()
+    combined = union_all(
+        select(
+            DailyTaskStatusRollup.day.label("day"),
+            DailyTaskStatusRollup.status.label("status"),
+            DailyTaskStatusRollup.task_count.label("task_count"),
+        ).where(
+            DailyTaskStatusRollup.organization_id == organization_id,
+            DailyTaskStatusRollup.day >= today - timedelta(days=days),
+            DailyTaskStatusRollup.day < today,
+        ),
+        select(literal(today, Date), Task.status, func.count(Task.id))
+        .join(Project, Task.project_id == Project.id)
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+        .group_by(Task.status),
+    ).subquery("status_days")
+
+    result = await db.execute(
+        select(combined.c.day, combined.c.status, combined.c.task_count)
+        .order_by(combined.c.day, combined.c.status)
+    )
+    return [(row.day, row.status, int(row.task_count)) for row in result.all()]
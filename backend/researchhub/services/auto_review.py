@@ -18,10 +18,12 @@ from sqlalchemy.orm import selectinload
 
 from researchhub.ai.service import get_ai_service
 from researchhub.ai.schemas import AIFeatureName
+from researchhub.config import get_settings
 from researchhub.models.document import Document
 from researchhub.models.project import Task
 from researchhub.models.review import Review, AutoReviewConfig, AutoReviewLog
 from researchhub.models.activity import Notification
+from researchhub.services.document_retrieval import select_passages
 from researchhub.services.review import ReviewService
 
 logger = logging.getLogger(__name__)
@@ -67,7 +69,7 @@ class AutoReviewService:
             List of AI suggestion dicts ready for ReviewComment creation
         """
         # 1. Assemble context bundle
-        context = await self._assemble_context_bundle(task_id)
+        context = await self._assemble_context_bundle(task_id, focus_areas)
 
         if not context["has_content"]:
             logger.info(
@@ -154,11 +156,19 @@ class AutoReviewService:
 
         return len(comments)
 
-    async def _assemble_context_bundle(self, task_id: UUID) -> dict[str, Any]:
+    async def _assemble_context_bundle(
+        self,
+        task_id: UUID,
+        focus_areas: list[str] | None = None,
+    ) -> dict[str, Any]:
         """Assemble content from task and all linked documents.
 
+        Linked documents contribute the passages most relevant to the task
+        and focus areas, within settings.auto_review_context_tokens in total.
+
         Args:
             task_id: Task to assemble context for
+            focus_areas: Optional focus areas, used to pick passages
 
         Returns:
             Context bundle dict with task and document content
@@ -185,12 +195,19 @@ class AutoReviewService:
         }
 
         # Add linked documents
-        for doc in task.linked_documents or []:
+        documents = list(task.linked_documents or [])
+        query = " ".join(filter(None, [task.title, context["task_description"], *(focus_areas or [])]))
+        excerpts = await select_passages(
+            self.db, documents, query, get_settings().auto_review_context_tokens
+        )
+        for doc in documents:
+            excerpt = excerpts[doc.id]
             doc_content = {
                 "document_id": str(doc.id),
                 "document_title": doc.title,
                 "document_type": doc.document_type,
-                "content": self._extract_text_from_content(doc.content),
+                "content": excerpt.text,
+                "excerpted": not excerpt.complete,
             }
             context["documents"].append(doc_content)
 
@@ -332,11 +349,9 @@ class AutoReviewService:
             parts.append(f"=== DOCUMENT {i}: {doc['document_title']} ===")
             parts.append(f"Type: {doc.get('document_type', 'unknown')}")
             if doc["content"]:
-                # Truncate very long documents
-                content = doc["content"]
-                if len(content) > 10000:
-                    content = content[:10000] + "\n\n[Content truncated...]"
-                parts.append(f"\nContent:\n{content}")
+                # Long documents are bounded to their most relevant passages
+                label = "Excerpts ([...] marks omitted text)" if doc.get("excerpted") else "Content"
+                parts.append(f"\n{label}:\n{doc['content']}")
             parts.append("")
 
         return "\n".join(parts)
@@ -0,0 +1,180 @@
+"""Text chunking for passage-level embeddings.
+
+Splits long entity text into passages that fit the embedding model's
+context, preferring TipTap block boundaries (paragraphs, headings, lists)
+and falling back to sentence and then hard character splits for oversized
+blocks. Token counts use the same ~4 characters per token estimate as the
+rest of the embedding pipeline.
+"""
+
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+CHARS_PER_TOKEN = 4
+BLOCK_SEPARATOR = "\n\n"
+
+# TipTap node types that start a new section when chunking
+SECTION_NODE_TYPES = {"heading"}
+
+# Sentence or line boundaries used to split blocks that exceed a chunk
+_SENTENCE_BOUNDARY = re.compile(r"[.!?]\s+|\n+")
+
+
+@dataclass
+class TextChunk:
+    """A passage of an entity's text, with character offsets into it."""
+
+    index: int
+    text: str
+    span_start: int
+    span_end: int
+    token_count: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (~4 characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _node_text(node: dict) -> str:
+    """Recursively extract text from a TipTap node."""
+    if not isinstance(node, dict):
+        return ""
+    if node.get("type") == "text":
+        return node.get("text", "")
+    children = node.get("content", [])
+    if not isinstance(children, list):
+        return ""
+    return " ".join(filter(None, (_node_text(child) for child in children)))
+
+
+def tiptap_blocks(content: dict | None) -> tuple[list[str], set[int]]:
+    """Split TipTap JSON into top-level block texts.
+
+    Returns:
+        The non-empty block texts, and the indexes of blocks that start a
+        section (headings).
+    """
+    if not content or not isinstance(content.get("content"), list):
+        return [], set()
+
+    blocks: list[str] = []
+    sections: set[int] = set()
+    for node in content["content"]:
+        text = re.sub(r"\s+", " ", _node_text(node)).strip()
+        if not text:
+            continue
+        if isinstance(node, dict) and node.get("type") in SECTION_NODE_TYPES:
+            sections.add(len(blocks))
+        blocks.append(text)
+    return blocks, sections
+
+
+def text_blocks(text: str | None) -> list[str]:
+    """Split plain text into paragraph blocks on blank lines."""
+    if not text:
+        return []
+    return [block.strip() for block in re.split(r"\n\s*\n", text) if block.strip()]
+
+
+def _split_block(block: str, max_chars: int) -> list[tuple[int, int]]:
+    """Split an oversized block into (start, end) spans of at most max_chars."""
+    boundaries = [m.end() for m in _SENTENCE_BOUNDARY.finditer(block)] + [len(block)]
+    spans: list[tuple[int, int]] = []
+    start = 0
+    end = 0
+    for boundary in boundaries:
+        if boundary - start <= max_chars:
+            end = boundary
+            continue
+        if end > start:
+            spans.append((start, end))
+            start = end
+        # A single sentence longer than a chunk: hard split it
+        while boundary - start > max_chars:
+            spans.append((start, start + max_chars))
+            start += max_chars
+        end = boundary
+    if end > start:
+        spans.append((start, end))
+    return spans
+
+
+def chunk_blocks(
+    blocks: list[str],
+    max_tokens: int,
+    section_starts: set[int] | None = None,
+) -> list[TextChunk]:
+    """Pack blocks into chunks of at most max_tokens.
+
+    Blocks are never split unless a single block exceeds max_tokens. A
+    section start (heading) begins a new chunk once the current chunk is at
+    least a quarter full, so passages tend to align with document sections.
+    Spans are offsets into ``BLOCK_SEPARATOR.join(blocks)``.
+    """
+    section_starts = section_starts or set()
+    full_text = BLOCK_SEPARATOR.join(blocks)
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    # (start, end, starts_section) pieces in document order
+    pieces: list[tuple[int, int, bool]] = []
+    offset = 0
+    for i, block in enumerate(blocks):
+        if len(block) <= max_chars:
+            pieces.append((offset, offset + len(block), i in section_starts))
+        else:
+            for j, (start, end) in enumerate(_split_block(block, max_chars)):
+                pieces.append((offset + start, offset + end, j == 0 and i in section_starts))
+        offset += len(block) + len(BLOCK_SEPARATOR)
+
+    chunks: list[TextChunk] = []
+    current: tuple[int, int] | None = None
+
+    def flush() -> None:
+        start, end = current
+        while end > start and full_text[end - 1].isspace():
+            end -= 1
+        text = full_text[start:end]
+        if text:
+            chunks.append(TextChunk(
+                index=len(chunks),
+                text=text,
+                span_start=start,
+                span_end=end,
+                token_count=estimate_tokens(text),
+            ))
+
+    for start, end, starts_section in pieces:
+        if current is not None:
+            current_chars = current[1] - current[0]
+            if end - current[0] > max_chars or (
+                starts_section and current_chars >= max_chars // 4
+            ):
+                flush()
+                current = None
+        current = (start, end) if current is None else (current[0], end)
+
+    if current is not None:
+        flush()
+    return chunks
+
+
+def pack_by_token_budget(
+    texts: list[str],
+    max_tokens: int,
+    max_items: int,
+) -> Iterator[list[str]]:
+    """Group texts into request batches bounded by total tokens and item count."""
+    batch: list[str] = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_items):
+            yield batch
+            batch = []
+            batch_tokens = 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        yield batch
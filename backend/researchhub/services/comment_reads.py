@@ -0,0 +1,251 @@
+"""Comment read tracking with per-thread read watermarks.
+
+A user's progress through a comment thread (a task's, document's or
+review's comments, or the generic comments on one resource) is a single
+CommentThreadRead row: comments created at or before its ``read_through``
+are read. Marking a thread read writes that one row, and unread counts for
+any number of threads come from one grouped query that compares each
+comment's ``created_at`` with the watermark. A user's own comments never
+count as unread.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from researchhub.models.collaboration import Comment, CommentThreadRead
+from researchhub.models.document import DocumentComment
+from researchhub.models.project import TaskComment
+from researchhub.models.review import ReviewComment
+
+CommentType = Literal["task", "document", "review", "generic"]
+
+
+@dataclass(frozen=True)
+class _Thread:
+    """Where a comment type keeps its thread and author."""
+
+    comment: Any
+    thread_id: Any
+    author_id: Any
+
+
+THREADS: dict[str, _Thread] = {
+    "task": _Thread(TaskComment, TaskComment.task_id, TaskComment.user_id),
+    "document": _Thread(DocumentComment, DocumentComment.document_id, DocumentComment.created_by_id),
+    "review": _Thread(ReviewComment, ReviewComment.review_id, ReviewComment.user_id),
+    "generic": _Thread(Comment, Comment.resource_id, Comment.author_id),
+}
+
+
+@dataclass
+class ThreadUnread:
+    """Comment totals for one thread."""
+
+    total_comments: int
+    unread_count: int
+
+
+def _watermark_join(thread: _Thread, comment_type: str, user_id: UUID):
+    return and_(
+        CommentThreadRead.user_id == user_id,
+        CommentThreadRead.thread_type == comment_type,
+        CommentThreadRead.thread_id == thread.thread_id,
+    )
+
+
+def _is_unread(thread: _Thread, user_id: UUID):
+    return and_(
+        thread.author_id.is_distinct_from(user_id),
+        or_(
+            CommentThreadRead.read_through.is_(None),
+            thread.comment.created_at > CommentThreadRead.read_through,
+        ),
+    )
+
+
+async def _advance(
+    db: AsyncSession,
+    user_id: UUID,
+    comment_type: str,
+    watermarks: dict[UUID, datetime],
+) -> None:
+    """Move watermarks forward; a watermark never moves back here."""
+    if not watermarks:
+        return
+    stmt = insert(CommentThreadRead).values([
+        {
+            "user_id": user_id,
+            "thread_type": comment_type,
+            "thread_id": thread_id,
+            "read_through": read_through,
+        }
+        for thread_id, read_through in watermarks.items()
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_comment_thread_read",
+            set_={
+                "read_through": func.greatest(
+                    CommentThreadRead.read_through, stmt.excluded.read_through
+                ),
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def mark_thread_read(
+    db: AsyncSession,
+    user_id: UUID,
+    comment_type: CommentType,
+    thread_id: UUID,
+) -> datetime:
+    """Mark every comment currently in a thread as read.
+
+    Returns:
+        The thread's new watermark
+    """
+    thread = THREADS[comment_type]
+    latest = await db.scalar(
+        select(func.max(thread.comment.created_at)).where(thread.thread_id == thread_id)
+    )
+    read_through = latest or datetime.now(timezone.utc)
+    await _advance(db, user_id, comment_type, {thread_id: read_through})
+    return read_through
+
+
+async def mark_comments_read(
+    db: AsyncSession,
+    user_id: UUID,
+    comment_type: CommentType,
+    comment_ids: Sequence[UUID],
+) -> int:
+    """Advance each affected thread's watermark to the newest of ``comment_ids``.
+
+    Comments in those threads up to that point count as read too.
+
+    Returns:
+        Number of ``comment_ids`` that exist
+    """
+    thread = THREADS[comment_type]
+    result = await db.execute(
+        select(
+            thread.thread_id,
+            func.max(thread.comment.created_at),
+            func.count(),
+        )
+        .where(thread.comment.id.in_(comment_ids))
+        .group_by(thread.thread_id)
+    )
+    rows = result.all()
+    await _advance(db, user_id, comment_type, {row[0]: row[1] for row in rows})
+    return sum(row[2] for row in rows)
+
+
+async def mark_comment_unread(
+    db: AsyncSession,
+    user_id: UUID,
+    comment_type: CommentType,
+    comment_id: UUID,
+) -> bool:
+    """Move the thread's watermark back to just before ``comment_id``.
+
+    That comment and every later one in the thread become unread.
+
+    Returns:
+        Whether the watermark moved
+    """
+    thread = THREADS[comment_type]
+    comment = (await db.execute(
+        select(thread.thread_id, thread.comment.created_at).where(thread.comment.id == comment_id)
+    )).first()
+    if comment is None:
+        return False
+
+    read_through = comment[1] - timedelta(microseconds=1)
+    result = await db.execute(
+        update(CommentThreadRead)
+        .where(
+            CommentThreadRead.user_id == user_id,
+            CommentThreadRead.thread_type == comment_type,
+            CommentThreadRead.thread_id == comment[0],
+            CommentThreadRead.read_through > read_through,
+        )
+        .values(read_through=read_through)
+    )
+    return result.rowcount > 0
+
+
+async def read_state(
+    db: AsyncSession,
+    user_id: UUID,
+    comment_type: CommentType,
+    comment_ids: Sequence[UUID],
+) -> dict[UUID, Optional[datetime]]:
+    """When each comment was read, or None if it is unread.
+
+    The read time of a read comment is when its thread's watermark last
+    moved. Comments that don't exist are omitted.
+    """
+    thread = THREADS[comment_type]
+    result = await db.execute(
+        select(
+            thread.comment.id,
+            thread.comment.created_at <= CommentThreadRead.read_through,
+            CommentThreadRead.updated_at,
+        )
+        .outerjoin(CommentThreadRead, _watermark_join(thread, comment_type, user_id))
+        .where(thread.comment.id.in_(comment_ids))
+    )
+    return {row[0]: row[2] if row[1] else None for row in result.all()}
+
+
+def with_unread_count(query: Select, user_id: UUID, comment_type: CommentType) -> Select:
+    """Add an ``unread_count`` column to a grouped query over comments.
+
+    ``query`` must select from the comment table of ``comment_type``; its
+    grouping decides what the count is per (thread, project, ...).
+    """
+    thread = THREADS[comment_type]
+    return (
+        query
+        .add_columns(func.count().filter(_is_unread(thread, user_id)).label("unread_count"))
+        .outerjoin(CommentThreadRead, _watermark_join(thread, comment_type, user_id))
+    )
+
+
+async def unread_counts(
+    db: AsyncSession,
+    user_id: UUID,
+    comment_type: CommentType,
+    thread_ids: Select | Sequence[UUID],
+) -> dict[UUID, ThreadUnread]:
+    """Total and unread comments per thread, in one grouped query.
+
+    Args:
+        db: Database session
+        user_id: Reader
+        comment_type: Kind of thread
+        thread_ids: Thread ids, or a select of them (e.g. a project's task
+            ids), which runs as part of the same query
+
+    Returns:
+        Counts for the threads that have comments
+    """
+    thread = THREADS[comment_type]
+    query = (
+        select(thread.thread_id, func.count().label("total_comments"))
+        .where(thread.thread_id.in_(thread_ids))
+        .group_by(thread.thread_id)
+    )
+    result = await db.execute(with_unread_count(query, user_id, comment_type))
+    return {
+        row[0]: ThreadUnread(total_comments=row.total_comments, unread_count=row.unread_count)
+        for row in result.all()
+    }
@@ -0,0 +1,304 @@
+"""Relevant-passage retrieval for prompts about documents.
+
+Prompts that discuss a document (document chat, auto-review bundles) get
+the passages most relevant to the question instead of the whole text, so
+their size is bounded by a token budget however long the documents are.
+Documents that fit the budget whole are included whole.
+
+Passages are the same chunks the embedding pipeline stores in
+EmbeddingChunk (see EmbeddingService.chunk_entity). Each is ranked two
+ways, and the rankings are merged with Reciprocal Rank Fusion:
+
+- by cosine similarity of its stored chunk embedding to the question,
+  computed in SQL. Chunks whose stored text no longer matches the
+  document (the embedding queue hasn't caught up with an edit) are
+  skipped.
+- by BM25 keyword score of the question against the passage.
+
+Chunking and term statistics are kept per document in an in-process LRU
+keyed by the document's ``updated_at``, so follow-up questions about an
+unchanged document reuse them; an edited document gets a new entry.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from researchhub.config import get_settings
+from researchhub.models.document import Document
+from researchhub.models.embedding import EmbeddingChunk
+from researchhub.services.embedding import get_embedding_service
+
+logger = structlog.get_logger()
+
+# Marks text left out between two excerpts
+OMISSION = "\n\n[...]\n\n"
+
+# RRF constant, as in the assistant's hybrid search
+RRF_K = 60
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TERM = re.compile(r"\w{2,}")
+
+
+def _terms(text: str) -> list[str]:
+    return _TERM.findall(text.lower())
+
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _IndexedPassage:
+    index: int
+    text: str
+    token_count: int
+    text_md5: str
+    term_counts: Counter
+    length: int
+
+
+@dataclass
+class _PassageIndex:
+    passages: list[_IndexedPassage]
+
+    @property
+    def token_count(self) -> int:
+        return sum(p.token_count for p in self.passages)
+
+
+@dataclass
+class DocumentExcerpt:
+    """The text of one document selected for a prompt."""
+
+    document_id: UUID
+    text: str
+    complete: bool
+    passage_indexes: list[int] = field(default_factory=list)
+    token_count: int = 0
+
+
+class _PassageIndexCache:
+    """LRU of passage indexes keyed by (document id, updated_at)."""
+
+    def __init__(self, max_documents: int):
+        self.max_documents = max_documents
+        self._entries: OrderedDict[tuple[UUID, datetime], _PassageIndex] = OrderedDict()
+
+    def get(self, document: Document) -> _PassageIndex:
+        key = (document.id, document.updated_at)
+        index = self._entries.get(key)
+        if index is not None:
+            self._entries.move_to_end(key)
+            return index
+
+        service = get_embedding_service()
+        text = service.extract_text_for_embedding("document", document) or ""
+        passages = []
+        for chunk in service.chunk_entity("document", document, text):
+            terms = _terms(chunk.text)
+            passages.append(_IndexedPassage(
+                index=chunk.index,
+                text=chunk.text,
+                token_count=chunk.token_count,
+                text_md5=_md5(chunk.text),
+                term_counts=Counter(terms),
+                length=len(terms),
+            ))
+        index = _PassageIndex(passages)
+
+        # An edited document's old entry is never hit again
+        for stale in [k for k in self._entries if k[0] == document.id]:
+            del self._entries[stale]
+        self._entries[key] = index
+        while len(self._entries) > self.max_documents:
+            self._entries.popitem(last=False)
+        return index
+
+
+_cache: _PassageIndexCache | None = None
+
+
+def _get_cache() -> _PassageIndexCache:
+    global _cache
+    if _cache is None:
+        _cache = _PassageIndexCache(get_settings().document_passage_cache_max_documents)
+    return _cache
+
+
+def _bm25_ranking(
+    candidates: list[tuple[UUID, _IndexedPassage]],
+    query: str,
+) -> list[tuple[UUID, int]]:
+    """Candidates with any query term, best BM25 score first."""
+    query_terms = set(_terms(query))
+    if not query_terms or not candidates:
+        return []
+
+    count = len(candidates)
+    avg_length = sum(p.length for _, p in candidates) / count or 1.0
+    document_frequency = {
+        term: sum(1 for _, p in candidates if term in p.term_counts)
+        for term in query_terms
+    }
+
+    scored = []
+    for document_id, passage in candidates:
+        score = 0.0
+        for term in query_terms:
+            tf = passage.term_counts.get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * passage.length / avg_length)
+            score += idf * tf * (BM25_K1 + 1) / norm
+        if score > 0:
+            scored.append((score, document_id, passage.index))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [(document_id, index) for _, document_id, index in scored]
+
+
+async def _embedding_ranking(
+    db: AsyncSession,
+    indexes: dict[UUID, _PassageIndex],
+    query: str,
+) -> list[tuple[UUID, int]]:
+    """Passages with a current stored embedding, most similar first."""
+    settings = get_settings()
+    try:
+        query_embedding = await get_embedding_service().generate_query_embedding(query)
+    except Exception as e:
+        # Keyword ranking alone still bounds and orders the prompt
+        logger.warning("document_retrieval_embedding_unavailable", error=str(e))
+        return []
+
+    distance = EmbeddingChunk.embedding.cosine_distance(query_embedding)
+    result = await db.execute(
+        select(EmbeddingChunk.entity_id, EmbeddingChunk.chunk_idx, func.md5(EmbeddingChunk.content))
+        .where(
+            EmbeddingChunk.entity_type == "document",
+            EmbeddingChunk.entity_id.in_(list(indexes)),
+            EmbeddingChunk.embedding_model == settings.embedding_model,
+        )
+        .order_by(distance)
+    )
+
+    ranking = []
+    for document_id, chunk_idx, text_md5 in result.all():
+        passages = indexes[document_id].passages
+        if chunk_idx < len(passages) and passages[chunk_idx].text_md5 == text_md5:
+            ranking.append((document_id, chunk_idx))
+    return ranking
+
+
+def _format(passages: list[_IndexedPassage], total: int) -> str:
+    """Passages in document order, marking where text was left out."""
+    if not passages:
+        return ""
+    parts = [OMISSION.lstrip()] if passages[0].index > 0 else []
+    previous: Optional[int] = None
+    for passage in passages:
+        if previous is not None:
+            parts.append(OMISSION if passage.index != previous + 1 else "\n\n")
+        parts.append(passage.text)
+        previous = passage.index
+    if previous < total - 1:
+        parts.append(OMISSION.rstrip())
+    return "".join(parts)
+
+
+async def select_passages(
+    db: AsyncSession,
+    documents: Sequence[Document],
+    query: str,
+    token_budget: int,
+) -> dict[UUID, DocumentExcerpt]:
+    """Pick the passages of ``documents`` most relevant to ``query``.
+
+    Args:
+        db: Database session, for stored chunk embeddings
+        documents: Documents to draw from, with their content loaded
+        query: The question or topic the prompt is about
+        token_budget: Maximum estimated tokens across all excerpts
+
+    Returns:
+        An excerpt per document, passages in document order and joined with
+        an omission marker where text was skipped. A document with no
+        selected passage gets an empty excerpt.
+    """
+    cache = _get_cache()
+    indexes = {document.id: cache.get(document) for document in documents}
+
+    if sum(index.token_count for index in indexes.values()) <= token_budget:
+        return {
+            document_id: DocumentExcerpt(
+                document_id=document_id,
+                text=_format(index.passages, len(index.passages)),
+                complete=True,
+                passage_indexes=[p.index for p in index.passages],
+                token_count=index.token_count,
+            )
+            for document_id, index in indexes.items()
+        }
+
+    candidates = [
+        (document_id, passage)
+        for document_id, index in indexes.items()
+        for passage in index.passages
+    ]
+    scores: dict[tuple[UUID, int], float] = {}
+    rankings = [_bm25_ranking(candidates, query), await _embedding_ranking(db, indexes, query)]
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+
+    # Unmatched passages keep document order as a last resort, so the
+    # budget is still filled (e.g. with the opening of the document)
+    order = sorted(
+        range(len(candidates)),
+        key=lambda i: -scores.get((candidates[i][0], candidates[i][1].index), 0.0),
+    )
+
+    selected: dict[UUID, list[_IndexedPassage]] = {document_id: [] for document_id in indexes}
+    remaining = token_budget
+    for i in order:
+        document_id, passage = candidates[i]
+        if passage.token_count <= remaining:
+            selected[document_id].append(passage)
+            remaining -= passage.token_count
+
+    excerpts = {}
+    for document_id, passages in selected.items():
+        passages.sort(key=lambda p: p.index)
+        excerpts[document_id] = DocumentExcerpt(
+            document_id=document_id,
+            text=_format(passages, len(indexes[document_id].passages)),
+            complete=len(passages) == len(indexes[document_id].passages),
+            passage_indexes=[p.index for p in passages],
+            token_count=sum(p.token_count for p in passages),
+        )
+
+    logger.info(
+        "document_passages_selected",
+        documents=len(indexes),
+        passages=sum(len(p) for p in selected.values()),
+        candidates=len(candidates),
+        tokens=token_budget - remaining,
+        token_budget=token_budget,
+        ranked_by_embedding=bool(rankings[1]),
+    )
+    return excerpts
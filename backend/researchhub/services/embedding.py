@@ -4,21 +4,34 @@ Supports both OpenAI and Azure OpenAI for generating embeddings
 that enable semantic search across documents, tasks, and other entities.
 """
 
+import hashlib
+import math
 import re
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
 import structlog
 from openai import AsyncAzureOpenAI, AsyncOpenAI
-from sqlalchemy import select
+from sqlalchemy import Select, delete, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from researchhub.config import get_settings
 from researchhub.models.document import Document
+from researchhub.models.embedding import EmbeddingChunk
 from researchhub.models.journal import JournalEntry
 from researchhub.models.knowledge import Paper
 from researchhub.models.project import Project, Task
+from researchhub.services.chunking import (
+    TextChunk,
+    chunk_blocks,
+    pack_by_token_budget,
+    text_blocks,
+    tiptap_blocks,
+)
+from researchhub.services.embedding_cache import get_embedding_cache
 
 logger = structlog.get_logger()
 
@@ -31,6 +44,177 @@ EMBEDDABLE_ENTITIES = {
     "project": Project,
 }
 
+# Long-form entity types embedded passage by passage (see EmbeddingChunk)
+CHUNKED_ENTITY_TYPES = {"document", "paper"}
+
+# Per-input limit (~8K tokens at ~4 chars/token, with buffer)
+MAX_EMBEDDING_INPUT_CHARS = 30000
+# Provider limit on inputs per embeddings request
+MAX_EMBEDDING_BATCH_INPUTS = 2048
+# Chunks fetched per requested entity before pooling chunk hits
+CHUNK_SEARCH_FANOUT = 4
+# pgvector's default and maximum hnsw.ef_search
+HNSW_MIN_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def content_hash(text: str) -> str:
+    """Hash embeddable text so unchanged content can skip re-embedding."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def stale_embedding_clause(model_class: Any, embedding_model: str) -> Any:
+    """SQL filter for rows whose embedding may be out of date.
+
+    Matches rows with no embedding, an embedding from another model, or no
+    recorded content hash. Rows whose text changed since embedding can only
+    be detected after extraction, so the pipeline re-checks hashes per row.
+    """
+    return or_(
+        model_class.embedding.is_(None),
+        model_class.embedding_model.is_distinct_from(embedding_model),
+        model_class.embedding_content_hash.is_(None),
+    )
+
+
+@dataclass
+class ChunkHit:
+    """An entity matched through its best passages."""
+
+    entity_id: UUID
+    similarity: float
+    chunk_idx: int
+    passage: str
+
+
+def mean_vector(vectors: list[list[float]]) -> list[float]:
+    """L2-normalized mean of vectors (entity-level vector from its chunks)."""
+    if len(vectors) == 1:
+        return vectors[0]
+    mean = [sum(values) / len(vectors) for values in zip(*vectors)]
+    norm = math.sqrt(sum(v * v for v in mean)) or 1.0
+    return [v / norm for v in mean]
+
+
+def pool_chunk_hits(rows: list[Any], pooling: str) -> list[ChunkHit]:
+    """Aggregate chunk rows (ordered by similarity) into per-entity hits.
+
+    ``max`` scores an entity by its best passage; ``mean`` averages the
+    similarity of its retrieved passages. Either way the best passage is
+    kept for the snippet.
+    """
+    grouped: dict[UUID, list[Any]] = {}
+    for row in rows:
+        grouped.setdefault(row.entity_id, []).append(row)
+
+    hits = []
+    for entity_id, entity_rows in grouped.items():
+        best = entity_rows[0]
+        if pooling == "mean":
+            similarity = sum(r.similarity for r in entity_rows) / len(entity_rows)
+        else:
+            similarity = best.similarity
+        hits.append(ChunkHit(
+            entity_id=entity_id,
+            similarity=float(similarity),
+            chunk_idx=best.chunk_idx,
+            passage=best.content,
+        ))
+    hits.sort(key=lambda hit: hit.similarity, reverse=True)
+    return hits
+
+
+async def delete_entity_chunks(
+    db: AsyncSession,
+    entity_type: str,
+    entity_ids: list[UUID],
+) -> None:
+    """Delete the stored passages of the given entities.
+
+    Chunks reference their entity polymorphically, so nothing cascades from
+    the entity row; hard deletes are covered by the embedding_chunks_cleanup
+    triggers, soft deletes (archiving) call this.
+    """
+    await db.execute(
+        delete(EmbeddingChunk).where(
+            EmbeddingChunk.entity_type == entity_type,
+            EmbeddingChunk.entity_id.in_(entity_ids),
+        )
+    )
+
+
+_hnsw_iterative_scan: bool | None = None
+
+
+async def widen_vector_scan(db: AsyncSession, fetch: int) -> None:
+    """Let filtered HNSW scans in this transaction return ``fetch`` rows.
+
+    An HNSW index scan stops after hnsw.ef_search candidates (40 by default)
+    and filters apply to those afterwards, so a selective filter (one entity
+    type, one tenant's scope) can leave few or no rows even when matches
+    exist. This raises ef_search to the fetch size and, on pgvector 0.8+,
+    enables iterative scans, which keep walking the graph until enough rows
+    pass the filters. Results may come back slightly out of order
+    (relaxed_order); callers re-sort.
+    """
+    global _hnsw_iterative_scan
+    if _hnsw_iterative_scan is None:
+        version = await db.scalar(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+        try:
+            _hnsw_iterative_scan = tuple(int(part) for part in version.split(".")[:2]) >= (0, 8)
+        except (AttributeError, ValueError):
+            _hnsw_iterative_scan = False
+
+    ef_search = min(max(fetch, HNSW_MIN_EF_SEARCH), HNSW_MAX_EF_SEARCH)
+    settings = [func.set_config("hnsw.ef_search", str(ef_search), True)]
+    if _hnsw_iterative_scan:
+        settings.append(func.set_config("hnsw.iterative_scan", "relaxed_order", True))
+    await db.execute(select(*settings))
+
+
+async def search_entity_chunks(
+    db: AsyncSession,
+    entity_type: str,
+    model_class: Any,
+    query_embedding: list[float],
+    limit: int,
+    scope: Callable[[Select], Select] | None = None,
+    pooling: str | None = None,
+) -> list[ChunkHit]:
+    """Find entities whose passages are most similar to the query.
+
+    Args:
+        db: Database session.
+        entity_type: Chunked entity type ("document", "paper").
+        model_class: The entity model, joined so ``scope`` can filter on it.
+        query_embedding: The query vector.
+        limit: Maximum number of entities to return.
+        scope: Optional callback adding access-control joins/filters.
+        pooling: "max" or "mean"; defaults to settings.semantic_chunk_pooling.
+
+    Returns:
+        Entity hits with their best passage, most similar first.
+    """
+    distance = EmbeddingChunk.embedding.cosine_distance(query_embedding)
+    query = (
+        select(
+            EmbeddingChunk.entity_id,
+            EmbeddingChunk.chunk_idx,
+            EmbeddingChunk.content,
+            (1 - distance).label("similarity"),
+        )
+        .join(model_class, model_class.id == EmbeddingChunk.entity_id)
+        .where(EmbeddingChunk.entity_type == entity_type)
+    )
+    if scope is not None:
+        query = scope(query)
+    query = query.order_by(distance).limit(limit * CHUNK_SEARCH_FANOUT)
+
+    await widen_vector_scan(db, limit * CHUNK_SEARCH_FANOUT)
+    result = await db.execute(query)
+    hits = pool_chunk_hits(result.all(), pooling or get_settings().semantic_chunk_pooling)
+    return hits[:limit]
+
 
 class EmbeddingService:
     """Service for generating and managing vector embeddings.
@@ -99,6 +283,20 @@ class EmbeddingService:
             return self.settings.azure_embedding_deployment
         return self.settings.embedding_model
 
+    async def _create_embeddings(self, inputs: str | list[str]) -> Any:
+        """Call the embeddings API for one input or a list of inputs."""
+        # Azure OpenAI doesn't support dimensions parameter for all models
+        if self.use_azure:
+            return await self.client.embeddings.create(
+                model=self.model_name,
+                input=inputs,
+            )
+        return await self.client.embeddings.create(
+            model=self.model_name,
+            input=inputs,
+            dimensions=self.settings.embedding_dimensions,
+        )
+
     async def generate_embedding(self, text: str) -> list[float]:
         """Generate an embedding vector for the given text.
 
@@ -114,28 +312,16 @@ class EmbeddingService:
         """
         # Truncate text if too long (OpenAI has ~8K token limit for embeddings)
         # Rough estimate: 4 chars per token, leave buffer
-        max_chars = 30000
-        if len(text) > max_chars:
-            text = text[:max_chars]
+        if len(text) > MAX_EMBEDDING_INPUT_CHARS:
             logger.warning(
                 "embedding_text_truncated",
                 original_length=len(text),
-                truncated_to=max_chars,
+                truncated_to=MAX_EMBEDDING_INPUT_CHARS,
             )
+            text = text[:MAX_EMBEDDING_INPUT_CHARS]
 
         try:
-            # Azure OpenAI doesn't support dimensions parameter for all models
-            if self.use_azure:
-                response = await self.client.embeddings.create(
-                    model=self.model_name,
-                    input=text,
-                )
-            else:
-                response = await self.client.embeddings.create(
-                    model=self.model_name,
-                    input=text,
-                    dimensions=self.settings.embedding_dimensions,
-                )
+            response = await self._create_embeddings(text)
             return response.data[0].embedding
         except Exception as e:
             logger.error(
@@ -146,12 +332,32 @@ class EmbeddingService:
             )
             raise
 
+    async def generate_query_embedding(self, text: str) -> list[float]:
+        """Generate an embedding for a search query, using the query cache.
+
+        Search queries repeat often (type-ahead, assistant retries), so these
+        go through the two-tier EmbeddingCache. Entity content should use
+        generate_embedding directly.
+
+        Args:
+            text: The query text to embed.
+
+        Returns:
+            A list of floats representing the embedding vector.
+        """
+        cache = get_embedding_cache()
+        key = cache.make_key(text, self.model_name, self.settings.embedding_dimensions)
+        return await cache.get_or_create(key, lambda: self.generate_embedding(text))
+
     async def generate_embeddings_batch(
         self, texts: list[str]
     ) -> list[list[float]]:
-        """Generate embeddings for multiple texts in a single API call.
+        """Generate embeddings for multiple texts in as few API calls as possible.
 
-        More efficient than calling generate_embedding multiple times.
+        Texts are packed into requests by estimated token count
+        (settings.embedding_batch_max_tokens) rather than by number of
+        entities, so large inputs never push a request over the provider's
+        per-request limit.
 
         Args:
             texts: List of texts to embed.
@@ -163,33 +369,103 @@ class EmbeddingService:
             return []
 
         # Truncate each text
-        max_chars = 30000
-        truncated_texts = [t[:max_chars] if len(t) > max_chars else t for t in texts]
-
-        try:
-            # Azure OpenAI doesn't support dimensions parameter for all models
-            if self.use_azure:
-                response = await self.client.embeddings.create(
-                    model=self.model_name,
-                    input=truncated_texts,
-                )
-            else:
-                response = await self.client.embeddings.create(
-                    model=self.model_name,
-                    input=truncated_texts,
-                    dimensions=self.settings.embedding_dimensions,
+        truncated_texts = [
+            t[:MAX_EMBEDDING_INPUT_CHARS] if len(t) > MAX_EMBEDDING_INPUT_CHARS else t
+            for t in texts
+        ]
+
+        embeddings: list[list[float]] = []
+        for batch in pack_by_token_budget(
+            truncated_texts,
+            max_tokens=self.settings.embedding_batch_max_tokens,
+            max_items=MAX_EMBEDDING_BATCH_INPUTS,
+        ):
+            try:
+                response = await self._create_embeddings(batch)
+            except Exception as e:
+                logger.error(
+                    "batch_embedding_generation_failed",
+                    error=str(e),
+                    batch_size=len(batch),
+                    provider="azure" if self.use_azure else "openai",
                 )
+                raise
             # Sort by index to ensure correct order
             sorted_data = sorted(response.data, key=lambda x: x.index)
-            return [item.embedding for item in sorted_data]
-        except Exception as e:
-            logger.error(
-                "batch_embedding_generation_failed",
-                error=str(e),
-                batch_size=len(texts),
-                provider="azure" if self.use_azure else "openai",
-            )
-            raise
+            embeddings.extend(item.embedding for item in sorted_data)
+        return embeddings
+
+    def chunk_entity(self, entity_type: str, entity: Any, text: str) -> list[TextChunk]:
+        """Split an entity's embeddable text into passages.
+
+        Documents are chunked on TipTap block boundaries (headings start new
+        sections); other types fall back to paragraph blocks of ``text``.
+        """
+        max_tokens = self.settings.embedding_chunk_max_tokens
+        if entity_type == "document" and entity.content:
+            blocks, sections = tiptap_blocks(entity.content)
+            if blocks:
+                if entity.title:
+                    blocks = [entity.title] + blocks
+                    sections = {0} | {i + 1 for i in sections}
+                return chunk_blocks(blocks, max_tokens, sections)
+        return chunk_blocks(text_blocks(text), max_tokens)
+
+    async def _embed_chunked(
+        self,
+        entity_type: str,
+        entities: list[Any],
+        texts: list[str],
+    ) -> list[list[float]]:
+        """Embed entities passage by passage and replace their stored chunks.
+
+        Returns one entity-level vector per entity, the normalized mean of its
+        chunk vectors, so the entity embedding covers the whole text instead
+        of only the first MAX_EMBEDDING_INPUT_CHARS.
+        """
+        chunk_sets = [
+            self.chunk_entity(entity_type, entity, text)
+            for entity, text in zip(entities, texts)
+        ]
+        inputs = []
+        for entity, chunks in zip(entities, chunk_sets):
+            title = getattr(entity, "title", None)
+            for chunk in chunks:
+                # Later passages get the title as context
+                inputs.append(f"{title}\n\n{chunk.text}" if title and chunk.index else chunk.text)
+
+        vectors = await self.generate_embeddings_batch(inputs)
+
+        await delete_entity_chunks(self.db, entity_type, [entity.id for entity in entities])
+
+        entity_vectors = []
+        position = 0
+        for entity, chunks in zip(entities, chunk_sets):
+            chunk_vectors = vectors[position:position + len(chunks)]
+            position += len(chunks)
+            self.db.add_all([
+                EmbeddingChunk(
+                    entity_type=entity_type,
+                    entity_id=entity.id,
+                    chunk_idx=chunk.index,
+                    span_start=chunk.span_start,
+                    span_end=chunk.span_end,
+                    content=chunk.text,
+                    token_count=chunk.token_count,
+                    embedding=vector,
+                    embedding_model=self.settings.embedding_model,
+                )
+                for chunk, vector in zip(chunks, chunk_vectors)
+            ])
+            entity_vectors.append(mean_vector(chunk_vectors))
+
+        logger.info(
+            "chunk_embeddings_generated",
+            entity_type=entity_type,
+            entity_count=len(entities),
+            chunk_count=len(vectors),
+        )
+        return entity_vectors
 
     def extract_text_for_embedding(
         self, entity_type: str, entity: Any
@@ -385,12 +661,17 @@ class EmbeddingService:
         self,
         entity_type: str,
         entity_id: UUID,
+        force: bool = False,
     ) -> bool:
         """Generate and store embedding for a specific entity.
 
+        Skips the embedding call when the entity's embeddable text hashes to
+        the stored embedding_content_hash and the model is unchanged.
+
         Args:
             entity_type: The type of entity ("document", "task", etc.)
             entity_id: The UUID of the entity.
+            force: Regenerate even if the content hash is unchanged.
 
         Returns:
             True if embedding was generated and stored, False otherwise.
@@ -430,9 +711,21 @@ class EmbeddingService:
             )
             return False
 
+        text_hash = content_hash(text)
+        if not force and entity.is_embedding_current(text_hash):
+            logger.info(
+                "embedding_unchanged",
+                entity_type=entity_type,
+                entity_id=str(entity_id),
+            )
+            return False
+
         # Generate embedding
         try:
-            embedding = await self.generate_embedding(text)
+            if entity_type in CHUNKED_ENTITY_TYPES:
+                embedding = (await self._embed_chunked(entity_type, [entity], [text]))[0]
+            else:
+                embedding = await self.generate_embedding(text)
         except Exception as e:
             logger.error(
                 "failed_to_generate_embedding",
@@ -445,6 +738,7 @@ class EmbeddingService:
         # Store embedding
         entity.embedding = embedding
         entity.embedding_model = self.settings.embedding_model
+        entity.embedding_content_hash = text_hash
         entity.embedded_at = datetime.now(timezone.utc)
 
         await self.db.commit()
@@ -462,24 +756,27 @@ class EmbeddingService:
         self,
         entity_type: str,
         entity_ids: list[UUID],
+        force: bool = False,
     ) -> dict[str, int]:
         """Generate embeddings for multiple entities of the same type.
 
-        More efficient than calling embed_entity multiple times.
+        More efficient than calling embed_entity multiple times. Entities
+        whose content hash and model are unchanged are not sent to the API.
 
         Args:
             entity_type: The type of entities.
             entity_ids: List of entity UUIDs.
+            force: Regenerate even if content hashes are unchanged.
 
         Returns:
-            Dict with counts: {"success": N, "skipped": M, "failed": K}
+            Dict with counts: {"success": N, "skipped": M, "unchanged": U, "failed": K}
         """
         if self.db is None:
             raise ValueError("Database session required for embed_entities_batch")
 
         model_class = EMBEDDABLE_ENTITIES.get(entity_type)
         if not model_class:
-            return {"success": 0, "skipped": 0, "failed": len(entity_ids)}
+            return {"success": 0, "skipped": 0, "unchanged": 0, "failed": len(entity_ids)}
 
         # Fetch all entities
         result = await self.db.execute(
@@ -487,10 +784,12 @@ class EmbeddingService:
         )
         entities = {e.id: e for e in result.scalars().all()}
 
-        # Extract texts and track which entities have content
+        # Extract texts and track which entities have changed content
         texts = []
+        hashes = []
         entities_with_text = []
         skipped = 0
+        unchanged = 0
 
         for entity_id in entity_ids:
             entity = entities.get(entity_id)
@@ -499,18 +798,28 @@ class EmbeddingService:
                 continue
 
             text = self.extract_text_for_embedding(entity_type, entity)
-            if text:
-                texts.append(text)
-                entities_with_text.append(entity)
-            else:
+            if not text:
                 skipped += 1
+                continue
+
+            text_hash = content_hash(text)
+            if not force and entity.is_embedding_current(text_hash):
+                unchanged += 1
+                continue
+
+            texts.append(text)
+            hashes.append(text_hash)
+            entities_with_text.append(entity)
 
         if not texts:
-            return {"success": 0, "skipped": skipped, "failed": 0}
+            return {"success": 0, "skipped": skipped, "unchanged": unchanged, "failed": 0}
 
         # Generate embeddings in batch
         try:
-            embeddings = await self.generate_embeddings_batch(texts)
+            if entity_type in CHUNKED_ENTITY_TYPES:
+                embeddings = await self._embed_chunked(entity_type, entities_with_text, texts)
+            else:
+                embeddings = await self.generate_embeddings_batch(texts)
         except Exception as e:
             logger.error(
                 "batch_embedding_failed",
@@ -518,13 +827,19 @@ class EmbeddingService:
                 batch_size=len(texts),
                 error=str(e),
             )
-            return {"success": 0, "skipped": skipped, "failed": len(texts)}
+            return {
+                "success": 0,
+                "skipped": skipped,
+                "unchanged": unchanged,
+                "failed": len(texts),
+            }
 
         # Store embeddings
         now = datetime.now(timezone.utc)
-        for entity, embedding in zip(entities_with_text, embeddings):
+        for entity, text_hash, embedding in zip(entities_with_text, hashes, embeddings):
             entity.embedding = embedding
             entity.embedding_model = self.settings.embedding_model
+            entity.embedding_content_hash = text_hash
             entity.embedded_at = now
 
         await self.db.commit()
@@ -535,7 +850,12 @@ class EmbeddingService:
             count=len(embeddings),
         )
 
-        return {"success": len(embeddings), "skipped": skipped, "failed": 0}
+        return {
+            "success": len(embeddings),
+            "skipped": skipped,
+            "unchanged": unchanged,
+            "failed": 0,
+        }
 
 
 def get_embedding_service(db: AsyncSession | None = None) -> EmbeddingService:
@@ -0,0 +1,193 @@
+"""Two-tier cache for query embeddings.
+
+Search and the AI assistant embed the user's query on every call, which is
+a network round trip to OpenAI/Azure even when the same string was embedded
+a moment ago (type-ahead, repeated assistant searches). This cache keeps
+recent vectors in an in-process LRU and shares them across API workers
+through Redis.
+
+Entries are keyed on the normalized text plus the embedding model and
+dimensions, so changing either setting never returns a stale vector.
+Vectors are stored in Redis as packed little-endian float32.
+"""
+
+import asyncio
+import hashlib
+import struct
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+from researchhub.config import get_settings
+from researchhub.db.redis import get_redis
+from researchhub.metrics import EMBEDDING_CACHE_REQUESTS
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "emb:v1"
+
+
+class _OwnerCancelled(Exception):
+    """The request computing an in-flight embedding was cancelled."""
+
+
+def normalize_query_text(text: str) -> str:
+    """Normalize query text for cache keys (NFKC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def pack_vector(vector: list[float]) -> bytes:
+    """Pack a vector as little-endian float32."""
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def unpack_vector(data: bytes) -> list[float]:
+    """Unpack a little-endian float32 vector."""
+    return list(struct.unpack(f"<{len(data) // 4}f", data))
+
+
+class EmbeddingCache:
+    """In-process LRU with TTL in front of a shared Redis tier.
+
+    Redis failures are logged and treated as misses; the cache never makes
+    an embedding request fail. Concurrent lookups for the same key share a
+    single in-flight computation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        redis_ttl_seconds: int,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[list[float]]] = {}
+
+    @staticmethod
+    def make_key(text: str, model: str, dimensions: int) -> str:
+        """Build the cache key for a query under a given model configuration."""
+        digest = hashlib.sha256(normalize_query_text(text).encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}:{model}:{dimensions}:{digest}"
+
+    def _get_local(self, key: str) -> list[float] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def _set_local(self, key: str, vector: list[float]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> list[float] | None:
+        """Look up a vector in memory, then Redis."""
+        vector = self._get_local(key)
+        if vector is not None:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="memory", result="hit").inc()
+            return vector
+        EMBEDDING_CACHE_REQUESTS.labels(tier="memory", result="miss").inc()
+
+        try:
+            data = await get_redis().get(key)
+        except Exception as e:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="redis", result="error").inc()
+            logger.warning("embedding_cache_redis_get_failed", error=str(e))
+            return None
+
+        if data is None:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="redis", result="miss").inc()
+            return None
+
+        EMBEDDING_CACHE_REQUESTS.labels(tier="redis", result="hit").inc()
+        vector = unpack_vector(data)
+        self._set_local(key, vector)
+        return vector
+
+    async def set(self, key: str, vector: list[float]) -> None:
+        """Store a vector in both tiers."""
+        self._set_local(key, vector)
+        try:
+            await get_redis().set(key, pack_vector(vector), ex=self.redis_ttl_seconds)
+        except Exception as e:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="redis", result="error").inc()
+            logger.warning("embedding_cache_redis_set_failed", error=str(e))
+
+    async def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[list[float]]],
+    ) -> list[float]:
+        """Return the cached vector for key, computing it once on a miss.
+
+        If the request computing the vector is cancelled, its waiters don't
+        inherit the cancellation: the first to resume computes it instead.
+        """
+        while True:
+            vector = await self.get(key)
+            if vector is not None:
+                return vector
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except _OwnerCancelled:
+                continue
+
+        future: asyncio.Future[list[float]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            vector = await factory()
+            await self.set(key, vector)
+            future.set_result(vector)
+            return vector
+        except asyncio.CancelledError:
+            # Cancelling the shared future would cancel every waiter with it
+            future.set_exception(_OwnerCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure with no waiters isn't logged by asyncio
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, int]:
+        """Current in-process cache occupancy."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+        }
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide query embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        settings = get_settings()
+        _embedding_cache = EmbeddingCache(
+            max_entries=settings.embedding_cache_max_entries,
+            ttl_seconds=settings.embedding_cache_ttl_seconds,
+            redis_ttl_seconds=settings.embedding_cache_redis_ttl_seconds,
+        )
+    return _embedding_cache
@@ -0,0 +1,320 @@
+"""Debounced, coalescing queue for entity embedding jobs.
+
+Saving an entity used to start one Celery task per save, and each task made
+its own single-input embeddings request. Autosave can save a document
+dozens of times a minute. Now each save adds the entity to a Redis sorted set,
+scored by the time its job becomes due:
+
+- Saving again inside the debounce window moves the due time back.
+  Repeated saves therefore collapse into a single job.
+- A job is never delayed more than ``embedding_queue_max_delay_seconds``
+  after it was first queued. Continuous editing still gets embedded.
+
+A long-lived worker (``python -m researchhub.embedding_worker``) claims due
+jobs atomically. It groups them by entity type and embeds them through
+``EmbeddingService.embed_entities_batch``, which packs requests by token
+count and skips unchanged content.
+
+Jobs in a failed batch are retried with exponential backoff, each in a
+batch of its own so one bad entity can't keep failing the others. After
+``embedding_queue_max_attempts`` failures a job moves to a dead-letter set
+and is logged; saving the entity again queues it afresh.
+"""
+
+import asyncio
+import signal
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from uuid import UUID
+
+import structlog
+
+from researchhub.config import get_settings
+from researchhub.db.redis import close_redis, get_redis
+from researchhub.db.session import async_session_factory, close_db
+from researchhub.metrics import (
+    EMBEDDING_QUEUE_DEPTH,
+    EMBEDDING_QUEUE_JOBS,
+    EMBEDDING_QUEUE_LAG,
+    EMBEDDING_QUEUE_OVERDUE,
+)
+from researchhub.services.embedding import EMBEDDABLE_ENTITIES, get_embedding_service
+
+logger = structlog.get_logger()
+
+DUE_KEY = "embq:v1:due"
+FIRST_QUEUED_KEY = "embq:v1:first"
+ATTEMPTS_KEY = "embq:v1:attempts"
+DEAD_KEY = "embq:v1:dead"  # Sorted set scored by dead-letter time
+
+# Queue a member, or push its due time back, capped at first-queued + max delay.
+# A save is new content: it clears the member's dead letter, and its failed
+# attempts unless a retry is already pending (so continuous edits still count
+# towards the attempt limit).
+_ENQUEUE_SCRIPT = """
+local now = tonumber(ARGV[2])
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) == false then
+    redis.call('HDEL', KEYS[3], ARGV[1])
+end
+redis.call('ZREM', KEYS[4], ARGV[1])
+redis.call('HSETNX', KEYS[2], ARGV[1], ARGV[2])
+local first = tonumber(redis.call('HGET', KEYS[2], ARGV[1]))
+local due = math.min(now + tonumber(ARGV[3]), first + tonumber(ARGV[4]))
+redis.call('ZADD', KEYS[1], due, ARGV[1])
+return tostring(due)
+"""
+
+# Atomically take up to N due members with their first-queued times and
+# failed attempts so far
+_CLAIM_SCRIPT = """
+local members = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #members == 0 then
+    return {}
+end
+local firsts = redis.call('HMGET', KEYS[2], unpack(members))
+local attempts = redis.call('HMGET', KEYS[3], unpack(members))
+redis.call('ZREM', KEYS[1], unpack(members))
+redis.call('HDEL', KEYS[2], unpack(members))
+redis.call('HDEL', KEYS[3], unpack(members))
+local result = {}
+for i, member in ipairs(members) do
+    result[#result + 1] = member
+    result[#result + 1] = firsts[i] or ''
+    result[#result + 1] = attempts[i] or '0'
+end
+return result
+"""
+
+# Schedule a retry of a failed member, or dead-letter it once attempts reach
+# the maximum. A member saved again since it was claimed is already queued
+# afresh and is left alone.
+_RETRY_SCRIPT = """
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) ~= false then
+    return 'superseded'
+end
+if tonumber(ARGV[3]) >= tonumber(ARGV[5]) then
+    redis.call('ZADD', KEYS[4], ARGV[6], ARGV[1])
+    return 'dead'
+end
+redis.call('HSETNX', KEYS[2], ARGV[1], ARGV[2])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+redis.call('ZADD', KEYS[1], ARGV[4], ARGV[1])
+return 'retry'
+"""
+
+
+@dataclass
+class EmbeddingJob:
+    """A claimed embedding job."""
+
+    entity_type: str
+    entity_id: UUID
+    first_queued_at: float
+    attempts: int = 0  # Failed attempts before this claim
+
+
+def _member(entity_type: str, entity_id: UUID | str) -> str:
+    return f"{entity_type}:{entity_id}"
+
+
+async def enqueue_embedding(entity_type: str, entity_id: UUID | str) -> None:
+    """Queue (or re-debounce) embedding generation for an entity.
+
+    Raises:
+        ValueError: If entity_type is not embeddable.
+        redis.RedisError: If the queue is unreachable; callers log and move
+            on, and the backfill task picks up anything missed.
+    """
+    if entity_type not in EMBEDDABLE_ENTITIES:
+        raise ValueError(f"Unknown entity type: {entity_type}")
+
+    settings = get_settings()
+    await get_redis().eval(
+        _ENQUEUE_SCRIPT,
+        4,
+        DUE_KEY,
+        FIRST_QUEUED_KEY,
+        ATTEMPTS_KEY,
+        DEAD_KEY,
+        _member(entity_type, entity_id),
+        time.time(),
+        settings.embedding_queue_debounce_seconds,
+        settings.embedding_queue_max_delay_seconds,
+    )
+
+
+async def claim_due_jobs(limit: int) -> list[EmbeddingJob]:
+    """Remove and return up to ``limit`` jobs whose due time has passed."""
+    now = time.time()
+    raw = await get_redis().eval(
+        _CLAIM_SCRIPT, 3, DUE_KEY, FIRST_QUEUED_KEY, ATTEMPTS_KEY, now, limit
+    )
+
+    jobs = []
+    for member, first, attempts in zip(raw[::3], raw[1::3], raw[2::3]):
+        entity_type, _, entity_id = member.decode().partition(":")
+        jobs.append(EmbeddingJob(
+            entity_type=entity_type,
+            entity_id=UUID(entity_id),
+            first_queued_at=float(first) if first else now,
+            attempts=int(attempts),
+        ))
+    return jobs
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before retrying a job that has failed ``attempts`` times."""
+    settings = get_settings()
+    return min(
+        settings.embedding_queue_retry_seconds * 2 ** (attempts - 1),
+        settings.embedding_queue_retry_max_seconds,
+    )
+
+
+async def retry_jobs(jobs: list[EmbeddingJob]) -> list[EmbeddingJob]:
+    """Requeue failed jobs with backoff, keeping their original queue time.
+
+    Returns:
+        Jobs that reached the attempt limit and were dead-lettered
+    """
+    settings = get_settings()
+    now = time.time()
+    redis = get_redis()
+    dead = []
+    for job in jobs:
+        attempts = job.attempts + 1
+        outcome = await redis.eval(
+            _RETRY_SCRIPT,
+            4,
+            DUE_KEY,
+            FIRST_QUEUED_KEY,
+            ATTEMPTS_KEY,
+            DEAD_KEY,
+            _member(job.entity_type, job.entity_id),
+            job.first_queued_at,
+            attempts,
+            now + retry_delay(attempts),
+            settings.embedding_queue_max_attempts,
+            now,
+        )
+        if outcome == b"dead":
+            logger.error(
+                "embedding_job_dead_lettered",
+                entity_type=job.entity_type,
+                entity_id=str(job.entity_id),
+                attempts=attempts,
+            )
+            dead.append(job)
+    return dead
+
+
+async def queue_stats() -> dict[str, float]:
+    """Queue depth, dead letters, and how far the earliest due job is overdue."""
+    async with get_redis().pipeline(transaction=False) as pipe:
+        pipe.zcard(DUE_KEY)
+        pipe.zrange(DUE_KEY, 0, 0, withscores=True)
+        pipe.zcard(DEAD_KEY)
+        depth, earliest, dead = await pipe.execute()
+    overdue = max(0.0, time.time() - earliest[0][1]) if earliest else 0.0
+    return {"depth": depth, "overdue_seconds": overdue, "dead": dead}
+
+
+async def process_jobs(jobs: list[EmbeddingJob]) -> dict[str, int]:
+    """Embed claimed jobs, one batch call per entity type.
+
+    Jobs that failed before are embedded one per batch, so a failure can be
+    pinned on its entity. Jobs in a batch that fails are retried with
+    backoff (see ``retry_jobs``).
+    """
+    batches: dict[str, list[EmbeddingJob]] = defaultdict(list)
+    retried: list[tuple[str, list[EmbeddingJob]]] = []
+    for job in jobs:
+        if job.attempts:
+            retried.append((job.entity_type, [job]))
+        else:
+            batches[job.entity_type].append(job)
+
+    totals = {"success": 0, "skipped": 0, "unchanged": 0, "failed": 0, "dead_lettered": 0}
+    for entity_type, type_jobs in [*batches.items(), *retried]:
+        try:
+            async with async_session_factory() as db:
+                result = await get_embedding_service(db).embed_entities_batch(
+                    entity_type=entity_type,
+                    entity_ids=[job.entity_id for job in type_jobs],
+                )
+        except Exception as e:
+            logger.error(
+                "embedding_queue_batch_failed",
+                entity_type=entity_type,
+                batch_size=len(type_jobs),
+                error=str(e),
+            )
+            result = {"success": 0, "skipped": 0, "unchanged": 0, "failed": len(type_jobs)}
+
+        if result["failed"]:
+            result["dead_lettered"] = len(await retry_jobs(type_jobs))
+
+        for key, count in result.items():
+            totals[key] += count
+            EMBEDDING_QUEUE_JOBS.labels(entity_type=entity_type, result=key).inc(count)
+
+    now = time.time()
+    for job in jobs:
+        EMBEDDING_QUEUE_LAG.observe(now - job.first_queued_at)
+    return totals
+
+
+async def run_embedding_worker(stop: asyncio.Event | None = None) -> None:
+    """Drain the embedding queue until ``stop`` is set.
+
+    Claims up to ``embedding_queue_batch_size`` due jobs at a time, and
+    sleeps for the poll interval when nothing is due.
+    """
+    settings = get_settings()
+    stop = stop or asyncio.Event()
+    logger.info("embedding_worker_started")
+
+    while not stop.is_set():
+        try:
+            stats = await queue_stats()
+            EMBEDDING_QUEUE_DEPTH.set(stats["depth"])
+            EMBEDDING_QUEUE_OVERDUE.set(stats["overdue_seconds"])
+
+            jobs = await claim_due_jobs(settings.embedding_queue_batch_size)
+            if jobs:
+                totals = await process_jobs(jobs)
+                logger.info(
+                    "embedding_queue_drained",
+                    claimed=len(jobs),
+                    queue_depth=stats["depth"] - len(jobs),
+                    dead_letters=stats["dead"],
+                    max_lag_seconds=round(time.time() - min(j.first_queued_at for j in jobs), 3),
+                    **totals,
+                )
+                # More may already be due; don't sleep
+                if len(jobs) == settings.embedding_queue_batch_size:
+                    continue
+        except Exception as e:
+            logger.error("embedding_worker_iteration_failed", error=str(e))
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.embedding_queue_poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    logger.info("embedding_worker_stopped")
+
+
+async def serve_embedding_worker() -> None:
+    """Run the worker until SIGINT/SIGTERM, then release connections."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await run_embedding_worker(stop)
+    finally:
+        await close_redis()
+        await close_db()
@@ -0,0 +1,598 @@
+"""Export generation for the /exports endpoints.
+
+Tabular exports (CSV, NDJSON) are streamed: rows come from a server-side
+cursor, ``export_stream_batch_size`` at a time, and are encoded into
+chunks of about EXPORT_CHUNK_BYTES as they arrive, so memory stays flat
+however many rows an export has.
+
+A PDF needs all of its rows before the first byte, and ReportLab is CPU
+bound, so rendering never runs on the API's event loop:
+
+- Exports of up to ``export_pdf_inline_max_rows`` rows render in a pool
+  of worker processes while the request waits.
+- Larger ones become an export job: the render_export Celery task renders
+  the PDF, and the client polls the job and then downloads the file.
+
+Finished PDFs are stored in ``export_artifact_dir`` under a content
+address, a hash of the export's kind and parameters and of a fingerprint
+(row count and latest ``updated_at``) of every table it reads. Exporting
+unchanged data again serves the stored file without rendering, including
+the generation date printed in it. The directory must be shared by the
+API and the Celery workers; files unused for ``export_artifact_ttl_seconds``
+are pruned by the prune_export_artifacts beat task.
+"""
+
+import asyncio
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, Sequence
+from uuid import UUID, uuid4
+
+import orjson
+import structlog
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from researchhub.config import get_settings
+from researchhub.db.redis import get_redis
+from researchhub.db.session import async_session_factory, release_connection
+from researchhub.metrics import EXPORT_ARTIFACT_CACHE, EXPORT_PDF_RENDER, EXPORT_ROWS
+from researchhub.models.document import Document
+from researchhub.models.idea import Idea
+from researchhub.models.knowledge import Paper
+from researchhub.models.organization import Team
+from researchhub.models.project import Project, Task
+from researchhub.services.pdf_generator import render_to_file
+
+logger = structlog.get_logger()
+
+# Encoded bytes collected before a streamed chunk is sent
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+JOB_KEY = "export_job:{}"
+
+
+# --- Row sources ---
+#
+# Shared by the streamed exports, the PDF payloads and their fingerprints,
+# so all three read the same rows.
+
+def task_query(
+    *columns: Any,
+    organization_id: UUID,
+    project_id: Optional[UUID] = None,
+    status_filter: Optional[str] = None,
+) -> Select:
+    """Select ``columns`` over an organization's tasks."""
+    query = (
+        select(*columns)
+        .select_from(Task)
+        .join(Project, Task.project_id == Project.id)
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+    )
+    if project_id:
+        query = query.where(Task.project_id == project_id)
+    if status_filter:
+        query = query.where(Task.status == status_filter)
+    return query
+
+
+def project_task_query(*columns: Any, project_id: UUID) -> Select:
+    """Select ``columns`` over one project's tasks."""
+    return select(*columns).select_from(Task).where(Task.project_id == project_id)
+
+
+def project_document_query(*columns: Any, project_id: UUID) -> Select:
+    """Select ``columns`` over one project's user-visible documents."""
+    return (
+        select(*columns)
+        .select_from(Document)
+        .where(Document.project_id == project_id, Document.is_system == False)  # noqa: E712
+    )
+
+
+def idea_query(
+    *columns: Any,
+    organization_id: UUID,
+    project_id: Optional[UUID] = None,
+) -> Select:
+    """Select ``columns`` over an organization's ideas (of one project: converted to it)."""
+    query = select(*columns).select_from(Idea).where(Idea.organization_id == organization_id)
+    if project_id:
+        query = query.where(Idea.converted_to_project_id == project_id)
+    return query
+
+
+def paper_query(*columns: Any, organization_id: UUID) -> Select:
+    """Select ``columns`` over an organization's papers."""
+    return select(*columns).select_from(Paper).where(Paper.organization_id == organization_id)
+
+
+def organization_project_query(*columns: Any, organization_id: UUID) -> Select:
+    """Select ``columns`` over an organization's projects."""
+    return (
+        select(*columns)
+        .select_from(Project)
+        .join(Team, Project.team_id == Team.id)
+        .where(Team.organization_id == organization_id)
+    )
+
+
+async def stream_rows(db: AsyncSession, *queries: Select) -> AsyncIterator[Row]:
+    """Rows of each query in turn, fetched from a server-side cursor."""
+    batch_size = get_settings().export_stream_batch_size
+    for query in queries:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield row
+
+
+# --- Streamed encodings ---
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return value
+
+
+async def csv_chunks(
+    headers: Sequence[str],
+    rows: AsyncIterable[Sequence[Any]],
+    export: str,
+) -> AsyncIterator[str]:
+    """CSV text in chunks of about EXPORT_CHUNK_BYTES.
+
+    None is written as an empty cell, dates in ISO format and lists as
+    comma-separated text.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    count = 0
+    async for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        count += 1
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+    EXPORT_ROWS.labels(export=export, format="csv").inc(count)
+
+
+def ndjson_field(header: str) -> str:
+    """The NDJSON key of a CSV header, e.g. "Due Date" -> "due_date"."""
+    return header.lower().replace(" ", "_")
+
+
+async def ndjson_chunks(
+    headers: Sequence[str],
+    rows: AsyncIterable[Sequence[Any]],
+    export: str,
+) -> AsyncIterator[bytes]:
+    """One JSON object per row, keyed by ``ndjson_field`` of each header."""
+    fields = [ndjson_field(header) for header in headers]
+    chunk = bytearray()
+    count = 0
+    async for row in rows:
+        chunk += orjson.dumps(dict(zip(fields, row)), option=orjson.OPT_NON_STR_KEYS)
+        chunk += b"\n"
+        count += 1
+        if len(chunk) >= EXPORT_CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+    EXPORT_ROWS.labels(export=export, format="ndjson").inc(count)
+
+
+# --- PDF exports ---
+
+@dataclass(frozen=True)
+class PDFExport:
+    """A PDF export request.
+
+    ``params`` are JSON-safe (UUIDs as strings): they travel to the
+    render_export task and are part of the artifact's address.
+    """
+
+    kind: str
+    params: dict[str, Any]
+    filename: str
+
+
+@dataclass(frozen=True)
+class _Kind:
+    """How a kind of PDF export reads its data and renders it."""
+
+    renderer: str  # PDFGenerator method
+    sources: Callable[[dict[str, Any]], list[Select]]
+    payload: Callable[[AsyncSession, dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+def _uuid(value: Optional[str]) -> Optional[UUID]:
+    return UUID(value) if value else None
+
+
+def _version(query: Callable[..., Select], model: Any, **kwargs: Any) -> Select:
+    return query(func.count(), func.max(model.updated_at), **kwargs)
+
+
+def _project_sources(params: dict[str, Any]) -> list[Select]:
+    project_id = UUID(params["project_id"])
+    sources = [
+        select(func.count(), func.max(Project.updated_at)).where(Project.id == project_id)
+    ]
+    if params["include_tasks"]:
+        sources.append(_version(project_task_query, Task, project_id=project_id))
+    if params["include_documents"]:
+        sources.append(_version(project_document_query, Document, project_id=project_id))
+    return sources
+
+
+async def _project_payload(db: AsyncSession, params: dict[str, Any]) -> dict[str, Any]:
+    project_id = UUID(params["project_id"])
+    project = (await db.execute(
+        select(Project.name, Project.status, Project.description).where(Project.id == project_id)
+    )).one()
+
+    tasks = []
+    if params["include_tasks"]:
+        query = project_task_query(
+            Task.title, Task.status, Task.priority, Task.due_date, project_id=project_id
+        ).order_by(Task.created_at)
+        async for title, task_status, priority, due_date in stream_rows(db, query):
+            tasks.append({
+                'title': title,
+                'status': task_status,
+                'priority': priority,
+                'due_date': due_date.isoformat() if due_date else 'N/A',
+            })
+
+    documents = []
+    if params["include_documents"]:
+        query = project_document_query(
+            Document.title, Document.document_type, Document.created_at, project_id=project_id
+        ).order_by(Document.created_at)
+        async for title, document_type, created_at in stream_rows(db, query):
+            documents.append({
+                'title': title,
+                'document_type': document_type or 'N/A',
+                'created_at': created_at.strftime('%Y-%m-%d'),
+            })
+
+    return {
+        "project_name": project.name,
+        "project_status": project.status,
+        "project_description": project.description,
+        "tasks": tasks,
+        "documents": documents,
+    }
+
+
+def _task_filters(params: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "organization_id": UUID(params["organization_id"]),
+        "project_id": _uuid(params.get("project_id")),
+        "status_filter": params.get("status_filter"),
+    }
+
+
+def _tasks_sources(params: dict[str, Any]) -> list[Select]:
+    return [_version(task_query, Task, **_task_filters(params))]
+
+
+async def _tasks_payload(db: AsyncSession, params: dict[str, Any]) -> dict[str, Any]:
+    query = task_query(
+        Task.title, Task.status, Task.priority, Task.due_date, Task.assignee_id,
+        **_task_filters(params),
+    ).order_by(Task.created_at.desc())
+    tasks = []
+    async for title, task_status, priority, due_date, assignee_id in stream_rows(db, query):
+        tasks.append({
+            'title': title,
+            'status': task_status,
+            'priority': priority,
+            'due_date': due_date.isoformat() if due_date else 'N/A',
+            'assignee': str(assignee_id)[:8] if assignee_id else 'Unassigned',
+        })
+    return {"tasks": tasks}
+
+
+def _idea_filters(params: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "organization_id": UUID(params["organization_id"]),
+        "project_id": _uuid(params.get("project_id")),
+    }
+
+
+def _ideas_sources(params: dict[str, Any]) -> list[Select]:
+    return [_version(idea_query, Idea, **_idea_filters(params))]
+
+
+async def _ideas_payload(db: AsyncSession, params: dict[str, Any]) -> dict[str, Any]:
+    query = idea_query(
+        Idea.title, Idea.status, Idea.tags, **_idea_filters(params),
+    ).order_by(Idea.created_at.desc())
+    ideas = []
+    async for title, idea_status, tags in stream_rows(db, query):
+        ideas.append({
+            'title': title or '',
+            'status': idea_status,
+            'tags': tags if tags else [],
+        })
+    return {"ideas": ideas}
+
+
+def _document_sources(params: dict[str, Any]) -> list[Select]:
+    document_id = UUID(params["document_id"])
+    return [select(func.count(), func.max(Document.updated_at)).where(Document.id == document_id)]
+
+
+async def _document_payload(db: AsyncSession, params: dict[str, Any]) -> dict[str, Any]:
+    document = (await db.execute(
+        select(Document.title, Document.content, Document.created_at, Document.updated_at)
+        .where(Document.id == UUID(params["document_id"]))
+    )).one()
+    return {
+        "title": document.title,
+        "content": document.content or "",
+        "metadata": {
+            'Created': document.created_at.strftime('%Y-%m-%d'),
+            'Last Updated': document.updated_at.strftime('%Y-%m-%d') if document.updated_at else None,
+        },
+    }
+
+
+def _analytics_sources(params: dict[str, Any]) -> list[Select]:
+    organization_id = UUID(params["organization_id"])
+    return [
+        _version(organization_project_query, Project, organization_id=organization_id),
+        _version(task_query, Task, organization_id=organization_id),
+    ]
+
+
+async def analytics_metrics(db: AsyncSession, organization_id: UUID) -> dict[str, Any]:
+    """Project and task totals for an organization, counted in SQL."""
+    total_projects, active_projects = (await db.execute(
+        organization_project_query(
+            func.count(),
+            func.count().filter(Project.status == "active"),
+            organization_id=organization_id,
+        )
+    )).one()
+    result = await db.execute(
+        task_query(Task.status, func.count(), organization_id=organization_id)
+        .group_by(Task.status)
+        .order_by(Task.status)
+    )
+    task_statuses = {task_status: count for task_status, count in result.all()}
+    total_tasks = sum(task_statuses.values())
+    completed_tasks = task_statuses.get("completed", 0)
+
+    return {
+        'total_projects': total_projects,
+        'active_projects': active_projects,
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'completion_rate': f"{(completed_tasks / total_tasks * 100) if total_tasks > 0 else 0:.1f}%",
+        'task_statuses': task_statuses,
+    }
+
+
+async def _analytics_payload(db: AsyncSession, params: dict[str, Any]) -> dict[str, Any]:
+    return {"metrics": await analytics_metrics(db, UUID(params["organization_id"]))}
+
+
+KINDS: dict[str, _Kind] = {
+    "project": _Kind("generate_project_pdf", _project_sources, _project_payload),
+    "tasks": _Kind("generate_tasks_pdf", _tasks_sources, _tasks_payload),
+    "ideas": _Kind("generate_ideas_pdf", _ideas_sources, _ideas_payload),
+    "document": _Kind("generate_document_pdf", _document_sources, _document_payload),
+    "analytics": _Kind("generate_analytics_pdf", _analytics_sources, _analytics_payload),
+}
+
+
+# --- Artifact store ---
+
+def _artifact_dir() -> Path:
+    path = Path(get_settings().export_artifact_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def artifact_path(key: str) -> Path:
+    """Where the PDF with content address ``key`` is stored."""
+    return _artifact_dir() / f"{key}.pdf"
+
+
+def _cached_artifact(key: str) -> Optional[Path]:
+    path = artifact_path(key)
+    try:
+        # Pruning goes by last use, not by when the file was written
+        os.utime(path)
+    except FileNotFoundError:
+        EXPORT_ARTIFACT_CACHE.labels(result="miss").inc()
+        return None
+    EXPORT_ARTIFACT_CACHE.labels(result="hit").inc()
+    return path
+
+
+async def _fingerprint(db: AsyncSession, export: PDFExport) -> tuple[str, int]:
+    """The export's content address, and how many rows it reads."""
+    versions = []
+    for source in KINDS[export.kind].sources(export.params):
+        count, updated_at = (await db.execute(source)).one()
+        versions.append([count, updated_at.isoformat() if updated_at else None])
+    digest = hashlib.sha256(orjson.dumps(
+        [export.kind, export.params, versions], option=orjson.OPT_SORT_KEYS
+    )).hexdigest()
+    return digest, sum(count for count, _ in versions)
+
+
+def prune_artifacts() -> int:
+    """Delete stored PDFs unused for ``export_artifact_ttl_seconds``."""
+    cutoff = time.time() - get_settings().export_artifact_ttl_seconds
+    removed = 0
+    for path in _artifact_dir().iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+# --- Rendering ---
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Spawned rather than forked: children start without the parent's
+        # event loop, connection pools and threads
+        _pool = ProcessPoolExecutor(
+            max_workers=get_settings().export_pdf_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the rendering processes, if they were started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+@dataclass
+class ExportJob:
+    """A PDF export rendered by the render_export task."""
+
+    id: str
+    kind: str
+    params: dict[str, Any]
+    filename: str
+    user_id: str
+    artifact_key: str
+    status: str = "queued"  # queued|running|done|failed
+    error: Optional[str] = None
+    created_at: str = ""
+
+
+async def export_pdf(
+    db: AsyncSession,
+    export: PDFExport,
+    user_id: UUID,
+) -> Path | ExportJob:
+    """Get a PDF export's file, rendering it if needed.
+
+    Returns:
+        The stored PDF, or the job that will render it when the export
+        reads more than ``export_pdf_inline_max_rows`` rows
+    """
+    settings = get_settings()
+    key, rows = await _fingerprint(db, export)
+    path = _cached_artifact(key)
+    if path is not None:
+        return path
+
+    if rows > settings.export_pdf_inline_max_rows:
+        return await start_job(export, key, user_id)
+
+    kind = KINDS[export.kind]
+    payload = await kind.payload(db, export.params)
+    # The request's connection isn't needed while the PDF renders
+    await release_connection(db)
+
+    path = artifact_path(key)
+    start = time.monotonic()
+    await asyncio.get_running_loop().run_in_executor(
+        _get_pool(), render_to_file, kind.renderer, payload, str(path)
+    )
+    EXPORT_PDF_RENDER.labels(export=export.kind, runner="pool").observe(time.monotonic() - start)
+    return path
+
+
+# --- Jobs ---
+
+async def _save_job(job: ExportJob) -> None:
+    await get_redis().set(
+        JOB_KEY.format(job.id),
+        orjson.dumps(asdict(job)),
+        ex=get_settings().export_job_ttl_seconds,
+    )
+
+
+async def get_job(job_id: UUID) -> Optional[ExportJob]:
+    """An export job, or None if it doesn't exist or has expired."""
+    data = await get_redis().get(JOB_KEY.format(job_id))
+    return ExportJob(**orjson.loads(data)) if data else None
+
+
+async def start_job(export: PDFExport, artifact_key: str, user_id: UUID) -> ExportJob:
+    """Queue a render_export job for ``export``."""
+    from researchhub.tasks import render_export
+
+    job = ExportJob(
+        id=str(uuid4()),
+        kind=export.kind,
+        params=export.params,
+        filename=export.filename,
+        user_id=str(user_id),
+        artifact_key=artifact_key,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+    await _save_job(job)
+    render_export.delay(job.id)
+    logger.info("export_job_queued", job_id=job.id, kind=job.kind, artifact_key=artifact_key)
+    return job
+
+
+async def run_job(job_id: str) -> Optional[ExportJob]:
+    """Render a queued export job's PDF (in the Celery worker).
+
+    Returns:
+        The finished job, or None if it has expired
+    """
+    job = await get_job(UUID(job_id))
+    if job is None:
+        return None
+    job.status = "running"
+    await _save_job(job)
+
+    try:
+        path = _cached_artifact(job.artifact_key)
+        if path is None:
+            kind = KINDS[job.kind]
+            async with async_session_factory() as db:
+                payload = await kind.payload(db, job.params)
+            start = time.monotonic()
+            render_to_file(kind.renderer, payload, str(artifact_path(job.artifact_key)))
+            EXPORT_PDF_RENDER.labels(export=job.kind, runner="job").observe(time.monotonic() - start)
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+        await _save_job(job)
+        raise
+
+    job.status = "done"
+    await _save_job(job)
+    return job
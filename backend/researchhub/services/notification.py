@@ -1,15 +1,106 @@
-"""Notification service for creating in-app notifications."""
+"""Notification service for creating in-app notifications.
 
-from uuid import UUID
+Fan-out to many recipients (``notify_many``) costs the same few round trips
+however many users it reaches: their preferences are read with one query,
+filtered in memory, and the notifications are written with one multi-row
+INSERT. Fan-outs to more than ``notification_fanout_inline_max`` users are
+handed to the fan_out_notifications Celery task instead.
+
+Preferences are cached in process memory for
+``notification_preference_cache_ttl_seconds``. A commit that changes a
+user's preferences evicts them from the committing process's cache; other
+processes see the change when their entry expires.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Iterable, Sequence
+from uuid import UUID, uuid4
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import event, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from researchhub.config import get_settings
+from researchhub.metrics import NOTIFICATION_FANOUT_RECIPIENTS, NOTIFICATION_PREFERENCE_CACHE
 from researchhub.models.activity import Notification, NotificationPreference
 
 logger = structlog.get_logger()
 
+# Rows per multi-row INSERT, well under PostgreSQL's 32767 bind parameters
+INSERT_BATCH_ROWS = 1000
+
+
+@dataclass(frozen=True)
+class PreferenceSnapshot:
+    """The parts of a NotificationPreference row that decide in-app delivery."""
+
+    in_app_enabled: bool = True
+    notify_mentions: bool = True
+    notify_assignments: bool = True
+    notify_comments: bool = True
+    notify_task_updates: bool = True
+    notify_document_updates: bool = True
+    notify_project_updates: bool = True
+    notify_team_changes: bool = True
+
+    @classmethod
+    def from_row(cls, prefs: NotificationPreference) -> "PreferenceSnapshot":
+        return cls(**{f.name: getattr(prefs, f.name) for f in fields(cls)})
+
+
+class _PreferenceCache:
+    """LRU of users' preferences with a TTL; None caches "no preferences row"."""
+
+    def __init__(self, max_users: int, ttl_seconds: float):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[UUID, tuple[float, PreferenceSnapshot | None]] = OrderedDict()
+
+    def get_many(self, user_ids: Iterable[UUID]) -> tuple[dict[UUID, PreferenceSnapshot | None], list[UUID]]:
+        """Cached preferences, and the users that missed."""
+        now = time.monotonic()
+        found: dict[UUID, PreferenceSnapshot | None] = {}
+        missing = []
+        for user_id in user_ids:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                missing.append(user_id)
+                continue
+            self._entries.move_to_end(user_id)
+            found[user_id] = entry[1]
+        NOTIFICATION_PREFERENCE_CACHE.labels(result="hit").inc(len(found))
+        NOTIFICATION_PREFERENCE_CACHE.labels(result="miss").inc(len(missing))
+        return found, missing
+
+    def set_many(self, preferences: dict[UUID, PreferenceSnapshot | None]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        for user_id, snapshot in preferences.items():
+            self._entries[user_id] = (expires_at, snapshot)
+            self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def evict(self, user_ids: Iterable[UUID]) -> None:
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+
+
+_preference_cache: _PreferenceCache | None = None
+
+
+def _get_preference_cache() -> _PreferenceCache:
+    global _preference_cache
+    if _preference_cache is None:
+        settings = get_settings()
+        _preference_cache = _PreferenceCache(
+            max_users=settings.notification_preference_cache_max_users,
+            ttl_seconds=settings.notification_preference_cache_ttl_seconds,
+        )
+    return _preference_cache
+
 
 class NotificationService:
     """Service for creating and managing user notifications."""
@@ -82,7 +173,7 @@ class NotificationService:
             return None
 
         # Check user preferences
-        prefs = await self._get_preferences(user_id)
+        prefs = (await self._get_preferences_many([user_id]))[user_id]
 
         # Check if in-app notifications are enabled
         if prefs and not prefs.in_app_enabled:
@@ -130,7 +221,7 @@ class NotificationService:
 
     async def notify_many(
         self,
-        user_ids: list[UUID],
+        user_ids: Sequence[UUID],
         notification_type: str,
         title: str,
         message: str,
@@ -140,44 +231,122 @@ class NotificationService:
         target_url: str | None = None,
         sender_id: UUID | None = None,
         extra_data: dict | None = None,
-    ) -> list[Notification]:
+        defer_large: bool = True,
+    ) -> int:
         """
-        Create notifications for multiple users.
+        Create the same notification for multiple users.
 
-        Each user's preferences are checked individually.
+        Each user's preferences are checked as in notify(), but all of them
+        are loaded with one query and the notifications are inserted with
+        one statement and committed together.
+
+        Args:
+            user_ids: Recipients; duplicates and the sender are skipped
+            defer_large: Hand fan-outs to more than
+                notification_fanout_inline_max users to the
+                fan_out_notifications task instead of writing them here
+            (others as for notify())
 
         Returns:
-            List of created Notifications (may be fewer than user_ids if some are filtered)
+            Number of notifications created (0 if the fan-out was deferred)
         """
-        notifications = []
-        for user_id in user_ids:
-            notification = await self.notify(
-                user_id=user_id,
+        recipients = [
+            user_id for user_id in dict.fromkeys(user_ids)
+            if not (sender_id and user_id == sender_id)
+        ]
+        if not recipients:
+            return 0
+
+        if defer_large and len(recipients) > get_settings().notification_fanout_inline_max:
+            from researchhub.tasks import fan_out_notifications
+
+            fan_out_notifications.delay(
+                user_ids=[str(user_id) for user_id in recipients],
                 notification_type=notification_type,
                 title=title,
                 message=message,
-                organization_id=organization_id,
+                organization_id=str(organization_id),
                 target_type=target_type,
-                target_id=target_id,
+                target_id=str(target_id) if target_id else None,
                 target_url=target_url,
-                sender_id=sender_id,
+                sender_id=str(sender_id) if sender_id else None,
                 extra_data=extra_data,
             )
-            if notification:
-                notifications.append(notification)
-        return notifications
-
-    async def _get_preferences(self, user_id: UUID) -> NotificationPreference | None:
-        """Get notification preferences for a user."""
-        result = await self.db.execute(
-            select(NotificationPreference).where(
-                NotificationPreference.user_id == user_id
+            logger.info(
+                "notification_fanout_deferred",
+                notification_type=notification_type,
+                recipients=len(recipients),
             )
+            return 0
+
+        preferences = await self._get_preferences_many(recipients)
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "notification_type": notification_type,
+                "title": title,
+                "message": message,
+                "organization_id": organization_id,
+                "target_type": target_type,
+                "target_id": target_id,
+                "target_url": target_url,
+                "sender_id": sender_id,
+                "extra_data": extra_data,
+                "is_read": False,
+                "is_archived": False,
+            }
+            for user_id in recipients
+            if self._allows_in_app(preferences[user_id], notification_type)
+        ]
+        NOTIFICATION_FANOUT_RECIPIENTS.observe(len(recipients))
+
+        if rows:
+            for start in range(0, len(rows), INSERT_BATCH_ROWS):
+                await self.db.execute(
+                    insert(Notification).values(rows[start:start + INSERT_BATCH_ROWS])
+                )
+            await self.db.commit()
+
+        logger.info(
+            "notifications_created",
+            notification_type=notification_type,
+            recipients=len(recipients),
+            created=len(rows),
         )
-        return result.scalar_one_or_none()
+        return len(rows)
+
+    async def _get_preferences_many(
+        self, user_ids: Sequence[UUID]
+    ) -> dict[UUID, PreferenceSnapshot | None]:
+        """Preferences of each user (None if they have none), cached or in one query."""
+        cache = _get_preference_cache()
+        preferences, missing = cache.get_many(user_ids)
+        if missing:
+            result = await self.db.execute(
+                select(NotificationPreference).where(
+                    NotificationPreference.user_id.in_(missing)
+                )
+            )
+            loaded: dict[UUID, PreferenceSnapshot | None] = dict.fromkeys(missing)
+            for prefs in result.scalars():
+                loaded[prefs.user_id] = PreferenceSnapshot.from_row(prefs)
+            cache.set_many(loaded)
+            preferences.update(loaded)
+        return preferences
+
+    def _allows_in_app(
+        self, prefs: PreferenceSnapshot | None, notification_type: str
+    ) -> bool:
+        """Whether in-app delivery and this notification type are both enabled."""
+        if prefs and not prefs.in_app_enabled:
+            return False
+        return self._should_notify(prefs, notification_type)
 
     def _should_notify(
-        self, prefs: NotificationPreference | None, notification_type: str
+        self,
+        prefs: PreferenceSnapshot | NotificationPreference | None,
+        notification_type: str,
     ) -> bool:
         """
         Check if a notification type is enabled in user preferences.
@@ -197,3 +366,25 @@ class NotificationService:
 
         # Check the preference value
         return getattr(prefs, pref_field, True)
+
+
+# --- Invalidation ---
+
+@event.listens_for(Session, "after_flush")
+def _collect_preference_changes(session: Session, flush_context) -> None:
+    """Record whose preferences the flushed rows change."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, NotificationPreference) and obj.user_id is not None:
+            session.info.setdefault("notification_preference_invalidation", set()).add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_preference_invalidation(session: Session) -> None:
+    user_ids = session.info.pop("notification_preference_invalidation", None)
+    if user_ids and _preference_cache is not None:
+        _preference_cache.evict(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_preference_invalidation(session: Session) -> None:
+    session.info.pop("notification_preference_invalidation", None)
@@ -0,0 +1,212 @@
+"""Keyset (cursor) pagination with optional totals.
+
+OFFSET pagination makes Postgres read and discard every row before the
+requested page, and a separate COUNT(*) over the filtered query on every
+page often costs more than the page itself. ``paginate`` instead seeks past
+the last row of the previous page using an opaque cursor that encodes its
+sort key and id, so page N costs the same as page 1 when an index covers
+the sort order. ``has_more`` comes from fetching one extra row.
+
+Totals are opt-in:
+
+- ``"exact"``: COUNT(*) over the filtered query
+- ``"estimate"``: the planner's row estimate from EXPLAIN, which costs no
+  table scan but can be off on very selective filters
+- ``"none"``: no total
+
+Example:
+    page = await paginate(
+        db,
+        select(Activity).where(Activity.organization_id == org_id),
+        order_by=[Activity.created_at.desc(), Activity.id.desc()],
+        limit=50,
+        cursor=cursor,
+    )
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, Literal, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ClauseElement, UnaryExpression
+from sqlalchemy.sql.expression import Executable
+from sqlalchemy.sql.operators import desc_op
+
+T = TypeVar("T")
+
+TotalMode = Literal["none", "estimate", "exact"]
+
+# Query pattern for endpoints exposing the total mode as a parameter
+TOTAL_MODE_PATTERN = "^(none|estimate|exact)$"
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results."""
+
+    items: list[T]
+    has_more: bool
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _split_order(order_by: Sequence[Any]) -> list[tuple[Any, bool]]:
+    """(column, descending) pairs for ``col``, ``col.asc()`` and ``col.desc()``."""
+    keys = []
+    for clause in order_by:
+        if isinstance(clause, UnaryExpression) and clause.modifier is not None:
+            keys.append((clause.element, clause.modifier is desc_op))
+        else:
+            keys.append((clause, False))
+    return keys
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(column: Any, value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key as an opaque cursor."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list[Any]:
+    """Decode a cursor into sort key values typed for ``columns``.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or for another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the ordering")
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _after(keys: list[tuple[Any, bool]], values: list[Any]):
+    """Condition selecting the rows that sort after ``values``."""
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        # Row comparison, which Postgres can satisfy with one index range scan
+        columns = tuple_(*(column for column, _ in keys))
+        row = tuple_(*values)
+        return columns < row if directions.pop() else columns > row
+
+    alternatives = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [keys[j][0] == values[j] for j in range(i)]
+        alternatives.append(and_(*equal, column < values[i] if descending else column > values[i]))
+    return or_(*alternatives)
+
+
+async def _count(db: AsyncSession, query: Select, mode: TotalMode) -> Optional[int]:
+    base = query.order_by(None).limit(None).offset(None)
+    if mode == "exact":
+        return await db.scalar(select(func.count()).select_from(base.subquery())) or 0
+    if mode == "estimate":
+        plan = (await db.execute(_Explain(base))).scalar()
+        if isinstance(plan, (str, bytes)):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return None
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    total: TotalMode = "none",
+) -> Page:
+    """Fetch one page of ``query``.
+
+    Args:
+        db: Database session
+        query: Filtered select of one entity, without ordering or limits
+        order_by: Sort columns, optionally ``.asc()``/``.desc()``; the last
+            must be unique (normally the primary key) so the order is total
+        limit: Page size
+        cursor: ``next_cursor`` of the previous page
+        offset: Rows to skip when no cursor is given, for clients still
+            paging by offset
+        total: Whether and how to compute the total number of rows
+
+    Returns:
+        The page; ``next_cursor`` is set when ``has_more`` is.
+    """
+    keys = _split_order(order_by)
+    columns = [column for column, _ in keys]
+
+    total_count = await _count(db, query, total)
+
+    page_query = query.order_by(*order_by).limit(limit + 1)
+    if cursor:
+        page_query = page_query.where(_after(keys, decode_cursor(cursor, columns)))
+    elif offset:
+        page_query = page_query.offset(offset)
+
+    # Fetch the sort key alongside each entity, so columns need not be
+    # mapped attributes of it
+    result = await db.execute(page_query.add_columns(*columns))
+    rows = result.all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(list(rows[-1][1:])) if has_more and rows else None
+
+    return Page(
+        items=[row[0] for row in rows],
+        has_more=has_more,
+        next_cursor=next_cursor,
+        total=total_count,
+        total_is_estimate=total == "estimate",
+    )
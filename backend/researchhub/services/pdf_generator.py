@@ -1,6 +1,7 @@
 """PDF generation service using ReportLab."""
 
 import io
+import os
 from datetime import datetime
 from typing import Any
 
@@ -19,6 +20,9 @@ from reportlab.platypus import (
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
+# Rows per Table flowable in long listings (see PDFGenerator._long_table)
+TABLE_CHUNK_ROWS = 200
+
 
 class PDFGenerator:
     """Generate professional PDF documents."""
@@ -69,6 +73,35 @@ class PDFGenerator:
             alignment=TA_CENTER,
         ))
 
+    def _long_table(
+        self,
+        data: list[list[Any]],
+        col_widths: list[float],
+        style: list[tuple],
+    ) -> list[Table]:
+        """Lay out a header row and any number of rows as consecutive tables.
+
+        ReportLab re-measures every remaining row of a table at each page
+        break, so one table of n rows takes time quadratic in n (minutes for
+        tens of thousands of tasks). Chunks of TABLE_CHUNK_ROWS rows keep
+        that work per chunk and render the same: only the first chunk has
+        the header, and the others get its body styles shifted up a row.
+        """
+        first = Table(data[:TABLE_CHUNK_ROWS + 1], colWidths=col_widths)
+        first.setStyle(TableStyle(style))
+        tables = [first]
+
+        body_style = [
+            (command, (start[0], max(start[1] - 1, 0)), end, *args)
+            for command, start, end, *args in style
+            if end[1] != 0
+        ]
+        for offset in range(TABLE_CHUNK_ROWS + 1, len(data), TABLE_CHUNK_ROWS):
+            table = Table(data[offset:offset + TABLE_CHUNK_ROWS], colWidths=col_widths)
+            table.setStyle(TableStyle(body_style))
+            tables.append(table)
+        return tables
+
     def _add_header_footer(self, canvas, doc) -> None:
         """Add header and footer to each page."""
         canvas.saveState()
@@ -141,8 +174,7 @@ class PDFGenerator:
                     task.get('due_date', 'N/A'),
                 ])
 
-            task_table = Table(task_data, colWidths=[3*inch, 1*inch, 1*inch, 1.2*inch])
-            task_table.setStyle(TableStyle([
+            story.extend(self._long_table(task_data, [3*inch, 1*inch, 1*inch, 1.2*inch], [
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -155,7 +187,6 @@ class PDFGenerator:
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cbd5e0')),
                 ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')]),
             ]))
-            story.append(task_table)
             story.append(Spacer(1, 20))
 
         # Documents Section
@@ -170,8 +201,7 @@ class PDFGenerator:
                     doc_item.get('created_at', 'N/A'),
                 ])
 
-            doc_table = Table(doc_data, colWidths=[4*inch, 1.2*inch, 1.5*inch])
-            doc_table.setStyle(TableStyle([
+            story.extend(self._long_table(doc_data, [4*inch, 1.2*inch, 1.5*inch], [
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -184,7 +214,6 @@ class PDFGenerator:
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cbd5e0')),
                 ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')]),
             ]))
-            story.append(doc_table)
 
         doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
         buffer.seek(0)
@@ -255,8 +284,7 @@ class PDFGenerator:
                 task.get('assignee', 'Unassigned')[:20],
             ])
 
-        task_table = Table(task_data, colWidths=[2.5*inch, 0.9*inch, 0.8*inch, 1*inch, 1.3*inch])
-        task_table.setStyle(TableStyle([
+        story.extend(self._long_table(task_data, [2.5*inch, 0.9*inch, 0.8*inch, 1*inch, 1.3*inch], [
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -269,7 +297,6 @@ class PDFGenerator:
             ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cbd5e0')),
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')]),
         ]))
-        story.append(task_table)
 
         doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
         buffer.seek(0)
@@ -357,8 +384,7 @@ class PDFGenerator:
                 tags,
             ])
 
-        idea_table = Table(idea_data, colWidths=[2.2*inch, 0.9*inch, 0.8*inch, 0.9*inch, 1.7*inch])
-        idea_table.setStyle(TableStyle([
+        story.extend(self._long_table(idea_data, [2.2*inch, 0.9*inch, 0.8*inch, 0.9*inch, 1.7*inch], [
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -371,7 +397,6 @@ class PDFGenerator:
             ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cbd5e0')),
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')]),
         ]))
-        story.append(idea_table)
 
         doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
         buffer.seek(0)
@@ -455,3 +480,21 @@ class PDFGenerator:
 
 # Singleton instance
 pdf_generator = PDFGenerator()
+
+
+def render_to_file(method: str, kwargs: dict[str, Any], path: str) -> int:
+    """Render with ``pdf_generator.<method>(**kwargs)`` and write the PDF to ``path``.
+
+    Runs in the export rendering processes and Celery workers (see
+    services/exports.py). The file appears atomically, so a concurrent
+    reader sees either nothing or the whole PDF.
+
+    Returns:
+        Size of the PDF in bytes
+    """
+    data = getattr(pdf_generator, method)(**kwargs).getvalue()
+    partial = f"{path}.{os.getpid()}.partial"
+    with open(partial, "wb") as f:
+        f.write(data)
+    os.replace(partial, path)
+    return len(data)
@@ -0,0 +1,185 @@
+"""Project hierarchy queries.
+
+Subtrees, ancestor chains and depths are each resolved with a single
+recursive CTE over ``projects.parent_id``. Before this, callers walked the
+tree one query per node or per level. Every CTE stops after
+MAX_TRAVERSAL_DEPTH levels, so a corrupt parent_id cycle cannot make a
+query run away.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import CTE, exists, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, lazyload
+
+from researchhub.models.project import Project, Task
+
+# Well above MAX_HIERARCHY_DEPTH; only guards against cycles
+MAX_TRAVERSAL_DEPTH = 32
+
+# Load bare Project rows: no vector payloads, no eager relationship loads
+_BARE_PROJECT = (
+    defer(Project.embedding),
+    defer(Project.search_vector),
+    lazyload("*"),
+)
+
+
+@dataclass
+class TreeNode:
+    """A project in a resolved subtree."""
+
+    project: Project
+    depth: int
+    task_count: int = 0
+    children: list["TreeNode"] = field(default_factory=list)
+
+
+def descendants_cte(root_ids: list[UUID], include_archived: bool = True) -> CTE:
+    """(id, parent_id, depth) for the roots (depth 0) and all descendants.
+
+    With include_archived=False, archived projects and everything below
+    them are pruned.
+    """
+    base = select(
+        Project.id.label("id"),
+        Project.parent_id.label("parent_id"),
+        literal(0).label("depth"),
+    ).where(Project.id.in_(root_ids))
+    cte = base.cte("project_descendants", recursive=True)
+
+    step = (
+        select(Project.id, Project.parent_id, cte.c.depth + 1)
+        .join(cte, Project.parent_id == cte.c.id)
+        .where(cte.c.depth < MAX_TRAVERSAL_DEPTH)
+    )
+    if not include_archived:
+        step = step.where(Project.is_archived == False)
+    return cte.union_all(step)
+
+
+def ancestors_cte(project_ids: list[UUID]) -> CTE:
+    """(origin_id, ancestor_id, distance) for every ancestor of each project.
+
+    distance is 1 for the parent, 2 for the grandparent, and so on.
+    """
+    base = select(
+        Project.id.label("origin_id"),
+        Project.parent_id.label("ancestor_id"),
+        literal(1).label("distance"),
+    ).where(Project.id.in_(project_ids), Project.parent_id.isnot(None))
+    cte = base.cte("project_ancestors", recursive=True)
+
+    step = (
+        select(cte.c.origin_id, Project.parent_id, cte.c.distance + 1)
+        .join(cte, Project.id == cte.c.ancestor_id)
+        .where(Project.parent_id.isnot(None), cte.c.distance < MAX_TRAVERSAL_DEPTH)
+    )
+    return cte.union_all(step)
+
+
+async def get_subtree(
+    db: AsyncSession,
+    root_id: UUID,
+    include_archived: bool = True,
+) -> TreeNode | None:
+    """Load a project and all its descendants, with per-node task counts.
+
+    One query, whatever the depth. Children are ordered by name.
+    """
+    cte = descendants_cte([root_id], include_archived)
+    task_count = (
+        select(func.count(Task.id))
+        .where(Task.project_id == cte.c.id)
+        .correlate(cte)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(Project, cte.c.depth, task_count)
+        .join(cte, Project.id == cte.c.id)
+        .options(*_BARE_PROJECT)
+        .order_by(cte.c.depth, Project.name)
+    )
+
+    nodes: dict[UUID, TreeNode] = {}
+    root = None
+    for project, depth, count in result.all():
+        if project.id in nodes:
+            continue  # Only reachable twice through a cycle
+        node = TreeNode(project=project, depth=depth, task_count=count)
+        nodes[project.id] = node
+        if project.id == root_id:
+            root = node
+        elif project.parent_id in nodes:
+            nodes[project.parent_id].children.append(node)
+    return root
+
+
+async def get_descendant_ids(
+    db: AsyncSession,
+    project_id: UUID,
+    include_self: bool = True,
+) -> list[UUID]:
+    """IDs of a project's descendants (and itself), shallowest first."""
+    cte = descendants_cte([project_id])
+    query = select(cte.c.id).order_by(cte.c.depth)
+    if not include_self:
+        query = query.where(cte.c.depth > 0)
+    result = await db.execute(query)
+    # A cycle would repeat ids; keep the first (shallowest) occurrence
+    return list(dict.fromkeys(result.scalars().all()))
+
+
+async def is_descendant(db: AsyncSession, project_id: UUID, ancestor_id: UUID) -> bool:
+    """True if project_id is ancestor_id itself or below it."""
+    cte = descendants_cte([ancestor_id])
+    result = await db.execute(select(exists().where(cte.c.id == project_id)))
+    return bool(result.scalar())
+
+
+async def get_ancestor_ids(db: AsyncSession, project_id: UUID) -> list[UUID]:
+    """IDs of a project's ancestors, nearest (parent) first."""
+    cte = ancestors_cte([project_id])
+    result = await db.execute(select(cte.c.ancestor_id).order_by(cte.c.distance))
+    return list(result.scalars().all())
+
+
+async def get_ancestors(db: AsyncSession, project_id: UUID, *options: Any) -> list[Project]:
+    """A project's ancestors as entities, root first (breadcrumb order)."""
+    chains = await get_ancestor_chains(db, [project_id], *options)
+    return chains.get(project_id, [])
+
+
+async def get_ancestor_chains(
+    db: AsyncSession,
+    project_ids: list[UUID],
+    *options: Any,
+) -> dict[UUID, list[Project]]:
+    """Ancestor chains (root first) for many projects in one query.
+
+    Projects without a parent map to an empty list. ``options`` are loader
+    options for the returned Project entities; by default they are loaded
+    without relationships.
+    """
+    chains: dict[UUID, list[Project]] = {project_id: [] for project_id in project_ids}
+    if not project_ids:
+        return chains
+
+    cte = ancestors_cte(project_ids)
+    result = await db.execute(
+        select(cte.c.origin_id, Project)
+        .join(Project, Project.id == cte.c.ancestor_id)
+        .options(*(options or _BARE_PROJECT))
+        .order_by(cte.c.origin_id, cte.c.distance.desc())
+    )
+    for origin_id, ancestor in result.all():
+        chains[origin_id].append(ancestor)
+    return chains
+
+
+async def get_depth(db: AsyncSession, project_id: UUID) -> int:
+    """Depth of a project in the hierarchy (1 = top-level)."""
+    return len(await get_ancestor_ids(db, project_id)) + 1
@@ -269,17 +269,7 @@ class RecurringTaskService:
         if rule.due_date_offset_days:
             due_date = date.today() + timedelta(days=rule.due_date_offset_days)
 
-        # Get max position for todo status
-        from sqlalchemy import func
-        max_pos_result = await self.db.execute(
-            select(func.max(Task.position)).where(
-                Task.project_id == rule.project_id,
-                Task.status == "todo",
-            )
-        )
-        max_position = max_pos_result.scalar() or 0
-
-        # Create the task
+        # Create the task (the rank hook appends it to the todo column)
         task = Task(
             title=rule.title,
             description=rule.description,
@@ -291,7 +281,6 @@ class RecurringTaskService:
             created_by_id=created_by_id or rule.created_by_id,
             due_date=due_date,
             status="todo",
-            position=max_position + 1,
         )
         self.db.add(task)
         await self.db.flush()  # Get task ID
@@ -238,12 +238,14 @@ class TaskAssignmentService:
         assignment_id: UUID,
     ) -> bool:
         """Remove an assignment by its ID."""
-        result = await self.db.execute(
-            delete(TaskAssignment).where(TaskAssignment.id == assignment_id)
-        )
+        # Deleted through the ORM so the board hooks see which task it was on
+        assignment = await self.db.get(TaskAssignment, assignment_id)
+        if assignment is None:
+            return False
+        await self.db.delete(assignment)
         await self.db.commit()
 
-        return result.rowcount > 0
+        return True
 
     # =========================================================================
     # Assignment Queries
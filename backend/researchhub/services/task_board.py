@@ -0,0 +1,474 @@
+"""Kanban board snapshots with SQL-side counts.
+
+A board is a project's top-level tasks grouped by status, optionally with
+the tasks of its descendant projects. Cards are built from one query that
+counts comments and subtasks in SQL instead of loading them, and carry a
+short plain-text ``description_preview`` (the text nodes of the TipTap
+document, extracted in SQL) instead of the full description, which is only
+included when asked for.
+
+Boards without descriptions are cached in Redis as serialized snapshots per
+(project, include_children). A snapshot is stamped with the version counter
+``tasks:v1:board:ver:{project_id}`` of every project it covers, and its
+ETag is a hash of its body. SQLAlchemy session hooks bump a project's
+counter when its tasks, their comments or assignments, or the project's
+name change, and when a creator or assignee of one of its cards changes
+their name or email, so a stale snapshot is rebuilt on the next load, and clients
+revalidating with If-None-Match get a 304 without any task query. The
+hooks only read flushed instances and the identity map; the bumps are sent
+after commit without blocking the event loop (see db.redis).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+from sqlalchemy import cast, event, func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, load_only, selectinload
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+from sqlalchemy.sql.operators import eq, in_op
+
+from researchhub.config import get_settings
+from researchhub.db.redis import (
+    counter_unconfirmed,
+    get_redis,
+    retry_counter_bumps,
+    schedule_counter_bumps,
+)
+from researchhub.db.session import async_session_factory
+from researchhub.models.project import Project, Task, TaskAssignment, TaskComment
+from researchhub.models.user import User
+from researchhub.services import project_hierarchy as hierarchy
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "tasks:v1:board"
+
+BOARD_STATUSES = ("idea", "todo", "in_progress", "in_review", "done")
+
+DESCRIPTION_PREVIEW_LENGTH = 200
+
+# Text nodes of a TipTap document, in document order
+_TEXT_NODES_PATH = 'strict $.** ? (@.type == "text").text'
+
+# Task columns loaded for a board card
+CARD_COLUMNS = (
+    "id",
+    "title",
+    "status",
+    "priority",
+    "task_type",
+    "project_id",
+    "created_by_id",
+    "assignee_id",
+    "due_date",
+    "completed_at",
+    "position",
+    "estimated_hours",
+    "actual_hours",
+    "parent_task_id",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+
+# Task attributes whose changes show on a board (description feeds the preview)
+CARD_ATTRS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "task_type",
+    "project_id",
+    "assignee_id",
+    "due_date",
+    "completed_at",
+    "rank",
+    "estimated_hours",
+    "actual_hours",
+    "parent_task_id",
+    "tags",
+)
+
+# User attributes embedded in cards (creator and assignee names and emails)
+USER_CARD_ATTRS = ("display_name", "email")
+
+
+def _version_key(project_id: UUID) -> str:
+    return f"{KEY_PREFIX}:ver:{project_id}"
+
+
+def _snapshot_key(project_id: UUID, include_children: bool) -> str:
+    return f"{KEY_PREFIX}:{project_id}:{int(include_children)}"
+
+
+@dataclass
+class BoardSnapshot:
+    """A serialized board and the ETag identifying it."""
+
+    etag: str
+    body: bytes
+
+
+def _preview(texts: Any) -> str | None:
+    if isinstance(texts, str):
+        texts = json.loads(texts)
+    if not texts:
+        return None
+    text = " ".join(t for t in texts if isinstance(t, str)).strip()
+    return text[:DESCRIPTION_PREVIEW_LENGTH] or None
+
+
+async def load_board(
+    db: AsyncSession,
+    project_id: UUID,
+    include_children: bool = False,
+    include_description: bool = False,
+) -> dict[str, list[dict]]:
+    """Build a board from the database.
+
+    Returns:
+        Card dicts per status, each column ordered by rank (and by
+        project first when include_children is set).
+    """
+    from researchhub.api.v1.tasks import _assignment_to_response
+
+    if include_children:
+        project_ids = await hierarchy.get_descendant_ids(db, project_id)
+    else:
+        project_ids = [project_id]
+
+    names_result = await db.execute(
+        select(Project.id, Project.name).where(Project.id.in_(project_ids))
+    )
+    project_names = dict(names_result.all())
+
+    subtask = aliased(Task)
+    comment_count = (
+        select(func.count(TaskComment.id))
+        .where(TaskComment.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    subtask_count = (
+        select(func.count(subtask.id))
+        .where(subtask.parent_task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    preview_texts = func.jsonb_path_query_array(
+        Task.description,
+        cast(literal(_TEXT_NODES_PATH), JSONPATH),
+        literal({}, JSONB),
+        True,
+        type_=JSONB,
+    )
+
+    # Only card columns: tasks also carry embeddings and search vectors
+    columns = [getattr(Task, attr) for attr in CARD_COLUMNS]
+    if include_description:
+        columns.append(Task.description)
+    options = [
+        load_only(*columns),
+        selectinload(Task.assignments).selectinload(TaskAssignment.user),
+        selectinload(Task.created_by),
+    ]
+
+    query = (
+        select(Task, comment_count, subtask_count, preview_texts)
+        .options(*options)
+        .where(Task.project_id.in_(project_ids), Task.parent_task_id.is_(None))
+    )
+    if include_children:
+        query = query.order_by(Task.project_id, Task.rank.asc())
+    else:
+        query = query.order_by(Task.rank.asc())
+
+    result = await db.execute(query)
+
+    board: dict[str, list[dict]] = {status: [] for status in BOARD_STATUSES}
+    for task, comments, subtasks, texts in result.all():
+        if task.status not in board:
+            continue
+        board[task.status].append({
+            "id": task.id,
+            "title": task.title,
+            "description": task.description if include_description else None,
+            "description_preview": _preview(texts),
+            "status": task.status,
+            "priority": task.priority,
+            "task_type": task.task_type,
+            "project_id": task.project_id,
+            "project_name": project_names.get(task.project_id),
+            "assignee_id": task.assignee_id,
+            "created_by_id": task.created_by_id,
+            "created_by_name": task.created_by.display_name if task.created_by else None,
+            "created_by_email": task.created_by.email if task.created_by else None,
+            "due_date": task.due_date,
+            "completed_at": task.completed_at,
+            "position": task.position,
+            "estimated_hours": task.estimated_hours,
+            "actual_hours": task.actual_hours,
+            "parent_task_id": task.parent_task_id,
+            "tags": task.tags or [],
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+            "comment_count": comments or 0,
+            "subtask_count": subtasks or 0,
+            "vote_count": getattr(task, "vote_count", 0),
+            "user_voted": False,
+            "impact_score": getattr(task, "impact_score", None),
+            "effort_score": getattr(task, "effort_score", None),
+            "assignments": [_assignment_to_response(a) for a in task.assignments],
+        })
+    return board
+
+
+def serialize_board(board: dict[str, list[dict]]) -> bytes:
+    """Serialize a board exactly as the API responds with it."""
+    from researchhub.api.v1.tasks import TasksByStatusResponse
+
+    return TasksByStatusResponse.model_validate(board).model_dump_json().encode()
+
+
+def _stamp(project_ids: list[UUID], versions: list[bytes | None]) -> bytes:
+    """Digest of the covered projects and their board versions."""
+    material = ",".join(
+        f"{project_id}={(version or b'0').decode()}"
+        for project_id, version in zip(project_ids, versions)
+    )
+    return hashlib.sha256(material.encode()).hexdigest()[:32].encode()
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header lists ``etag``."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def get_board_snapshot(
+    db: AsyncSession,
+    project_id: UUID,
+    include_children: bool = False,
+) -> BoardSnapshot:
+    """Get a project's board without descriptions, from cache when current."""
+    if include_children:
+        project_ids = sorted(await hierarchy.get_descendant_ids(db, project_id))
+    else:
+        project_ids = [project_id]
+    key = _snapshot_key(project_id, include_children)
+
+    await retry_counter_bumps()
+    if counter_unconfirmed(*(_version_key(p) for p in project_ids)):
+        # A failed invalidation may have left this snapshot stale
+        body = serialize_board(await load_board(db, project_id, include_children))
+        return BoardSnapshot(etag=_etag(body), body=body)
+
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.mget([_version_key(p) for p in project_ids])
+            pipe.get(key)
+            versions, cached = await pipe.execute()
+    except RedisError as e:
+        logger.warning("task_board_cache_unavailable", error=str(e))
+        body = serialize_board(await load_board(db, project_id, include_children))
+        return BoardSnapshot(etag=_etag(body), body=body)
+
+    stamp = _stamp(project_ids, versions)
+    if cached:
+        cached_stamp, _, rest = cached.partition(b"|")
+        if cached_stamp == stamp:
+            etag, _, body = rest.partition(b"|")
+            return BoardSnapshot(etag=etag.decode(), body=body)
+
+    body = serialize_board(await load_board(db, project_id, include_children))
+    etag = _etag(body)
+    try:
+        await get_redis().set(
+            key,
+            b"|".join((stamp, etag.encode(), body)),
+            ex=get_settings().task_board_cache_ttl_seconds,
+        )
+    except RedisError as e:
+        logger.warning("task_board_cache_store_failed", error=str(e))
+    return BoardSnapshot(etag=etag, body=body)
+
+
+def invalidate_projects(
+    project_ids: Iterable[UUID],
+    task_ids: Iterable[UUID] = (),
+    user_ids: Iterable[UUID] = (),
+) -> None:
+    """Bump the board version of each project, of each task's project, and
+    of each project with a card created by or assigned to one of the users.
+
+    Returns immediately; the bumps (and the lookups of task and user
+    projects) run in the background.
+    """
+    task_ids, user_ids = list(task_ids), list(user_ids)
+
+    async def resolve_projects() -> list[str]:
+        project_ids: set[UUID] = set()
+        async with async_session_factory() as session:
+            if task_ids:
+                project_ids.update((await session.execute(
+                    select(Task.project_id).where(Task.id.in_(task_ids))
+                )).scalars().all())
+            if user_ids:
+                assigned = select(TaskAssignment.task_id).where(TaskAssignment.user_id.in_(user_ids))
+                project_ids.update((await session.execute(
+                    select(Task.project_id)
+                    .where(
+                        Task.parent_task_id.is_(None),
+                        Task.created_by_id.in_(user_ids) | Task.id.in_(assigned),
+                    )
+                    .distinct()
+                )).scalars().all())
+        return [_version_key(project_id) for project_id in project_ids]
+
+    schedule_counter_bumps(
+        [_version_key(project_id) for project_id in project_ids],
+        "task_board_invalidation_failed",
+        resolve_keys=resolve_projects if task_ids or user_ids else None,
+    )
+
+
+# --- Invalidation ---
+# Hooks run inside flush/execute, so they only read instance state and the
+# identity map: tasks not loaded in the session, and the boards showing a
+# changed user, are resolved after commit.
+
+def _pending(session: Session) -> dict[str, set[UUID]]:
+    return session.info.setdefault(
+        "task_board_invalidation", {"projects": set(), "tasks": set(), "users": set()}
+    )
+
+
+def _attr_changed(obj: Any, attrs: tuple[str, ...]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _identity(session: Session, model: type, row_id: UUID) -> Any:
+    return session.identity_map.get(inspect(model).identity_key_from_primary_key([row_id]))
+
+
+def _add_tasks(session: Session, task_ids: Iterable[UUID]) -> None:
+    """Record tasks whose boards changed, by project where the task is loaded."""
+    pending = _pending(session)
+    for task_id in task_ids:
+        task = _identity(session, Task, task_id)
+        if task is not None and task.project_id is not None:
+            pending["projects"].add(task.project_id)
+        elif task_id is not None:
+            pending["tasks"].add(task_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_board_changes(session: Session, flush_context) -> None:
+    """Record which projects' boards the flushed rows affect."""
+    pending = _pending(session)
+    projects = pending["projects"]
+    task_ids: set[UUID] = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Task):
+            if obj in session.dirty and not _attr_changed(obj, CARD_ATTRS):
+                continue
+            projects.add(obj.project_id)
+            # Tasks moved between projects leave the old board too
+            history = inspect(obj).attrs.project_id.history
+            projects.update(project_id for project_id in history.deleted if project_id)
+        elif isinstance(obj, (TaskComment, TaskAssignment)):
+            task_ids.add(obj.task_id)
+        elif isinstance(obj, Project) and obj in session.dirty:
+            # Names show on aggregated boards; other project fields don't
+            if _attr_changed(obj, ("name",)):
+                projects.add(obj.id)
+        elif isinstance(obj, User) and obj in session.dirty:
+            if _attr_changed(obj, USER_CARD_ATTRS):
+                pending["users"].add(obj.id)
+
+    projects.discard(None)
+    _add_tasks(session, task_ids)
+
+
+def _bound_values(whereclause: Any, column: Any) -> set:
+    """Values a WHERE clause compares ``column`` to with = or IN."""
+    values: set = set()
+    if whereclause is None:
+        return values
+    for element in visitors.iterate(whereclause):
+        if not isinstance(element, BinaryExpression) or element.operator not in (eq, in_op):
+            continue
+        if not element.left.compare(column) or not isinstance(element.right, BindParameter):
+            continue
+        value = element.right.value
+        if isinstance(value, (list, tuple, set)):
+            values.update(value)
+        elif value is not None:
+            values.add(value)
+    return values
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_board_changes(orm_execute_state) -> None:
+    """Bulk UPDATE/DELETE statements don't list the rows they change.
+
+    Statements that pin the project or task ids in their WHERE clause (as
+    the assignment deletes do), or the ids of comments/assignments loaded in
+    the session, invalidate those projects. Other bulk statements on these
+    tables are logged; the boards they touch refresh when their snapshots
+    expire.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, (Task, TaskComment, TaskAssignment)):
+        return
+    session = orm_execute_state.session
+    whereclause = orm_execute_state.statement.whereclause
+    table = mapper.class_.__table__
+
+    if mapper.class_ is Task:
+        project_ids = _bound_values(whereclause, table.c.project_id)
+        task_ids = _bound_values(whereclause, table.c.id)
+    else:
+        project_ids = set()
+        task_ids = _bound_values(whereclause, table.c.task_id)
+        for row_id in _bound_values(whereclause, table.c.id):
+            row = _identity(session, mapper.class_, row_id)
+            if row is not None:
+                task_ids.add(row.task_id)
+
+    if not (project_ids or task_ids):
+        logger.warning("task_board_bulk_change_untracked", model=mapper.class_.__name__)
+        return
+    _pending(session)["projects"].update(project_ids)
+    _add_tasks(session, task_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_board_invalidation(session: Session) -> None:
+    pending = session.info.pop("task_board_invalidation", None)
+    if not pending:
+        return
+    invalidate_projects(pending["projects"], pending["tasks"], pending["users"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_board_invalidation(session: Session) -> None:
+    session.info.pop("task_board_invalidation", None)
@@ -0,0 +1,251 @@
+"""Rank keys ordering tasks within a status column.
+
+A task's place in its column is its ``rank``: a base-62 string read as a
+fraction (digits after the point), compared bytewise (the column uses the
+"C" collation). A key can always be generated between any two others, so
+moving a task rewrites that task alone instead of renumbering the column,
+and concurrent moves don't contend for the same rows.
+
+Keys start six digits wide. Appends step by 62^3, so a column takes about
+235,000 appends before its keys grow. Inserting repeatedly into the same
+gap lengthens keys by roughly one digit per six inserts. When a key grows
+past MAX_RANK_LENGTH, the column is queued for rebalancing, which respaces
+its keys evenly at the base width.
+
+Moves hold a shared transaction-level advisory lock on their column and
+rebalancing holds it exclusively, so a move never computes a key from ranks
+that a concurrent rebalance is rewriting.
+"""
+
+import zlib
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import bindparam, event, func, inspect, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from researchhub.models.project import Task
+
+logger = structlog.get_logger()
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+BASE_WIDTH = 6
+APPEND_STEP_DIGITS = 3
+MAX_RANK_LENGTH = 24
+
+# First key of the two-key advisory locks taken on task columns
+_RANK_LOCK_NAMESPACE = 7301
+
+
+def _to_int(key: str, width: int) -> int:
+    value = 0
+    for char in key.ljust(width, DIGITS[0]):
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def _to_key(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        chars.append(DIGITS[digit])
+    # Trailing zeros don't change the fraction; stripping them keeps one
+    # spelling per value, which keeps string and numeric order aligned
+    return "".join(reversed(chars)).rstrip(DIGITS[0])
+
+
+def key_between(before: Optional[str], after: Optional[str]) -> str:
+    """A rank sorting strictly between ``before`` and ``after``.
+
+    Either bound may be None for the start or end of the column. Without an
+    upper bound the key steps a fixed distance past ``before`` (and
+    likewise without a lower bound), so runs of appends stay short.
+
+    Raises:
+        ValueError: If ``before`` does not sort before ``after``
+    """
+    if before is not None and after is not None and not before < after:
+        raise ValueError(f"rank {before!r} does not sort before {after!r}")
+
+    width = max(BASE_WIDTH, len(before or ""), len(after or ""))
+    low = _to_int(before or "", width)
+    high = _to_int(after, width) if after is not None else BASE ** width
+    while high - low < 2:
+        width += 1
+        low *= BASE
+        high *= BASE
+
+    gap = high - low
+    step = BASE ** (width - BASE_WIDTH + APPEND_STEP_DIGITS)
+    if after is None and before is not None:
+        value = low + min(step, gap // 2)
+    elif before is None and after is not None:
+        value = high - min(step, gap // 2)
+    else:
+        value = low + gap // 2
+    return _to_key(value, width)
+
+
+def spaced_keys(count: int) -> list[str]:
+    """``count`` ascending keys spread evenly at the base width."""
+    span = BASE ** BASE_WIDTH
+    return [_to_key((i + 1) * span // (count + 1), BASE_WIDTH) for i in range(count)]
+
+
+def _lock_id(project_id: UUID, status: str) -> int:
+    # Signed 32-bit key for pg_advisory_xact_lock(int, int)
+    return zlib.crc32(f"{project_id}:{status}".encode()) - 2 ** 31
+
+
+async def lock_column(db: AsyncSession, project_id: UUID, status: str, exclusive: bool = False) -> None:
+    """Take the column's advisory lock for the rest of the transaction."""
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    await db.execute(
+        text(f"SELECT {function}(:namespace, :key)"),
+        {"namespace": _RANK_LOCK_NAMESPACE, "key": _lock_id(project_id, status)},
+    )
+
+
+async def rank_for_move(
+    db: AsyncSession,
+    task: Task,
+    status: str,
+    after_id: Optional[UUID] = None,
+    before_id: Optional[UUID] = None,
+    position: Optional[int] = None,
+) -> str:
+    """Rank placing ``task`` in ``status`` among its siblings.
+
+    The place is given by neighbor ids (``after_id`` is the task above,
+    ``before_id`` the task below) or by the index the task should take in
+    the column. With neither, the task goes to the end of the column.
+
+    Raises:
+        ValueError: If a neighbor is not in the target column
+    """
+    await lock_column(db, task.project_id, status)
+
+    parent = (
+        Task.parent_task_id.is_(None)
+        if task.parent_task_id is None
+        else Task.parent_task_id == task.parent_task_id
+    )
+    column = select(Task.rank).where(
+        Task.project_id == task.project_id,
+        Task.status == status,
+        parent,
+        Task.id != task.id,
+    )
+
+    async def rank_of(task_id: UUID) -> str:
+        rank = await db.scalar(column.where(Task.id == task_id))
+        if rank is None:
+            raise ValueError(f"task {task_id} is not in the {status} column")
+        return rank
+
+    async def next_after(rank: str) -> Optional[str]:
+        return await db.scalar(column.where(Task.rank > rank).order_by(Task.rank.asc()).limit(1))
+
+    async def column_end() -> Optional[str]:
+        return await db.scalar(column.with_only_columns(func.max(Task.rank)))
+
+    if after_id is not None:
+        lower = await rank_of(after_id)
+        upper = await rank_of(before_id) if before_id is not None else await next_after(lower)
+    elif before_id is not None:
+        upper = await rank_of(before_id)
+        lower = await db.scalar(column.where(Task.rank < upper).order_by(Task.rank.desc()).limit(1))
+    elif position is not None and position > 0:
+        result = await db.execute(
+            column.order_by(Task.rank.asc(), Task.id.asc()).offset(position - 1).limit(2)
+        )
+        neighbors = list(result.scalars().all())
+        if neighbors:
+            lower, upper = neighbors[0], (neighbors[1] if len(neighbors) > 1 else None)
+        else:
+            # Past the end of the column
+            lower, upper = await column_end(), None
+    elif position == 0:
+        lower = None
+        upper = await db.scalar(column.order_by(Task.rank.asc()).limit(1))
+    else:
+        lower, upper = await column_end(), None
+
+    if lower is not None and upper is not None and not lower < upper:
+        # Equal ranks, left by concurrent inserts into the same gap
+        upper = await next_after(lower)
+    return key_between(lower, upper)
+
+
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) > MAX_RANK_LENGTH
+
+
+async def rebalance_column(db: AsyncSession, project_id: UUID, status: str) -> int:
+    """Respace a column's ranks at the base width, keeping their order.
+
+    Returns:
+        Number of tasks re-ranked
+    """
+    await lock_column(db, project_id, status, exclusive=True)
+    result = await db.execute(
+        select(Task.id)
+        .where(Task.project_id == project_id, Task.status == status)
+        .order_by(Task.rank.asc(), Task.id.asc())
+    )
+    task_ids = list(result.scalars().all())
+    if task_ids:
+        # Core statement: the order is unchanged, so no ORM hooks need to see it
+        tasks = Task.__table__
+        await db.execute(
+            update(tasks).where(tasks.c.id == bindparam("task_id")).values(rank=bindparam("new_rank")),
+            [
+                {"task_id": task_id, "new_rank": rank}
+                for task_id, rank in zip(task_ids, spaced_keys(len(task_ids)))
+            ],
+        )
+    await db.commit()
+    logger.info("task_column_rebalanced", project_id=str(project_id), status=status, tasks=len(task_ids))
+    return len(task_ids)
+
+
+# --- Ranks for new and re-columned tasks ---
+
+def _column_end(session: Session, project_id: UUID, status: str) -> Optional[str]:
+    return session.execute(
+        select(func.max(Task.rank)).where(Task.project_id == project_id, Task.status == status)
+    ).scalar()
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_ranks(session: Session, flush_context, instances) -> None:
+    """Append new tasks, and tasks changing status without a new rank, to their column.
+
+    One index lookup per affected column finds its current end; tasks
+    flushed together are appended in the order they were added.
+    """
+    ends: dict[tuple[UUID, str], Optional[str]] = {}
+
+    def append(task: Task) -> None:
+        project_id = task.project_id if task.project_id is not None else getattr(task.project, "id", None)
+        if project_id is None:
+            return
+        column = (project_id, task.status)
+        if column not in ends:
+            ends[column] = _column_end(session, *column)
+        task.rank = key_between(ends[column], None)
+        ends[column] = task.rank
+
+    for obj in session.new:
+        if isinstance(obj, Task) and not obj.rank:
+            append(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, Task):
+            state = inspect(obj)
+            if state.attrs.status.history.has_changes() and not state.attrs.rank.history.has_changes():
+                append(obj)
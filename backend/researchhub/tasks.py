@@ -1,12 +1,13 @@
 """Celery background tasks."""
 
-import asyncio
 import structlog
 from uuid import UUID
 
-from researchhub.worker import celery_app
+from researchhub.config import get_settings
+from researchhub.worker import async_task, celery_app
 
 logger = structlog.get_logger()
+settings = get_settings()
 
 
 @celery_app.task(bind=True, name="researchhub.tasks.example_task")
@@ -62,6 +63,62 @@ def send_notification(self, user_id: str, notification_type: str, data: dict) ->
     }
 
 
+@async_task(name="researchhub.tasks.fan_out_notifications")
+async def fan_out_notifications(
+    self,
+    user_ids: list[str],
+    notification_type: str,
+    title: str,
+    message: str,
+    organization_id: str,
+    target_type: str | None = None,
+    target_id: str | None = None,
+    target_url: str | None = None,
+    sender_id: str | None = None,
+    extra_data: dict | None = None,
+) -> dict:
+    """
+    Create one notification for many users.
+
+    Queued by NotificationService.notify_many for fan-outs to more than
+    notification_fanout_inline_max users.
+    """
+    async def _process():
+        from researchhub.db.session import async_session_factory
+        from researchhub.services.notification import NotificationService
+
+        async with async_session_factory() as db:
+            return await NotificationService(db).notify_many(
+                user_ids=[UUID(user_id) for user_id in user_ids],
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                organization_id=UUID(organization_id),
+                target_type=target_type,
+                target_id=UUID(target_id) if target_id else None,
+                target_url=target_url,
+                sender_id=UUID(sender_id) if sender_id else None,
+                extra_data=extra_data,
+                defer_large=False,
+            )
+
+    try:
+        created = await _process()
+        return {"status": "success", "notification_type": notification_type, "created": created}
+    except Exception as e:
+        logger.error(
+            "notification_fanout_failed",
+            notification_type=notification_type,
+            recipients=len(user_ids),
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "notification_type": notification_type,
+            "error": str(e),
+        }
+
+
 @celery_app.task(bind=True, name="researchhub.tasks.cleanup_expired_sessions")
 def cleanup_expired_sessions(self) -> dict:
     """Periodic task to clean up expired sessions."""
@@ -69,8 +126,8 @@ def cleanup_expired_sessions(self) -> dict:
     return {"status": "cleaned", "sessions_removed": 0}
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.process_recurring_tasks")
-def process_recurring_tasks(self) -> dict:
+@async_task(name="researchhub.tasks.process_recurring_tasks")
+async def process_recurring_tasks(self) -> dict:
     """
     Process all due recurring task rules and create tasks.
 
@@ -95,7 +152,7 @@ def process_recurring_tasks(self) -> dict:
             return len(created_tasks)
 
     try:
-        tasks_created = asyncio.run(_process())
+        tasks_created = await _process()
         logger.info(
             "recurring_tasks_processed",
             tasks_created=tasks_created,
@@ -115,8 +172,8 @@ def process_recurring_tasks(self) -> dict:
         }
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.auto_review_task")
-def auto_review_task(
+@async_task(name="researchhub.tasks.auto_review_task")
+async def auto_review_task(
     self,
     task_id: str,
     user_id: str,
@@ -153,7 +210,7 @@ def auto_review_task(
             return suggestions
 
     try:
-        suggestions = asyncio.run(_process())
+        suggestions = await _process()
         logger.info(
             "auto_review_completed",
             task_id=task_id,
@@ -177,8 +234,8 @@ def auto_review_task(
         }
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.auto_review_document_task")
-def auto_review_document_task(
+@async_task(name="researchhub.tasks.auto_review_document_task")
+async def auto_review_document_task(
     self,
     document_id: str,
     user_id: str,
@@ -218,7 +275,7 @@ def auto_review_document_task(
             return result
 
     try:
-        result = asyncio.run(_process())
+        result = await _process()
         logger.info(
             "auto_review_document_completed",
             document_id=document_id,
@@ -243,8 +300,8 @@ def auto_review_document_task(
         }
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.generate_embedding")
-def generate_embedding(
+@async_task(name="researchhub.tasks.generate_embedding")
+async def generate_embedding(
     self,
     entity_type: str,
     entity_id: str,
@@ -252,8 +309,9 @@ def generate_embedding(
     """
     Generate embedding for a single entity.
 
-    This task is triggered when an entity is created or updated.
-    It generates a vector embedding for semantic search capabilities.
+    Entity saves go through the debounced embedding queue
+    (services/embedding_queue.py) instead; this task is kept for one-off
+    regeneration of a single entity.
 
     Args:
         entity_type: Type of entity ("document", "task", "journal_entry", "paper")
@@ -275,7 +333,7 @@ def generate_embedding(
             return success
 
     try:
-        success = asyncio.run(_process())
+        success = await _process()
         if success:
             logger.info(
                 "embedding_generated",
@@ -313,8 +371,8 @@ def generate_embedding(
         }
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.generate_embeddings_batch")
-def generate_embeddings_batch(
+@async_task(name="researchhub.tasks.generate_embeddings_batch")
+async def generate_embeddings_batch(
     self,
     entity_type: str,
     entity_ids: list[str],
@@ -345,7 +403,7 @@ def generate_embeddings_batch(
             return result
 
     try:
-        result = asyncio.run(_process())
+        result = await _process()
         logger.info(
             "batch_embeddings_completed",
             entity_type=entity_type,
@@ -372,23 +430,28 @@ def generate_embeddings_batch(
         }
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.backfill_embeddings")
-def backfill_embeddings(
+@async_task(name="researchhub.tasks.backfill_embeddings")
+async def backfill_embeddings(
     self,
     entity_type: str,
     batch_size: int = 50,
     reembed_existing: bool = False,
+    force: bool = False,
 ) -> dict:
     """
     Backfill embeddings for all entities of a given type.
 
     Used to generate embeddings for existing data that was created
-    before the embedding system was enabled.
+    before the embedding system was enabled. Candidate rows are streamed
+    in keyset-paginated batches rather than loading every ID up front, and
+    rows whose content hash and model are unchanged are not re-embedded.
 
     Args:
         entity_type: Type of entities to backfill ("document", "task", "journal_entry", "paper")
         batch_size: Number of entities to process per batch
-        reembed_existing: If True, regenerate embeddings even if they exist
+        reembed_existing: If True, scan every row instead of only rows with a
+            missing/outdated embedding (unchanged content is still skipped)
+        force: If True, regenerate embeddings even when content is unchanged
 
     Returns:
         Dict with total processed counts
@@ -396,52 +459,68 @@ def backfill_embeddings(
     async def _process():
         from sqlalchemy import select
 
+        from researchhub.config import get_settings
         from researchhub.db.session import async_session_factory
         from researchhub.services.embedding import (
             EMBEDDABLE_ENTITIES,
             get_embedding_service,
+            stale_embedding_clause,
         )
 
         model_class = EMBEDDABLE_ENTITIES.get(entity_type)
         if not model_class:
             return {"error": f"Unknown entity type: {entity_type}"}
 
+        total_processed = 0
         total_success = 0
         total_skipped = 0
+        total_unchanged = 0
         total_failed = 0
 
         async with async_session_factory() as db:
             service = get_embedding_service(db)
 
             # Query for entities needing embeddings
-            query = select(model_class.id)
-            if not reembed_existing:
-                query = query.where(model_class.embedding.is_(None))
+            query = select(model_class.id).order_by(model_class.id).limit(batch_size)
+            if not (reembed_existing or force):
+                query = query.where(
+                    stale_embedding_clause(model_class, get_settings().embedding_model)
+                )
 
-            # Get all IDs first
-            result = await db.execute(query)
-            all_ids = [row[0] for row in result.all()]
+            # Walk candidates by id so each batch is a bounded query
+            last_id = None
+            while True:
+                batch_query = query if last_id is None else query.where(model_class.id > last_id)
+                result = await db.execute(batch_query)
+                batch_ids = [row[0] for row in result.all()]
+                if not batch_ids:
+                    break
+                last_id = batch_ids[-1]
 
-            # Process in batches
-            for i in range(0, len(all_ids), batch_size):
-                batch_ids = all_ids[i : i + batch_size]
                 batch_result = await service.embed_entities_batch(
                     entity_type=entity_type,
                     entity_ids=batch_ids,
+                    force=force,
                 )
+                total_processed += len(batch_ids)
                 total_success += batch_result.get("success", 0)
                 total_skipped += batch_result.get("skipped", 0)
+                total_unchanged += batch_result.get("unchanged", 0)
                 total_failed += batch_result.get("failed", 0)
 
+                # Release loaded entities (and their vectors) between batches
+                db.expunge_all()
+
         return {
-            "total_processed": len(all_ids),
+            "total_processed": total_processed,
             "success": total_success,
             "skipped": total_skipped,
+            "unchanged": total_unchanged,
             "failed": total_failed,
         }
 
     try:
-        result = asyncio.run(_process())
+        result = await _process()
         if "error" in result:
             return {"status": "error", **result}
 
@@ -468,8 +547,8 @@ def backfill_embeddings(
         }
 
 
-@celery_app.task(bind=True, name="researchhub.tasks.auto_review_for_review_task")
-def auto_review_for_review_task(
+@async_task(name="researchhub.tasks.auto_review_for_review_task")
+async def auto_review_for_review_task(
     self,
     review_id: str,
     user_id: str,
@@ -506,7 +585,7 @@ def auto_review_for_review_task(
             return comment_count
 
     try:
-        comment_count = asyncio.run(_process())
+        comment_count = await _process()
         logger.info(
             "auto_review_for_review_completed",
             review_id=review_id,
@@ -528,3 +607,113 @@ def auto_review_for_review_task(
             "review_id": review_id,
             "error": str(e),
         }
+
+
+@async_task(name="researchhub.tasks.refresh_analytics_rollups")
+async def refresh_analytics_rollups(self, lookback_days: int | None = None) -> dict:
+    """
+    Recompute the daily analytics rollups for today and recent days.
+
+    Scheduled by the Celery beat entry in researchhub.worker. Run manually
+    with a large lookback_days to backfill history.
+    """
+    async def _process():
+        from researchhub.config import get_settings
+        from researchhub.db.session import async_session_factory
+        from researchhub.services.analytics import refresh_rollups
+
+        days = lookback_days
+        if days is None:
+            days = get_settings().analytics_rollup_lookback_days
+        async with async_session_factory() as db:
+            return await refresh_rollups(db, lookback_days=days)
+
+    try:
+        rows = await _process()
+        if rows is None:
+            return {"status": "skipped"}
+        return {"status": "success", "rows": rows}
+    except Exception as e:
+        logger.error(
+            "analytics_rollup_refresh_failed",
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "error": str(e),
+        }
+
+
+@async_task(name="researchhub.tasks.rebalance_task_ranks")
+async def rebalance_task_ranks(self, project_id: str, status: str) -> dict:
+    """
+    Respace the rank keys of one status column of a project.
+
+    Queued by move_task when a move produces a key longer than
+    task_rank.MAX_RANK_LENGTH.
+    """
+    async def _process():
+        from researchhub.db.session import async_session_factory
+        from researchhub.services.task_rank import rebalance_column
+
+        async with async_session_factory() as db:
+            return await rebalance_column(db, UUID(project_id), status)
+
+    try:
+        count = await _process()
+        return {"status": "success", "project_id": project_id, "column": status, "tasks": count}
+    except Exception as e:
+        logger.error(
+            "task_rank_rebalance_failed",
+            project_id=project_id,
+            column=status,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "project_id": project_id,
+            "error": str(e),
+        }
+
+
+@async_task(
+    name="researchhub.tasks.render_export",
+    time_limit=settings.export_job_time_limit_seconds,
+    soft_time_limit=settings.export_job_time_limit_seconds - 60,
+)
+async def render_export(self, job_id: str) -> dict:
+    """
+    Render the PDF of an export job.
+
+    Queued by services.exports.export_pdf for exports too large to render
+    while the request waits.
+    """
+    async def _process():
+        from researchhub.services.exports import run_job
+
+        return await run_job(job_id)
+
+    try:
+        job = await _process()
+        if job is None:
+            return {"status": "expired", "job_id": job_id}
+        return {"status": "success", "job_id": job_id, "artifact_key": job.artifact_key}
+    except Exception as e:
+        logger.error(
+            "export_render_failed",
+            job_id=job_id,
+            error=str(e),
+        )
+        return {
+            "status": "error",
+            "job_id": job_id,
+            "error": str(e),
+        }
+
+
+@celery_app.task(bind=True, name="researchhub.tasks.prune_export_artifacts")
+def prune_export_artifacts(self) -> dict:
+    """Delete stored export PDFs that haven't been downloaded for a while."""
+    from researchhub.services.exports import prune_artifacts
+
+    return {"status": "success", "removed": prune_artifacts()}
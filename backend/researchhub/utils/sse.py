@@ -0,0 +1,221 @@
+"""Server-Sent Events streaming.
+
+``sse_stream`` turns an async iterator of ``(event, data)`` pairs into SSE
+frames for a StreamingResponse:
+
+- Data is encoded with orjson, straight to bytes.
+- Consecutive text deltas (``text_delta``, ``thinking``) are coalesced:
+  a delta is held for up to ``sse_flush_interval_ms`` so the ones arriving
+  behind it join the same frame, up to ``sse_max_frame_chars``. Any other
+  event flushes the held delta first, so order is kept.
+- Events are produced by a separate task into a bounded buffer. A slow
+  client simply gets larger coalesced frames; once ``sse_max_pending_events``
+  frames are waiting, the producer pauses until the client catches up.
+- After ``sse_heartbeat_seconds`` without a frame, a comment line is sent
+  so proxies keep the connection open. EventSource parsers ignore it.
+- One in ``sse_log_sample_every`` frames is logged at debug level, and a
+  summary with the stream's CPU time (encoding, coalescing, logging) is
+  logged when it ends.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+import structlog
+
+from researchhub.config import get_settings
+from researchhub.metrics import SSE_EVENTS_COALESCED, SSE_FRAMES, SSE_STREAM_CPU
+
+logger = structlog.get_logger()
+
+COALESCED_EVENTS = frozenset({"text_delta", "thinking"})
+
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def encode_event(event: str, data: Any) -> bytes:
+    """One SSE frame: the event name and its data as a single JSON line."""
+    data_json = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return b"event: " + event.encode() + b"\ndata: " + data_json + b"\n\n"
+
+
+class _Pending:
+    """An event waiting to be sent; a delta collects its followers in ``parts``."""
+
+    __slots__ = ("event", "data", "parts", "size", "created_at")
+
+    def __init__(self, event: str, data: Any, parts: Optional[list[str]], created_at: float):
+        self.event = event
+        self.data = data
+        self.parts = parts
+        self.size = sum(len(part) for part in parts) if parts else 0
+        self.created_at = created_at
+
+    def encode(self) -> bytes:
+        if self.parts is None:
+            return encode_event(self.event, self.data)
+        return encode_event(self.event, {**self.data, "content": "".join(self.parts)})
+
+
+class _EventBuffer:
+    """Events produced but not yet sent."""
+
+    def __init__(self, max_events: int, max_frame_chars: int):
+        self.max_events = max_events
+        self.max_frame_chars = max_frame_chars
+        self.items: deque[_Pending] = deque()
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.coalesced = 0
+        self.cpu = 0.0
+        self._changed = asyncio.Event()
+        self._drained = asyncio.Event()
+
+    async def put(self, event: str, data: Any) -> None:
+        start = time.thread_time()
+        content = data.get("content") if event in COALESCED_EVENTS and isinstance(data, dict) else None
+        if isinstance(content, str):
+            last = self.items[-1] if self.items else None
+            if (
+                last is not None
+                and last.event == event
+                and last.parts is not None
+                and last.size < self.max_frame_chars
+            ):
+                last.parts.append(content)
+                last.size += len(content)
+                self.coalesced += 1
+                if last.size >= self.max_frame_chars:
+                    self._changed.set()
+                self.cpu += time.thread_time() - start
+                return
+            parts: Optional[list[str]] = [content]
+        else:
+            parts = None
+        self.cpu += time.thread_time() - start
+
+        while len(self.items) >= self.max_events:
+            # Backpressure: wait for the client to take some frames
+            self._drained.clear()
+            await self._drained.wait()
+
+        self.items.append(_Pending(event, data, parts, time.monotonic()))
+        self._changed.set()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._changed.set()
+
+    def pop(self) -> _Pending:
+        item = self.items.popleft()
+        self._drained.set()
+        return item
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a new or grown event; False on timeout."""
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+async def _produce(events: AsyncIterator[tuple[str, Any]], buffer: _EventBuffer) -> None:
+    try:
+        async for event, data in events:
+            await buffer.put(event, data)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        buffer.close(e)
+    else:
+        buffer.close()
+
+
+async def sse_stream(
+    events: AsyncIterator[tuple[str, Any]],
+    stream: str,
+) -> AsyncIterator[bytes]:
+    """Encode ``(event, data)`` pairs as SSE frames.
+
+    Args:
+        events: Events in order; text deltas carry ``{"content": str}``
+        stream: Name for logs and metrics
+
+    Raises:
+        Exception: Whatever ``events`` raised, after the frames before it
+            have been sent
+    """
+    settings = get_settings()
+    flush_interval = settings.sse_flush_interval_ms / 1000
+    heartbeat = settings.sse_heartbeat_seconds
+    sample_every = max(settings.sse_log_sample_every, 1)
+
+    buffer = _EventBuffer(settings.sse_max_pending_events, settings.sse_max_frame_chars)
+    producer = asyncio.create_task(_produce(events, buffer))
+    started_at = last_sent = time.monotonic()
+    frames = heartbeats = sent_bytes = 0
+
+    try:
+        while True:
+            now = time.monotonic()
+            head = buffer.items[0] if buffer.items else None
+            if head is None:
+                if buffer.done:
+                    break
+                if not await buffer.wait(last_sent + heartbeat - now):
+                    heartbeats += 1
+                    SSE_FRAMES.labels(stream=stream, event="heartbeat").inc()
+                    yield HEARTBEAT
+                    last_sent = time.monotonic()
+                continue
+
+            growing = (
+                head.parts is not None
+                and len(buffer.items) == 1
+                and not buffer.done
+                and head.size < buffer.max_frame_chars
+            )
+            if growing and now < head.created_at + flush_interval:
+                # Let deltas arriving behind this one join its frame
+                await buffer.wait(head.created_at + flush_interval - now)
+                continue
+
+            start = time.thread_time()
+            item = buffer.pop()
+            frame = item.encode()
+            frames += 1
+            sent_bytes += len(frame)
+            SSE_FRAMES.labels(stream=stream, event=item.event).inc()
+            if frames % sample_every == 1 or sample_every == 1:
+                logger.debug("sse_frame", stream=stream, event_type=item.event, frame=frames, bytes=len(frame))
+            buffer.cpu += time.thread_time() - start
+
+            yield frame
+            last_sent = time.monotonic()
+
+        if buffer.error is not None:
+            raise buffer.error
+    finally:
+        producer.cancel()
+        with suppress(asyncio.CancelledError):
+            await producer
+
+        SSE_EVENTS_COALESCED.labels(stream=stream).inc(buffer.coalesced)
+        SSE_STREAM_CPU.labels(stream=stream).observe(buffer.cpu)
+        logger.info(
+            "sse_stream_closed",
+            stream=stream,
+            frames=frames,
+            events=frames + buffer.coalesced,
+            heartbeats=heartbeats,
+            bytes=sent_bytes,
+            duration_ms=round((time.monotonic() - started_at) * 1000),
+            cpu_ms=round(buffer.cpu * 1000, 2),
+        )
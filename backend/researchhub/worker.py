@@ -1,6 +1,14 @@
-"""Celery worker configuration."""
+"""Celery worker configuration and async task runtime."""
+
+import asyncio
+import contextlib
+import functools
+import os
+from collections.abc import Callable, Coroutine
+from typing import Any
 
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
 
 from researchhub.config import get_settings
 
@@ -23,7 +31,110 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=300,  # 5 minutes
     task_soft_time_limit=240,  # 4 minutes
+    beat_schedule={
+        "refresh-analytics-rollups": {
+            "task": "researchhub.tasks.refresh_analytics_rollups",
+            "schedule": settings.analytics_rollup_interval_seconds,
+        },
+        "prune-export-artifacts": {
+            "task": "researchhub.tasks.prune_export_artifacts",
+            "schedule": 3600,
+        },
+    },
 )
 
+
+# --- Async task runtime ---
+#
+# Tasks are coroutines, but asyncio.run() per task would build a new event
+# loop each time, and the asyncpg pool is bound to the loop that opened its
+# connections. Instead each worker process keeps one event loop for its
+# lifetime, plus an engine sized for one task at a time, so pooled
+# connections are reused across tasks. Assumes the prefork or solo pool
+# (one task at a time per process).
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get this process's event loop, creating it (and its engine) on first use."""
+    global _loop, _loop_pid
+    if _loop is None or _loop_pid != os.getpid():
+        from researchhub.db.session import configure_engine
+
+        # First task in this process, or first after fork: anything inherited
+        # from the parent belongs to its loop and must not be reused
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+        configure_engine(
+            pool_size=settings.celery_database_pool_size,
+            max_overflow=settings.celery_database_max_overflow,
+        )
+    return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion on the worker's persistent loop."""
+    from researchhub.db.redis import flush_counter_bumps
+
+    loop = get_worker_loop()
+    task = loop.create_task(coro)
+    try:
+        result = loop.run_until_complete(task)
+        # Cache invalidations scheduled by the task's commits would otherwise
+        # wait for the next task to run the loop
+        loop.run_until_complete(flush_counter_bumps())
+        return result
+    except BaseException:
+        # e.g. SoftTimeLimitExceeded raised from a signal handler mid-loop:
+        # don't leave the task pending to resume during the next one
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(BaseException):
+                loop.run_until_complete(task)
+        raise
+
+
+def async_task(name: str, **options: Any) -> Callable:
+    """Register a coroutine function as a bound Celery task.
+
+    Usage:
+        @async_task(name="researchhub.tasks.example")
+        async def example(self, arg: str) -> dict:
+            ...
+    """
+    def decorator(fn: Callable[..., Coroutine[Any, Any, Any]]) -> Any:
+        @functools.wraps(fn)
+        def run(self: Any, *args: Any, **kwargs: Any) -> Any:
+            return run_async(fn(self, *args, **kwargs))
+
+        return celery_app.task(bind=True, name=name, **options)(run)
+
+    return decorator
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_worker_loop(**kwargs: Any) -> None:
+    """Close pooled connections and the loop when the worker process exits."""
+    global _loop
+    if _loop is None or _loop_pid != os.getpid():
+        return
+    from researchhub.db.session import close_db
+
+    with contextlib.suppress(Exception):
+        _loop.run_until_complete(close_db())
+    _loop.close()
+    _loop = None
+
+
+# Register the access-set, board and assistant memo invalidation hooks for
+# commits made by tasks
+import researchhub.ai.assistant.memo  # noqa: E402,F401
+import researchhub.services.access_cache  # noqa: E402,F401
+import researchhub.services.task_board  # noqa: E402,F401
+
 # Auto-discover tasks from researchhub.tasks module
 celery_app.autodiscover_tasks(["researchhub"])
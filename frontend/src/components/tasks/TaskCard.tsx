@@ -289,7 +289,10 @@ export default function TaskCard({ task, onClick, isDragging, reviewStatus, bloc
     e.stopPropagation(); // Prevent card click
     onVote?.(task.id);
   };
-  const descriptionText = useMemo(() => getDescriptionText(task.description), [task.description]);
+  const descriptionText = useMemo(
+    () => task.description_preview ?? getDescriptionText(task.description),
+    [task.description_preview, task.description]
+  );
 
   const isOverdue = useMemo(() => {
     if (!task.due_date || task.status === "done") return false;
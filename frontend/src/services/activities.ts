@@ -27,8 +27,10 @@ export interface Activity {
 
 export interface ActivityFeedResponse {
   activities: Activity[];
-  total: number;
+  total: number | null;
+  total_is_estimate: boolean;
   has_more: boolean;
+  next_cursor: string | null;
 }
 
 export interface Notification {
@@ -54,8 +56,10 @@ export interface Notification {
 export interface NotificationListResponse {
   notifications: Notification[];
   unread_count: number;
-  total: number;
+  total: number | null;
+  total_is_estimate: boolean;
   has_more: boolean;
+  next_cursor: string | null;
 }
 
 export interface NotificationPreferences {
@@ -88,6 +92,7 @@ export const activitiesApi = {
     actor_id?: string;
     skip?: number;
     limit?: number;
+    cursor?: string;
   }): Promise<ActivityFeedResponse> {
     const searchParams = new URLSearchParams();
     searchParams.append('organization_id', params.organization_id);
@@ -97,6 +102,7 @@ export const activitiesApi = {
     if (params.actor_id) searchParams.append('actor_id', params.actor_id);
     if (params.skip !== undefined) searchParams.append('skip', params.skip.toString());
     if (params.limit !== undefined) searchParams.append('limit', params.limit.toString());
+    if (params.cursor) searchParams.append('cursor', params.cursor);
 
     const response = await api.get<ActivityFeedResponse>(`/activities/feed?${searchParams}`);
     return response.data;
@@ -118,12 +124,14 @@ export const notificationsApi = {
     is_read?: boolean;
     skip?: number;
     limit?: number;
+    cursor?: string;
   } = {}): Promise<NotificationListResponse> {
     const searchParams = new URLSearchParams();
     if (params.organization_id) searchParams.append('organization_id', params.organization_id);
     if (params.is_read !== undefined) searchParams.append('is_read', params.is_read.toString());
     if (params.skip !== undefined) searchParams.append('skip', params.skip.toString());
     if (params.limit !== undefined) searchParams.append('limit', params.limit.toString());
+    if (params.cursor) searchParams.append('cursor', params.cursor);
 
     const queryString = searchParams.toString();
     const response = await api.get<NotificationListResponse>(`/activities/notifications${queryString ? `?${queryString}` : ''}`);
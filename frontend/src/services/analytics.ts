@@ -99,6 +99,7 @@ export interface DashboardAnalytics {
   project_progress: ProjectProgress[];
   recent_activity_types: ActivityMetrics[];
   top_contributors: TeamProductivity[];
+  task_status_over_time: TimeSeriesData[];
 }
 
 export const analyticsApi = {
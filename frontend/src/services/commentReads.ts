@@ -24,6 +24,12 @@ export interface MarkReadResponse {
   comment_type: string;
 }
 
+export interface MarkThreadReadResponse {
+  comment_type: string;
+  thread_id: string;
+  read_through: string;
+}
+
 export interface CommentReadStatus {
   comment_id: string;
   is_read: boolean;
@@ -45,13 +51,27 @@ export interface UnreadCountResponse {
 export const commentReadsApi = {
   /**
    * Mark one or more comments as read.
-   * Uses upsert to handle both new reads and re-reads.
+   * Earlier comments in the same threads are marked read too.
    */
   async markRead(params: MarkReadRequest): Promise<MarkReadResponse> {
     const response = await api.post<MarkReadResponse>('/comment-reads/mark-read', params);
     return response.data;
   },
 
+  /**
+   * Mark every comment in a thread (task, document, review, or the
+   * commented resource for generic comments) as read.
+   */
+  async markThreadRead(
+    commentType: CommentType,
+    threadId: string
+  ): Promise<MarkThreadReadResponse> {
+    const response = await api.post<MarkThreadReadResponse>(
+      `/comment-reads/threads/${commentType}/${threadId}/mark-read`
+    );
+    return response.data;
+  },
+
   /**
    * Get read status for a batch of comments.
    * Returns read status for each comment ID in the request.
@@ -63,7 +83,6 @@ export const commentReadsApi = {
 
   /**
    * Get unread comment count for a resource.
-   * Note: The frontend typically calculates this from loaded comments + read status.
    */
   async getUnreadCount(
     commentType: CommentType,
@@ -76,7 +95,7 @@ export const commentReadsApi = {
   },
 
   /**
-   * Mark a comment as unread (remove read record).
+   * Mark a comment, and the later comments in its thread, as unread.
    * Useful for "mark as unread" functionality.
    */
   async markUnread(
@@ -14,7 +14,16 @@ function getApiBase(): string {
 
 const API_BASE = getApiBase();
 
-async function downloadFile(url: string, filename: string): Promise<void> {
+const JOB_POLL_INTERVAL_MS = 2000;
+
+interface ExportJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  filename: string;
+  error: string | null;
+}
+
+async function authorizedFetch(url: string): Promise<Response> {
   const token = localStorage.getItem('pasteur-auth')
     ? JSON.parse(localStorage.getItem('pasteur-auth') || '{}')?.state?.accessToken
     : null;
@@ -27,6 +36,28 @@ async function downloadFile(url: string, filename: string): Promise<void> {
     const error = await response.json().catch(() => ({ detail: 'Export failed' }));
     throw new Error(error.detail || 'Export failed');
   }
+  return response;
+}
+
+/**
+ * Wait for a background export (large PDFs answer 202 with a job) and fetch its file.
+ */
+async function waitForExportJob(job: ExportJob): Promise<Response> {
+  while (job.status !== 'done') {
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Export failed');
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    job = await (await authorizedFetch(`/exports/jobs/${job.job_id}`)).json();
+  }
+  return authorizedFetch(`/exports/jobs/${job.job_id}/download`);
+}
+
+async function downloadFile(url: string, filename: string): Promise<void> {
+  let response = await authorizedFetch(url);
+  if (response.status === 202) {
+    response = await waitForExportJob(await response.json());
+  }
 
   const blob = await response.blob();
   const downloadUrl = window.URL.createObjectURL(blob);
@@ -45,7 +76,7 @@ export const exportsApi = {
   async exportProject(
     projectId: string,
     options: {
-      format?: 'csv' | 'pdf';
+      format?: 'csv' | 'ndjson' | 'pdf';
       includeTasks?: boolean;
       includeDocuments?: boolean;
     } = {}
@@ -70,7 +101,7 @@ export const exportsApi = {
   async exportTasks(
     organizationId: string,
     options: {
-      format?: 'csv' | 'pdf';
+      format?: 'csv' | 'ndjson' | 'pdf';
       projectId?: string;
       status?: string;
     } = {}
@@ -106,7 +137,7 @@ export const exportsApi = {
   async exportIdeas(
     organizationId: string,
     options: {
-      format?: 'csv' | 'pdf';
+      format?: 'csv' | 'ndjson' | 'pdf';
       projectId?: string;
     } = {}
   ): Promise<void> {
@@ -123,7 +154,7 @@ export const exportsApi = {
   async exportPapers(
     organizationId: string,
     options: {
-      format?: 'csv' | 'bibtex';
+      format?: 'csv' | 'ndjson' | 'bibtex';
       collectionId?: string;
     } = {}
   ): Promise<void> {
@@ -132,7 +163,7 @@ export const exportsApi = {
     params.append('format', options.format || 'csv');
     if (options.collectionId) params.append('collection_id', options.collectionId);
 
-    const ext = options.format === 'bibtex' ? 'bib' : 'csv';
+    const ext = options.format === 'bibtex' ? 'bib' : options.format || 'csv';
     await downloadFile(`/exports/papers?${params}`, `papers_export.${ext}`);
   },
 
@@ -127,6 +127,7 @@ export async function getPapers(
     collection_id?: string;
     skip?: number;
     limit?: number;
+    cursor?: string;
   }
 ): Promise<Paper[]> {
   const response = await api.get<Paper[]>('/knowledge/papers', {
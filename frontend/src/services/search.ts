@@ -22,6 +22,8 @@ export interface SearchResponse {
   query: string;
   filters: Record<string, unknown>;
   has_more: boolean;
+  next_cursor: string | null;
+  partial: boolean;
 }
 
 export interface SearchSuggestion {
@@ -38,6 +40,7 @@ export interface SearchParams {
   created_after?: string;
   created_before?: string;
   sort_by?: 'relevance' | 'created_at' | 'updated_at';
+  cursor?: string;
   skip?: number;
   limit?: number;
 }
@@ -55,6 +58,7 @@ export const searchApi = {
     if (params.created_after) searchParams.append('created_after', params.created_after);
     if (params.created_before) searchParams.append('created_before', params.created_before);
     if (params.sort_by) searchParams.append('sort_by', params.sort_by);
+    if (params.cursor) searchParams.append('cursor', params.cursor);
     if (params.skip !== undefined) searchParams.append('skip', params.skip.toString());
     if (params.limit !== undefined) searchParams.append('limit', params.limit.toString());
 
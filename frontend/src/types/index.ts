@@ -125,6 +125,7 @@ export interface Task {
   id: string;
   title: string;
   description: string | Record<string, unknown> | null; // JSONB TipTap content or legacy string
+  description_preview?: string | null; // Plain-text start of the description (board cards)
   status: "idea" | "todo" | "in_progress" | "in_review" | "done";
   priority: "low" | "medium" | "high" | "urgent";
   task_type: string;